@@ -89,6 +89,61 @@ newFols = newFollicleGrid(
         patch=None, name=None, selectNew=True, edgeBounded=[1, 0],
         uvRows=[5, 1], uvRange=[None, None, None, None])
 
+# Create many follicles quickly, duplicating them from the first one
+import follicleJntsTool.follicleJnts as folTools
+reload(folTools)
+newFols = folTools.newFollicleGrid(
+        patch=None, name=None, uvRows=[50, 20], edgeBounded=[1, 1],
+        clone=True, folType='t/f-j')
+
+# Plan a grid without changing the scene, then apply it in one modifier
+import follicleJntsTool.follicleJnts as folTools
+reload(folTools)
+plan = folTools.newFollicleGrid(
+        patch=None, name=None, uvRows=[50, 20], edgeBounded=[1, 1],
+        planOnly=True)
+print plan
+plan.execute(useModifier=True)
+print plan.stats
+
+# Run several tools as one undo step, without redraws in between
+import follicleJntsTool.follicleJnts as folTools
+reload(folTools)
+with folTools.batchSession(pauseEvaluation=True):
+    newFols = folTools.newFollicleGrid(
+            patch=None, name=None, uvRows=[20, 10], selectNew=False)
+    folTools.mirrorFollicles(objs=newFols, selectNew=True)
+
+# Make lots of follicles with undo off, keeping a journal to revert them
+import follicleJntsTool.follicleJnts as folTools
+reload(folTools)
+with folTools.batchSession(fastMode=True) as session:
+    newFols = folTools.newFollicleGrid(
+            patch=None, name=None, uvRows=[100, 50], selectNew=False)
+print session.journal
+session.rollback()
+
+# Pin a grid of joints to the patch with one shared uvPin (Maya 2020+)
+# Pinned types ('t@p', 't@p-j', 'j@p') have no follicle. Their offsets
+# can be set, frozen (freezeOffsets) and mirrored (mirrorFollicleOffsets),
+# but duplicating, mirroring (mirrorFollicles), transferring to another
+# patch, adding offset drivers, cloning and disconnecting from the patch
+# raise an error for them.
+import follicleJntsTool.follicleJnts as folTools
+reload(folTools)
+newFols = folTools.newFollicleGrid(
+        patch=None, name=None, uvRows=[50, 20], edgeBounded=[1, 1],
+        folType='t@p-j')
+print newFols[0].pin, newFols[0].pinIndex
+
+# Read and set values of many follicle joints at once, as NumPy arrays
+import follicleJntsTool.follicleJnts as folTools
+reload(folTools)
+folArray = folTools.getFollicleJoints(useSelection=True, asArray=True)
+print folArray.uv, folArray.sideCodes
+folArray.offsets = 0.0
+folArray[folArray.hasJoint].radius = 0.2
+
 # Duplicate follicles
 import follicleJntsTool.follicleJnts as folTools
 reload(folTools)
@@ -104,12 +159,76 @@ mirObjs = folTools.mirrorFollicles(
         axis='u', midVal=0.5, uvRange=[0.0, 1.0],
         strict=True, warnings=True)
 
+# Pair follicles with their mirrors by position, however they're named
+import follicleJntsTool.follicleJnts as folTools
+reload(folTools)
+pairs, middles, orphans = folTools.mirrorPairs(
+    objs=None, useSelection=True, pairBy='uv', axis='u', tolerance=0.001)
+folTools.mirrorFollicleOffsets(objs=None, pairBy='uv', strict=False)
+
+# Mirror follicles on a mesh whose UVs aren't symmetric, by its topology
+import follicleJntsTool.follicleJnts as folTools
+reload(folTools)
+folTools.mirrorFollicleOffsets(
+    objs=None, baseValues=True, pairBy='topology', strict=False)
+mirObjs = folTools.mirrorFollicles(
+    objs=None, pairBy='topology', seedEdge=None, strict=False)
+
 # Auto-Rename follicles (left/right)
 import follicleJntsTool.follicleJnts as folTools
 reload(folTools)
 newNames = folTools.autoRename(
     objs=None, useSelection=True, patch=None, name="ribbonFol_#", 
-    middleTolerance=0.04, uvAsXy=['u', 'v'], midVal=0.5, scaleY=4)
+    middleTolerance=0.04, uvAsXy=['u', 'v'], midVal=0.5, rowTolerance=0.01)
+
+# Evaluate a nurbs patch offline (NumPy; only reading the patch needs Maya)
+import follicleJntsTool.nurbsEval as nurbsEval
+reload(nurbsEval)
+patchData = nurbsEval.NurbsPatch.fromPatch(pm.PyNode('nurbsPlaneShape1'))
+points, dPdu, dPdv = patchData.evaluate([[0.0, 0.5], [0.5, 0.5], [1.0, 0.5]])
+normals = patchData.normals([[0.5, 0.5]])
+
+# Report how heavy the follicle joint rig is (nodes, connections, cost)
+import follicleJntsTool.footprint as footprint
+reload(footprint)
+report = footprint.footprintReport(hierarchy=None, worst=10)
+print footprint.footprintText(report)
+footprint.writeFootprint(report, 'footprint.json')
+
+# Benchmark the tools outside Maya, on the in-memory stand-in (per follicle
+# times and command counts), or: python -m follicleJntsTool.standInBenchmarks
+from follicleJntsTool import standInBenchmarks as standInBench
+results = standInBench.runSuite(sizes=[10, 100, 1000, 10000])
+standInBench.printResults(results)
+
+# Check the bulk operations' Maya command counts against their budgets
+# (commandBudgets.json), or: python -m follicleJntsTool.commandBudgets
+from follicleJntsTool import commandBudgets
+failures = commandBudgets.checkBudgets()
+
+# Time importing each tool module (cold and warm, in new processes), or:
+# mayapy -m follicleJntsTool.importBenchmarks
+from follicleJntsTool import importBenchmarks
+results = importBenchmarks.runImportBenchmarks(repeat=3)
+importBenchmarks.printResults(results)
+
+# While editing the tools: reload their dependencies too (eg. customQueries)
+# on reloading them (pymel, NumPy etc. are otherwise loaded on first use)
+import follicleJntsTool
+follicleJntsTool.devReload = True
+import follicleJntsTool.follicleJnts as folTools
+reload(folTools)
+
+# Trace the tools' calls: time and Maya commands per call (Chrome trace)
+import follicleJntsTool.follicleJnts as folTools
+import follicleJntsTool.profiling as folProfile
+reload(folProfile)
+with folProfile.profiled() as trace:
+    newFols = folTools.newFollicleGrid(
+            patch=None, name=None, uvRows=[20, 10], selectNew=False)
+    folTools.mirrorFollicles(objs=newFols, selectNew=False)
+print trace.summary(limit=20)
+trace.writeChromeTrace('trace.json')  # open in chrome://tracing
 
 # Test name split
 import follicleJntsTool.follicleJnts as folTools
@@ -1,3 +1,7 @@
 #
 # @author Nathan Chisholm - nathanchisholm.weebly.com
-#
\ No newline at end of file
+#
+
+# Reload the tool modules' own dependencies (eg. customQueries) when
+# the tools are next reloaded and used, to pick up edits in development
+devReload = False
@@ -0,0 +1,783 @@
+"""
+#
+# batchPlan.py
+#
+# @author Nathan Chisholm
+# @web nathanchisholm.weebly.com
+#
+# --------------------------------------------------------------------
+# Operation plans: scene changes (nodes to create, attributes to add,
+# connections to make and values to set) recorded ahead of time, then
+# applied together.
+#
+# A plan can be applied command by command, or through a single Maya
+# API modifier, which skips the per command dispatch, undo and name
+# lookup overhead. Either way it makes one undo step.
+#
+# import follicleJntsTool.batchPlan as batchPlan
+# plan = batchPlan.OperationPlan()
+# mult = plan.createNode('multDoubleLinear', 'myMult')
+# plan.setValue((mult, 'i2'), 0.1)
+# plan.connect(('pSphere1', 'tx'), (mult, 'i1'))
+# plan.execute(useModifier=True)
+# print mult.node, plan.stats
+#
+# Values of many plugs can also be read and set in bulk:
+# values = batchPlan.getValues([('pSphere1', 'tx'), ('pSphere2', 'tx')])
+# batchPlan.setValues([('pSphere1', 'tx'), ('pSphere2', 'tx')], values*2)
+#
+# (This file is also a Maya plugin, loaded when first needed, with the
+# command that records modifier plans for undo.)
+#
+"""
+
+
+import re
+import time
+
+from follicleJntsTool import lazyImport
+
+# Imported on first use (see lazyImport)
+np = lazyImport.LazyModule('numpy', globals(), 'np')
+pm = lazyImport.LazyModule('pymel.core', globals(), 'pm')
+
+
+class PlannedNode(object):
+    """A node an OperationPlan will create.
+
+    node is the PyNode, once the plan has been executed.
+    """
+
+    def __init__(self, nodeType, name, parent=None):
+        self.nodeType = nodeType
+        self.name = name
+        self.parent = parent
+        self.node = None
+
+    def __repr__(self):
+        return '%s(%r, %r)' % (
+            self.__class__.__name__, self.nodeType, self.name)
+
+
+class OperationPlan(object):
+    """Scene changes, recorded in order, to be applied in one go.
+
+    Nodes are given either as PlannedNodes (for nodes the plan creates)
+    or as existing PyNodes/names; plugs as (node, attributeName) pairs
+    (or existing Attributes/'node.attr' strings).
+    Names are used as given, so should already be unique.
+
+    Functions which are run after execution can be added with
+    addCallback (eg. to fill in objects from the planned nodes).
+    shared holds anything the parts of a plan share, by key (eg. a 
+    node several of them connect to, once planned.)
+    """
+
+    def __init__(self):
+        # [(operation name, args)]
+        self.operations = []
+        self.nodes = []
+        self.callbacks = []
+        self.executed = False
+        # Set on execution: {'operations', 'commands', 'seconds'}
+        self.stats = {}
+        self.shared = {}
+
+        # Planned changes to the inputs and attributes of nodes
+        self._inputs = {}
+        self._attrs = set()
+
+    def __len__(self):
+        return len(self.operations)
+
+    def __repr__(self):
+        return '<%s: %s>' % (self.__class__.__name__, ', '.join([
+            '%s %s' % (count, opName)
+            for opName, count in sorted(self.counts().items())]) or 'empty')
+
+    def counts(self):
+        """Return {operation name: count}"""
+        counts = {}
+        for opName, args in self.operations:
+            counts[opName] = counts.get(opName, 0) + 1
+        return counts
+
+    def createNode(self, nodeType, name, parent=None):
+        """Plan a new node; returns its PlannedNode.
+
+        (Shapes should be given a parent transform.)
+        """
+        planned = PlannedNode(nodeType, name, parent)
+        self.nodes.append(planned)
+        self.operations.append(('createNode', (planned,)))
+        return planned
+
+    def addAttr(self, node, longName, shortName, keyable=True):
+        """Plan a new (double) attribute on a node."""
+        self._attrs.update([(node, longName), (node, shortName)])
+        self.operations.append(
+            ('addAttr', (node, longName, shortName, keyable)))
+
+    def connect(self, src, dest):
+        self._inputs[_plugKey(dest)] = src
+        self.operations.append(('connect', (src, dest)))
+
+    def disconnect(self, src, dest):
+        self._inputs[_plugKey(dest)] = None
+        self.operations.append(('disconnect', (src, dest)))
+
+    def setValue(self, plug, value):
+        self.operations.append(('setValue', (plug, value)))
+
+    def setKeyable(self, plug, keyable=True):
+        self.operations.append(('setKeyable', (plug, keyable)))
+
+    def addCallback(self, func):
+        """Run func (without arguments) once the plan is executed."""
+        self.callbacks.append(func)
+
+    def hasAttr(self, node, attrName):
+        """Return whether node has (or will have) the attribute."""
+        if (node, attrName) in self._attrs:
+            return True
+        if isinstance(node, PlannedNode):
+            return False
+        return pm.attributeQuery(attrName, n=node, ex=1)
+
+    def inputOf(self, plug):
+        """Return the plug's (planned) input connection, or None."""
+        key = _plugKey(plug)
+        if key in self._inputs:
+            return self._inputs[key]
+        if isinstance(key[0], PlannedNode):
+            return None
+        inputs = pm.listConnections(_plugPath(plug), s=1, d=0, p=1)
+        if inputs:
+            return inputs[0]
+        return None
+
+    def extend(self, plan):
+        """Add another (unexecuted) plan's operations to the end of this"""
+        self.operations.extend(plan.operations)
+        self.nodes.extend(plan.nodes)
+        self.callbacks.extend(plan.callbacks)
+        self._inputs.update(plan._inputs)
+        self._attrs.update(plan._attrs)
+        self.shared.update(plan.shared)
+
+    def execute(self, useModifier=False):
+        """Apply the plan (see execute)"""
+        return execute(self, useModifier=useModifier)
+
+
+def execute(plan, useModifier=False):
+    """Apply a plan's operations to the scene, as one undo step.
+
+    useModifier: apply the operations with a Maya API modifier rather
+     than a command each. Nodes and attributes are then created first,
+     then the connections and values applied in order.
+    Then runs the plan's callbacks; returns the plan, with stats filled
+    in.
+    The changes are recorded in any active RollbackJournal.
+    """
+    if plan.executed:
+        raise StandardError("The plan has already been executed!")
+
+    startTime = time.time()
+    journal = activeJournal()
+    if journal is not None:
+        journal.recordPlan(plan)
+    pm.undoInfo(openChunk=True)
+    try:
+        if useModifier:
+            commands = _executeWithModifier(plan)
+        else:
+            commands = _executeWithCommands(plan)
+        plan.executed = True
+        markEdited()
+        if journal is not None:
+            journal.recordCreated([planned.node for planned in plan.nodes])
+        for callback in plan.callbacks:
+            callback()
+    finally:
+        pm.undoInfo(closeChunk=True)
+
+    plan.stats = {
+        'operations':len(plan.operations), 'commands':commands,
+        'seconds':time.time()-startTime}
+    return plan
+
+
+def plugName(plug):
+    """Return a plug's 'node.attr' name (with planned node names)"""
+    if isinstance(plug, tuple):
+        node, attrName = plug
+        if isinstance(node, PlannedNode):
+            node = node.name
+        return '%s.%s' % (node, attrName)
+    return str(plug)
+
+
+def _plugKey(plug):
+    if isinstance(plug, tuple) and isinstance(plug[0], PlannedNode):
+        return plug
+    return tuple(plugName(plug).split('.', 1))
+
+
+def _plugNode(plug):
+    if isinstance(plug, tuple):
+        return plug[0]
+    return plugName(plug).split('.', 1)[0]
+
+
+def _sceneNode(node):
+    if isinstance(node, PlannedNode):
+        return node.node
+    return node
+
+
+def _plugPath(plug):
+    if isinstance(plug, tuple):
+        return '%s.%s' % (_sceneNode(plug[0]), plug[1])
+    return plug
+
+
+def _executeWithCommands(plan):
+    """Apply the operations in order, a command each."""
+    for opName, args in plan.operations:
+        if opName == 'createNode':
+            planned = args[0]
+            kwargs = {'n':planned.name}
+            if planned.parent is not None:
+                kwargs['p'] = _sceneNode(planned.parent)
+            planned.node = pm.createNode(planned.nodeType, ss=1, **kwargs)
+        elif opName == 'addAttr':
+            node, longName, shortName, keyable = args
+            pm.addAttr(_sceneNode(node), ln=longName, sn=shortName, k=keyable)
+        elif opName == 'connect':
+            pm.connectAttr(_plugPath(args[0]), _plugPath(args[1]))
+        elif opName == 'disconnect':
+            pm.disconnectAttr(_plugPath(args[0]), _plugPath(args[1]))
+        elif opName == 'setValue':
+            pm.setAttr(_plugPath(args[0]), args[1])
+        elif opName == 'setKeyable':
+            pm.setAttr(_plugPath(args[0]), k=args[1])
+    return len(plan.operations)
+
+
+# - Scene edit counter -
+
+# Bumped by every scene edit made through this module (and by the
+# tools' other edits, with markEdited), so that cached graph queries
+# can tell when they may be out of date.
+_editCount = 0
+_editCallbacks = []
+
+
+def editCount():
+    """Return the scene edit counter (see markEdited)"""
+    return _editCount
+
+
+def markEdited(*args):
+    """Bump the scene edit counter, invalidating cached graph queries.
+
+    (Takes and ignores any arguments, to also serve as a callback.)
+    """
+    global _editCount
+    _editCount += 1
+
+
+def watchSceneEdits(watch=True):
+    """Also bump the edit counter on any connection change, node
+    deletion, undo or redo (by Maya callbacks), or stop doing so.
+
+    Attributes added or removed by other tools aren't noticed.
+    """
+    import maya.api.OpenMaya as om
+
+    if _editCallbacks:
+        om.MMessage.removeCallbacks(_editCallbacks)
+        del _editCallbacks[:]
+    if watch:
+        _editCallbacks.extend([
+            om.MDGMessage.addConnectionCallback(markEdited),
+            om.MDGMessage.addNodeRemovedCallback(markEdited),
+            om.MEventMessage.addEventCallback('Undo', markEdited),
+            om.MEventMessage.addEventCallback('Redo', markEdited)])
+    markEdited()
+
+
+def watchingSceneEdits():
+    """Return True if scene edits are being watched by callbacks"""
+    return bool(_editCallbacks)
+
+
+# - Rollback journal -
+
+# Active journals; changes are recorded in the last
+_journals = []
+
+
+def activeJournal():
+    """Return the RollbackJournal changes are being recorded in, or None"""
+    if _journals:
+        return _journals[-1]
+    return None
+
+
+class RollbackJournal(object):
+    """A compact record of scene changes, to revert them without undo.
+
+    Nodes are recorded by UUID, so they can be found again after being
+    renamed or reparented; created nodes are just deleted on rollback,
+    so changes to them aren't recorded.
+    Used by follicleJnts.batchSession in fast mode (with undo off),
+    which records the changes made by plans and the tools in the
+    journal on top of _journals.
+    """
+
+    def __init__(self):
+        # UUIDs of created nodes
+        self.created = []
+        # [(UUID, old name)]
+        self.renames = []
+        # [((UUID, attr), old value)], in the order changed
+        self.values = []
+        # [((UUID, attr), old keyable state)]
+        self.keyable = []
+        # [(connected, (UUID, attr) source, (UUID, attr) destination)]
+        self.connections = []
+        # [(UUID, long name)] of attributes added to existing nodes
+        self.attrs = []
+
+    def __len__(self):
+        return (
+            len(self.created) + len(self.renames) + len(self.values) +
+            len(self.keyable) + len(self.connections) + len(self.attrs))
+
+    def __repr__(self):
+        return '<%s: %s created, %s renamed, %s values, %s connections>' % (
+            self.__class__.__name__, len(self.created), len(self.renames),
+            len(self.values) + len(self.keyable), len(self.connections))
+
+    def recordCreated(self, nodes):
+        self.created.extend(_uuids(nodes))
+
+    def recordRename(self, node, oldName):
+        self.renames.append((_uuids([node])[0], oldName))
+
+    def recordValues(self, plugs, keyable=False, values=None):
+        """Record the current values (or keyable states) of plugs
+        
+        values: the current values, if already known.
+        """
+        plugs = [plugName(plug) for plug in plugs]
+        keys = _plugUuidKeys(plugs)
+        if keyable:
+            self.keyable.extend([
+                (key, pm.getAttr(plug, k=1))
+                for key, plug in zip(keys, plugs)])
+        else:
+            if values is None:
+                values = [pm.getAttr(plug) for plug in plugs]
+            self.values.extend(zip(keys, values))
+
+    def recordConnections(self, connections, connected=True):
+        """Record (source, destination) plugs being (dis)connected"""
+        plugs = [
+            plugName(plug) for connection in connections
+            for plug in connection]
+        keys = _plugUuidKeys(plugs)
+        self.connections.extend([
+            (connected, keys[i], keys[i+1]) for i in range(0, len(keys), 2)])
+
+    def recordAddedAttrs(self, node, longNames):
+        uuid = _uuids([node])[0]
+        self.attrs.extend([(uuid, longName) for longName in longNames])
+
+    def recordPlan(self, plan):
+        """Record what an (unexecuted) plan will change on existing nodes"""
+        existing = lambda node: not isinstance(node, PlannedNode)
+        values = []
+        keyable = []
+        connections = {True:[], False:[]}
+        for opName, args in plan.operations:
+            if opName == 'addAttr':
+                if existing(args[0]):
+                    self.recordAddedAttrs(args[0], [args[1]])
+            elif opName in ('connect', 'disconnect'):
+                if existing(_plugNode(args[0])) and (
+                        existing(_plugNode(args[1]))):
+                    connections[opName == 'connect'].append(args)
+            elif opName == 'setValue':
+                if existing(_plugNode(args[0])):
+                    values.append(args[0])
+            elif opName == 'setKeyable':
+                if existing(_plugNode(args[0])):
+                    keyable.append(args[0])
+        # (Plugs on nodes added to earlier in the plan have no old value)
+        values = [
+            plug for plug in values
+            if not (_plugNode(plug), plugName(plug).split('.', 1)[1])
+            in plan._attrs]
+
+        self.recordValues(values)
+        self.recordValues(keyable, keyable=True)
+        for connected in (True, False):
+            if connections[connected]:
+                self.recordConnections(connections[connected], connected)
+
+    def rollback(self):
+        """Revert the recorded changes (with undo off), then clear them.
+
+        Changes which can no longer be reverted (eg. values on plugs 
+        since connected or locked) are skipped.
+        Returns {change type: count reverted}, including 'skipped'.
+        """
+        counts = dict.fromkeys(
+            ['deleted', 'renamed', 'values', 'connections', 'attrs',
+             'skipped'], 0)
+        uuids = set(self.created)
+        uuids.update([uuid for uuid, name in self.renames + self.attrs])
+        for key, value in self.values + self.keyable:
+            uuids.add(key[0])
+        for connected, srcKey, destKey in self.connections:
+            uuids.update([srcKey[0], destKey[0]])
+        nodes = {}
+        if uuids:
+            found = pm.ls(list(uuids))
+            nodes = dict(zip(pm.ls(found, uuid=1), found))
+        created = set(self.created)
+
+        def plugPath(key):
+            if not key[0] in nodes or key[0] in created:
+                return None
+            return '%s.%s' % (nodes[key[0]], key[1])
+
+        def attempt(func, *args, **kwargs):
+            try:
+                func(*args, **kwargs)
+            except RuntimeError:
+                counts['skipped'] += 1
+                return False
+            return True
+
+        undoState = pm.undoInfo(q=1, state=1)
+        if undoState:
+            pm.undoInfo(stateWithoutFlush=False)
+        try:
+            # Break new connections, so the old values can be set again
+            for connected, srcKey, destKey in reversed(self.connections):
+                src, dest = plugPath(srcKey), plugPath(destKey)
+                if connected and src and dest:
+                    if attempt(pm.disconnectAttr, src, dest):
+                        counts['connections'] += 1
+
+            changes = [(False, change) for change in self.values] + [
+                (True, change) for change in self.keyable]
+            for keyable, (key, value) in reversed(changes):
+                plug = plugPath(key)
+                if plug is None:
+                    continue
+                if keyable:
+                    done = attempt(pm.setAttr, plug, k=value)
+                elif isinstance(value, (list, tuple)):
+                    done = attempt(pm.setAttr, plug, *value)
+                else:
+                    done = attempt(pm.setAttr, plug, value)
+                counts['values'] += done
+
+            for connected, srcKey, destKey in reversed(self.connections):
+                src, dest = plugPath(srcKey), plugPath(destKey)
+                if not connected and src and dest:
+                    if attempt(pm.connectAttr, src, dest, f=1):
+                        counts['connections'] += 1
+
+            toDelete = [nodes[uuid] for uuid in self.created if uuid in nodes]
+            if toDelete:
+                try:
+                    pm.delete(toDelete)
+                    counts['deleted'] = len(toDelete)
+                except RuntimeError:
+                    # Eg. a locked node; delete what can be, one at a
+                    # time (by UUID, as some may have gone already)
+                    for uuid in self.created:
+                        found = pm.ls(uuid)
+                        if found and attempt(pm.delete, found):
+                            counts['deleted'] += 1
+
+            for uuid, longName in reversed(self.attrs):
+                if uuid in nodes and not uuid in created:
+                    if attempt(pm.deleteAttr, nodes[uuid], at=longName):
+                        counts['attrs'] += 1
+
+            for uuid, oldName in reversed(self.renames):
+                if uuid in nodes and not uuid in created:
+                    if attempt(pm.rename, nodes[uuid], oldName):
+                        counts['renamed'] += 1
+        finally:
+            if undoState:
+                pm.undoInfo(stateWithoutFlush=True)
+
+        self.__init__()
+        markEdited()
+        return counts
+
+
+def _uuids(nodes):
+    """Return the UUIDs of nodes (in one query)"""
+    names = [str(node) for node in nodes]
+    unique = list(set(names))
+    if not unique:
+        return []
+    byName = dict(zip(unique, pm.ls(unique, uuid=1)))
+    return [byName[name] for name in names]
+
+
+def _plugUuidKeys(plugs):
+    """Return (node UUID, attribute) keys for 'node.attr' plug names"""
+    split = [plug.split('.', 1) for plug in plugs]
+    uuids = _uuids([nodeName for nodeName, attrName in split])
+    return [
+        (uuid, attrName) for uuid, (nodeName, attrName) in zip(uuids, split)]
+
+
+# - Bulk plug values -
+
+def getValues(plugs):
+    """Return the values of (numeric) plugs, as a float array.
+
+    The plugs are read through the API in one pass, rather than with a
+    getAttr command each.
+    """
+    return np.array(
+        [mplug.asDouble() for mplug in _mPlugs(plugs)], dtype=float)
+
+
+def setValues(plugs, values):
+    """Set (numeric) plugs to values (one each, or one for all).
+
+    The values are set with one API modifier, as one undo step (and
+    recorded in any active RollbackJournal). Plugs should be free to
+    change (see freeToChange).
+    """
+    import maya.api.OpenMaya as om
+
+    values = np.broadcast_to(np.asarray(values, dtype=float), (len(plugs),))
+    if not len(plugs):
+        return
+    mplugs = _mPlugs(plugs)
+    journal = activeJournal()
+    if journal is not None:
+        journal.recordValues(
+            plugs, values=[mplug.asDouble() for mplug in mplugs])
+
+    modifier = om.MDGModifier()
+    for mplug, value in zip(mplugs, values):
+        modifier.newPlugValueDouble(mplug, float(value))
+    modifier.doIt()
+    if pm.undoInfo(q=1, state=1):
+        _recordForUndo(modifier)
+
+
+def freeToChange(plugs):
+    """Return a bool array of whether each plug can be set (ie. isn't
+    locked or connected)."""
+    import maya.api.OpenMaya as om
+
+    return np.array([
+        mplug.isFreeToChange() == om.MPlug.kFreeToChange
+        for mplug in _mPlugs(plugs)], dtype=bool)
+
+
+def _mPlugs(plugs):
+    """Return an MPlug for each plug (found with one selection list)"""
+    import maya.api.OpenMaya as om
+
+    selList = om.MSelectionList()
+    byName = {}
+    mplugs = []
+    for plug in plugs:
+        name = plugName(plug)
+        if not name in byName:
+            count = selList.length()
+            try:
+                selList.add(name)
+            except RuntimeError:
+                raise StandardError("Attribute '%s' doesn't exist!" % name)
+            if selList.length() == count:
+                # (The plug was already listed under another name)
+                single = om.MSelectionList()
+                single.add(name)
+                byName[name] = single.getPlug(0)
+            else:
+                byName[name] = selList.getPlug(count)
+        mplugs.append(byName[name])
+    return mplugs
+
+
+# - API modifier execution -
+
+_dagTypes = {}
+
+_elementRegex = re.compile(r'^(\w+)\[(\d+)\](?:\.(\w+))?$')
+
+
+def _isDagType(nodeType):
+    if not nodeType in _dagTypes:
+        _dagTypes[nodeType] = 'dagNode' in pm.nodeType(
+            nodeType, isTypeName=True, inherited=True)
+    return _dagTypes[nodeType]
+
+
+def _executeWithModifier(plan):
+    """Apply the operations with one MDagModifier.
+
+    Returns the number of commands used (the undo record).
+    """
+    import maya.api.OpenMaya as om
+
+    modifier = om.MDagModifier()
+    objects = {}
+
+    def mObject(node):
+        if isinstance(node, PlannedNode):
+            return objects[node]
+        selList = om.MSelectionList()
+        selList.add(str(node))
+        return selList.getDependNode(0)
+
+    def mPlug(plug):
+        if not isinstance(plug, tuple):
+            selList = om.MSelectionList()
+            selList.add(str(plug))
+            return selList.getPlug(0)
+        node, attrName = plug
+        if not isinstance(node, PlannedNode):
+            return mPlug(_plugPath(plug))
+        index = childName = None
+        match = _elementRegex.match(attrName)
+        if match:
+            attrName, index, childName = match.groups()
+        nodeFn = om.MFnDependencyNode(objects[node])
+        mplug = nodeFn.findPlug(attrName, False)
+        if index is not None:
+            mplug = mplug.elementByLogicalIndex(int(index))
+        if childName:
+            # (Child of a compound element, eg. 'coordinate[0].coordinateU')
+            mplug = mplug.child(nodeFn.attribute(childName))
+        return mplug
+
+    # Create the nodes and attributes first, so that their plugs exist
+    # for the connections and values
+    for opName, args in plan.operations:
+        if opName == 'createNode':
+            planned = args[0]
+            if _isDagType(planned.nodeType):
+                parent = om.MObject.kNullObj
+                if planned.parent is not None:
+                    parent = mObject(planned.parent)
+                obj = modifier.createNode(planned.nodeType, parent)
+            else:
+                obj = om.MDGModifier.createNode(modifier, planned.nodeType)
+            modifier.renameNode(obj, planned.name)
+            objects[planned] = obj
+        elif opName == 'addAttr':
+            node, longName, shortName, keyable = args
+            attrFn = om.MFnNumericAttribute()
+            attr = attrFn.create(
+                longName, shortName, om.MFnNumericData.kDouble, 0.0)
+            attrFn.keyable = keyable
+            modifier.addAttribute(mObject(node), attr)
+    modifier.doIt()
+
+    for opName, args in plan.operations:
+        if opName == 'connect':
+            modifier.connect(mPlug(args[0]), mPlug(args[1]))
+        elif opName == 'disconnect':
+            modifier.disconnect(mPlug(args[0]), mPlug(args[1]))
+        elif opName == 'setValue':
+            plug, value = args
+            if isinstance(value, bool):
+                modifier.newPlugValueBool(mPlug(plug), value)
+            elif isinstance(value, int):
+                modifier.newPlugValueInt(mPlug(plug), value)
+            else:
+                modifier.newPlugValueDouble(mPlug(plug), value)
+        elif opName == 'setKeyable':
+            plug, keyable = args
+            modifier.commandToExecute('setAttr -k %d "%s"' % (
+                keyable, mPlug(plug).partialName(
+                    includeNodeName=True, useFullAttributePath=True)))
+    modifier.doIt()
+
+    for planned, obj in objects.items():
+        if obj.hasFn(om.MFn.kDagNode):
+            name = om.MDagPath.getAPathTo(obj).partialPathName()
+        else:
+            name = om.MFnDependencyNode(obj).name()
+        planned.node = pm.PyNode(name)
+
+    if pm.undoInfo(q=1, state=1):
+        _recordForUndo(modifier)
+        return 1
+    return 0
+
+
+# - Undo (plugin) command -
+
+_undoCommand = 'folJntsPlanUndo'
+
+# Modifiers waiting to be picked up by the undo command
+_pendingModifiers = []
+
+
+def _recordForUndo(modifier):
+    """Put an (already applied) modifier on Maya's undo queue."""
+    import os
+    import maya.cmds as cmds
+
+    pluginPath = os.path.splitext(os.path.abspath(__file__))[0] + '.py'
+    if not cmds.pluginInfo(pluginPath, q=1, loaded=1):
+        cmds.loadPlugin(pluginPath, quiet=1)
+    _pendingModifiers.append(modifier)
+    getattr(cmds, _undoCommand)()
+
+
+def maya_useNewAPI():
+    """(The plugin uses the Python API 2.0)"""
+    pass
+
+
+def _undoCommandClass():
+    import maya.api.OpenMaya as om
+
+    class PlanUndoCommand(om.MPxCommand):
+        """Holds an applied modifier, to undo and redo it."""
+
+        def doIt(self, args):
+            from follicleJntsTool import batchPlan
+            self.modifier = batchPlan._pendingModifiers.pop()
+
+        def undoIt(self):
+            self.modifier.undoIt()
+
+        def redoIt(self):
+            self.modifier.doIt()
+
+        def isUndoable(self):
+            return True
+
+    return PlanUndoCommand
+
+
+def initializePlugin(plugin):
+    import maya.api.OpenMaya as om
+    commandClass = _undoCommandClass()
+    om.MFnPlugin(plugin).registerCommand(_undoCommand, commandClass)
+
+
+def uninitializePlugin(plugin):
+    import maya.api.OpenMaya as om
+    om.MFnPlugin(plugin).deregisterCommand(_undoCommand)
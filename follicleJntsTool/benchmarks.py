@@ -0,0 +1,287 @@
+"""
+#
+# benchmarks.py
+#
+# @author Nathan Chisholm
+# @web nathanchisholm.weebly.com
+#
+# --------------------------------------------------------------------
+# Timing scripts for the follicle joint tools, run in a Maya session.
+#
+# import follicleJntsTool.benchmarks as folBench
+# reload(folBench)
+# folBench.benchGridCreation(sizes=[5, 10, 20, 40])
+# folBench.benchGridCreation(sizes=[20, 40, 80], clone=True)
+# folBench.benchClosestUVs(counts=[100, 1000, 10000, 100000])
+# folBench.benchPlanExecution(uvRows=[40, 50])
+# folBench.benchFastMode(sizes=[20, 40, 70])
+# folBench.benchAttachment(sizes=[10, 20, 45], frames=20)
+#
+"""
+
+
+import time
+
+import numpy as np
+import pymel.core as pm
+
+from follicleJntsTool import follicleJnts as folTools
+
+
+def _printTable(title, header, rows):
+    """Print benchmark rows as a simple aligned table."""
+    print title
+    widths = [
+        max([len(str(row[i])) for row in rows] + [len(header[i])])
+        for i in range(len(header))]
+    print '  '.join([header[i].rjust(widths[i]) for i in range(len(header))])
+    for row in rows:
+        print '  '.join([str(row[i]).rjust(widths[i]) for i in range(len(row))])
+
+
+def _undoableRun(func, *args, **kwargs):
+    """Time func in one undo chunk, then undo it to leave the scene as is.
+
+    Returns (seconds, result)
+    """
+    pm.undoInfo(openChunk=True)
+    try:
+        startTime = time.time()
+        result = func(*args, **kwargs)
+        seconds = time.time() - startTime
+    finally:
+        pm.undoInfo(closeChunk=True)
+    pm.undo()
+    return seconds, result
+
+
+def benchGridCreation(sizes=(5, 10, 20, 40), folType='t/f-j', name=None,
+                      verbose=True, **kwargs):
+    """Time newFollicleGrid on square grids of increasing size.
+
+    Every follicle shares the same 'patch_fol#' name stem, which is the
+    worst case for finding unique names; creation time should grow
+    linearly with the follicle count (a flat 'ms/fol' column).
+
+    Each grid is created on a temporary nurbsPlane and undone again
+    afterwards.  Extra kwargs are passed to newFollicleGrid.
+    Returns a list of [follicle count, seconds, ms per follicle].
+    """
+    results = []
+    for size in sizes:
+        patch = pm.nurbsPlane(name='benchPatch#', ch=0)[0].getShape()
+        try:
+            seconds, fols = _undoableRun(
+                folTools.newFollicleGrid, patch=patch, name=name,
+                selectNew=False, uvRows=[size, size], edgeBounded=[1, 1],
+                giveWarning=False, folType=folType, **kwargs)
+        finally:
+            pm.delete(patch.getParent())
+        count = size*size
+        results.append([count, round(seconds, 3),
+                        round(1000.0*seconds/count, 3)])
+
+    if verbose:
+        _printTable(
+            'newFollicleGrid (%s%s):' % (
+                folType, kwargs.get('clone') and ', cloned' or ''),
+            ['follicles', 'seconds', 'ms/fol'], results)
+    return results
+
+
+def benchClosestUVs(counts=(100, 1000, 10000), nodeLimit=10000, spans=8,
+                    patchType='nurbsSurface', verbose=True):
+    """Time closestUVs through Maya nodes against the NumPy solvers.
+
+    Random points within a unit of a temporary nurbsPlane (or polyPlane,
+    for a patchType of 'mesh') are projected both ways; the node path 
+    is skipped for counts above nodeLimit. Mesh timings after the first
+    count reuse the cached meshBVH.
+    Returns a list of [point count, node seconds, NumPy seconds,
+    speedup, largest UV difference] ('-' where the node path was
+    skipped).
+    """
+    random = np.random.RandomState(0)
+    if patchType == 'mesh':
+        patch = pm.polyPlane(
+            name='benchPatch#', ch=0, w=10, h=10, sx=spans, sy=spans
+            )[0].getShape()
+    else:
+        patch = pm.nurbsPlane(
+            name='benchPatch#', ch=0, w=10, u=spans, v=spans)[0].getShape()
+    results = []
+    try:
+        for count in counts:
+            points = random.uniform(-5.0, 5.0, (count, 3))
+            points[:, 1] *= 0.2
+
+            startTime = time.time()
+            offlineUVs = folTools.closestUVs(patch, points, offline=True)
+            offlineSeconds = time.time() - startTime
+
+            if count > nodeLimit:
+                results.append(
+                    [count, '-', round(offlineSeconds, 3), '-', '-'])
+                continue
+            startTime = time.time()
+            nodeUVs = folTools.closestUVs(patch, points)
+            nodeSeconds = time.time() - startTime
+            uvDiff = np.abs(np.array(nodeUVs) - offlineUVs).max()
+            results.append([
+                count, round(nodeSeconds, 3), round(offlineSeconds, 3),
+                round(nodeSeconds/max(offlineSeconds, 1e-6), 1),
+                '%.2g' % uvDiff])
+    finally:
+        pm.delete(patch.getParent())
+
+    if verbose:
+        _printTable(
+            'closestUVs, nodes vs NumPy (%s, %s spans):' % (patchType, spans),
+            ['points', 'nodes s', 'numpy s', 'speedup', 'max uv diff'],
+            results)
+    return results
+
+
+def benchPlanExecution(uvRows=(40, 50), folType='t/f-j', verbose=True):
+    """Time a newFollicleGrid plan applied by commands and by modifier.
+    
+    The grid (2000 follicles by default) is planned, then applied 
+    command by command (as newFollicleGrid does by default) or with a 
+    single API modifier; each is undone again afterwards.
+    'commands' is the number of Maya commands the plan was applied 
+    with (the modifier just needs the one, to record it for undo).
+    Returns a list of [executor, follicle count, plan seconds, apply 
+    seconds, total seconds, commands].
+    """
+    results = []
+    for useModifier in (False, True):
+        patch = pm.nurbsPlane(name='benchPatch#', ch=0)[0].getShape()
+        
+        def planAndApply():
+            startTime = time.time()
+            plan = folTools.newFollicleGrid(
+                patch=patch, selectNew=False, uvRows=list(uvRows),
+                edgeBounded=[1, 1], giveWarning=False, folType=folType,
+                planOnly=True)
+            planSeconds = time.time() - startTime
+            plan.execute(useModifier=useModifier)
+            return planSeconds, plan
+        
+        try:
+            seconds, (planSeconds, plan) = _undoableRun(planAndApply)
+        finally:
+            pm.delete(patch.getParent())
+        results.append([
+            useModifier and 'modifier' or 'commands', uvRows[0]*uvRows[1],
+            round(planSeconds, 3), round(plan.stats['seconds'], 3),
+            round(seconds, 3), plan.stats['commands']])
+    
+    if verbose:
+        _printTable(
+            'newFollicleGrid plan execution (%s):' % folType,
+            ['executor', 'follicles', 'plan s', 'apply s', 'total s',
+             'commands'], results)
+    return results
+
+
+def benchFastMode(sizes=(20, 40), folType='t/f-j', verbose=True):
+    """Time grids made with undo against fast mode (undo off).
+
+    Each square grid is created in a batchSession, then reverted; by
+    undo normally, or by rolling back the session's journal in fast
+    mode.
+    Returns a list of [mode, follicle count, create seconds, revert 
+    seconds, journal entries].
+    """
+    results = []
+    for size in sizes:
+        for fastMode in (False, True):
+            patch = pm.nurbsPlane(name='benchPatch#', ch=0)[0].getShape()
+            try:
+                startTime = time.time()
+                with folTools.batchSession(fastMode=fastMode) as session:
+                    folTools.newFollicleGrid(
+                        patch=patch, selectNew=False, uvRows=[size, size],
+                        edgeBounded=[1, 1], giveWarning=False,
+                        folType=folType)
+                seconds = time.time() - startTime
+                entries = session.journal and len(session.journal) or '-'
+                
+                startTime = time.time()
+                if fastMode:
+                    session.rollback()
+                else:
+                    pm.undo()
+                revertSeconds = time.time() - startTime
+            finally:
+                pm.delete(patch.getParent())
+            results.append([
+                fastMode and 'fast' or 'undo', size*size, round(seconds, 3),
+                round(revertSeconds, 3), entries])
+    
+    if verbose:
+        _printTable(
+            'newFollicleGrid with undo and in fast mode (%s):' % folType,
+            ['mode', 'follicles', 'create s', 'revert s', 'journal'],
+            results)
+    return results
+
+
+def benchAttachment(sizes=(10, 20, 45), folType='t/f-j', pinnedType='t@p-j',
+                    frames=20, verbose=True):
+    """Compare the classic (follicle each) and pinned layouts.
+
+    Square grids are made with folType, and with pinnedType (one 
+    shared uvPin per patch; Maya 2020+), on a temporary nurbsPlane 
+    with an animated bend deformer. The nodes each grid creates are 
+    counted, then evaluation is timed by stepping through the frames,
+    pulling every follicle joint's world matrix (dgeval) on each.
+    Each grid is undone again afterwards.
+    Returns a list of [layout, follicle count, nodes, nodes per 
+    follicle, create seconds, ms per frame].
+    """
+    results = []
+    for size in sizes:
+        for typeString in (folType, pinnedType):
+            patch = pm.nurbsPlane(
+                name='benchPatch#', ch=0, u=8, v=8)[0].getShape()
+            bend, bendHandle = pm.nonLinear(patch, type='bend')
+            pm.setKeyframe(bend, attribute='curvature', t=1, v=0.0)
+            pm.setKeyframe(bend, attribute='curvature', t=frames, v=90.0)
+            
+            def createAndEvaluate():
+                startTime = time.time()
+                plan = folTools.newFollicleGrid(
+                    patch=patch, selectNew=False, uvRows=[size, size],
+                    edgeBounded=[1, 1], giveWarning=False, 
+                    folType=typeString, planOnly=True)
+                plan.execute()
+                createSeconds = time.time() - startTime
+                
+                plugs = ['%s.worldMatrix' % node.longName() for node in (
+                    planned.node for planned in plan.nodes)
+                    if isinstance(node, pm.nt.Transform)]
+                startTime = time.time()
+                for frame in range(1, frames+1):
+                    pm.currentTime(frame, update=False)
+                    pm.dgeval(plugs)
+                evalSeconds = time.time() - startTime
+                return len(plan.nodes), createSeconds, evalSeconds
+            
+            try:
+                seconds, (nodes, createSeconds, evalSeconds) = (
+                    _undoableRun(createAndEvaluate))
+            finally:
+                pm.delete(bendHandle, patch.getParent())
+            count = size*size
+            results.append([
+                typeString, count, nodes, round(float(nodes)/count, 2),
+                round(createSeconds, 3), 
+                round(1000.0*evalSeconds/frames, 2)])
+    
+    if verbose:
+        _printTable(
+            'Follicle vs pin attachment (%s frames):' % frames,
+            ['layout', 'follicles', 'nodes', 'nodes/fol', 'create s', 
+             'ms/frame'], results)
+    return results
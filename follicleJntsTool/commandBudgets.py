@@ -0,0 +1,159 @@
+"""
+#
+# commandBudgets.py
+#
+# @author Nathan Chisholm
+# @web nathanchisholm.weebly.com
+#
+# --------------------------------------------------------------------
+# Command-count budgets for the bulk operations: the most Maya commands
+# each public operation may issue, as a fixed amount plus an amount
+# per follicle (commandBudgets.json). The checker runs each operation
+# on the in-memory Maya stand-in (see standInBenchmarks), at a small
+# and a larger size so that any extra per-follicle (or worse) queries
+# push it over, and prints the commands by type where it fails.
+#
+# Run outside Maya, eg. from the folder holding follicleJntsTool:
+# python -m follicleJntsTool.commandBudgets
+#
+# from follicleJntsTool import commandBudgets
+# failures = commandBudgets.checkBudgets()
+# # After an intended change to the counts, re-measure the budgets:
+# commandBudgets.writeBudgets(commandBudgets.measureBudgets())
+#
+"""
+
+
+import os
+import sys
+import json
+import math
+
+from follicleJntsTool import standInBenchmarks
+
+
+# The budget file shipped with the tools
+budgetFile = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), 'commandBudgets.json')
+
+# The stand-in benchmark each operation's commands are counted with
+operationBenchmarks = {
+    'newFollicleGrid':'grid',
+    'newFollicleGrid(clone)':'gridClone',
+    'newFollicleAtClosestPt(clone)':'closestClone',
+    'findFollicleJoints':'discovery',
+    'freezeOffsets':'freeze',
+    'mirrorFollicleOffsets':'mirrorOffsets',
+    'mirrorFollicles':'mirrorFollicles',
+    'autoRename':'autoRename',
+    'autoRename(named)':'autoRenameNamed',
+    'duplicateFollicles':'duplicate',
+    'transferFolliclesToPatch':'transfer',
+    }
+
+# Follicle counts the budgets are checked at (roughly)
+checkSizes = (20, 200)
+
+
+def loadBudgets(filePath=None):
+    """Return the budgets: {operation: {'fixed', 'perFollicle'}}"""
+    with open(filePath or budgetFile) as jsonFile:
+        budgets = json.load(jsonFile)
+    unknown = set(budgets) - set(operationBenchmarks)
+    if unknown:
+        raise ValueError(
+            "No benchmark for budgeted operations: %s" % (
+                ', '.join(sorted(unknown))))
+    return budgets
+
+
+def writeBudgets(budgets, filePath=None):
+    """Write budgets (as measureBudgets returns) to the budget file"""
+    with open(filePath or budgetFile, 'w') as jsonFile:
+        json.dump(
+            budgets, jsonFile, indent=4, sort_keys=True,
+            separators=(',', ': '))
+        jsonFile.write('\n')
+
+
+def measureBudgets(operations=None, sizes=checkSizes, headroom=5):
+    """Measure budgets from the current command counts.
+
+    The per follicle count is the slope between the smallest and
+    largest of sizes (rounded up to a tenth), and the fixed count what
+    remains at the smallest, plus headroom.
+    """
+    budgets = {}
+    for operation in sorted(operations or operationBenchmarks):
+        results = [_run(operation, size) for size in (min(sizes), max(sizes))]
+        (count1, commands1), (count2, commands2) = [
+            (result['follicles'], result['commands']) for result in results]
+        perFollicle = max(
+            float(commands2 - commands1)/max(count2 - count1, 1), 0.0)
+        perFollicle = math.ceil(round(perFollicle*10, 6))/10
+        fixed = int(math.ceil(max(
+            commands1 - perFollicle*count1,
+            commands2 - perFollicle*count2, 0)))
+        budgets[operation] = {
+            'fixed':fixed + headroom, 'perFollicle':perFollicle}
+    return budgets
+
+
+def checkBudgets(filePath=None, operations=None, sizes=checkSizes,
+                 verbose=True):
+    """Run each budgeted operation and compare its commands to budget.
+
+    Returns the failures, as [{'operation', 'follicles', 'commands',
+    'budget', 'commandCounts'}]; each failure's commands are printed
+    by type.
+    """
+    budgets = loadBudgets(filePath)
+    failures = []
+    for operation in sorted(operations or budgets):
+        if not operation in budgets:
+            raise ValueError("No budget for operation: %s" % operation)
+        budget = budgets[operation]
+        for size in sizes:
+            result = _run(operation, size)
+            count = result['follicles']
+            allowed = budget['fixed'] + budget['perFollicle']*count
+            passed = result['commands'] <= allowed
+            if verbose:
+                print '%s %s, %s follicles: %s commands (%.1f per ' \
+                    'follicle), budget %d' % (
+                        passed and 'ok  ' or 'FAIL', operation, count,
+                        result['commands'],
+                        result['commands']/float(max(count, 1)), allowed)
+            if not passed:
+                failure = {
+                    'operation':operation, 'follicles':count,
+                    'commands':result['commands'], 'budget':allowed,
+                    'commandCounts':result['commandCounts']}
+                failures.append(failure)
+                print breakdownText(failure)
+    if verbose:
+        print '%s budget failure(s)' % len(failures)
+    return failures
+
+
+def breakdownText(failure):
+    """The commands of a failure by type, most used first"""
+    count = float(max(failure['follicles'], 1))
+    counts = sorted(
+        [item for item in failure['commandCounts'].items()
+         if item[0] != 'api'],
+        key=lambda item: (-item[1], item[0]))
+    width = max([len(command) for command, num in counts] or [0])
+    return '\n'.join([
+        '    %s  %6d  (%.2f per follicle)' % (
+            command.ljust(width), num, num/count)
+        for command, num in counts])
+
+
+def _run(operation, size):
+    return standInBenchmarks.runBenchmark(
+        operationBenchmarks[operation], size)
+
+
+if __name__ == '__main__':
+    sys.exit(checkBudgets() and 1 or 0)
@@ -2,7 +2,13 @@
 API of the Chisholm pipeline
 '''
 
-import pymel.core as pm
+import re
+
+from follicleJntsTool import lazyImport
+
+# Imported on first use (see lazyImport)
+np = lazyImport.LazyModule('numpy', globals(), 'np')
+pm = lazyImport.LazyModule('pymel.core', globals(), 'pm')
 
 def filterSelectionForShapeType(objs=None, typ='nurbsSurface', ni=1):
     # Look for object type in objs, then in selection, then in components' objects
@@ -54,23 +60,135 @@ def filterSelectionForShapeType(objs=None, typ='nurbsSurface', ni=1):
     return outShapes
 
     
-def getPointPositions(objs=[]):
+# Component names which index a shape's points directly, by shape type
+_pointComponents = {
+    'mesh': 'vtx',
+    'nurbsSurface': 'cv',
+    'nurbsCurve': 'cv',
+    }
+
+_componentRegex = re.compile(r'^(?:.*\.)?(\w+)((?:\[[^\]]*\])+)$')
+_indexRangeRegex = re.compile(r'\[(\*|\d+)(?::(\d+))?\]')
+
+
+def getPointPositionArray(objs=None):
+    """Get the world space positions of points and objects in bulk.
+    
+    Components are read as the index ranges they're selected as (eg. 
+    'pSphereShape1.vtx[0:2499]') rather than flattened into a PyNode 
+    each; all the points of each shape are fetched with one call, and 
+    the selected ones picked out by index.
+    Objects (not components) give their world space rotate pivot.
+    
+    Returns (positions, sourceIds, sourceNodes):
+    positions: (N, 3) NumPy float array
+    sourceIds: (N, 2) NumPy int array of [index in sourceNodes, 
+     point index in the shape (-1 for objects)], parallel to positions
+    sourceNodes: list of the shapes/objects the points came from
+    """
     #Get objects
     if not objs:
-        objs = pm.ls(sl=1, fl=1)
+        objs = pm.ls(sl=1)
         if not objs: raise TypeError('No points or objects found!')
     else:
-        objs = pm.ls(objs, fl=1)
-            
-    # Get points of objects
-    posList = []
+        objs = pm.ls(objs)
+    
+    posChunks = []
+    idChunks = []
+    sourceNodes = []
+    nodeIndices = {}
+    shapePoints = {}
     for obj in objs:
-        if '.' in str(obj):
-            # Get position of component
-            posList.append(pm.pointPosition(obj, w=1))
+        objStr = str(obj)
+        if not '.' in objStr:
+            # Get position of object
+            if not obj in nodeIndices:
+                nodeIndices[obj] = len(sourceNodes)
+                sourceNodes.append(obj)
+            posChunks.append(np.array(
+                [pm.xform(obj, q=1, ws=1, rp=1)], dtype=float))
+            idChunks.append(np.array([[nodeIndices[obj], -1]]))
+            continue
+        
+        node = obj.node()
+        if not node in nodeIndices:
+            nodeIndices[node] = len(sourceNodes)
+            sourceNodes.append(node)
+        
+        indices = None
+        nodeType = node.type()
+        match = _componentRegex.match(objStr)
+        if match and _pointComponents.get(nodeType) == match.group(1):
+            # Get all of the shape's points once
+            if not node in shapePoints:
+                shapePoints[node] = _shapePointArray(node, nodeType)
+            indices = _componentIndices(
+                node, nodeType, match.group(2), len(shapePoints[node]))
+        
+        if indices is not None:
+            posChunks.append(shapePoints[node][indices])
         else:
-            posList.append(pm.xform(obj, q=1, ws=1, rp=1))  # Or try parent constraint to grp
-            
-    return posList
+            # Other components; get position of each (flattened) point
+            flatComps = pm.ls(obj, fl=1)
+            posChunks.append(np.array(
+                [pm.pointPosition(comp, w=1) for comp in flatComps],
+                dtype=float).reshape(-1, 3))
+            indices = -np.ones(len(flatComps), dtype=int)
+        idChunks.append(np.column_stack((
+            np.full(len(indices), nodeIndices[node], dtype=int), indices)))
+    
+    positions = np.concatenate(posChunks).reshape(-1, 3)
+    sourceIds = np.concatenate(idChunks).reshape(-1, 2)
+    return positions, sourceIds, sourceNodes
+
+
+def _shapePointArray(shape, shapeType):
+    """All of a shape's points, in world space, as an (N, 3) array"""
+    comp = _pointComponents[shapeType]
+    if shapeType == 'nurbsSurface':
+        comp += '[*][*]'
+    else:
+        comp += '[*]'
+    flat = pm.xform('%s.%s' % (shape.longName(), comp), q=1, ws=1, t=1)
+    return np.array(flat, dtype=float).reshape(-1, 3)
+
+
+def _componentIndices(shape, shapeType, indexStr, pointCount):
+    """Point indices of a component's index ranges (eg. '[0:3][2]')
+    
+    Returns an int array, or None if the ranges can't be read.
+    """
+    ranges = []
+    for start, end in _indexRangeRegex.findall(indexStr):
+        if start == '*':
+            ranges.append(None)
+        else:
+            ranges.append((int(start), int(end or start)))
+    
+    if shapeType == 'nurbsSurface':
+        if len(ranges) != 2:
+            return None
+        # CV [u][v] indices are stored u-major
+        numV = shape.numCVsInV()
+        numU = pointCount // numV
+        axes = []
+        for indexRange, count in zip(ranges, (numU, numV)):
+            if indexRange is None:
+                axes.append(np.arange(count))
+            else:
+                axes.append(np.arange(indexRange[0], indexRange[1]+1))
+        return (axes[0][:, None]*numV + axes[1][None, :]).ravel()
+    
+    if len(ranges) != 1:
+        return None
+    if ranges[0] is None:
+        return np.arange(pointCount)
+    return np.arange(ranges[0][0], ranges[0][1]+1)
+
+    
+def getPointPositions(objs=[]):
+    """Get world space positions of points/objects as a list of [x, y, z]
     
-    
\ No newline at end of file
+    See getPointPositionArray for the bulk (NumPy) version.
+    """
+    return getPointPositionArray(objs)[0].tolist()
@@ -18,11 +18,31 @@
 import sys
 import re
 import string
+import contextlib
+import functools
+import itertools
 
-import pymel.core as pm
+from follicleJntsTool import lazyImport
 
-from follicleJntsTool import customQueries as cq
-reload(cq)
+# Imported on first use (see lazyImport), so the name helpers can be
+# used without loading Maya or NumPy
+np = lazyImport.LazyModule('numpy', globals(), 'np')
+pm = lazyImport.LazyModule('pymel.core', globals(), 'pm')
+cq = lazyImport.LazyModule(
+    'follicleJntsTool.customQueries', globals(), 'cq', devReload=True)
+nurbsEval = lazyImport.LazyModule(
+    'follicleJntsTool.nurbsEval', globals(), 'nurbsEval')
+meshBVH = lazyImport.LazyModule(
+    'follicleJntsTool.meshBVH', globals(), 'meshBVH')
+meshSymmetry = lazyImport.LazyModule(
+    'follicleJntsTool.meshSymmetry', globals(), 'meshSymmetry')
+batchPlan = lazyImport.LazyModule(
+    'follicleJntsTool.batchPlan', globals(), 'batchPlan')
+
+
+# Check every cached graph query against a fresh one, raising an 
+# exception if they differ (see FollicleJoint._cachedQuery)
+verifyGraphCache = False
 
 
 class FolJntType(object):
@@ -46,6 +66,18 @@ class FolJntType(object):
         (follicle shape under joint; follicle drives joint)
         - Can be skinned to but disrupts the skinning RMB popup in 
         some maya versions.
+    
+    Pinned types (@p=attached by a pin node shared by every follicle
+    joint on the patch, rather than a follicle each; needs the uvPin
+    node, Maya 2020+):
+    Pinned transform:         t@p
+        (pin output drives the transform's offsetParentMatrix)
+    Pinned standard joint:    t@p-j
+        (as t@p, with a joint under the transform)
+    Pinned joint:             j@p
+        (pin output drives the joint's offsetParentMatrix)
+    Pinned types always have the control attributes; see 
+    FollicleJoint.newPlan.
     """
     
     _typeNames = {
@@ -55,12 +87,31 @@ class FolJntType(object):
         'j/f':'follicleJoint'
         }
     
-    validTypes = _typeNames.keys()
+    _pinnedTypeNames = {
+        't@p':'pinnedTransform',
+        't@p-j':'pinnedJointStandard',
+        'j@p':'pinnedJoint'
+        }
+    
+    validTypes = _typeNames.keys() + sorted(_pinnedTypeNames)
     defaultType = validTypes[1]
     renameFormats={
         'main':"{pre}{num}{suf}",
         'j':"{pre}_J_{num}{suf}"
         }
+    
+    # Structure flags of each type, worked out once rather than from
+    # the type string on every check:
+    # (hasTransform, hasJoint, topTransform, follicleParent)
+    _flags = {
+        't/f':(True, False, 't', 't'),
+        't/f-j':(True, True, 't', 't'),
+        't-j/f':(True, True, 't', 'j'),
+        'j/f':(False, True, 'j', 'j'),
+        't@p':(True, False, 't', None),
+        't@p-j':(True, True, 't', None),
+        'j@p':(False, True, 'j', None)
+        }
 
     
     def __init__(self, typeString=None):
@@ -99,11 +150,11 @@ class FolJntType(object):
     
     @property
     def hasTransform(self):
-        return 't' in self.typeString
+        return self._flags[self.typeString][0]
     
     @property
     def hasJoint(self):
-        return 'j' in self.typeString
+        return self._flags[self.typeString][1]
     
     @property
     def hasOffsetTransform(self):
@@ -111,21 +162,22 @@ class FolJntType(object):
         
     @property
     def topTransform(self):
-        if self.hasTransform:
-            return 't'
-        elif self.hasJoint:
-            return 'j'
-        else:
-            raise AttributeError("Error identifying top transform!")
+        return self._flags[self.typeString][2]
     
     @property
     def follicleParent(self):
-        return self.typeString.partition('/f')[0][-1]
+        return self._flags[self.typeString][3]
+    
+    @property
+    def isPinned(self):
+        """Attached by a shared pin node, rather than a follicle"""
+        return self.follicleParent is None
     
     @property
     def name(self):
         if self._name is None: 
-            self._name = self._typeNames[self.typeString]
+            self._name = self._typeNames.get(
+                self.typeString) or self._pinnedTypeNames[self.typeString]
         return self._name
         
         
@@ -143,6 +195,8 @@ class FolJntType(object):
         # Set the default control node (joint if joint exists)
         if self.hasJoint:
             self.controlNode = 'j'
+        elif self.isPinned:
+            self.controlNode = 't'
         else:
             self.controlNode = 'f'
 
@@ -172,6 +226,9 @@ class FollicleJoint(object):
         self._patch = None  # property
         self._controlObj = None  # property
         self._nameObj = None  # property
+        self._plannedNodes = None  # (see newPlan)
+        self._graphCache = {}  # (see _cachedQuery)
+        self._graphCacheCount = None
         #self.topObj = None  # property
         #self.allDagObjs = None  # property
         
@@ -194,11 +251,14 @@ class FollicleJoint(object):
             self.set(folObject)
     
     def __str__(self):
+        if self.type is not None and self.type.isPinned:
+            return "%s of type '%s'; pin output: '%s'" % (
+                self.__class__.__name__, self.type, self.pinPlug)
         return "%s of type '%s'; follicle node: '%s'" % (
             self.__class__.__name__, self.type, self.fol)
         
     def __repr__(self):
-        return '%s(%r)' % (self.__class__.__name__, self.fol)
+        return '%s(%r)' % (self.__class__.__name__, self.fol or self.topObj)
         
     @property
     def controlObj(self):
@@ -269,23 +329,7 @@ class FollicleJoint(object):
     @property
     def patch(self):
         if not self._patch:
-            if self.fol:
-                # Find the patch shape (mesh or nurbSurface)
-                fol = self.fol
-                nurbs = fol.inputSurface.inputs(t='nurbsSurface', shapes=1)
-                meshs = fol.inputMesh.inputs(t='mesh', shapes=1)
-                
-                patch = None
-                if nurbs:
-                    patch = nurbs[0]
-                elif meshs:
-                    patch = meshs[0]
-                else:
-                    return False
-                
-                self._patch = patch
-            else:
-                self._patch = None
+            return self._cachedQuery('patch', self._queryPatch)
         return self._patch
     
     @patch.setter
@@ -337,35 +381,136 @@ class FollicleJoint(object):
     
     @property
     def uvDriverAttrs(self):
-        controlObj = self.controlObj
-        if controlObj is None: return
-        return (pm.attributeQuery('ou', n=controlObj, ex=1) and 
-            pm.attributeQuery('ov', n=controlObj, ex=1))
+        return self._cachedQuery('uvDriverAttrs', self._queryUvDriverAttrs)
     
     @property
     def uvDriverRatio(self):
         controlObj = self.controlObj
         if controlObj is None: return None
         
-        uvRatio = []
         uvDrivNodes = self._driverRatioNodes
         if not uvDrivNodes: return None
         
-        for i in range(2):
-            if uvDrivNodes[i] is None:
-                uvRatio.append(None)
-            else:
-                uvRatio.append(uvDrivNodes[i].i2.get())
+        uvRatio = [None, None]
+        found = [i for i in range(2) if uvDrivNodes[i] is not None]
+        values = batchPlan.getValues([(uvDrivNodes[i], 'i2') for i in found])
+        for i, value in zip(found, values):
+            uvRatio[i] = float(value)
         return uvRatio
     
     @property
     def _driverRatioNodes(self):
         """Return the nodes linking the offset values to the final uv"""
+        return self._cachedQuery(
+            '_driverRatioNodes', self._queryDriverRatioNodes)
+    
+    @property
+    def _linkRatioAttrs(self):
+        """Return the nodes linking other follicle joints to this one"""
+        return self._cachedQuery(
+            '_linkRatioAttrs', self._queryLinkRatioAttrs)
+    
+    @property
+    def pinPlug(self):
+        """The shared pin output driving a pinned type's top node
+        (pin.outputMatrix[index]), or None"""
+        return self._cachedQuery('pinPlug', self._queryPinPlug)
+    
+    @property
+    def pin(self):
+        pinPlug = self.pinPlug
+        if pinPlug is None: return None
+        return pinPlug.node()
+    
+    @property
+    def pinIndex(self):
+        pinPlug = self.pinPlug
+        if pinPlug is None: return None
+        return pinPlug.index()
+    
+    @property
+    def _uvPlugs(self):
+        """The plugs of the final u and v parameters, as (node, attr)
+        
+        (The follicle's, or the pin coordinate's for pinned types.)
+        """
+        if self.fol:
+            return [(self.fol, 'pu'), (self.fol, 'pv')]
+        pinPlug = self.pinPlug
+        if pinPlug is None: return None
+        return _pinCoordinatePlugs(pinPlug)
+    
+    def _requireFollicle(self, action):
+        """Raise an error if this is a pinned type (without follicle)"""
+        if self.type is not None and self.type.isPinned:
+            raise StandardError(
+                "%s isn't supported for pinned follicle joints (%s)!" % (
+                    action, self.name))
+    
+    def _cachedQuery(self, name, query):
+        """Return the result of a graph query, cached while the scene 
+        is unchanged.
+        
+        Results are kept (on this object) while a batchSession is 
+        running, or while batchPlan.watchSceneEdits is on, until the
+        scene edit counter (batchPlan.editCount) changes. With the 
+        module's verifyGraphCache set, cached results are checked 
+        against a fresh query.
+        """
+        if not (_batchSessionStack or batchPlan.watchingSceneEdits()):
+            return query()
+        editCount = batchPlan.editCount()
+        if self._graphCacheCount != editCount:
+            self._graphCache = {}
+            self._graphCacheCount = editCount
+        if not name in self._graphCache:
+            self._graphCache[name] = query()
+        elif verifyGraphCache:
+            result = query()
+            if result != self._graphCache[name]:
+                raise StandardError(
+                    "Cached %s of %r is out of date! (%r, now %r)" % (
+                        name, self, self._graphCache[name], result))
+        return self._graphCache[name]
+    
+    def _queryPatch(self):
+        """Find the patch shape (mesh or nurbSurface)"""
+        if not self.fol:
+            pin = self.pin
+            if pin is None:
+                return None
+            patches = pin.deformedGeometry.inputs(
+                t=['nurbsSurface', 'mesh'], shapes=1)
+            if patches:
+                return patches[0]
+            return False
+        fol = self.fol
+        nurbs = fol.inputSurface.inputs(t='nurbsSurface', shapes=1)
+        meshs = fol.inputMesh.inputs(t='mesh', shapes=1)
+        
+        if nurbs:
+            return nurbs[0]
+        elif meshs:
+            return meshs[0]
+        return False
+    
+    def _queryUvDriverAttrs(self):
+        controlObj = self.controlObj
+        if controlObj is None: return
+        return (pm.attributeQuery('ou', n=controlObj, ex=1) and 
+            pm.attributeQuery('ov', n=controlObj, ex=1))
+    
+    def _queryDriverRatioNodes(self):
         uvRatioNodesFound = False
         uvRatioNodes = []
         controlObj = self.controlObj
         uvDrvAttrs = [controlObj.ou, controlObj.ov]
-        folAttrs = [self.fol.pu, self.fol.pv]
+        if self.fol:
+            folAttrs = [self.fol.pu, self.fol.pv]
+        else:
+            folAttrs = [
+                pm.Attribute(batchPlan.plugName(plug)) 
+                for plug in self._uvPlugs]
         for i in range(2):
             # Check for slow attr node through inputs (as outputs may be 
             # connected to other things)
@@ -375,7 +520,7 @@ class FollicleJoint(object):
                 offsetDriver = offsetAdd[0].i2.inputs(t='multDoubleLinear')
                 if offsetDriver:
                     offsetAttrChk = offsetDriver[0].i1.inputs(p=1)
-                    if offsetAttrChk[0] == uvDrvAttrs[i]:
+                    if offsetAttrChk and offsetAttrChk[0] == uvDrvAttrs[i]:
                         uvRatioNode = offsetDriver[0]
                         uvRatioNodesFound = True
             uvRatioNodes.append(uvRatioNode)
@@ -385,9 +530,15 @@ class FollicleJoint(object):
         else:
             return None
         
-    @property
-    def _linkRatioAttrs(self):
-        """Return the nodes linking other follicle joints to this one"""
+    def _queryPinPlug(self):
+        if self.fol or self.type is None or not self.type.isPinned:
+            return None
+        pinPlugs = self.topObj.offsetParentMatrix.inputs(p=1, t='uvPin')
+        if pinPlugs:
+            return pinPlugs[0]
+        return None
+    
+    def _queryLinkRatioAttrs(self):
         linkDriverFound = False
         linkRatioNodes = []
         controlObj = self.controlObj
@@ -424,7 +575,8 @@ class FollicleJoint(object):
     def new(self, patch=None, name=None, uv=[0.5, 0.5], folType='t/f-j',
             jntRadius=0.1, attrs=True, uvDriverRatio=0.1,
             normaliseUV=False, warnNormalised=True,
-            useSmoothedMesh=False, nameFormats=None):
+            useSmoothedMesh=False, nameFormats=None,
+            planOnly=False, plan=None, useModifier=False, patchIsNurb=None):
         """Create a new follicle, with the given settings.
         
         patch: (string/PyObj) mesh or nurbSurface object
@@ -433,13 +585,15 @@ class FollicleJoint(object):
         
         uv: follicle u and v parameter values eg. [0.5, 0.5]
         
-        folType: one of 't/f', 't/f-j', 't-j/f', 'j/f';
+        folType: one of 't/f', 't/f-j', 't-j/f', 'j/f', or a pinned
+         type ('t@p', 't@p-j', 'j@p'; Maya 2020+);
          see help(FolJntType) for more info
         
         jntRadius: joint radius
         
         attrs: if this is false, no attributes are created to drive the
          uv parameters, so the follicle must be selected manually.
+         (Pinned types always have them.)
         
         uvDriverRatio: default 0.1 means the offset attribute values
          are scaled by 10.
@@ -459,6 +613,19 @@ class FollicleJoint(object):
          Supplying an alternative dict (or supplying a FolJntType
          instance with customised .renameFormats) can allow a
          different convention to be used.
+        
+        planOnly: don't change the scene, just record the nodes, 
+         connections and values into plan (a new 
+         batchPlan.OperationPlan if not given) and return it. This 
+         FollicleJoint is filled in when the plan is executed.
+         (Giving a plan also implies planOnly.)
+        
+        useModifier: apply the plan with an API modifier rather than 
+         command by command (see batchPlan.execute).
+        
+        patchIsNurb: whether patch is a nurbsSurface, if already known 
+         (eg. from duplicateFollicles); patch must then be the shape 
+         PyNode and uv already normalised, as neither is checked again.
         """
         
         if uvDriverRatio and not isinstance(uvDriverRatio, list):
@@ -467,19 +634,22 @@ class FollicleJoint(object):
         # Create a new follicle on the surface at the given position
         returnList = []
         
-        # Get patch
-        patchTest = cq.filterSelectionForShapeType(
-            patch, ['nurbsSurface', 'mesh'])[0]
-        if patchTest:
-            self._patch = patchTest
-        patchIsNurb = pm.objectType(self.patch, i='nurbsSurface')
-        
-        # Adjust UV for UV ranges if not Normalised
         self.uv = list(uv)
-        if patchIsNurb:
-            self.uv = normalisedNurbsUV(
-                self.patch, uv, warningOnly=not normaliseUV,
-                giveWarning=warnNormalised)
+        if patchIsNurb is None:
+            # Get patch
+            patchTest = cq.filterSelectionForShapeType(
+                patch, ['nurbsSurface', 'mesh'])[0]
+            if patchTest:
+                self._patch = patchTest
+            patchIsNurb = pm.objectType(self.patch, i='nurbsSurface')
+            
+            # Adjust UV for UV ranges if not Normalised
+            if patchIsNurb:
+                self.uv = normalisedNurbsUV(
+                    self.patch, uv, warningOnly=not normaliseUV,
+                    giveWarning=warnNormalised)
+        else:
+            self._patch = patch
         
         # Set the type specifier object (create new FolJntType if required)
         if isinstance(folType, FolJntType):
@@ -496,104 +666,273 @@ class FollicleJoint(object):
         if not name:
             name = '%s_fol#' % str(self.patch.getParent())
         
-        # Create a follicle
-        fol = pm.createNode('follicle', ss=1)
-        self.fol = fol
-        folXform = fol.getParent()
-        if self.type.hasTransform:
-            self.xfm = folXform
-        #folXform = pm.rename(fol.getParent(), 'tempName#')
-        #fol = folXform.getShape()
+        ownPlan = plan is None
+        if ownPlan:
+            plan = batchPlan.OperationPlan()
+        self.newPlan(
+            plan, name, nameFormats, jntRadius, attrs, uvDriverRatio,
+            useSmoothedMesh, patchIsNurb=patchIsNurb)
+        if planOnly or not ownPlan:
+            return plan
+        plan.execute(useModifier=useModifier)
         
-        returnList = [fol, folXform, self.patch]
+        if self.type.isPinned:
+            returnList = [self.pin, self.topObj, self.patch]
+        else:
+            returnList = [self.fol, self.fol.getParent(), self.patch]
+        if self.jnt:
+            returnList.append(self.jnt)
+        return returnList
+    
+    def newPlan(self, plan, name, nameFormats, jntRadius=0.1, attrs=True,
+                uvDriverRatio=None, useSmoothedMesh=False, patchIsNurb=None):
+        """Record the nodes of a new follicle joint into plan.
         
-        paramObj = fol
-        if self.type.hasJoint:
-            # Create a joint (under the follicle transform if necessary)
-            if self.type.topTransform == 't':
-                newJnt = pm.createNode('joint', p=folXform, ss=1)
+        (For new; self.patch, uv and type must be set already.
+        patchIsNurb is looked up if not given.)
+        The names are chosen (and reserved in the active NameIndex) 
+        straight away, as rename would choose them.
+        Once the plan is executed, this FollicleJoint is filled in.
+        Returns the PlannedNodes, as {'f':, 't':, 'j':, 'ctrl':} and
+        'ratio': [u, v] offset ratio nodes (None where not part of the
+        setup); these are also kept as self._plannedNodes until then.
+        
+        Pinned types have no follicle ('f' is None); the top node's 
+        offsetParentMatrix is driven by an element of the patch's 
+        shared uvPin node ('pin'; see _planPin) instead, with the 
+        offset nodes driving that element's coordinate.
+        """
+        folType = self.type
+        patch = self.patch
+        
+        # Choose the names
+        pre, num, suf, numBuffer = _nameParts(name)
+        abbrs = ['main']
+        if folType.hasTransform and folType.hasJoint:
+            abbrs.append('j')
+        nameBase = name.rpartition('_')[0]
+        patterns = [
+            nameFormats[abbr].format(pre=pre, num='*', suf=suf) 
+            for abbr in abbrs]
+        nameIndex = _getNameIndex(
+            patterns + [pattern+'Shape*' for pattern in patterns] + 
+            ['%saddOffset*' % nameBase])
+        num = nameIndex.nextNumber(
+            pre, suf, numBuffer, [nameFormats[abbr] for abbr in abbrs],
+            start=num)
+        names = {}
+        for abbr in abbrs:
+            names[abbr] = joinNumberedName(
+                pre, num, suf, numBuffer, nameFormat=nameFormats[abbr])
+            nameIndex.add(names[abbr])
+        
+        # Create the transform and/or joint, and the follicle shape
+        nodes = {'t':None, 'j':None}
+        if folType.hasTransform:
+            nodes['t'] = plan.createNode('transform', names['main'])
+        if folType.hasJoint:
+            nodes['j'] = plan.createNode(
+                'joint', names.get('j', names['main']), parent=nodes['t'])
+            plan.setValue((nodes['j'], 'radius'), jntRadius)
+        if folType.isPinned:
+            fol = None
+            pin, pinIndex = _planPin(plan, patch, useSmoothedMesh)
+            nodes['pin'] = pin
+            uvPlugs = [
+                (pin, 'coordinate[%s].coordinate%s' % (pinIndex, uvStr))
+                for uvStr in 'UV']
+            attrs = True
+        else:
+            folParent = nodes[folType.follicleParent]
+            folName = folParent.name + 'Shape'
+            if nameIndex.exists(folName):
+                folName = nameIndex.uniqueName(folName + '#')
             else:
-                newJnt = pm.createNode('joint', ss=1)
-            #newJnt = pm.createNode('joint', p=folXform, n=jntName, ss=1)
-            
-            self.jnt = newJnt
-            newJnt.radius.set(jntRadius)
-            
-            returnList.append(newJnt)
+                nameIndex.add(folName)
+            fol = plan.createNode('follicle', folName, parent=folParent)
+            uvPlugs = [(fol, 'pu'), (fol, 'pv')]
+        nodes['f'] = fol
         
+        paramObj = fol
+        ctrlAbbr = None
+        nodes['ctrl'] = None
+        nodes['ratio'] = [None, None]
         if attrs:
-            if self.type.controlNode == 'j':
-                ctrlNode = self.jnt
-            else:
-                ctrlNode = self.xfm
+            ctrlAbbr = 't'
+            if folType.controlNode == 'j':
+                ctrlAbbr = 'j'
+            ctrlNode = nodes[ctrlAbbr]
+            nodes['ctrl'] = ctrlNode
             
             # Add attributes to adjust the follicle position with
-            pm.addAttr(ctrlNode, ln='parameterU', sn='pu', k=1)
-            pm.addAttr(ctrlNode, ln='parameterV', sn='pv', k=1)
-            pm.addAttr(ctrlNode, ln='offsetU', sn='ou', k=1)
-            pm.addAttr(ctrlNode, ln='offsetV', sn='ov', k=1)
+            plan.addAttr(ctrlNode, 'parameterU', 'pu')
+            plan.addAttr(ctrlNode, 'parameterV', 'pv')
+            plan.addAttr(ctrlNode, 'offsetU', 'ou')
+            plan.addAttr(ctrlNode, 'offsetV', 'ov')
             
-            nameBase = name.rpartition('_')[0]
             for i in range(2):
                 uvStr = ['U', 'V'][i]
                 uvLow = uvStr.lower()
                 ofName = '%saddOffset%s_#' % (nameBase, uvStr)
-                offsetAdd = pm.createNode(
-                    'addDoubleLinear', n=ofName, ss=1)
+                offsetAdd = plan.createNode(
+                    'addDoubleLinear', nameIndex.uniqueName(ofName))
                 
-                offsetAttr = '%s.o%s' % (ctrlNode, uvLow)
+                offsetAttr = (ctrlNode, 'o%s' % uvLow)
                 if uvDriverRatio and uvDriverRatio[i]:
                     # Multiply the offset value by .1 to enable fineTuning
-                    mlName = '%saddOffset%s_#' % (nameBase, uvStr)
-                    offsetMult = pm.createNode(
-                        'multDoubleLinear', n=mlName, ss=1)
-                    offsetMult.i2.set(uvDriverRatio[i])
+                    offsetMult = plan.createNode(
+                        'multDoubleLinear', nameIndex.uniqueName(ofName))
+                    plan.setValue((offsetMult, 'i2'), uvDriverRatio[i])
                     
-                    pm.connectAttr(offsetAttr, offsetMult.i1)
-                    offsetAttr = offsetMult.o
+                    plan.connect(offsetAttr, (offsetMult, 'i1'))
+                    offsetAttr = (offsetMult, 'o')
+                    nodes['ratio'][i] = offsetMult
                 
-                pm.connectAttr('%s.p%s' % (ctrlNode, uvLow), offsetAdd.i1)
-                pm.connectAttr(offsetAttr, offsetAdd.i2)
-                pm.connectAttr(offsetAdd.o, '%s.p%s' % (fol, uvLow))
+                plan.connect((ctrlNode, 'p%s' % uvLow), (offsetAdd, 'i1'))
+                plan.connect(offsetAttr, (offsetAdd, 'i2'))
+                plan.connect((offsetAdd, 'o'), uvPlugs[i])
             
-            if self.type.controlNode == 'j':
+            if folType.controlNode == 'j' and fol:
                 # Hide the follicle shape
-                fol.visibility.set(0)
+                plan.setValue((fol, 'visibility'), False)
             paramObj = ctrlNode
         
-        # Reparent the follicle if necessary
-        topTransform = folXform
-        if self.type.follicleParent == 'j':
-            pm.parent(self.fol, self.jnt, r=1, s=1)
-            # Delete the original follice transform if not required.
-            if not self.type.hasTransform:
-                pm.delete(folXform)
-        if self.type.topTransform == 'j':
-            topTransform = self.jnt
-        
-        # Set up the follicle
-        pm.connectAttr(fol.outTranslate, topTransform.t)
-        pm.connectAttr(fol.outRotate, topTransform.r)
-        pm.connectAttr(self.patch.worldMatrix[0], fol.inputWorldMatrix)
-        if patchIsNurb:
-            pm.connectAttr(self.patch.local, fol.inputSurface)
-        elif useSmoothedMesh:
-            pm.connectAttr(self.patch.outSmoothMesh, fol.inputMesh)
+        topTransform = nodes[folType.topTransform]
+        if folType.isPinned:
+            # Place the top node with its pin output
+            plan.connect(
+                (pin, 'outputMatrix[%s]' % pinIndex), 
+                (topTransform, 'offsetParentMatrix'))
         else:
-            pm.connectAttr(self.patch.outMesh, fol.inputMesh)
+            # Set up the follicle
+            plan.connect((fol, 'outTranslate'), (topTransform, 't'))
+            plan.connect((fol, 'outRotate'), (topTransform, 'r'))
+            plan.connect(
+                (patch, 'worldMatrix[0]'), (fol, 'inputWorldMatrix'))
+            if patchIsNurb is None:
+                patchIsNurb = pm.objectType(patch, i='nurbsSurface')
+            if patchIsNurb:
+                plan.connect((patch, 'local'), (fol, 'inputSurface'))
+            elif useSmoothedMesh:
+                plan.connect((patch, 'outSmoothMesh'), (fol, 'inputMesh'))
+            else:
+                plan.connect((patch, 'outMesh'), (fol, 'inputMesh'))
         
-        paramObj.parameterU.set(self.uv[0])
-        paramObj.parameterV.set(self.uv[1])
+        plan.setValue((paramObj, 'parameterU'), self.uv[0])
+        plan.setValue((paramObj, 'parameterV'), self.uv[1])
         
-        # Name the objects
-        self.rename(name, skipPreRename=True, renameFormats=nameFormats)
+        self._plannedNodes = nodes
+        plan.addCallback(functools.partial(
+            self._setPlannedNodes, nodes, ctrlAbbr))
+        return nodes
+    
+    def _setPlannedNodes(self, nodes, ctrlAbbr=None):
+        """Fill in the nodes from an executed newPlan"""
+        self._plannedNodes = None
+        self.fol = nodes['f'] and nodes['f'].node
+        self.xfm = nodes['t'] and nodes['t'].node
+        self.jnt = nodes['j'] and nodes['j'].node
+        self.type = FolJntType(self.type.typeString)
+        if ctrlAbbr:
+            self.type.controlNode = ctrlAbbr
+        self._controlObj = None
+        self._side = None
         
-        # Populate object values 
-        # Should be able to be optimised by setting values here instead
-        self.set(fol)
+    def clones(self, count):
+        """Duplicate this follicle joint's node network count times.
         
-        return returnList
+        The offset nodes are duplicated along with the DAG nodes (with
+        -upstreamNodes), in a few duplicate calls, the number of copies
+        doubling with each call. The patch is disconnected while 
+        duplicating (so that it isn't duplicated too) and the copies are
+        then connected to it in the same way.
+        Returns the copies as FollicleJoints, populated directly; they 
+        keep the names Maya gave them and this one's UV values.
+        """
+        self._requireFollicle('Cloning')
+        if count < 1:
+            return []
+        patch = self.patch
+        patchConns = [
+            conn for conn in self.fol.inputs(c=1, p=1)
+            if conn[1].node() == patch]
+        
+        selection = _selected()
+        for dest, src in patchConns:
+            pm.disconnectAttr(src, dest)
+        try:
+            roots = [self.topObj]
+            created = []
+            while len(roots) < count+1:
+                sources = roots[:count+1-len(roots)]
+                # (duplicate lists the new roots first, in order, then
+                # the rest of the nodes it made)
+                dups = pm.duplicate(sources, un=1)
+                roots.extend(dups[:len(sources)])
+                created.extend(dups)
+        finally:
+            for dest, src in patchConns:
+                pm.connectAttr(src, dest)
+            batchPlan.markEdited()
+            if selection:
+                _select(selection, r=1)
+            else:
+                _select(cl=1)
+        roots = roots[1:]
+        uv = self.uv
+        if uv is None:
+            uv = [self.fol.parameterU.get(), self.fol.parameterV.get()]
+        
+        # Find the copies' nodes by their place in the hierarchy (under
+        # whichever root their full path starts with)
+        subNodes = _batchListRelatives(roots, ad=1, fullPath=1)
+        fols = set(_batchLs(subNodes, type='follicle'))
+        jnts = set(_batchLs(subNodes, type='joint'))
+        rootPaths = dict((root.longName(), root) for root in roots)
+        found = dict((root, {}) for root in roots)
+        for node in subNodes:
+            if node in fols:
+                key = 'f'
+            elif node in jnts:
+                key = 'j'
+            else:
+                continue
+            path = node.longName()
+            while path and not path in rootPaths:
+                path = path.rpartition('|')[0]
+            if path:
+                found[rootPaths[path]][key] = node
+        
+        if _nameIndexStack:
+            _nameIndexStack[-1].addNodes(created)
+        journal = batchPlan.activeJournal()
+        if journal is not None:
+            # Only what duplicate made (the roots' children go with them)
+            descendants = set(subNodes)
+            journal.recordCreated([
+                node for node in created if not node in descendants])
         
+        newObjs = []
+        for root in roots:
+            nodes = found[root]
+            newObj = FollicleJoint()
+            newObj.type = FolJntType(self.type.typeString)
+            newObj.type.controlNode = self.type.controlNode
+            if self.type.topTransform == 't':
+                newObj.xfm = root
+                newObj.jnt = nodes.get('j')
+            else:
+                newObj.jnt = root
+            newObj.fol = nodes['f']
+            newObj._patch = patch
+            newObj.uv = list(uv)
+            
+            for dest, src in patchConns:
+                pm.connectAttr(
+                    src, newObj.fol.attr(dest.attrName(longName=True)))
+            newObjs.append(newObj)
+        return newObjs
+    
     def set(self, folObject=None):
         """Populate the self.fol, xfm and jnt fields if possible."""
         if not folObject:
@@ -609,6 +948,8 @@ class FollicleJoint(object):
         If 'strict' is specified, if any input object cannot be 
         identified as a sub follicle joint node, an exception is 
         raised.  Returns True if successful.
+        (To identify many follicle joints at once, findFollicleJoints is
+        much faster than calling this for each one.)
         """
         # Look for object type in objs, then in selection, 
         # then in components' objects
@@ -623,119 +964,43 @@ class FollicleJoint(object):
         if not objs:
             raise StandardError(
                 "No objects found for the given name(s) %s!" % (
-                    ', '.join(folObject)))
-        
-        # Try to identify a valid follicle joint setup
-        for obj in objs:
-            # [transform, follicle, joint]
-            possibleItem = [None, None, None]
-            tmpFol = None
-            folName = None
-            folFormat = None
-            
-            # Setup must always include a 'follicle' shape node;
-            # Setup may contain a 'joint' and/or 'transform'
-            # A 'transform' is only relevant if it's the direct parent 
-            # of a 'follicle' or 'joint'
-
-            # Locate the follicle
-            curType = obj.type()
-            if curType == 'follicle':
-                # Selection is follicle
-                tmpFol = obj
-            elif curType in ['transform', 'joint']:
-                # Selection is joint; find follicle.
-                fols = obj.getShapes(typ='follicle', ni=1)
-                if not fols:
-                    if curType == 'joint':
-                        fols = obj.getSiblings(typ='follicle', ni=1)
-                    else:
-                        jnts = obj.getChildren(typ='joint')
-                        if jnts:
-                            # Could almost finish off here, but it's best to 
-                            # leave it for connection checks later
-                            fols = jnts[0].getShapes(typ='follicle', ni=1)
-                if fols:
-                    tmpFol = fols[0]
-            
-            # Get the necessary details
-            if tmpFol:
-                possibleItem[1] = tmpFol
-                folName = tmpFol.name()
-                
-                # Identify the other nodes from the follicle
-                par = tmpFol.getParent()
-                if par.type()=='joint':
-                    possibleItem[2] = par
-                    folFormat = 'j/f'
-                    
-                    # Check for transform 
-                    # (only useful if a parent is driven by the follicle)
-                    checkOutputXforms = tmpFol.outputs(
-                        t='transform', exactType=True)
-                    jntPar = par.getParent()
-                    if checkOutputXforms and jntPar in checkOutputXforms:
-                        possibleItem[0] = jntPar
-                        folFormat = 't-j/f'
-                elif par.type()=='transform':
-                    possibleItem[0] = par
-                    folFormat = 't/f'
-                    
-                    # Check for a joint
-                    sibJnt = par.getChildren(typ='joint')
-                    if sibJnt:
-                        possibleItem[2] = sibJnt[0]
-                        folFormat = 't/f-j'
-                
-                # Check that the follicle actually drives the parent transform
-                checkFolOutputs = tmpFol.outputs(
-                    t=['transform', 'joint'], exactType=True)
-                if not (
-                    possibleItem[0] in checkFolOutputs or 
-                    possibleItem[2] in checkFolOutputs):
-                    folFormat = None
-            
-            # Check whether a follicle was identified
-            if folName:
-                # Store the object node values, finish search
-                self.xfm, self.fol, self.jnt = possibleItem
-                self.type = FolJntType(folFormat)
-                # Stop searching for follicleJoint
-                break
+                    ', '.join([str(obj) for obj in folObject])))
         
-        # Get more accurate control node value than just type string
-        if self.jnt and hasattr(self.jnt, 'pu') and hasattr(self.jnt, 'pv'):
-            self.type.controlNode = 'j'
-        elif self.xfm and hasattr(self.xfm, 'pu') and hasattr(self.xfm, 'pv'):
-            self.type.controlNode = 't'
+        # Try to identify a valid follicle joint setup 
+        # (from the first object with a follicle)
+        arrangement = None
+        fols = [fol for fol in _inputFollicles(objs) if fol is not None]
+        if fols:
+            arrangement = _follicleArrangements(fols[:1])[fols[0]]
+        else:
+            # A pinned type (see FolJntType)
+            tops = [top for top in _inputPinTops(objs) if top is not None]
+            if tops:
+                arrangement = _pinArrangements(tops[:1])[tops[0]]
         
         # Return None/error if the result was invalid
-        raiseMessage = ''
-        if not self.type or not self.type.typeString in FolJntType.validTypes:
-            raiseMessage = "Node arrangement was not recognised as a valid \
-                follicle joint. "
-        
-        if not self.fol:
-            raiseMessage += "No follicle was found!"
-        elif not self.type.typeString in FolJntType.validTypes:
-            if self.type.typeString is None:
-                raiseMessage += "Check the follicle output connections!"
-            elif not self.xfm or not self.jnt:
-                # (Still allows a transform or joint to be missing if it is 
-                # a valid setup)
-                erList = []
-                if not self.xfm: erList.append('transform')
-                if not self.jnt: erList.append('joint')
-                raiseMessage += "No %s was found! " % ' or '.join(erList)
-        
+        raiseMessage = _arrangementError(arrangement)
         if raiseMessage:
             if strict: raise StandardError(raiseMessage)
             elif self.verbose: print "Warning: %s Skipped." % raiseMessage
             return None
-
+        
+        self._populate(*arrangement)
+        
         # Return True if successful
         return True
     
+    def _populate(self, xfm, fol, jnt, typeString, controlNode=None):
+        """Store already identified nodes (see findFollicleJoints)"""
+        self.xfm, self.fol, self.jnt = xfm, fol, jnt
+        self.type = FolJntType(typeString)
+        if controlNode:
+            self.type.controlNode = controlNode
+        self._patch = None
+        self._controlObj = None
+        self._side = None
+        self._graphCache = {}
+    
     def getMirrorObject(self, strict=True, justName=False):
         """Return the follicle joint named with right instead of left etc."""
         lrIndex = None
@@ -771,7 +1036,7 @@ class FollicleJoint(object):
             return False
     
     def rename(self, name="temp_fol#", dontApply=False, skipPreRename=False,
-               renameFormats=None):
+               renameFormats=None, nameIndex=None):
         """Rename the nodes that make up the FollicleJoint.
         
         Usual use:
@@ -804,100 +1069,111 @@ class FollicleJoint(object):
         suffix is added for the 'joint'.  The 'follicle' is a shape 
         so will be named according to it's parent transform 
         (transform or joint) as is Maya convention.
+        
+        Free names are looked up in a NameIndex: 'nameIndex' if given, 
+        else the one of the surrounding nameIndexScope, else a small 
+        one built just for the names that could clash.
+        (skipPreRename is no longer needed and is ignored; the nodes' 
+        own current names are never treated as clashes.)
         """
-        # Ensure there is a node(s) to rename
-        if not self.nameObj:
-            raise StandardError(
-                "No transform objects associated with FollicleJoint!"
-                )
+        objs = self._namedNodes()
         
         if renameFormats is None:
             renameFormats = dict(self.type.renameFormats)
         
-        num = 1
-        numBuffer = 0
-        numberPlaceholder = False
-        if name is not None:
-            # Check for number position
-            if '#' in name:
-                numberPlaceholder = True
-                hasNum = True
-                numBuffer = 1
-                # Split the new name:
-                pre, numNull, suf = splitNumberedName(name, "#")
-        else:
+        if name is None:
             # Reformat existing name:
             name = self.name
-            
-        if not numberPlaceholder:
-            # For existing name, or string without '#':
-            # Split the name to get the number
-            pre, numStr, suf = splitNumberedName(name)
-            if numStr:
-                hasNum = True
-                numBuffer = len(numStr)
-                num = int(numStr)
-            else:
-                hasNum = False
-            
-        # Choose which object is the main name one
-        objs = {}
-        objs['main'] = self.nameObj
-        if self.jnt and objs['main'] != self.jnt:
-            objs['j'] = self.jnt
+        pre, num, suf, numBuffer = _nameParts(name)
+        abbrs = sorted(objs)
         
         allMatch = True
         newNames = {}
         for abbr in objs:
             # Derive name for each object; compare to current name.
-            firstNum = num
-            if not hasNum:
-                # Try without number first, if '#' was omitted.
-                firstNum = None
             nameNew = joinNumberedName(
                 pre, num, suf, numBuffer, nameFormat=renameFormats[abbr])
             newNames[abbr] = nameNew
             obj = objs[abbr]
             # Check against object name
-            if nameNew != obj.name():
+            if nameNew != obj.nodeName():
                 allMatch = False
         # Return if both objects are already named that
         if allMatch:
             return objs, newNames
         
-        # Rename all first to avoid unnecessary clashes
-        if not skipPreRename:
-            for obj in objs.values():
-                pm.rename(obj, obj.name()+"various1___tempjunk3")
+        if nameIndex is None:
+            # Only index the names that could clash
+            patterns = [
+                renameFormats[abbr].format(pre=pre, num='*', suf=suf) 
+                for abbr in abbrs]
+            if self.fol:
+                patterns.extend([pattern+'Shape*' for pattern in patterns])
+            nameIndex = _getNameIndex(patterns)
         
-        # If a name already exists, find one that doesn't
-        if hasNum:
-            # First number has already been tested
-            num += 1
-        while _anyObjsExist(newNames):
-            newNames = {}
-            for abbr in objs:
-                newNames[abbr] = joinNumberedName(
-                    pre, num, suf, numBuffer, nameFormat=renameFormats[abbr])
-            num += 1
+        # The nodes' own names don't clash (as if renamed out of the way)
+        ownNames = [objs[abbr].nodeName() for abbr in abbrs]
+        for ownName in ownNames:
+            nameIndex.discard(ownName)
+        
+        # If a name already exists, find the first number that doesn't
+        num = nameIndex.nextNumber(
+            pre, suf, numBuffer, 
+            [renameFormats[abbr] for abbr in abbrs], start=num)
+        for abbr in abbrs:
+            newNames[abbr] = joinNumberedName(
+                pre, num, suf, numBuffer, nameFormat=renameFormats[abbr])
+        
+        if dontApply:
+            for ownName in ownNames:
+                nameIndex.add(ownName)
+            return objs, newNames
         
         # Rename the objects!
-        if not dontApply:
-            for abbr in objs:
-                pm.rename(objs[abbr], newNames[abbr])
-            if self.fol:
-                # Rename the follicle shape (Maya style)
-                folParent = self.fol.getParent()
-                folCorrect = folParent.name()+"Shape"
-                if self.fol.name() != folCorrect:
-                    if not pm.objExists(folCorrect):
-                        pm.rename(self.fol, folCorrect)
-                    else:
-                        pm.rename(self.fol, folCorrect+"#")
+        folShapes = {}
+        if self.fol:
+            folShapes[self.fol.getParent()] = [self.fol]
+        finalNames = _renameNodes(
+            [(objs[abbr], newNames[abbr]) for abbr in abbrs], nameIndex,
+            shapes=folShapes)
+        for finalName in finalNames:
+            nameIndex.add(finalName)
+        if self.fol:
+            # Rename the follicle shape (Maya style)
+            folParent = self.fol.getParent()
+            folCorrect = folParent.nodeName()+"Shape"
+            folName = self.fol.nodeName()
+            if folName != folCorrect:
+                if nameIndex.exists(folCorrect):
+                    folCorrect = nameIndex.uniqueName(
+                        folCorrect+"#", reserve=False)
+                _indexedRename(self.fol, folCorrect, nameIndex)
             
         return objs, newNames
     
-    def disconnectFromPatch(self):
+    def _namedNodes(self):
+        """The nodes named by rename formats; {'main': self.nameObj} and
+        'j': self.jnt, if that isn't 'main'
+        """
+        # Ensure there is a node(s) to rename
+        if not self.nameObj:
+            raise StandardError(
+                "No transform objects associated with FollicleJoint!"
+                )
+        
+        # Choose which object is the main name one
+        objs = {}
+        objs['main'] = self.nameObj
+        if self.jnt and objs['main'] != self.jnt:
+            objs['j'] = self.jnt
+        return objs
+    
+    def disconnectFromPatch(self, plan=None):
+        """Disconnect the follicle from its patch (returned)
+        
+        plan: record the disconnections into this OperationPlan instead
+        """
+        self._requireFollicle('Disconnecting from the patch')
         # Find the patch
         patch = self.patch
         
@@ -906,8 +1182,17 @@ class FollicleJoint(object):
         patchConns = [
             conn for conn in allInputConns if conn[1].node() == patch
             ]
+        journal = batchPlan.activeJournal()
+        if plan is None and journal is not None:
+            journal.recordConnections(
+                [(conn[1], conn[0]) for conn in patchConns], connected=False)
         for conn in patchConns:
-            pm.disconnectAttr(conn[1], conn[0])
+            if plan is None:
+                pm.disconnectAttr(conn[1], conn[0])
+            else:
+                plan.disconnect(conn[1], conn[0])
+        if plan is None:
+            batchPlan.markEdited()
         
         return patch
     
@@ -920,24 +1205,20 @@ class FollicleJoint(object):
         """
         if (self.controlObj != self.fol and 
                 pm.attributeQuery('pu', n=self.controlObj, ex=1)):
-            if self.controlObj.ou.get() != 0 or self.controlObj.ov.get() != 0:
-                endVals = [self.fol.pu.get(), self.fol.pv.get()]
-                try:
-                    # Ensure the offsets can be reset,
-                    # before changing anything else
-                    self.controlObj.ou.set(0)
-                    self.controlObj.ov.set(0)
-                except RuntimeError as e:
-                    print "Maya Error - ", e
+            ctrl = self.controlObj
+            values = batchPlan.getValues(
+                [(ctrl, 'ou'), (ctrl, 'ov')] + self._uvPlugs)
+            if values[0] != 0 or values[1] != 0:
+                plugs = [
+                    (ctrl, 'ou'), (ctrl, 'ov'), (ctrl, 'pu'), (ctrl, 'pv')]
+                # Ensure the offsets can be reset,
+                # before changing anything else
+                if not batchPlan.freeToChange(plugs[:2]).all():
                     raise StandardError(
                         "Offsets on '%s' were not able to be frozen due to "
-                        "connections or locked attributes!" % (
-                            self.controlObj.name())
-                        )
-                else:
-                    self.controlObj.pu.set(endVals[0])
-                    self.controlObj.pv.set(endVals[1])
-                    return True
+                        "connections or locked attributes!" % ctrl.name())
+                batchPlan.setValues(plugs, [0, 0, values[2], values[3]])
+                return True
             else:
                 print "Skipped %s; offsets already zero." % str(
                     self.controlObj)
@@ -948,47 +1229,103 @@ class FollicleJoint(object):
     def copyValuesToMirror(self, baseValues=True, offsets=True, 
             axis='u', midVal=0.5, uvRange=[0.0, 1.0],
             strict=True, warnings=True, opposingOffsets=True,
-            jntRadius=False, uvDriverRatio=False, drivenOffsetRatios=False):
+            jntRadius=False, uvDriverRatio=False, drivenOffsetRatios=False,
+            pairBy='name', tolerance=0.001, seedEdge=None):
         """Copy uv values across to a mirror follicle joint setup.
         
         Can copy just base values, offset values or both.
+        pairBy: how the mirror object is found; by 'name', or by 'uv' or
+         'topology' position (see mirrorPairs, with tolerance and 
+         seedEdge). With 'topology', base values are set to the 
+         topologically mirrored UV on a mesh patch.
         """
-        if not self.isSide:
-            if strict:
-                raise StandardError("Follicle is neither left nor right!")
-            return
+        mirrorUV = None
+        if pairBy == 'name':
+            if not self.isSide:
+                if strict:
+                    raise StandardError("Follicle is neither left nor right!")
+                return
+            
+            # Find a follicleJoint with the opposite name 
+            # (left to right or vise versa)
+            mirrorObj = self.getMirrorObject(strict=strict)
+        else:
+            mirrorUVs = {}
+            pairs = _mirrorPairs(
+                [self], pairBy=pairBy, strict=strict, axis=axis, 
+                midVal=midVal, tolerance=tolerance, seedEdge=seedEdge,
+                mirrorUVs=mirrorUVs)[0]
+            mirrorObj = pairs and pairs[0][1] or False
+            if pairBy == 'topology':
+                mirrorUV = mirrorUVs.get(self.controlObj)
         
-        # Find a follicleJoint with the opposite name 
-        # (left to right or vise versa)
-        mirrorObj = self.getMirrorObject(strict=strict)
+        if not mirrorObj:
+            return mirrorObj
         
-        # Define what values to mirror, plus [2] value for ratios etc
-        axisVal = 0
-        if axis == 'v': axisVal = 1
+        toFromPlugs, missing = self._mirrorValuePlugs(
+            mirrorObj, baseValues=baseValues, offsets=offsets, 
+            midVal=midVal, uvRange=uvRange, opposingOffsets=opposingOffsets,
+            jntRadius=jntRadius, uvDriverRatio=uvDriverRatio,
+            drivenOffsetRatios=drivenOffsetRatios, mirrorUV=mirrorUV)
+        
+        # Set the values (skipping any locked or connected attributes)
+        skipped = _syncMirrorValues(toFromPlugs, axis=axis)
+        if warnings:
+            for message in missing:
+                print "%s! Skipped." % message
+            for plug in skipped:
+                print "%s locked or connected! Skipped." % (
+                    batchPlan.plugName(plug))
+        
+        return mirrorObj
+    
+    def _mirrorValuePlugs(
+            self, mirrorObj, baseValues=True, offsets=True, 
+            midVal=0.5, uvRange=[0.0, 1.0], opposingOffsets=True,
+            jntRadius=False, uvDriverRatio=False, drivenOffsetRatios=False,
+            uvDriverAttrs=None, mirrorUV=None):
+        """Return the plugs copyValuesToMirror copies, and what's missing
         
-        # Prepare the values
-        toFromAttrs = []
+        Returns ([(toPlug, fromPlug, uvIndex, midVal, (min, max))], 
+        [messages]), where a uvIndex of 0 or 1 (u or v) is mirrored 
+        about midVal if it's the mirror axis, and 2 is never mirrored.
+        uvDriverAttrs: whether this and the mirror object have offset
+         attributes, if already known.
+        mirrorUV: the mirror object's base UV, if already known (eg. 
+         from meshSymmetry), which is used as the fromPlug value instead.
+        """
+        noRange = (-np.inf, np.inf)
+        toFromPlugs = []
+        missing = []
         
         # Base uv parameters
+        ctrl = self.controlObj
         mirCtrl = mirrorObj.controlObj
-        if baseValues:
-            toFromAttrs.append(
-                (mirCtrl.pu, self.controlObj.pu, 0, midVal, uvRange))
-            toFromAttrs.append(
-                (mirCtrl.pv, self.controlObj.pv, 1, midVal, uvRange))
+        if baseValues and mirrorUV is not None:
+            for i, attrName in enumerate(['pu', 'pv']):
+                toFromPlugs.append((
+                    (mirCtrl, attrName), float(mirrorUV[i]), 2, midVal, 
+                    tuple(uvRange)))
+        elif baseValues:
+            for i, attrName in enumerate(['pu', 'pv']):
+                toFromPlugs.append((
+                    (mirCtrl, attrName), (ctrl, attrName), i, midVal, 
+                    tuple(uvRange)))
         
         # Offsets
-        if offsets and self.uvDriverAttrs and mirrorObj.uvDriverAttrs:
-            if opposingOffsets:
-                toFromAttrs.append((mirCtrl.ou, self.controlObj.ou, 2))
-                toFromAttrs.append((mirCtrl.ov, self.controlObj.ov, 2))
-            else:
-                toFromAttrs.append((mirCtrl.ou, self.controlObj.ou, 0))
-                toFromAttrs.append((mirCtrl.ov, self.controlObj.ov, 1))
+        if uvDriverAttrs is None:
+            uvDriverAttrs = self.uvDriverAttrs and mirrorObj.uvDriverAttrs
+        if offsets and uvDriverAttrs:
+            for i, attrName in enumerate(['ou', 'ov']):
+                toFromPlugs.append((
+                    (mirCtrl, attrName), (ctrl, attrName), 
+                    (2 if opposingOffsets else i), 0.0, noRange))
         
         # Optional settings
         if jntRadius and self.jnt and mirrorObj.jnt:
-            toFromAttrs.append((mirrorObj.jnt.radius, self.jnt.radius, 2))
+            toFromPlugs.append((
+                (mirrorObj.jnt, 'radius'), (self.jnt, 'radius'), 2, 0.0, 
+                noRange))
         
         if uvDriverRatio:
             # Get UV ratio nodes
@@ -997,12 +1334,12 @@ class FollicleJoint(object):
             if uvDrivNodes and mirDrivNodes:
                 for i in range(2):
                     if uvDrivNodes[i] and mirDrivNodes[i]:
-                        toFromAttrs.append((
-                            mirDrivNodes[i].i2, uvDrivNodes[i].i2, 
-                            (i if opposingOffsets else 2)
-                            ))
-                    elif warnings:
-                        print "%s ratio not found! Skipped." % ['U', 'V'][i]
+                        toFromPlugs.append((
+                            (mirDrivNodes[i], 'i2'), (uvDrivNodes[i], 'i2'), 
+                            (i if opposingOffsets else 2), 0.0, noRange))
+                    else:
+                        missing.append("%s ratio of %s not found" % (
+                            ['U', 'V'][i], self.name))
         
         if drivenOffsetRatios:
             # Get link nodes linking other follicleJoint drivers
@@ -1014,86 +1351,89 @@ class FollicleJoint(object):
                     pairNum = min(len(uvLinkNodes[i]), len(mirLinkNodes[i]))
                     for j in range(pairNum):
                         if uvLinkNodes[i][j] and mirLinkNodes[i][j]:
-                            toFromAttrs.append((
-                                mirLinkNodes[i][j],
-                                uvLinkNodes[i][j],
-                                2))
-        
-        # Set the values
-        for toFromAttr in toFromAttrs:
-            toAttr, fromAttr, uvIndex = toFromAttr[:3]
-            # Check that the attribute isn't locked or connected
-            if (toAttr.isFreeToChange() == 'freeToChange' or
-                toAttr.isFreeToChange() is True):  # Compatibility difference
-                val = fromAttr.get()
-                
-                midValTmp = 0
-                if len(toFromAttr) > 3:
-                    midValTmp = toFromAttr[3]
-                if uvIndex == axisVal:
-                    # Mirror value if it is a value on the mirrored axis
-                    val = 2*midValTmp - val
-                # Clamp value to between min and max values, if given
-                if len(toFromAttr) > 3:
-                    minVal, maxVal = toFromAttr[4]
-                    val = min(max(val, minVal), maxVal)
-                
-                toAttr.set(val)
-            elif warnings:
-                print "%s locked or connected! Skipped." % str(toAttr)
+                            toFromPlugs.append((
+                                mirLinkNodes[i][j], uvLinkNodes[i][j], 2,
+                                0.0, noRange))
         
-        return mirrorObj
+        return toFromPlugs, missing
     
     def transferToPatch(
             self, patch=None, newUV=None, closestPt=True, 
-            useSmoothedMesh=True):
+            useSmoothedMesh=True, planOnly=False, plan=None,
+            useModifier=False):
         """Transfer follicles from one patch to another
         
         Using closest point in worldspace
         Uses current follicle location, which may have offsets.
+        
+        planOnly, plan, useModifier: as for new (the plan is returned 
+        if planOnly).
         """
+        self._requireFollicle('Transferring to another patch')
         # Get patch
         patch = cq.filterSelectionForShapeType(
             patch, ['nurbsSurface', 'mesh'])[0]
         patchIsNurb = pm.objectType(patch, i='nurbsSurface')
         
         # If using the closest point, calculate the new uv values
-        if closestPt and not newUV:
-            outUVVals = getClosestUVs(patch, self.xfm, False)[0]
-            newUV = outVals[0]
+        if closestPt and newUV is None:
+            newUV = closestUVs(
+                patch, cq.getPointPositions([self.topObj]))[0]
+        
+        ownPlan = plan is None
+        if ownPlan:
+            plan = batchPlan.OperationPlan()
         
         # Disconnect the follicle from the old patch
-        self.disconnectFromPatch()
+        self.disconnectFromPatch(plan=plan)
         
         if closestPt:
             # Get the base UV parameter object
             uvObj = self.controlObj
             # Calculate UV offset from other offset drivers 
             # (assumes input is not scaled)
-            ofsU = self.fol.pu.get() - uvObj.pu.get()
-            ofsV = self.fol.pv.get() - uvObj.pv.get()
+            ofsU, ofsV = np.subtract(*batchPlan.getValues([
+                (self.fol, 'pu'), (self.fol, 'pv'),
+                (uvObj, 'pu'), (uvObj, 'pv')]).reshape(2, 2))
             # Set the UV values
-            uvObj.pu.set(newUV[0]-ofsU)
-            uvObj.pv.set(newUV[1]-ofsV)
+            plan.setValue((uvObj, 'parameterU'), newUV[0]-ofsU)
+            plan.setValue((uvObj, 'parameterV'), newUV[1]-ofsV)
         
         # Connect the follicle to the new patch
-        pm.connectAttr(patch.worldMatrix[0], self.fol.inputWorldMatrix, f=1)
+        patchConns = [('worldMatrix[0]', 'inputWorldMatrix')]
         if patchIsNurb:
-            pm.connectAttr(patch.local, self.fol.inputSurface, f=1)
+            patchConns.append(('local', 'inputSurface'))
         elif useSmoothedMesh:
-            pm.connectAttr(patch.outSmoothMesh, self.fol.inputMesh, f=1)
+            patchConns.append(('outSmoothMesh', 'inputMesh'))
         else:
-            pm.connectAttr(patch.outMesh, self.fol.inputMesh, f=1)
+            patchConns.append(('outMesh', 'inputMesh'))
+        for patchAttr, folAttr in patchConns:
+            # (Replacing any other input)
+            inputPlug = plan.inputOf((self.fol, folAttr))
+            if inputPlug is not None:
+                plan.disconnect(inputPlug, (self.fol, folAttr))
+            plan.connect((patch, patchAttr), (self.fol, folAttr))
+        plan.addCallback(functools.partial(setattr, self, '_patch', patch))
         
+        if planOnly:
+            return plan
+        if ownPlan:
+            plan.execute(useModifier=useModifier)
         return True
         
     def addOffsetDriver(
-            self, driverObj=None, ratio=0.5, attrs=True, selectDriver=True):
+            self, driverObj=None, ratio=0.5, attrs=True, selectDriver=True,
+            planOnly=False, plan=None, useModifier=False):
         """Drive the offset by another follicle's offset
         
         Connects the offset of another follicle joint to drive this 
         one's offset with adjustable follow ratio attributes.
+        
+        planOnly, plan, useModifier: as for new (the plan is returned 
+        if planOnly). With a plan, the returned offset nodes are 
+        PlannedNodes.
         """
+        self._requireFollicle('Adding offset drivers')
         if driverObj is None:
             objs = getFollicleJoints(
                 objs=None, useSelection=True, strict=True)
@@ -1103,110 +1443,130 @@ class FollicleJoint(object):
         if not driverObj:
             raise TypeError("A driver object must be supplied - "
                 "select the driver follicle first")
-            
+        
+        ownPlan = plan is None
+        if ownPlan:
+            plan = batchPlan.OperationPlan()
+        
         offsetMults = []
         nameBase = self.fol.name().rpartition('_')[0]
+        nameIndex = _getNameIndex(['%s_offsetScale*' % nameBase])
+        controlObj = self.controlObj
         driverNode = driverObj.controlObj
         print 'driverNode:', driverNode
         for uvStr in ['U', 'V']:
-            uvLow = uvStr.lower()
             ofName = '%s_offsetScale%s_#' % (nameBase, uvStr)
-            offsetRto = pm.createNode('multDoubleLinear', n=ofName, ss=1)
+            offsetRto = plan.createNode(
+                'multDoubleLinear', nameIndex.uniqueName(ofName))
             offsetMults.append(offsetRto)
             
-            pm.connectAttr('%s.o%s' % (driverNode, uvLow), offsetRto.i1)
-            #pm.connectAttr(offsetRto.o, '%s.o%s' % (self.controlObj, uvLow))
+            plan.connect((driverNode, 'offset%s' % uvStr), (offsetRto, 'i1'))
             # Insert an add node if a connection exists already
-            drivenAttr = pm.Attribute('%s.o%s' % (self.controlObj, uvLow))
-            extraAddNode = connectAttrAdd(offsetRto.o, drivenAttr)
-            ratioAttr = offsetRto.i2
+            extraAddNode = connectAttrAdd(
+                (offsetRto, 'o'), (controlObj, 'offset%s' % uvStr), 
+                plan=plan)
+            ratioAttr = (offsetRto, 'i2')
             
             if attrs:
                 # Get a unique name (allowing multiple drivers)
                 attrNameTry = 'offsetScale%s' % uvStr
-                attrShortTry = 'os%s' % uvLow
+                attrShortTry = 'os%s' % uvStr.lower()
                 num = 1
                 attrName = attrNameTry
                 attrShort = attrShortTry
-                while pm.attributeQuery(attrName, n=self.controlObj, ex=1):
+                while plan.hasAttr(controlObj, attrName):
                     attrName = attrNameTry + str(num)
                     attrShort = attrShortTry + str(num)
                     num += 1
                 
-                pm.addAttr(
-                    self.controlObj, ln=attrName, 
-                    sn=attrShort, k=1)
-                ratioAttr = pm.Attribute(
-                    '%s.%s' % (self.controlObj, attrShort))
-                pm.connectAttr(ratioAttr, offsetRto.i2)
+                plan.addAttr(controlObj, attrName, attrShort)
+                ratioAttr = (controlObj, attrShort)
+                plan.connect(ratioAttr, (offsetRto, 'i2'))
             else:
-                offsetRto.i2.set(k=1)
-            ratioAttr.set(ratio)
+                plan.setKeyable(ratioAttr)
+            plan.setValue(ratioAttr, ratio)
         
         if selectDriver:
             if attrs:
-                pm.select(self.controlObj, r=1)
+                plan.addCallback(functools.partial(
+                    _select, controlObj, r=1))
             else:
-                pm.select(offsetMults, r=1)
+                plan.addCallback(lambda: _select(
+                    [offsetRto.node for offsetRto in offsetMults], r=1))
         
-        return offsetMults, self.controlObj
+        if planOnly:
+            return plan
+        if ownPlan:
+            plan.execute(useModifier=useModifier)
+            offsetMults = [offsetRto.node for offsetRto in offsetMults]
+        return offsetMults, controlObj
     
     def duplicate(
             self, newPatch=None, name=None, freezeOffsets=False,
-            selectNew=False, **kwargs):
-        # Get patch
-        if newPatch:
-            try:
-                patch = cq.filterSelectionForShapeType(
-                    newPatch, ['nurbsSurface', 'mesh'])[0]
-                patchIsNurb = pm.objectType(patch, i='nurbsSurface')
-            except TypeError:
-                patch = None
-        else:
-            # Use the patch that the follicle is on, 
-            # if one wasn't supplied to copy to.
-            patch = self.patch
+            selectNew=False, planOnly=False, plan=None, useModifier=False,
+            values=None, **kwargs):
+        """Create a copy of this follicle joint (returned).
+        
+        planOnly, plan, useModifier: as for new (the plan is returned 
+        if planOnly). With a plan, the copy is filled in once the plan
+        is executed.
+        values: this follicle joint's values, if already read (as 
+         _duplicateValues reads them, for the same newPatch and 
+         freezeOffsets).
+        """
+        self._requireFollicle('Duplicating')
+        # Get the patch (the follicle's own, if one wasn't supplied to 
+        # copy to), the UV values and the offset values
+        if values is None:
+            values = _duplicateValues(
+                [self], newPatch=newPatch, freezeOffsets=freezeOffsets,
+                normaliseUV=kwargs.get('normaliseUV', False))[0]
         
         # Use original name if none given
         if name is None:
             name = self.name
         
-        # Get the UV values, and the offset values
-        uvObj = self.controlObj
-        if freezeOffsets:
-            uvObj = self.fol
-        uv = [uvObj.pu.get(), uvObj.pv.get()]
-        
-        attrs = self.uvDriverAttrs
-        
         # Setup for the follicle
         if not 'folType' in kwargs:
             kwargs['folType'] = self.type.typeString
         if self.type.hasJoint:
             if not 'jntRadius' in kwargs:
-                kwargs['jntRadius'] = self.jntRadius
+                kwargs['jntRadius'] = values['jntRadius']
+        
+        ownPlan = plan is None
+        if ownPlan:
+            plan = batchPlan.OperationPlan()
         
         # Create the duplicate follicle
+        attrs = values['uvDriverAttrs']
         newFol = FollicleJoint()
         newFol.new(
-            patch=patch, name=name, uv=uv, attrs=attrs,
-            uvDriverRatio=self.uvDriverRatio,
-            warnNormalised=False, **kwargs)
+            patch=values['patch'], name=name, uv=values['uv'], attrs=attrs,
+            uvDriverRatio=values['uvDriverRatio'],
+            warnNormalised=False, plan=plan,
+            patchIsNurb=values['patchIsNurb'], **kwargs)
         
-        dupControl = newFol.controlObj
+        dupControl = newFol._plannedNodes['ctrl']
         
         if attrs and dupControl and not freezeOffsets:
-            dupControl.ou.set(uvObj.ou.get())
-            dupControl.ov.set(uvObj.ov.get())
+            plan.setValue((dupControl, 'offsetU'), values['offsets'][0])
+            plan.setValue((dupControl, 'offsetV'), values['offsets'][1])
         
-        if selectNew: pm.select(newFol, r=1)
+        if selectNew:
+            plan.addCallback(functools.partial(_select, newFol, r=1))
         
+        if planOnly:
+            return plan
+        if ownPlan:
+            plan.execute(useModifier=useModifier)
         return newFol
     
     def createMirrorObject(
             self, newPatch=None, selectNew=False,
             axis='u', midVal=0.5, uvRange=[0.0, 1.0],
-            strict=True, warnings=True, opposingOffsets=True, **kwargs):
+            strict=True, warnings=True, opposingOffsets=True,
+            planOnly=False, plan=None, useModifier=False, existing=None,
+            mirrorUV=None, values=None, **kwargs):
         """Create a mirror version of this FollicleJoint.
         
         Extra kwargs, if supplied, serve as arguments to the 'new' 
@@ -1215,10 +1575,25 @@ class FollicleJoint(object):
         a side (left/right) will raise an exception.
         As also will trying to create a mirror item when one already 
         exists.
+        existing: the existing mirror object if already known (eg. from
+         mirrorPairs), or False if there's known to be none; otherwise
+         it's looked for by name.
+        mirrorUV: the mirror object's base UV, if known (eg. 
+         topologically mirrored on a mesh; see meshSymmetry), instead of
+         mirroring this one's about midVal on the axis.
+        values: this follicle joint's values, if already read (see 
+         duplicate).
+        
+        planOnly, plan, useModifier: as for new (the plan is returned 
+        if planOnly). With a plan, the mirror object is filled in once 
+        the plan is executed.
         """
+        self._requireFollicle('Mirroring')
         
         # Check for mirror obj first
-        existingMir = self.getMirrorObject(strict=False)
+        existingMir = existing
+        if existingMir is None:
+            existingMir = self.getMirrorObject(strict=False)
         if existingMir is None:
             if strict:
                 raise StandardError("Follicle is neither left nor right!")
@@ -1229,46 +1604,449 @@ class FollicleJoint(object):
             else:
                 return existingMir
         
+        ownPlan = plan is None
+        if ownPlan:
+            plan = batchPlan.OperationPlan()
+        
         # Otherwise create duplicate
+        if values is None:
+            values = _duplicateValues(
+                [self], newPatch=newPatch, 
+                freezeOffsets=kwargs.get('freezeOffsets', False),
+                normaliseUV=kwargs.get('normaliseUV', False))[0]
         mirName = self.getMirrorObject(strict=strict, justName=True)
-        mirObj = self.duplicate(name=mirName, newPatch=newPatch, **kwargs)
+        mirObj = self.duplicate(
+            name=mirName, newPatch=newPatch, plan=plan, values=values, 
+            **kwargs)
         
         # Mirror values
-        self.copyValuesToMirror(baseValues=True, offsets=True, 
-            axis=axis, midVal=midVal, uvRange=uvRange,
-            strict=strict, warnings=warnings, opposingOffsets=opposingOffsets,
-            jntRadius=True, uvDriverRatio=True, drivenOffsetRatios=True)
+        if self.isSide or mirrorUV is not None:
+            self._planMirrorValues(
+                plan, mirObj._plannedNodes, values, axis=axis, 
+                midVal=midVal, uvRange=uvRange, warnings=warnings,
+                opposingOffsets=opposingOffsets, mirrorUV=mirrorUV)
         
+        if planOnly:
+            return plan
+        if ownPlan:
+            plan.execute(useModifier=useModifier)
         return mirObj
+    
+    def _planMirrorValues(
+            self, plan, mirNodes, values, axis='u', midVal=0.5, 
+            uvRange=[0.0, 1.0], warnings=True, opposingOffsets=True, 
+            mirrorUV=None):
+        """Plan the values of a new mirror object's nodes (see newPlan)
+        
+        The same values as copyValuesToMirror would set, with all of 
+        the optional values (except drivenOffsetRatios, which a new 
+        follicle joint hasn't any of), taken from this one's values 
+        (as _duplicateValues reads them). mirrorUV replaces the 
+        mirrored base UV, if given.
+        """
+        axisVal = 0
+        if axis == 'v': axisVal = 1
+        
+        # [(planned plug, uvIndex (with index 2 not mirrored))], and 
+        # the source values
+        toPlugs = []
+        vals = []
+        mirCtrl = mirNodes['ctrl'] or mirNodes['f']
+        for i in range(2):
+            toPlugs.append(((mirCtrl, ['parameterU', 'parameterV'][i]), 2))
+            vals.append(values['baseUV'][i])
+        
+        if values['uvDriverAttrs'] and mirNodes['ctrl']:
+            for i in range(2):
+                toPlugs.append((
+                    (mirCtrl, ['offsetU', 'offsetV'][i]),
+                    (2 if opposingOffsets else i)))
+                vals.append(values['offsets'][i])
+        
+        if values['jntRadius'] is not None and mirNodes['j']:
+            toPlugs.append(((mirNodes['j'], 'radius'), 2))
+            vals.append(values['jntRadius'])
+        
+        uvDriverRatio = values['uvDriverRatio']
+        if uvDriverRatio:
+            for i in range(2):
+                if uvDriverRatio[i] is not None and mirNodes['ratio'][i]:
+                    toPlugs.append((
+                        (mirNodes['ratio'][i], 'i2'),
+                        (i if opposingOffsets else 2)))
+                    vals.append(uvDriverRatio[i])
+                elif warnings:
+                    print "%s ratio not found! Skipped." % ['U', 'V'][i]
+        
+        for i in range(2):
+            if mirrorUV is not None:
+                vals[i] = mirrorUV[i]
+            elif i == axisVal:
+                vals[i] = 2*midVal - vals[i]
+            vals[i] = min(max(vals[i], uvRange[0]), uvRange[1])
+        
+        for (plug, uvIndex), val in zip(toPlugs, vals):
+            if uvIndex == axisVal:
+                # (Mirrored about zero)
+                val = 0.0 - val
+            plan.setValue(plug, val)
 
 
-# - Generic utility functions -
+class FollicleJointArray(object):
+    """Many follicle joints, stored in columns.
 
-def getClosestUVs(patch=None, objs=None, keepCalcNode=False,
-                  notNormalised=False, defaultMeshMethod=False):
-    """Get the closest UV points to given points.
-    
-    Returns the UV values of the closest point on the (first) surface
-    to each input object/component.
+    Rather than a FollicleJoint object each, the nodes are kept in
+    parallel lists (xfms, fols, jnts; None where absent, including the
+    follicles of pinned types) and the types as NumPy code arrays,
+    indexing typeStrings and controlNodes.
+    Values are read and written for every follicle joint at once, as
+    NumPy arrays:
+    uv          (n, 2) base parameter values (on the control nodes, or
+                the follicles without control attributes)
+    offsets     (n, 2) offset values; nan without control attributes
+    radius      (n,) joint radius; nan without a joint
+    sideCodes   (n,) index into FollicleJoint._sideChars ('l'/'r'/'m')
+
+    Iterating (or indexing with an int) gives FollicleJointViews;
+    indexing with a slice, index or bool array gives a new array.
+
+    folArray = getFollicleJoints(useSelection=True, asArray=True)
+    folArray.offsets = 0.0
+    print folArray.uv[folArray.sideCodes == 0]
     """
-    returnList = []
-    
-    # Get patch, from keyword arg or from objs
-    if patch:
-        patch = cq.filterSelectionForShapeType(
-            patch, ['nurbsSurface', 'mesh'])[0]
-        patchIsNurb = pm.objectType(patch, i='nurbsSurface')
-    else:
-        patch = cq.filterSelectionForShapeType(
-            objs, ['nurbsSurface', 'mesh'])[0]
-        patchIsNurb = pm.objectType(patch, i='nurbsSurface')
-    
-    # Get objects, excluding the patch itself
-    if not objs:
-        objs = pm.ls(sl=1, fl=1)
-        if objs and patch in objs or patch.getParent() in objs:
-            objs = [obj for obj in objs
-                if str(obj) != str(patch) and
+
+    typeStrings = ('t/f', 't/f-j', 't-j/f', 'j/f', 't@p', 't@p-j', 'j@p')
+    controlNodes = ('f', 't', 'j')
+
+    # Type flags, indexed by type code
+    _hasTransform = tuple([FolJntType._flags[typ][0] for typ in typeStrings])
+    _hasJoint = tuple([FolJntType._flags[typ][1] for typ in typeStrings])
+
+    def __init__(self, folJnts=()):
+        """Build from FollicleJoints or (xfm, fol, jnt, typeString,
+        controlNode) arrangements (as found by _follicleArrangements).
+        """
+        self.xfms = []
+        self.fols = []
+        self.jnts = []
+        typeCodes = []
+        controlCodes = []
+        for item in folJnts:
+            if isinstance(item, FollicleJoint):
+                xfm, fol, jnt = item.xfm, item.fol, item.jnt
+                typeString = item.type.typeString
+                controlNode = item.type.controlNode
+            else:
+                xfm, fol, jnt, typeString, controlNode = item
+            if not controlNode:
+                controlNode = FolJntType(typeString).controlNode
+            self.xfms.append(xfm)
+            self.fols.append(fol)
+            self.jnts.append(jnt)
+            typeCodes.append(self.typeStrings.index(typeString))
+            controlCodes.append(self.controlNodes.index(controlNode))
+        self.typeCodes = np.array(typeCodes, dtype=np.int8)
+        self.controlCodes = np.array(controlCodes, dtype=np.int8)
+        self._sideCodes = None
+        self._hasAttrs = None
+
+    def __len__(self):
+        return len(self.fols)
+
+    def __repr__(self):
+        return '<%s: %s follicle joints>' % (
+            self.__class__.__name__, len(self))
+
+    def __iter__(self):
+        for i in xrange(len(self)):
+            yield FollicleJointView(self, i)
+
+    def __getitem__(self, index):
+        if isinstance(index, (int, long, np.integer)):
+            if index < 0:
+                index += len(self)
+            if not 0 <= index < len(self):
+                raise IndexError("FollicleJointArray index out of range")
+            return FollicleJointView(self, index)
+
+        indices = np.arange(len(self))[index]
+        subArray = FollicleJointArray()
+        subArray.xfms = [self.xfms[i] for i in indices]
+        subArray.fols = [self.fols[i] for i in indices]
+        subArray.jnts = [self.jnts[i] for i in indices]
+        subArray.typeCodes = self.typeCodes[indices]
+        subArray.controlCodes = self.controlCodes[indices]
+        if self._sideCodes is not None:
+            subArray._sideCodes = self._sideCodes[indices]
+        if self._hasAttrs is not None:
+            subArray._hasAttrs = self._hasAttrs[indices]
+        return subArray
+
+    def toFollicleJoints(self):
+        """Return a FollicleJoint for each follicle joint"""
+        folObjs = []
+        for i in xrange(len(self)):
+            folObj = FollicleJoint()
+            folObj._populate(
+                self.xfms[i], self.fols[i], self.jnts[i],
+                self.typeStrings[self.typeCodes[i]],
+                self.controlNodes[self.controlCodes[i]])
+            folObjs.append(folObj)
+        return folObjs
+
+    @property
+    def hasTransform(self):
+        return np.take(self._hasTransform, self.typeCodes)
+
+    @property
+    def hasJoint(self):
+        return np.take(self._hasJoint, self.typeCodes)
+
+    @property
+    def controlObjs(self):
+        """The nodes with the uv parameters"""
+        columns = (self.fols, self.xfms, self.jnts)
+        return [
+            columns[code][i] for i, code in enumerate(self.controlCodes)]
+
+    @property
+    def topObjs(self):
+        """The top of each follicle joint hierarchy (also the nameObj)"""
+        return [
+            xfm if xfm is not None else jnt
+            for xfm, jnt in zip(self.xfms, self.jnts)]
+
+    @property
+    def names(self):
+        return [node.name() for node in self.topObjs]
+
+    @property
+    def hasAttrs(self):
+        """Whether each control node has the parameter and offset 
+        attributes (see FollicleJoint.new)"""
+        if self._hasAttrs is None:
+            controlObjs = self.controlObjs
+            fols = set(self.fols)
+            withAttrs = set([
+                plug.node() for plug in _batchLs([
+                    '%s.ou' % _nodePath(node) for node in controlObjs
+                    if not node in fols])])
+            self._hasAttrs = np.array(
+                [node in withAttrs for node in controlObjs], dtype=bool)
+        return self._hasAttrs
+
+    @property
+    def _uvNodes(self):
+        """The nodes with the base parameters"""
+        return [
+            ctrl if hasAttrs else fol for ctrl, fol, hasAttrs in zip(
+                self.controlObjs, self.fols, self.hasAttrs)]
+
+    @property
+    def _uvPlugs(self):
+        """The final u and v parameter plugs of each, as [(node, attr)]
+        pairs (the follicle's, or the pin coordinate's if pinned)"""
+        topObjs = self.topObjs
+        pinPlugs = _pinnedNodes([
+            top for top, fol in zip(topObjs, self.fols) if fol is None])
+        uvPlugs = []
+        for top, fol in zip(topObjs, self.fols):
+            if fol is None:
+                uvPlugs.append(_pinCoordinatePlugs(pinPlugs[top]))
+            else:
+                uvPlugs.append([(fol, 'pu'), (fol, 'pv')])
+        return uvPlugs
+
+    @property
+    def sideCodes(self):
+        """Side of each, from the names (as FollicleJoint.side)
+
+        Setting only changes the array, not the names.
+        """
+        if self._sideCodes is None:
+            prefixes = FollicleJoint.sidePrefix
+            codes = []
+            for name in self.names:
+                for i in range(len(prefixes)):
+                    if name.startswith(prefixes[i]):
+                        codes.append(i)
+                        break
+                else:
+                    codes.append(2)  # Middle
+            self._sideCodes = np.array(codes, dtype=np.int8)
+        return self._sideCodes
+
+    @sideCodes.setter
+    def sideCodes(self, values):
+        codes = np.empty(len(self), dtype=np.int8)
+        codes[:] = values
+        self._sideCodes = codes
+
+    @property
+    def uv(self):
+        return self._getColumns(self._uvNodes, ('pu', 'pv'))
+
+    @uv.setter
+    def uv(self, values):
+        self._setColumns(self._uvNodes, ('pu', 'pv'), values)
+
+    @property
+    def offsets(self):
+        return self._getColumns(self.controlObjs, ('ou', 'ov'), self.hasAttrs)
+
+    @offsets.setter
+    def offsets(self, values):
+        self._setColumns(
+            self.controlObjs, ('ou', 'ov'), values, self.hasAttrs)
+
+    @property
+    def radius(self):
+        return self._getColumns(self.jnts, ('radius',), self.hasJoint)[:, 0]
+
+    @radius.setter
+    def radius(self, values):
+        self._setColumns(self.jnts, ('radius',), values, self.hasJoint)
+
+    def _getColumns(self, nodes, attrNames, mask=None):
+        """Read attributes of nodes into an (n, attrs) array (nan where
+        mask is False)"""
+        if mask is None:
+            mask = np.ones(len(nodes), dtype=bool)
+        values = np.full((len(nodes), len(attrNames)), np.nan)
+        indices = np.flatnonzero(mask)
+        plugs = [
+            '%s.%s' % (_nodePath(nodes[i]), attrName)
+            for i in indices for attrName in attrNames]
+        values[indices] = np.reshape(
+            batchPlan.getValues(plugs), (len(indices), len(attrNames)))
+        return values
+
+    def _setColumns(self, nodes, attrNames, values, mask=None):
+        """Write an (n, attrs) array (or a value to broadcast) to nodes,
+        skipping nan values and where mask is False
+        
+        Nothing is set if any of the attributes are locked or connected.
+        """
+        if mask is None:
+            mask = np.ones(len(nodes), dtype=bool)
+        values = np.asarray(values, dtype=float)
+        if len(attrNames) == 1 and values.ndim == 1:
+            values = values[:, np.newaxis]
+        values = np.broadcast_to(values, (len(nodes), len(attrNames)))
+        plugs = []
+        plugValues = []
+        for i in np.flatnonzero(mask):
+            for j, attrName in enumerate(attrNames):
+                if not np.isnan(values[i, j]):
+                    plugs.append('%s.%s' % (_nodePath(nodes[i]), attrName))
+                    plugValues.append(values[i, j])
+        free = batchPlan.freeToChange(plugs)
+        if not free.all():
+            raise StandardError(
+                "Attributes locked or connected: %s" % ', '.join(
+                    itertools.compress(plugs, ~free)))
+        batchPlan.setValues(plugs, plugValues)
+
+
+class FollicleJointView(object):
+    """One follicle joint of a FollicleJointArray.
+
+    A light stand in for a FollicleJoint, for reading its nodes and
+    values; toFollicleJoint() gives the full object (for its methods).
+    """
+
+    __slots__ = ('array', 'index')
+
+    def __init__(self, array, index):
+        self.array = array
+        self.index = index
+
+    def __repr__(self):
+        return '%s(%r)' % (self.__class__.__name__, self.fol)
+
+    @property
+    def xfm(self):
+        return self.array.xfms[self.index]
+
+    @property
+    def fol(self):
+        return self.array.fols[self.index]
+
+    @property
+    def jnt(self):
+        return self.array.jnts[self.index]
+
+    @property
+    def typeString(self):
+        return self.array.typeStrings[self.array.typeCodes[self.index]]
+
+    @property
+    def controlObj(self):
+        code = self.array.controlCodes[self.index]
+        return (self.fol, self.xfm, self.jnt)[code]
+
+    @property
+    def topObj(self):
+        if self.xfm is not None:
+            return self.xfm
+        return self.jnt
+
+    nameObj = topObj
+
+    @property
+    def name(self):
+        return self.topObj.name()
+
+    @property
+    def side(self):
+        return FollicleJoint._sideChars[self.array.sideCodes[self.index]]
+
+    @property
+    def uv(self):
+        return self.array[self.index:self.index+1].uv[0]
+
+    @property
+    def offsets(self):
+        return self.array[self.index:self.index+1].offsets[0]
+
+    @property
+    def jntRadius(self):
+        if self.jnt is None: return None
+        return self.jnt.radius.get()
+
+    def toFollicleJoint(self):
+        return self.array[self.index:self.index+1].toFollicleJoints()[0]
+
+
+# - Generic utility functions -
+
+def getClosestUVs(patch=None, objs=None, keepCalcNode=False,
+                  notNormalised=False, defaultMeshMethod=False, offline=False):
+    """Get the closest UV points to given points.
+    
+    Returns the UV values of the closest point on the (first) surface
+    to each input object/component.
+    offline: solve without nodes (see closestUVs); ignored with 
+     keepCalcNode
+    """
+    returnList = []
+    
+    # Get patch, from keyword arg or from objs
+    if patch:
+        patch = cq.filterSelectionForShapeType(
+            patch, ['nurbsSurface', 'mesh'])[0]
+        patchIsNurb = pm.objectType(patch, i='nurbsSurface')
+    else:
+        patch = cq.filterSelectionForShapeType(
+            objs, ['nurbsSurface', 'mesh'])[0]
+        patchIsNurb = pm.objectType(patch, i='nurbsSurface')
+    
+    # Get objects, excluding the patch itself
+    if not objs:
+        objs = _selected()
+        if objs and patch in objs or patch.getParent() in objs:
+            objs = [obj for obj in objs
+                if str(obj) != str(patch) and
                 str(obj) != str(patch.getParent())]
         
         if not objs:
@@ -1277,66 +2055,147 @@ def getClosestUVs(patch=None, objs=None, keepCalcNode=False,
     # Get point positions of objects
     posList = cq.getPointPositions(objs)
     
+    if not keepCalcNode:
+        # Query all the points with one closest point network
+        outVals = closestUVs(
+            patch, posList, notNormalised=notNormalised,
+            defaultMeshMethod=defaultMeshMethod, offline=offline)
+        return [outVals, [], patch]
+    
+    # Keep a live closest point network for each point
     outNodes = []
     outVals = []
     for point in posList:
-        # Create a 'closestPointOnSurface' node and connect it to the surface
-        name = '%s_cpt#' % str(patch.getParent())
-        inPointAttr = None
-        cptNodes = []
-        if patchIsNurb:
-            cpt = pm.createNode('closestPointOnSurface', n=name, ss=1)
-            cptNodes = [cpt]
-            pm.connectAttr(patch.worldSpace[0], cpt.inputSurface)
-            inPointAttr = cpt.inPosition
-        else:
-            cpt = pm.createNode('closestPointOnMesh', n=name, ss=1)
-            cptNodes = [cpt]
-            pm.connectAttr(patch.worldMesh[0], cpt.inMesh)
-            if defaultMeshMethod:
-                # Use the worldspace mesh location
-                pm.connectAttr(patch.worldMatrix[0], cpt.inputMatrix)
-                inPointAttr = cpt.inPosition
-            else:
-                # Transfer the input position into local space instead
-                # (avoids a UV value glitch on transformed meshes)
-                mtxName = cpt.name().replace('cpt','invWorldMtx')
-                mtx = pm.createNode('pointMatrixMult', n=mtxName, ss=1)
-                pm.connectAttr(patch.worldInverseMatrix[0], mtx.inMatrix)
-                pm.connectAttr(mtx.output, cpt.inPosition)
-                inPointAttr = mtx.inPoint
-                cptNodes.append(mtx)
-        
-        if keepCalcNode:
-            closeLoc = pm.createNode('transform', ss=1)
-            cptNodes.append(closeLoc)
-            pm.connectAttr(closeLoc.t, inPointAttr)
-            pm.xform(closeLoc, t=point)
-            
-            outNodes.append(list(cptNodes))
-            outVals.append([cpt.u.get(), cpt.v.get()])
-        else:
-            inPointAttr.set(point)
-            uv = [cpt.u.get(), cpt.v.get()]
-            
-            # Adjust UV for UV ranges if not Normalised
-            if patchIsNurb:
-               uv = normalisedNurbsUV(patch, uv, warningOnly=notNormalised)
-            
-            outVals.append(uv)
-            
-            pm.delete(cptNodes)
+        cpt, inPointAttr, cptNodes = _closestPointNetwork(
+            patch, patchIsNurb, defaultMeshMethod)
+        
+        closeLoc = _createNode('transform')
+        cptNodes.append(closeLoc)
+        pm.connectAttr(closeLoc.t, inPointAttr)
+        pm.xform(closeLoc, t=point)
+        
+        outNodes.append(list(cptNodes))
+        outVals.append([cpt.u.get(), cpt.v.get()])
     
     return [outVals, outNodes, patch]
 
 
+def closestUVs(patch, points, notNormalised=False, defaultMeshMethod=False,
+               offline=False):
+    """Get the closest UV values on a patch to many points at once.
+    
+    points: sequence of world space [x, y, z] positions (eg. from 
+     customQueries.getPointPositions)
+    offline: project all the points with NumPy instead, without creating
+     any nodes (nurbsEval's solver for nurbs patches, or a cached 
+     meshBVH for meshes, which always works in the mesh's local space)
+    Returns a list of [u, v] values, one for each point, as with
+    getClosestUVs.
+    
+    A single closest point network is created for the patch, and every
+    point is queried through it before it's deleted, instead of 
+    creating (and deleting) a network for each point.
+    """
+    if not len(points):
+        return []
+    patchIsNurb = pm.objectType(patch, i='nurbsSurface')
+    if offline:
+        return _offlineClosestUVs(patch, points, notNormalised)
+    cpt, inPointAttr, cptNodes = _closestPointNetwork(
+        patch, patchIsNurb, defaultMeshMethod)
+    
+    outVals = []
+    try:
+        for point in points:
+            inPointAttr.set(*[float(val) for val in point])
+            outVals.append([cpt.u.get(), cpt.v.get()])
+    finally:
+        _deleteNodes(cptNodes)
+    
+    # Adjust UVs for UV ranges if not Normalised
+    if patchIsNurb:
+        outVals = normalisedNurbsUVs(
+            patch, outVals, warningOnly=notNormalised)
+    return outVals
+
+
+def _offlineClosestUVs(patch, points, notNormalised=False):
+    """closestUVs using NumPy closest point queries instead of nodes."""
+    if not pm.objectType(patch, i='nurbsSurface'):
+        # Query the mesh's cached tree in local space, as the default
+        # closest point network does
+        tree = meshBVH.forPatch(patch)
+        inverseMtx = np.array(
+            [list(row) for row in patch.worldInverseMatrix[0].get()],
+            dtype=float)
+        points = np.asarray(points, dtype=float).reshape(-1, 3)
+        localPoints = np.dot(
+            np.column_stack((points, np.ones(len(points)))), inverseMtx)
+        return tree.closestUVs(localPoints[:, :3])[0].tolist()
+    
+    patchData = nurbsEval.NurbsPatch.fromPatch(patch)
+    uvs, distances, converged = patchData.closestUVs(points)
+    if not converged.all():
+        print "WARNING! %s of %s closest points on %s didn't converge" % (
+            len(converged)-converged.sum(), len(converged), patch)
+    
+    if notNormalised:
+        # Return the surface's own parameter values
+        if not patchData.isNormalised:
+            print "WARNING! surface isn't normalised!"
+        uvs = patchData.toParams(uvs)
+    return uvs.tolist()
+
+
+def _closestPointNetwork(patch, patchIsNurb, defaultMeshMethod=False):
+    """Create a closest point node (and helper) connected to the patch.
+    
+    Returns the closest point node, its world space input point
+    attribute, and the list of nodes created.
+    """
+    # Create a 'closestPointOnSurface' node and connect it to the surface
+    name = '%s_cpt#' % str(patch.getParent())
+    if patchIsNurb:
+        cpt = _createNode('closestPointOnSurface', name)
+        cptNodes = [cpt]
+        pm.connectAttr(patch.worldSpace[0], cpt.inputSurface)
+        inPointAttr = cpt.inPosition
+    else:
+        cpt = _createNode('closestPointOnMesh', name)
+        cptNodes = [cpt]
+        pm.connectAttr(patch.worldMesh[0], cpt.inMesh)
+        if defaultMeshMethod:
+            # Use the worldspace mesh location
+            pm.connectAttr(patch.worldMatrix[0], cpt.inputMatrix)
+            inPointAttr = cpt.inPosition
+        else:
+            # Transfer the input position into local space instead
+            # (avoids a UV value glitch on transformed meshes)
+            mtxName = cpt.nodeName().replace('cpt','invWorldMtx')
+            mtx = _createNode('pointMatrixMult', mtxName)
+            pm.connectAttr(patch.worldInverseMatrix[0], mtx.inMatrix)
+            pm.connectAttr(mtx.output, cpt.inPosition)
+            inPointAttr = mtx.inPoint
+            cptNodes.append(mtx)
+    return cpt, inPointAttr, cptNodes
+
+
 def normalisedNurbsUV(patch, uv, giveWarning=True, warningOnly=False):
     """Get Normalised UV values for UV points on a nurbsSurface.
     
     ('follicle' nodes treat their input UV parameters as normalised)
     """
+    return normalisedNurbsUVs(
+        patch, [uv], giveWarning=giveWarning, warningOnly=warningOnly)[0]
+
+
+def normalisedNurbsUVs(patch, uvs, giveWarning=True, warningOnly=False):
+    """normalisedNurbsUV for a list of UV points, reading the range once.
+    
+    Returns a list of [u, v] values.
+    """
     if pm.objectType(patch, i='nurbsSurface'):
-        finalUV = list(uv)
+        finalUVs = [list(uv) for uv in uvs]
         
         # Check if the surface is normalised (follicle values are normalised)
         minU = patch.minValueU.get()
@@ -1349,141 +2208,1398 @@ def normalisedNurbsUV(patch, uv, giveWarning=True, warningOnly=False):
                 uLength = maxU-minU
                 vLength = maxV-minV
                 
-                finalUV[0] = uv[0]/float(uLength)+minU
-                finalUV[1] = uv[1]/float(vLength)+minV
-                if giveWarning: 
-                    print 'Actual UV: %s %s   Normalised UV: %s %s' % (
-                        uv[0], uv[1], finalUV[0], finalUV[1])
+                for uv, finalUV in zip(uvs, finalUVs):
+                    finalUV[0] = uv[0]/float(uLength)+minU
+                    finalUV[1] = uv[1]/float(vLength)+minV
+                    if giveWarning: 
+                        print 'Actual UV: %s %s   Normalised UV: %s %s' % (
+                            uv[0], uv[1], finalUV[0], finalUV[1])
                 
-        return finalUV
+        return finalUVs
     else:
         raise StandardError("Patch must be a nurbSurface shape PyNode!")
 
 
-def splitNumberedName(name, alternateFindChar=None):
-    """Split a name into prefix, number, suffix
+def uvMirrorPairs(uvs, axis='u', midVal=0.5, tolerance=0.001):
+    """Pair up UV points which mirror each other about midVal.
+    
+    Each point's mirror image (across midVal on the axis) is matched to
+    the closest point on the other side, within tolerance; closest 
+    matches first, with each point in at most one pair. Points within
+    tolerance/2 of midVal (on the axis) mirror themselves.
+    Candidates are found by sorting the points into tolerance sized
+    cells and searching the neighbouring cells (see _uvNeighbours), so
+    it's O(n log n).
+    Returns (pairs, middles, orphans) as indices into uvs; pairs are
+    (lower, upper) along the axis.
+    """
+    uvs = np.asarray(uvs, dtype=float).reshape(-1, 2)
+    axisVal = axis == 'v' and 1 or 0
+    offsets = uvs[:, axisVal] - midVal
+    middles = np.flatnonzero(np.abs(offsets) <= tolerance/2.0)
+    lower = np.flatnonzero(offsets < -tolerance/2.0)
+    upper = np.flatnonzero(offsets > tolerance/2.0)
+    pairs = []
+    if len(lower) and len(upper):
+        mirrored = uvs[lower]
+        mirrored[:, axisVal] = 2*midVal - mirrored[:, axisVal]
+        queryIds, targetIds, dists = _uvNeighbours(
+            mirrored, uvs[upper], tolerance)
+        
+        # Closest first
+        usedQueries = set()
+        usedTargets = set()
+        for k in np.argsort(dists, kind='mergesort'):
+            i, j = queryIds[k], targetIds[k]
+            if not (i in usedQueries or j in usedTargets):
+                usedQueries.add(i)
+                usedTargets.add(j)
+                pairs.append((int(lower[i]), int(upper[j])))
+        pairs.sort()
+    paired = set([i for pair in pairs for i in pair])
+    orphans = [
+        int(i) for i in np.concatenate([lower, upper]) if not i in paired]
+    return pairs, [int(i) for i in middles], sorted(orphans)
+
+
+def mirroredUVPairs(uvs, mirroredUVs, tolerance=0.001):
+    """Pair up UV points with the points at their mirror images.
+    
+    As uvMirrorPairs, but with each point's mirror image given (eg. 
+    from meshSymmetry.mirroredUVs) instead of mirrored about a line;
+    NaN mirror images are left unmatched. Points matched to themselves
+    are middles.
+    Returns (pairs, middles, orphans) as indices into uvs.
+    """
+    uvs = np.asarray(uvs, dtype=float).reshape(-1, 2)
+    mirroredUVs = np.asarray(mirroredUVs, dtype=float).reshape(-1, 2)
+    valid = np.flatnonzero(~np.isnan(mirroredUVs).any(axis=1))
+    pairs = []
+    middles = []
+    used = set()
+    if len(valid):
+        queryIds, targetIds, dists = _uvNeighbours(
+            mirroredUVs[valid], uvs, tolerance)
+        # Closest first
+        for k in np.argsort(dists, kind='mergesort'):
+            i, j = int(valid[queryIds[k]]), int(targetIds[k])
+            if i in used or j in used:
+                continue
+            used.update([i, j])
+            if i == j:
+                middles.append(i)
+            else:
+                pairs.append(tuple(sorted([i, j])))
+    orphans = [i for i in range(len(uvs)) if not i in used]
+    return sorted(pairs), sorted(middles), orphans
+
+
+def _uvNeighbours(queries, targets, tolerance):
+    """Every (query, target) pair of UVs within tolerance of each other
+    
+    Candidates are found by sorting the points into tolerance sized
+    cells and searching the neighbouring cells, so it's O(n log n).
+    Returns (queryIds, targetIds, distances)
+    """
+    # Cell keys, sortable as one integer
+    cells = np.floor(np.concatenate([queries, targets])/tolerance)
+    cells = (cells - cells.min(axis=0) + 1).astype(np.int64)
+    stride = cells[:, 1].max() + 2
+    queryCells = cells[:len(queries)]
+    targetKeys = cells[len(queries):, 0]*stride + cells[len(queries):, 1]
+    order = np.argsort(targetKeys, kind='mergesort')
+    targetKeys = targetKeys[order]
+    
+    # Every (query, target) within the 3x3 neighbouring cells
+    queryIds = []
+    targetIds = []
+    for du in (-1, 0, 1):
+        for dv in (-1, 0, 1):
+            keys = (queryCells[:, 0] + du)*stride + queryCells[:, 1] + dv
+            starts = np.searchsorted(targetKeys, keys, side='left')
+            counts = np.searchsorted(targetKeys, keys, side='right') - starts
+            queryIds.append(np.repeat(np.arange(len(queries)), counts))
+            firsts = np.repeat(starts - np.cumsum(counts) + counts, counts)
+            targetIds.append(order[firsts + np.arange(counts.sum())])
+    queryIds = np.concatenate(queryIds)
+    targetIds = np.concatenate(targetIds)
+    dists = np.sqrt(((queries[queryIds] - targets[targetIds])**2).sum(1))
+    close = dists <= tolerance
+    return queryIds[close], targetIds[close], dists[close]
+
+
+def rowOrder(xs, ys, rowTolerance=0.01, scaleY=4):
+    """Order points along rows, from the lowest row (in y) up.
+    
+    The ys are sorted and split into rows wherever they jump by more
+    than rowTolerance, then each row is ordered by x (and equal points
+    by their order in xs), in one vectorised sort.
+    With a rowTolerance of None, points are ordered by x + scaleY*y 
+    instead.
+    Returns the indices of xs (and ys) in order.
+    """
+    xs = np.asarray(xs, dtype=float)
+    ys = np.asarray(ys, dtype=float)
+    if rowTolerance is None:
+        return np.lexsort((np.arange(len(xs)), xs + scaleY*ys))
+    yOrder = np.argsort(ys, kind='mergesort')
+    rows = np.empty(len(ys), dtype=int)
+    rows[yOrder] = np.concatenate((
+        [0], np.cumsum(np.diff(ys[yOrder]) > rowTolerance)))[:len(ys)]
+    return np.lexsort((np.arange(len(xs)), xs, rows))
+
+
+def splitNumberedName(name, alternateFindChar=None):
+    """Split a name into prefix, number, suffix
+    
+    Where number is the LAST occuring number.
+    """
+    if alternateFindChar:
+        findChars = alternateFindChar
+    else:
+        findChars = string.digits
+    # Starting from the end, collect the suffix letters,
+    # Then the number characters,
+    # Then the rest of the name.
+    splitStrs = ["", "", ""]
+    i = 2
+    digitLast = False
+    for c in reversed(name):
+        if i > 0:
+            if c in findChars:
+                if not digitLast:
+                    i -= 1
+                digitLast = True
+            else:
+                if digitLast:
+                    i -= 1
+                digitLast = False
+        splitStrs[i] = c + splitStrs[i]
+    
+    # If no number was found, return everything as the prefix
+    if not splitStrs[1]:
+        splitStrs = [name, "", ""]
+    return splitStrs
+
+
+def _nameParts(name):
+    """Split a name for renaming: returns (prefix, num, suffix, padding)
+    
+    The number goes at a '#' if there is one, else it's the last number 
+    in the name (1, unpadded, if there is none).
+    """
+    if '#' in name:
+        pre, numNull, suf = splitNumberedName(name, "#")
+        return pre, 1, suf, 1
+    pre, numStr, suf = splitNumberedName(name)
+    if numStr:
+        return pre, int(numStr), suf, len(numStr)
+    return pre, 1, suf, 0
+
+
+def joinNumberedName(
+        prefix=None, num=None, suffix=None, numPadding=0,
+        nameFormat="{pre}{num}{suf}", nameDef=None):
+    """Convenience function to format a name.
+    
+    Inserts a number with spacer zeroes, unless no number is given,
+    where it will skip inserting a number.
+    
+    eg. 
+    joinNumberedName('pizza_', 23, '_order', 3)
+    # Result: 'pizza_023_order' # 
+    
+    Or if a 'nameDef' is given, with a # in it, put the number at
+    that location.
+    
+    eg.
+    joinNumberedName(nameDef="pizza_#_order", num=23, numPadding=3)
+    """
+    # Format the number
+    numStr = ''
+    if num is not None and num != '':
+        if isinstance(num, basestring):
+            # Remove pre-existing padding, +-
+            num = int(num)
+        numStr = "{num:0>{pad}}".format(num=num, pad=numPadding)
+    
+    if nameDef:
+        # Replace the # with the number (or empty)
+        if not '#' in nameDef:
+            raise TypeError(
+                "A nameTemplate must contain a # symbol for the number!")
+        return nameDef.replace('#', numStr)
+    else:
+        # Concatenate the list, with any extra prefix etc. in format
+        if not prefix: prefix = ''
+        if not suffix: suffix = ''
+        return nameFormat.format(pre=prefix, num=numStr, suf=suffix)
+
+
+def connectAttrAdd(sourceAttr, destAttr, plan=None):
+    """Connect an attribute to add to an already connected value
+    
+    plan: record the changes into this OperationPlan instead (the add
+     node, if any, is then returned as a PlannedNode)
+    """
+    ownPlan = plan is None
+    if ownPlan:
+        plan = batchPlan.OperationPlan()
+    
+    # Check for an existing connection
+    firstCon = plan.inputOf(destAttr)
+    offsetAdd = None
+    if firstCon is not None:
+        # Insert an add node to add the two inputs
+        addName = batchPlan.plugName(destAttr).replace('.', '_')+"_add#"
+        nameIndex = _getNameIndex([addName.replace('#', '*')])
+        offsetAdd = plan.createNode(
+            'addDoubleLinear', nameIndex.uniqueName(addName))
+        plan.connect(firstCon, (offsetAdd, 'i1'))
+        plan.connect(sourceAttr, (offsetAdd, 'i2'))
+        plan.disconnect(firstCon, destAttr)
+        plan.connect((offsetAdd, 'o'), destAttr)
+    else:
+        # Normal connection
+        plan.connect(sourceAttr, destAttr)
+    
+    if ownPlan:
+        plan.execute()
+        if offsetAdd is not None:
+            return offsetAdd.node
+    return offsetAdd
+
+
+def _anyObjsExist(nameDict, nameIndex=None):
+    """Check for clashes with proposed names
+    
+    Helper function for loop;
+    Returns True if any dict Values exist as nodes in the scene.
+    If a NameIndex is given, it is checked instead of the scene.
+    """
+    for abbr in nameDict:
+        if nameIndex is not None:
+            if nameIndex.exists(nameDict[abbr]):
+                break
+        elif pm.objExists(nameDict[abbr]):
+            break
+    else:
+        # Nothing found by either name
+        return False
+    return True
+
+
+# - Scene name index -
+
+class NameIndex(object):
+    """Index of the node names in the scene, for collision-free naming.
+    
+    Built from a single 'ls' pass (optionally limited to wildcard 
+    patterns), then kept up to date by the tool as it creates and 
+    renames nodes, so that free names can be found without probing the
+    scene with objExists.
+    
+    Numbered names are handed out per stem (the text on either side of
+    the number, plus the number padding); each stem keeps a cursor 
+    below which every number is known to be taken, so asking for the 
+    next free 'patch_fol#' is O(1) rather than a scan from 1 each time.
+    
+    Usual use is through nameIndexScope(), which shares one index 
+    between all of the renames in a bulk operation:
+    with nameIndexScope():
+        for folObj in folObjs:
+            folObj.rename("ribbonFol#")
+    """
+    
+    def __init__(self, names=None):
+        self._names = set()
+        # {(head, tail): {padding: {taken number: next number to try}}}
+        self._skips = {}
+        if names:
+            self._names.update(names)
+    
+    def __len__(self):
+        return len(self._names)
+    
+    def __contains__(self, name):
+        return name in self._names
+    
+    @classmethod
+    def fromScene(cls, patterns=None):
+        """Build an index from the scene, with a single 'ls' call.
+        
+        patterns: wildcard name patterns (eg. 'patch_fol*') to limit
+         the index to; all node names are indexed if not given.
+        """
+        if patterns:
+            nodes = pm.ls(patterns)
+        else:
+            nodes = pm.ls()
+        return cls([node.nodeName() for node in nodes])
+    
+    def exists(self, name):
+        return name in self._names
+    
+    def add(self, name):
+        """Record a name as taken."""
+        self._names.add(name)
+    
+    def addNodes(self, nodes):
+        """Record the current names of (newly created) nodes."""
+        for node in nodes:
+            self._names.add(node.nodeName())
+    
+    def discard(self, name):
+        """Record a name as free again (eg. after a rename or delete)."""
+        if not name in self._names:
+            return
+        self._names.discard(name)
+        
+        # Forget the skips this name's number was counted under
+        head, numStr, tail = splitNumberedName(name)
+        skipsByPad = self._skips.get((head, tail))
+        if numStr and skipsByPad:
+            num = int(numStr)
+            for pad in skipsByPad.keys():
+                if "{0:0>{1}}".format(num, pad) == numStr:
+                    del skipsByPad[pad]
+    
+    def renamed(self, oldName, newName):
+        """Record a rename of a node from oldName to newName."""
+        if oldName == newName:
+            return
+        self.discard(oldName)
+        self._names.add(newName)
+    
+    def matching(self, regex):
+        """Return the indexed names matching a compiled regex."""
+        return [name for name in self._names if regex.match(name)]
+    
+    def nextNumber(self, prefix='', suffix='', numPadding=0,
+                   nameFormats=("{pre}{num}{suf}",), start=1):
+        """Return the first number >= start which is free in all formats.
+        
+        Each of nameFormats is formatted as in joinNumberedName, so 
+        that eg. a transform and joint can be given matching numbers.
+        """
+        stems = []
+        for nameFormat in nameFormats:
+            head, tail = nameFormat.format(
+                pre=prefix, num='\0', suf=suffix).split('\0')
+            stems.append((head, tail))
+        
+        # Move past each format's taken numbers until none move it
+        num = start
+        moved = True
+        while moved:
+            moved = False
+            for head, tail in stems:
+                nextNum = self._advance(head, tail, numPadding, num)
+                if nextNum != num:
+                    num = nextNum
+                    moved = True
+        return num
+    
+    def uniqueName(self, nameDef, reserve=True):
+        """Return the name with the '#' replaced by a free number.
+        
+        (As with Maya's own '#' naming.) Unless reserve is False, the 
+        name is recorded as taken.
+        """
+        prefix, numNull, suffix = splitNumberedName(nameDef, '#')
+        num = self.nextNumber(prefix, suffix)
+        name = joinNumberedName(prefix, num, suffix)
+        if reserve:
+            self._names.add(name)
+        return name
+    
+    def _advance(self, head, tail, pad, num):
+        """Return the stem's first free number >= num.
+        
+        The runs of taken numbers passed are remembered as skips (as 
+        long as none of their names are discarded), so that repeated
+        searches don't walk them again.
+        """
+        skips = self._skips.setdefault((head, tail), {}).setdefault(pad, {})
+        passed = []
+        while True:
+            if num in skips:
+                passed.append(num)
+                num = skips[num]
+            elif "{0}{1:0>{2}}{3}".format(head, num, pad, tail) in self._names:
+                passed.append(num)
+                num += 1
+            else:
+                break
+        for taken in passed:
+            skips[taken] = num
+        return num
+
+
+_nameIndexStack = []
+
+
+@contextlib.contextmanager
+def nameIndexScope(nameIndex=None):
+    """Share one NameIndex between all renames made within the block.
+    
+    The index is built from the whole scene (once) if not supplied.
+    Nested scopes reuse the outer index.
+    """
+    if _nameIndexStack and nameIndex is None:
+        yield _nameIndexStack[-1]
+        return
+    
+    if nameIndex is None:
+        nameIndex = NameIndex.fromScene()
+    _nameIndexStack.append(nameIndex)
+    try:
+        yield nameIndex
+    finally:
+        _nameIndexStack.pop()
+
+
+def _usesNameIndex(func):
+    """Decorator to run a bulk function inside a nameIndexScope"""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with nameIndexScope():
+            return func(*args, **kwargs)
+    return wrapper
+
+
+def _getNameIndex(patterns=None):
+    """Return the active NameIndex, or a new one limited to patterns."""
+    if _nameIndexStack:
+        return _nameIndexStack[-1]
+    return NameIndex.fromScene(patterns)
+
+
+class BatchSession(object):
+    """The state of a batchSession, and its deferred selection.
+
+    selection is None until something is selected within the session,
+    then the list of nodes to select once it ends.
+    journal is the session's (batchPlan) RollbackJournal, in fast mode.
+    """
+
+    def __init__(self, suspendRefresh=True, pauseEvaluation=False,
+                 undoChunk=True, deferSelection=True, fastMode=False):
+        self.suspendRefresh = suspendRefresh
+        self.pauseEvaluation = pauseEvaluation
+        self.undoChunk = undoChunk and not fastMode
+        self.deferSelection = deferSelection
+        self.fastMode = fastMode
+        self.selection = None
+        self.journal = None
+
+        # Scene state to restore on exit
+        self._evaluationMode = None
+        self._undoState = False
+
+    def rollback(self):
+        """Revert the changes made in fast mode (see RollbackJournal)"""
+        if self.journal is None:
+            raise StandardError(
+                "Only fast mode batch sessions can be rolled back!")
+        return self.journal.rollback()
+
+    def select(self, *objs, **kwargs):
+        """Record a pm.select call (r/add/d/cl flags) for the end."""
+        nodes = []
+        for obj in objs:
+            if isinstance(obj, (list, tuple, set)):
+                nodes.extend(obj)
+            else:
+                nodes.append(obj)
+
+        if kwargs.get('cl') or kwargs.get('clear'):
+            self.selection = []
+        elif kwargs.get('add') or kwargs.get('af'):
+            current = self.selected()
+            self.selection = current + [
+                node for node in nodes if not node in current]
+        elif kwargs.get('d') or kwargs.get('deselect'):
+            nodes = set([str(node) for node in nodes])
+            self.selection = [
+                node for node in self.selected() if not str(node) in nodes]
+        else:
+            self.selection = nodes
+
+    def selected(self, **kwargs):
+        """Return the (deferred) selection, as pm.ls(sl=1, **kwargs)"""
+        if self.selection is None:
+            return pm.ls(sl=1, **kwargs)
+        return pm.ls(self.selection, **kwargs)
+
+    def _enter(self):
+        if self.suspendRefresh:
+            pm.refresh(suspend=True)
+        if self.pauseEvaluation:
+            self._pauseEvaluation()
+        if self.undoChunk:
+            pm.undoInfo(openChunk=True)
+        if self.fastMode:
+            # Keep the existing undo queue, but stop adding to it
+            self._undoState = pm.undoInfo(q=1, state=1)
+            if self._undoState:
+                pm.undoInfo(stateWithoutFlush=False)
+            self.journal = batchPlan.RollbackJournal()
+            batchPlan._journals.append(self.journal)
+
+    def _pauseEvaluation(self):
+        # Stop the evaluation manager rebuilding its graph after every
+        # change, by evaluating in DG mode until the end
+        self._evaluationMode = pm.evaluationManager(q=1, mode=1)[0]
+        if self._evaluationMode != 'off':
+            pm.evaluationManager(mode='off')
+
+    def _nest(self, pauseEvaluation=False, fastMode=False):
+        """Take on a nested session's stricter modes, where possible.
+
+        Evaluation is paused from here on if the nested session asks
+        for it; fast mode can't start partway through a session (its
+        journal wouldn't cover the changes made before), so asking for
+        it in a session without it is an error.
+        """
+        if fastMode and not self.fastMode:
+            raise StandardError(
+                "A fast mode batchSession can't be nested in one that "
+                "isn't in fast mode!")
+        if pauseEvaluation and not self.pauseEvaluation:
+            self.pauseEvaluation = True
+            self._pauseEvaluation()
+
+    def _exit(self, failed=False):
+        try:
+            if self.fastMode:
+                batchPlan._journals.remove(self.journal)
+                if failed:
+                    self.journal.rollback()
+            if not failed and self.selection is not None:
+                if self.selection:
+                    pm.select(self.selection, r=1)
+                else:
+                    pm.select(cl=1)
+        finally:
+            if self.undoChunk:
+                pm.undoInfo(closeChunk=True)
+            if self._undoState:
+                pm.undoInfo(stateWithoutFlush=True)
+            if self._evaluationMode not in (None, 'off'):
+                pm.evaluationManager(mode=self._evaluationMode)
+            if self.suspendRefresh:
+                pm.refresh(suspend=False)
+
+
+_batchSessionStack = []
+
+
+@contextlib.contextmanager
+def batchSession(suspendRefresh=True, pauseEvaluation=False, undoChunk=True,
+                 deferSelection=True, fastMode=False):
+    """Run a block of bulk changes without redraws or selection churn.
+
+    suspendRefresh: suspend viewport refreshes until the end.
+    pauseEvaluation: evaluate in DG mode (evaluation manager 'off')
+     until the end, then switch back to the previous mode.
+    undoChunk: make the block one undo step.
+    deferSelection: selections made by the tools within the block are
+     applied as one select at the end (see BatchSession.select).
+    fastMode: turn undo off for the block, recording the tools' changes
+     in a compact journal instead; session.rollback() reverts them in
+     one go (even after the block). Deleted nodes and the outliner 
+     order (eg. from autoRename) aren't restored.
+
+    The scene state is restored if the block raises an exception
+    (without applying the deferred selection; in fast mode, the changes
+    are rolled back).
+    Nested sessions reuse the outer one, which pauses evaluation from
+    then on if a nested one asks for it (see BatchSession._nest); a
+    nested fastMode session raises an error unless the outer one is in
+    fast mode.
+
+    with folTools.batchSession(pauseEvaluation=True):
+        folTools.newFollicleGrid(uvRows=[20, 20])
+        folTools.autoRename()
+    """
+    if _batchSessionStack:
+        session = _batchSessionStack[-1]
+        session._nest(pauseEvaluation=pauseEvaluation, fastMode=fastMode)
+        yield session
+        return
+
+    session = BatchSession(
+        suspendRefresh=suspendRefresh, pauseEvaluation=pauseEvaluation,
+        undoChunk=undoChunk, deferSelection=deferSelection,
+        fastMode=fastMode)
+    session._enter()
+    # (Graph queries are cached within the session; see _cachedQuery)
+    batchPlan.markEdited()
+    _batchSessionStack.append(session)
+    try:
+        yield session
+    except BaseException:
+        _batchSessionStack.pop()
+        session._exit(failed=True)
+        raise
+    _batchSessionStack.pop()
+    session._exit()
+
+
+def _inBatchSession(func):
+    """Decorator to run a bulk function inside a batchSession"""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with batchSession():
+            return func(*args, **kwargs)
+    return wrapper
+
+
+def _select(*objs, **kwargs):
+    """pm.select, deferred to the end of any active batchSession"""
+    if _batchSessionStack and _batchSessionStack[-1].deferSelection:
+        _batchSessionStack[-1].select(*objs, **kwargs)
+    else:
+        pm.select(*objs, **kwargs)
+
+
+def _selected(**kwargs):
+    """pm.ls(sl=1), including any deferred (batchSession) selection"""
+    if _batchSessionStack:
+        return _batchSessionStack[-1].selected(**kwargs)
+    return pm.ls(sl=1, **kwargs)
+
+
+def _renameNodes(renames, nameIndex, shapes=None):
+    """Rename nodes, given (node, newName) pairs, updating the index.
+    
+    Nodes already named so are left alone, and the rest are renamed in
+    an order where each new name has been given up by any node in the 
+    batch holding it first (see _renameOrder); only one node of each 
+    cycle of swapped names is given a temporary name.
+    shapes: optional {node: [shape nodes]} of shapes which Maya may 
+     rename along with their transform, so the index can follow them.
+    Returns the final names.
+    """
+    if shapes is None:
+        shapes = {}
+    pending = []
+    for node, newName in renames:
+        currentName = node.nodeName()
+        if currentName != newName:
+            pending.append((node, currentName, newName))
+    
+    steps = _renameOrder([
+        (currentName, newName) for node, currentName, newName in pending])
+    for i, temporary in steps:
+        node, currentName, newName = pending[i]
+        if temporary:
+            newName = nameIndex.uniqueName(
+                currentName + '_temp_name_while_renaming_#', reserve=False)
+        _indexedRename(node, newName, nameIndex, shapes.get(node, []))
+    
+    return [node.nodeName() for node, newName in renames]
+
+
+def _renameFollicleShapes(shapesByParent, nameIndex):
+    """Name follicle shapes after their (renamed) parents, Maya style
+    
+    shapesByParent: {parent: [follicle shape]}
+    """
+    shapeRenames = []
+    shapeNames = set([
+        folShapes[0].nodeName() for folShapes in shapesByParent.values()])
+    for folParent, folShapes in shapesByParent.items():
+        folCorrect = folParent.nodeName()+"Shape"
+        if nameIndex.exists(folCorrect) and not folCorrect in shapeNames:
+            folCorrect = nameIndex.uniqueName(folCorrect+"#", reserve=False)
+        shapeRenames.append((folShapes[0], folCorrect))
+    _renameNodes(shapeRenames, nameIndex)
+
+
+def _renameOrder(renames):
+    """Order renames so no name is taken before it's been given up.
+    
+    renames: [(currentName, newName)], with no two alike
+    Each rename waits for the (one) rename taking the name it wants 
+    away, so they form chains, which are renamed from the free end,
+    and cycles (swaps), which are broken by moving one rename aside to
+    a temporary name first, then giving it its new name last.
+    Returns [(index into renames, temporary)], with each index listed
+    once, or twice (temporary first) for one of each cycle.
+    """
+    byCurrentName = dict([
+        (currentName, i) for i, (currentName, newName) in enumerate(renames)])
+    # {i: rename waiting for i's current name}
+    waitingFor = {}
+    freeStarts = []
+    for i, (currentName, newName) in enumerate(renames):
+        holder = byCurrentName.get(newName)
+        if holder is None:
+            freeStarts.append(i)
+        else:
+            waitingFor[holder] = i
+    
+    steps = []
+    done = set()
+    for i in freeStarts:
+        while i is not None:
+            steps.append((i, False))
+            done.add(i)
+            i = waitingFor.get(i)
+    
+    # Whatever's left is in cycles
+    for i in range(len(renames)):
+        if i in done:
+            continue
+        steps.append((i, True))
+        j = waitingFor[i]
+        while j != i:
+            steps.append((j, False))
+            done.add(j)
+            j = waitingFor[j]
+        steps.append((i, False))
+        done.add(i)
+    return steps
+
+
+def _indexedRename(node, newName, nameIndex, shapes=()):
+    """Rename a node (and any shapes Maya renames with it) in the index"""
+    shapeNames = [shape.nodeName() for shape in shapes]
+    
+    oldName = node.nodeName()
+    journal = batchPlan.activeJournal()
+    if journal is not None:
+        journal.recordRename(node, oldName)
+    pm.rename(node, newName)
+    nameIndex.renamed(oldName, node.nodeName())
+    
+    for shape, shapeName in zip(shapes, shapeNames):
+        nameIndex.renamed(shapeName, shape.nodeName())
+
+
+def _areLastChildren(nodes, parent=None):
+    """Whether nodes are the last transforms under parent (or the 
+    world), in the same order
+    """
+    if parent:
+        children = parent.getChildren(type='transform')
+    else:
+        children = pm.ls(assemblies=True)
+    return children[-len(nodes):] == list(nodes)
+
+
+def _createNode(nodeType, name=None, **kwargs):
+    """createNode wrapper, keeping any active NameIndex up to date.
+    
+    '#' in the name is resolved by the index if one is active.
+    """
+    nameIndex = None
+    if _nameIndexStack:
+        nameIndex = _nameIndexStack[-1]
+        if name and '#' in name:
+            name = nameIndex.uniqueName(name, reserve=False)
+    if name:
+        kwargs['n'] = name
+    node = pm.createNode(nodeType, ss=1, **kwargs)
+    
+    journal = batchPlan.activeJournal()
+    if journal is not None:
+        if not 'p' in kwargs and isinstance(node, pm.nt.Shape):
+            journal.recordCreated([node.getParent()])
+        else:
+            journal.recordCreated([node])
+    
+    if nameIndex is not None:
+        nameIndex.add(node.nodeName())
+        if not 'p' in kwargs and isinstance(node, pm.nt.Shape):
+            # A parent transform was created too
+            nameIndex.add(node.getParent().nodeName())
+    return node
+
+
+def _deleteNodes(nodes):
+    """Delete nodes, freeing their names in any active NameIndex"""
+    if not isinstance(nodes, list):
+        nodes = [nodes]
+    if _nameIndexStack:
+        for node in pm.ls(nodes, dag=1):
+            _nameIndexStack[-1].discard(node.nodeName())
+    pm.delete(nodes)
+    batchPlan.markEdited()
+
+
+# - Shared pin nodes (pinned FolJntTypes) -
+
+# Whether the pin node type exists (see _pinAvailable)
+_hasPinNode = None
+
+_pinElementRegex = re.compile(r'^(?:coordinate|outputMatrix)\[(\d+)\]')
+
+
+def _pinAvailable():
+    """Whether this Maya version has the uvPin node (2020+)"""
+    global _hasPinNode
+    if _hasPinNode is None:
+        try:
+            _hasPinNode = bool(pm.nodeType('uvPin', isTypeName=True))
+        except RuntimeError:
+            _hasPinNode = False
+    return _hasPinNode
+
+
+def _pinsInScene():
+    """Whether there are any pin nodes (so pinned follicle joints)"""
+    return _pinAvailable() and bool(pm.ls(type='uvPin'))
+
+
+def _pinCoordinatePlugs(pinPlug):
+    """The u and v coordinate plugs (as (node, attr)) of the pin 
+    element with the given output plug"""
+    return [
+        (pinPlug.node(), 'coordinate[%s].coordinate%s' % (
+            pinPlug.index(), uvStr)) for uvStr in 'UV']
+
+
+def _planPin(plan, patch, useSmoothedMesh=False):
+    """Return (pin node, coordinate index) for a new pinned follicle
+    joint on patch.
+    
+    A pin (uvPin) already following the patch's world space geometry
+    (into its deformedGeometry, with normalizedIsoParms on) is reused, 
+    whether in the scene or earlier in the plan; otherwise one is 
+    added to the plan. (Other pins, eg. following the local geometry,
+    are left alone.)
+    Indices are allocated after the highest one in use.
+    """
+    key = ('pin', patch)
+    if not key in plan.shared:
+        if not _pinAvailable():
+            raise StandardError(
+                "Pinned follicle joints need the uvPin node (Maya 2020+)!")
+        patchIsNurb = pm.objectType(patch, i='nurbsSurface')
+        if useSmoothedMesh and not patchIsNurb:
+            raise StandardError(
+                "Pinned follicle joints can't follow the smoothed mesh!")
+        geometryAttr = patchIsNurb and 'worldSpace[0]' or 'worldMesh[0]'
+        pins = [
+            dest.node() for src, dest in _batchListConnections(
+                ['%s.%s' % (_nodePath(patch), geometryAttr)], 
+                s=0, d=1, type='uvPin', c=1, p=1)
+            if dest.attrName(longName=True) == 'deformedGeometry']
+        normalized = batchPlan.getValues(
+            [(pin, 'normalizedIsoParms') for pin in pins])
+        pins = list(itertools.compress(pins, normalized))
+        if pins:
+            pin = pins[0]
+            index = _nextPinIndex(pin)
+        else:
+            pinName = '%s_uvPin#' % patch.getParent().nodeName()
+            nameIndex = _getNameIndex([pinName.replace('#', '*')])
+            pin = plan.createNode('uvPin', nameIndex.uniqueName(pinName))
+            plan.connect((patch, geometryAttr), (pin, 'deformedGeometry'))
+            plan.setValue((pin, 'normalizedIsoParms'), True)
+            index = 0
+        plan.shared[key] = [pin, index]
+    
+    pinIndex = plan.shared[key]
+    pinIndex[1] += 1
+    return pinIndex[0], pinIndex[1]-1
+
+
+def _nextPinIndex(pin):
+    """The index after the highest coordinate/output of pin in use"""
+    indices = [-1]
+    for pinPlug, otherPlug in _batchListConnections(pin, c=1, p=1):
+        match = _pinElementRegex.match(pinPlug.plugAttr(longName=True))
+        if match:
+            indices.append(int(match.group(1)))
+    return max(indices) + 1
+
+
+# - Bulk follicle joint discovery -
+
+def _parentPath(dagPath):
+    return dagPath.rpartition('|')[0]
+
+
+def _inputFollicles(nodes):
+    """Map input nodes to the follicle each one identifies, in bulk.
+    
+    (As FollicleJoint.getFollicleJoint does for one node: the node 
+    itself if a follicle, else a follicle shape under it, else a 
+    follicle sibling of a joint or the follicle under a transform's 
+    child joint.)
+    Returns a list parallel to nodes of follicle nodes (or None).
+    """
+    fols = set(_batchLs(nodes, type='follicle'))
+    jnts = set(_batchLs(nodes, type='joint'))
+    xfms = set(_batchLs(nodes, exactType='transform'))
+    
+    paths = {}
+    for node in nodes:
+        if node in jnts or node in xfms:
+            paths[node] = node.longName()
+    
+    # Follicle shapes directly under transforms/joints
+    folsUnder = _firstByParentPath(_batchListRelatives(
+        list(jnts | xfms), shapes=1, type='follicle', ni=1, fullPath=1))
+    
+    # Siblings of joints; shapes of transforms' child joints
+    sibParents = [
+        _parentPath(paths[jnt]) for jnt in jnts if
+        not paths[jnt] in folsUnder and _parentPath(paths[jnt])]
+    childJnts = _firstByParentPath(_batchListRelatives(
+        [xfm for xfm in xfms if not paths[xfm] in folsUnder],
+        c=1, type='joint', fullPath=1))
+    folsUnder.update(_firstByParentPath(_batchListRelatives(
+        sibParents + [jnt.longName() for jnt in childJnts.values()],
+        shapes=1, type='follicle', ni=1, fullPath=1)))
+    
+    inputFols = []
+    for node in nodes:
+        fol = None
+        if node in fols:
+            fol = node
+        elif node in paths:
+            path = paths[node]
+            fol = folsUnder.get(path)
+            if fol is None:
+                if node in jnts:
+                    fol = folsUnder.get(_parentPath(path))
+                elif path in childJnts:
+                    fol = folsUnder.get(childJnts[path].longName())
+        inputFols.append(fol)
+    return inputFols
+
+
+def _follicleArrangements(fols):
+    """Identify the follicle joint arrangement of each follicle, in bulk.
+    
+    Returns {follicle: (xfm, fol, jnt, typeString, controlNode)}, with
+    typeString None where the follicle doesn't drive its parents.
+    """
+    folPaths = dict((fol, fol.longName()) for fol in fols)
+    parPaths = sorted(set([_parentPath(path) for path in folPaths.values()]))
+    parents = dict(
+        (par.longName(), par) for par in _batchLs(parPaths))
+    jntPars = set(_batchLs(parents.values(), type='joint'))
+    xfmPars = set(_batchLs(parents.values(), exactType='transform'))
+    
+    # Parents of joints (only relevant if driven by the follicle)
+    grandPaths = [
+        _parentPath(path) for path, par in parents.items() 
+        if par in jntPars and _parentPath(path)]
+    grandParents = dict(
+        (gPar.longName(), gPar) for gPar in _batchLs(grandPaths))
+    childJnts = _firstByParentPath(_batchListRelatives(
+        list(xfmPars), c=1, type='joint', fullPath=1))
+    
+    # Transforms/joints driven by each follicle
+    driven = {}
+    conns = _batchListConnections(fols, s=0, d=1, c=1)
+    destNodes = list(set([dest for src, dest in conns]))
+    destXfms = set(_batchLs(destNodes, exactType='transform'))
+    destJnts = set(_batchLs(destNodes, exactType='joint'))
+    for src, dest in conns:
+        if dest in destXfms or dest in destJnts:
+            driven.setdefault(src.node(), set()).add(dest)
+    
+    found = {}
+    for fol in fols:
+        xfm = jnt = typeString = None
+        folDriven = driven.get(fol, set())
+        parPath = _parentPath(folPaths[fol])
+        par = parents.get(parPath)
+        if par in jntPars:
+            jnt = par
+            typeString = 'j/f'
+            jntPar = grandParents.get(_parentPath(parPath))
+            if jntPar is not None and jntPar in folDriven and (
+                    jntPar in destXfms):
+                xfm = jntPar
+                typeString = 't-j/f'
+        elif par in xfmPars:
+            xfm = par
+            typeString = 't/f'
+            if parPath in childJnts:
+                jnt = childJnts[parPath]
+                typeString = 't/f-j'
+        
+        # Check that the follicle actually drives the parent transform
+        if not (xfm in folDriven or jnt in folDriven):
+            typeString = None
+        found[fol] = [xfm, fol, jnt, typeString, None]
+    
+    _findControlNodes(found.values())
+    return dict((fol, tuple(item)) for fol, item in found.items())
+
+
+def _findControlNodes(arrangements):
+    """Fill in the control node of [xfm, fol, jnt, typeString, 
+    controlNode] arrangements, from which nodes have the parameter 
+    attributes (more accurate than just the type string.)
+    """
+    ctrlNodes = set()
+    for xfm, fol, jnt, typeString, ctrl in arrangements:
+        ctrlNodes.update([node for node in (xfm, jnt) if node is not None])
+    ctrlNodes = list(ctrlNodes)
+    ctrlPlugs = _batchLs(
+        ['%s.pu' % node.longName() for node in ctrlNodes] +
+        ['%s.pv' % node.longName() for node in ctrlNodes])
+    plugCount = {}
+    for plug in ctrlPlugs:
+        node = plug.node()
+        plugCount[node] = plugCount.get(node, 0) + 1
+    for item in arrangements:
+        xfm, fol, jnt, typeString = item[:4]
+        if plugCount.get(jnt) == 2:
+            item[4] = 'j'
+        elif plugCount.get(xfm) == 2:
+            item[4] = 't'
+
+
+def _folliclePatches(fols):
+    """Return the patch (nurbsSurface or mesh shape) of each follicle,
+    or None, found in bulk (as FollicleJoint.patch)"""
+    patches = {}
+    # (A nurbs input first, as FollicleJoint.patch)
+    for attrName, typ in [
+            ('inputMesh', 'mesh'), ('inputSurface', 'nurbsSurface')]:
+        conns = _batchListConnections(
+            ['%s.%s' % (_nodePath(fol), attrName) for fol in fols],
+            s=1, d=0, type=typ, shapes=1, c=1)
+        for dest, src in conns:
+            patches[dest.node()] = src
+    return [patches.get(fol) for fol in fols]
+
+
+def _offsetRatioNodes(fols, controlObjs):
+    """Return the [u, v] offset ratio nodes of each follicle (or None 
+    without any), found in bulk (as FollicleJoint._driverRatioNodes).
     
-    Where number is the LAST occuring number.
+    controlObjs: the control node of each, or None for those without 
+     the offset attributes.
     """
-    if alternateFindChar:
-        findChars = alternateFindChar
-    else:
-        findChars = string.digits
-    # Starting from the end, collect the suffix letters,
-    # Then the number characters,
-    # Then the rest of the name.
-    splitStrs = ["", "", ""]
-    i = 2
-    digitLast = False
-    for c in reversed(name):
-        if i > 0:
-            if c in findChars:
-                if not digitLast:
-                    i -= 1
-                digitLast = True
-            else:
-                if digitLast:
-                    i -= 1
-                digitLast = False
-        splitStrs[i] = c + splitStrs[i]
+    found = [[None, None] for fol in fols]
+    for i, uvStr in enumerate('uv'):
+        # Through the inputs (as the outputs may be connected to other
+        # things); follicle parameter <- add.i2 <- mult.i1 <- offset
+        adds = dict(
+            (dest.node(), src) for dest, src in _batchListConnections(
+                ['%s.p%s' % (_nodePath(fol), uvStr) for fol in fols],
+                s=1, d=0, type='addDoubleLinear', c=1))
+        mults = dict(
+            (dest.node(), src) for dest, src in _batchListConnections(
+                ['%s.i2' % _nodePath(add) for add in set(adds.values())],
+                s=1, d=0, type='multDoubleLinear', c=1))
+        multInputs = dict(
+            (dest.node(), src) for dest, src in _batchListConnections(
+                ['%s.i1' % _nodePath(mult) for mult in set(mults.values())],
+                s=1, d=0, c=1, p=1))
+        for j, fol in enumerate(fols):
+            mult = mults.get(adds.get(fol))
+            ctrl = controlObjs[j]
+            if mult is None or ctrl is None:
+                continue
+            if multInputs.get(mult) == ctrl.attr('o%s' % uvStr):
+                found[j][i] = mult
+    return [nodes if nodes != [None, None] else None for nodes in found]
+
+
+def _pinnedNodes(nodes):
+    """Return {node: pin output plug} for those of the transforms/
+    joints given whose offsetParentMatrix a pin drives"""
+    conns = _batchListConnections(
+        ['%s.offsetParentMatrix' % node.longName() for node in set(nodes)],
+        s=1, d=0, type='uvPin', c=1, p=1)
+    return dict((dest.node(), src) for dest, src in conns)
+
+
+def _inputPinTops(nodes):
+    """Map input nodes to the pinned follicle joint each identifies, 
+    in bulk (as _inputFollicles does for follicles.)
     
-    # If no number was found, return everything as the prefix
-    if not splitStrs[1]:
-        splitStrs = [name, "", ""]
-    return splitStrs
+    Pinned follicle joints are given by their top node: the node 
+    itself if a pin drives it, else the parent of a joint under a
+    pinned transform.
+    Returns a list parallel to nodes of top nodes (or None).
+    """
+    if not nodes or not _pinsInScene():
+        return [None]*len(nodes)
+    dagNodes = _batchLs(nodes, type='transform')
+    jnts = set(_batchLs(dagNodes, type='joint'))
+    paths = dict((node, node.longName()) for node in dagNodes)
+    parPaths = [
+        _parentPath(paths[jnt]) for jnt in jnts if _parentPath(paths[jnt])]
+    jntParents = dict(
+        (par.longName(), par) 
+        for par in _batchLs(parPaths, exactType='transform'))
+    pinned = _pinnedNodes(dagNodes + jntParents.values())
+    
+    tops = []
+    for node in nodes:
+        top = None
+        if node in pinned:
+            top = node
+        elif node in jnts:
+            par = jntParents.get(_parentPath(paths[node]))
+            if par in pinned:
+                top = par
+        tops.append(top)
+    return tops
 
 
-def joinNumberedName(
-        prefix=None, num=None, suffix=None, numPadding=0,
-        nameFormat="{pre}{num}{suf}", nameDef=None):
-    """Convenience function to format a name.
+def _pinArrangements(tops):
+    """Identify the arrangement of each pinned follicle joint, in bulk.
     
-    Inserts a number with spacer zeroes, unless no number is given,
-    where it will skip inserting a number.
+    (As _follicleArrangements, from top nodes found by _inputPinTops.)
+    Returns {top node: (xfm, None, jnt, typeString, controlNode)}
+    """
+    jnts = set(_batchLs(tops, type='joint'))
+    childJnts = _firstByParentPath(_batchListRelatives(
+        [top for top in tops if not top in jnts], c=1, type='joint',
+        fullPath=1))
     
-    eg. 
-    joinNumberedName('pizza_', 23, '_order', 3)
-    # Result: 'pizza_023_order' # 
+    found = {}
+    for top in tops:
+        if top in jnts:
+            found[top] = [None, None, top, 'j@p', None]
+        else:
+            jnt = childJnts.get(top.longName())
+            typeString = jnt is None and 't@p' or 't@p-j'
+            found[top] = [top, None, jnt, typeString, None]
     
-    Or if a 'nameDef' is given, with a # in it, put the number at
-    that location.
+    _findControlNodes(found.values())
+    return dict((top, tuple(item)) for top, item in found.items())
+
+
+def _resolveNodes(objs):
+    """Map names/PyNodes to PyNodes, with one ls call for all names.
     
-    eg.
-    joinNumberedName(nameDef="pizza_#_order", num=23, numPadding=3)
+    Returns {obj: PyNode or None}
     """
-    # Format the number
-    numStr = ''
-    if num is not None and num != '':
-        if isinstance(num, basestring):
-            # Remove pre-existing padding, +-
-            num = int(num)
-        numStr = "{num:0>{pad}}".format(num=num, pad=numPadding)
+    nodes = {}
+    names = []
+    for obj in objs:
+        if isinstance(obj, pm.PyNode):
+            nodes[obj] = obj
+        else:
+            names.append(obj)
     
-    if nameDef:
-        # Replace the # with the number (or empty)
-        if not '#' in nameDef:
-            raise TypeError(
-                "A nameTemplate must contain a # symbol for the number!")
-        return nameDef.replace('#', numStr)
-    else:
-        # Concatenate the list, with any extra prefix etc. in format
-        if not prefix: prefix = ''
-        if not suffix: suffix = ''
-        return nameFormat.format(pre=prefix, num=numStr, suf=suffix)
+    byName = {}
+    for node in _batchLs(names):
+        if not isinstance(node, pm.nt.DependNode):
+            continue
+        nodeNames = [node.name(), node.nodeName()]
+        if isinstance(node, pm.nt.DagNode):
+            nodeNames.append(node.longName())
+        for nodeName in nodeNames:
+            byName.setdefault(nodeName, node)
+    for name in names:
+        node = byName.get(name)
+        if node is None:
+            # Unusual names (eg. wildcards, attributes); look up directly
+            node = (pm.ls(name) or [None])[0]
+        nodes[name] = node
+    return nodes
 
 
-def connectAttrAdd(sourceAttr, destAttr):
-    """Connect an attribute to add to an already connected value"""
-    # Check for an existing connection
-    firstCon = destAttr.inputs(p=1)
-    if firstCon:
-        # Insert an add node to add the two inputs
-        addName = str(destAttr).replace('.', '_')+"_add#"
-        offsetAdd = pm.createNode('addDoubleLinear', n=addName, ss=1)
-        pm.connectAttr(firstCon[0], offsetAdd.i1)
-        pm.connectAttr(sourceAttr, offsetAdd.i2)
-        pm.connectAttr(offsetAdd.o, destAttr, f=1)
-        return offsetAdd
-    else:
-        # Normal connection
-        pm.connectAttr(sourceAttr, destAttr)
-        return None
+def _firstByParentPath(dagNodes):
+    """Map parent DAG paths to the first of the given nodes under them"""
+    byParent = {}
+    for node in dagNodes:
+        parPath = _parentPath(node.longName())
+        if not parPath in byParent:
+            byParent[parPath] = node
+    return byParent
 
 
-def _anyObjsExist(nameDict):
-    """Check for clashes with proposed names
+def _nodePath(node):
+    """A node's unique name (full path for DAG nodes)"""
+    if isinstance(node, pm.nt.DagNode):
+        return node.longName()
+    return str(node)
+
+
+def _batchLs(objs, **kwargs):
+    """pm.ls, which returns nothing for an empty list (not every node)"""
+    if not objs:
+        return []
+    return pm.ls(objs, **kwargs)
+
+
+def _batchListRelatives(objs, **kwargs):
+    if not objs:
+        return []
+    return pm.listRelatives(objs, **kwargs)
+
+
+def _batchListConnections(objs, **kwargs):
+    if not objs:
+        return []
+    return pm.listConnections(objs, **kwargs)
+
+
+def _arrangementError(arrangement):
+    """Return the (getFollicleJoint style) problem with an arrangement"""
+    if arrangement is None:
+        return ("Node arrangement was not recognised as a valid "
+                "follicle joint. No follicle was found!")
+    if arrangement[3] is None:
+        return ("Node arrangement was not recognised as a valid "
+                "follicle joint. Check the follicle output connections!")
+    return ''
+
+
+def findFollicleJoints(
+        objs=None, hierarchy=None, namespace=None, strict=True, verbose=True,
+        asArray=False):
+    """Return FollicleJoint objects for many nodes, found in bulk.
     
-    Helper function for loop;
-    Returns True if any dict Values exist as nodes in the scene.
+    Nodes are given as any of:
+    objs: a list of nodes (or names); any node that 
+     FollicleJoint.getFollicleJoint would accept. 
+    hierarchy: top node(s); every follicle joint below them is found.
+    namespace: every follicle joint in the namespace is found.
+    
+    Rather than querying each node separately, the transform/follicle/
+    joint nodes and FolJntType of every follicle joint are resolved 
+    together with a handful of batched ls/listRelatives/listConnections
+    calls, and the FollicleJoint objects are populated directly.
+    (Pinned types are found by their top nodes instead of follicles, 
+    if the scene has any pin nodes.)
+    FollicleJoint instances in objs are returned unchanged.
+    
+    If strict, an exception is raised for any node that isn't part of 
+    a valid follicle joint; otherwise it's skipped (with a warning if 
+    verbose.)
+    
+    asArray: return a FollicleJointArray instead (without making 
+     FollicleJoint objects).
     """
-    for abbr in nameDict:
-        if pm.objExists(nameDict[abbr]):
-            break
+    items = []
+    if objs:
+        if isinstance(objs, FollicleJointArray):
+            objs = list(objs)
+        if not isinstance(objs, list): objs = [objs]
+        nodeObjs = []
+        for obj in objs:
+            if isinstance(obj, FollicleJointView):
+                items.append(obj.toFollicleJoint())
+            elif isinstance(obj, FollicleJoint):
+                items.append(obj)
+            elif hasattr(obj, 'getFollicleJoint'):
+                # Shouldn't occur once dev stage is finished;
+                # (engine reload mid operation)
+                items.append(obj.fol)
+                nodeObjs.append(obj.fol)
+            else:
+                items.append(obj)
+                nodeObjs.append(obj)
+        nodes = _resolveNodes(nodeObjs)
+        nodeList = list(set([
+            node for node in nodes.values() if node is not None]))
+        nodeFols = dict(zip(nodeList, _inputFollicles(nodeList)))
+        unfound = [node for node in nodeList if nodeFols[node] is None]
+        pinTops = _inputPinTops(unfound)
+        nodeFols.update(zip(unfound, pinTops))
+        inputs = []
+        for item in items:
+            if isinstance(item, FollicleJoint):
+                inputs.append((item, item))
+            else:
+                inputs.append((item, nodeFols.get(nodes.get(item))))
     else:
-        # Nothing found by either name
-        return False
-    return True
+        pinTops = []
+        inputs = []
+    pinTops = set(pinTops)
+    
+    pinned = (hierarchy or namespace) and _pinsInScene()
+    if hierarchy:
+        inputs.extend([
+            (fol, fol) for fol in 
+            pm.ls(hierarchy, dag=1, type='follicle', ni=1)])
+        if pinned:
+            tops = _pinnedNodes(pm.ls(hierarchy, dag=1, type='transform'))
+            inputs.extend([(top, top) for top in tops])
+            pinTops.update(tops)
+    if namespace:
+        pattern = '%s:*' % namespace.rstrip(':')
+        inputs.extend([
+            (fol, fol) for fol in pm.ls(
+                pattern, type='follicle', ni=1, recursive=True)])
+        if pinned:
+            tops = _pinnedNodes(
+                pm.ls(pattern, type='transform', recursive=True))
+            inputs.extend([(top, top) for top in tops])
+            pinTops.update(tops)
+    
+    # Identify every follicle's arrangement at once
+    fols = list(set([
+        fol for item, fol in inputs 
+        if fol is not None and not isinstance(fol, FollicleJoint)]))
+    arrangements = _follicleArrangements(
+        [fol for fol in fols if not fol in pinTops])
+    arrangements.update(_pinArrangements(
+        [top for top in fols if top in pinTops]))
+    
+    # (FollicleJoints and arrangements)
+    outFols = []
+    foundFols = set()
+    for item, fol in inputs:
+        if isinstance(fol, FollicleJoint):
+            found = fol
+            found.verbose = verbose
+            fol = found.fol or found.topObj
+        else:
+            found = arrangements.get(fol)
+            problem = _arrangementError(found)
+            if problem:
+                if strict: raise StandardError(problem)
+                if verbose:
+                    print "Warning: %s Skipped." % problem
+                    print "Warning: no follicle joint identified for %r!" % (
+                        item)
+                continue
+        
+        if not fol in foundFols:
+            outFols.append(found)
+            foundFols.add(fol)
+    
+    if asArray:
+        return FollicleJointArray(outFols)
+    for i, found in enumerate(outFols):
+        if not isinstance(found, FollicleJoint):
+            outFols[i] = FollicleJoint()
+            outFols[i].verbose = verbose
+            outFols[i]._populate(*found)
+    return outFols
 
 
 # - Functions for multiple follicle joints etc -
 
 def getFollicleJoints(
-        objs=None, useSelection=False, strict=True, verbose=True):
+        objs=None, useSelection=False, strict=True, verbose=True,
+        asArray=False):
     """Returns a list of FollicleJoint objects from input.
     
     Uses a list of objects or the selection.
     Can take in FollicleJoint class instances without changing them.
+    (The follicle joints are identified in bulk by findFollicleJoints.)
+    asArray: return a FollicleJointArray instead.
     """
-    
-    # Ordered list, and 
-    outFols = []
-    foundFols = set()
+    if isinstance(objs, FollicleJointArray):
+        if asArray:
+            return objs
+        return objs.toFollicleJoints()
     
     # Filter input values, use selection if objects not supplied
     if objs:
         if not isinstance(objs, list): objs = [objs]
     elif useSelection:
-        objs = pm.ls(sl=1, typ=['transform', 'follicle'])
+        objs = _selected(typ=['transform', 'follicle'])
     
     # Ensure a valid object list
     if not objs:
@@ -1491,32 +3607,10 @@ def getFollicleJoints(
             "No objects found to identify follicle joints from!")
     
     # Look for object type in objs/selection/components' objects
-    for obj in objs:
-        if isinstance(obj, FollicleJoint):
-            testObj = obj
-            checkVal = True
-        elif hasattr(obj, 'getFollicleJoint'):
-            # Shouldn't occur once dev stage is finished;
-            # (engine reload mid operation)
-            testObj = FollicleJoint()
-            checkVal = testObj.getFollicleJoint(obj.fol, strict=strict)
-        else:
-            testObj = FollicleJoint()
-            checkVal = testObj.getFollicleJoint(obj, strict=strict)
-        testObj.verbose = verbose
-        
-        # If a valid follicle joint was identified, add it to the list
-        if checkVal:
-            fol = testObj.fol
-            if not fol in foundFols:
-                outFols.append(testObj)
-                foundFols.add(fol)
-            
-        elif testObj.verbose:
-            # Otherwise warn if verbose
-            print "Warning: no follicle joint identified for %r!" % obj
+    outFols = findFollicleJoints(
+        objs, strict=strict, verbose=verbose, asArray=asArray)
     
-    if not foundFols:
+    if not outFols:
         raise StandardError("No follicle setups were found!")
     
     return outFols
@@ -1530,6 +3624,96 @@ def newFollicle(patch=None, name=None, uv=[0.5, 0.5], *args, **kwargs):
     return newObj
 
 
+@_inBatchSession
+@_usesNameIndex
+def newFollicles(patch=None, name=None, uvs=[[0.5, 0.5]], clone=True,
+                 selectNew=False, **kwargs):
+    """Create a follicle joint at each of the given uv values.
+    
+    kwargs are as for FollicleJoint.new.
+    With clone, only the first follicle joint is built node by node; 
+    the rest are duplicated from it (see FollicleJoint.clones) and 
+    given their uv values and names in bulk. Otherwise (and for pinned
+    types, which share their pin node) each is created with 
+    FollicleJoint.new.
+    """
+    folType = kwargs.get('folType')
+    if folType and not isinstance(folType, FolJntType):
+        folType = FolJntType(folType)
+    if folType and folType.isPinned:
+        clone = False
+    if not clone:
+        newFols = [newFollicle(patch, name, uv, **kwargs) for uv in uvs]
+    elif uvs:
+        firstObj = newFollicle(patch, name, uvs[0], **kwargs)
+        newFols = [firstObj] + firstObj.clones(len(uvs)-1)
+        
+        # uv values go on the control object if it has offset attributes
+        paramKey = 'f'
+        if firstObj.controlObj.hasAttr('parameterU'):
+            paramKey = firstObj.type.controlNode
+        patch = firstObj.patch
+        cloneUVs = [list(uv) for uv in uvs[1:]]
+        if pm.objectType(patch, i='nurbsSurface'):
+            cloneUVs = normalisedNurbsUVs(
+                patch, cloneUVs, warningOnly=not kwargs.get('normaliseUV'),
+                giveWarning=False)
+        
+        if not name:
+            name = '%s_fol#' % str(patch.getParent())
+        nameFormats = kwargs.get('nameFormats')
+        if nameFormats is None:
+            folType = kwargs.get('folType')
+            if not isinstance(folType, FolJntType):
+                folType = FolJntType
+            nameFormats = dict(folType.renameFormats)
+        
+        # Set every clone's uv values at once
+        plugs = []
+        values = []
+        for obj, uv in zip(newFols[1:], cloneUVs):
+            obj.uv = uv
+            paramObj = {'f':obj.fol, 't':obj.xfm, 'j':obj.jnt}[paramKey]
+            plugs.extend([paramObj.parameterU, paramObj.parameterV])
+            values.extend(uv[:2])
+        batchPlan.setValues(plugs, values)
+        
+        # Plan every clone's names from the index, then rename them; 
+        # their own (Maya given) names count as free
+        nameIndex = _getNameIndex()
+        pre, num, suf, numBuffer = _nameParts(name)
+        renames = []
+        shapesByParent = {}
+        for obj in newFols[1:]:
+            objs = obj._namedNodes()
+            for node in objs.values():
+                nameIndex.discard(node.nodeName())
+            shapesByParent[obj.fol.getParent()] = [obj.fol]
+        for obj in newFols[1:]:
+            objs = obj._namedNodes()
+            abbrs = sorted(objs)
+            cloneNum = nameIndex.nextNumber(
+                pre, suf, numBuffer, 
+                [nameFormats[abbr] for abbr in abbrs], start=num)
+            for abbr in abbrs:
+                newName = joinNumberedName(
+                    pre, cloneNum, suf, numBuffer, 
+                    nameFormat=nameFormats[abbr])
+                nameIndex.add(newName)
+                renames.append((objs[abbr], newName))
+        _renameNodes(renames, nameIndex, shapes=shapesByParent)
+        _renameFollicleShapes(shapesByParent, nameIndex)
+    else:
+        newFols = []
+    
+    if selectNew:
+        _select([obj.controlObj for obj in newFols])
+    
+    return newFols
+
+
+@_inBatchSession
+@_usesNameIndex
 def newFollicleGrid(
         patch=None, name=None, selectNew=True,
         uvRows=[5, 1], edgeBounded=[1, 0], uvRange=[None, None, None, None],
@@ -1543,7 +3727,21 @@ def newFollicleGrid(
     uvRange defaults to the full range of the surface patch or mesh, 
     ie. [0.0, 1.0, 0.0, 1.0] (because follicles UV parameters are
     always normalised values)
+    
+    clone (keyword only): duplicate the follicle joints from the first 
+     one instead of building each one (see newFollicles); 
+     FollicleJoint.new args must then be given as keyword args.
+    
+    planOnly (keyword only): return the (batchPlan) OperationPlan for 
+     the grid, rather than applying it (the follicle joints are created
+     as one plan otherwise, too).
+    useModifier (keyword only): apply the plan with an API modifier 
+     (see batchPlan.execute).
     """
+    clone = kwargs.pop('clone', False)
+    planOnly = kwargs.pop('planOnly', False)
+    useModifier = kwargs.pop('useModifier', False)
+    
     # Check values
     for i in range(2):
         if uvRows[i]-edgeBounded[i] == 0:
@@ -1574,35 +3772,73 @@ def newFollicleGrid(
             if uvRange[i] is None:
                 uvRange[i] = uvRangeDefault[i]
     
-    # Create the follicles by row/column
-    newFols = []
-    uv = [0.0, 0.0]
+    # Get the uv values by row/column
+    uvs = []
     for i in range(uvRows[0]):
         normU = (float(i)+(1-edgeBounded[0])/2.0)/(uvRows[0]-edgeBounded[0])
-        uv[0] = uvRange[0] + normU*(uvRange[1]-uvRange[0])
+        u = uvRange[0] + normU*(uvRange[1]-uvRange[0])
         for j in range(uvRows[1]):
             normV = (
                 (float(j)+(1-edgeBounded[1])/2.0)/(uvRows[1]-edgeBounded[1])
                 )
-            uv[1] = uvRange[2] + normV*(uvRange[3]-uvRange[2])
-            
+            uvs.append([u, uvRange[2] + normV*(uvRange[3]-uvRange[2])])
+    
+    # Create the follicles
+    if clone:
+        if args:
+            raise StandardError(
+                "Clone mode only takes keyword arguments for new follicles!")
+        if planOnly:
+            raise StandardError("Cloned follicles can't be planned!")
+        newFols = newFollicles(
+            patch=patch, name=name, uvs=uvs, clone=True,
+            warnNormalised=False, normaliseUV=False, **kwargs)
+    else:
+        plan = batchPlan.OperationPlan()
+        newFols = []
+        for uv in uvs:
             newObj = FollicleJoint()
             newObj.new(
                 patch=patch, name=name, uv=uv, 
-                warnNormalised=False, normaliseUV=False, *args, **kwargs)
+                warnNormalised=False, normaliseUV=False, plan=plan,
+                *args, **kwargs)
             newFols.append(newObj)
+        if planOnly:
+            return plan
+        plan.execute(useModifier=useModifier)
     
     if selectNew:
-        pm.select([obj.controlObj for obj in newFols])
+        _select([obj.controlObj for obj in newFols])
     
     return newFols
 
 
+@_inBatchSession
+@_usesNameIndex
 def newFollicleAtClosestPt(
         patch=None, objs=None, name=None, keepCalcNodes=False,
         *args, **kwargs):
+    """Create a follicle joint at the closest point on patch to each 
+    of objs.
+    
+    offline (keyword only): find the closest points with the NumPy 
+     solvers (see getClosestUVs) rather than Maya nodes.
+    clone (keyword only): duplicate the follicle joints from the first
+     one (see newFollicles), unless keepCalcNodes.
+    Other args and kwargs are as for FollicleJoint.new.
+    """
+    offline = kwargs.pop('offline', False)
+    clone = kwargs.pop('clone', False)
+    
     # Get closest UV values from objects' positions
-    outVals, outNodes, patch = getClosestUVs(patch, objs, keepCalcNodes)
+    outVals, outNodes, patch = getClosestUVs(
+        patch, objs, keepCalcNodes, offline=offline)
+    
+    if clone and not keepCalcNodes:
+        if args:
+            raise StandardError(
+                "Clone mode only takes keyword arguments for new follicles!")
+        return newFollicles(patch, name, outVals, clone=True, **kwargs), []
     
     allFols = []
     extraNodes = []
@@ -1619,6 +3855,7 @@ def newFollicleAtClosestPt(
             cpt = outNodes[i][0]
             pm.connectAttr(cpt.u, uvObj.pu)
             pm.connectAttr(cpt.v, uvObj.pv)
+            batchPlan.markEdited()
             
             extraNodes.append(cpt)
         
@@ -1627,82 +3864,547 @@ def newFollicleAtClosestPt(
     return allFols, extraNodes
 
 
+def _namedMirrorPairs(folObjs, strict=True):
+    """Pair follicle joints with their mirror objects, found by name.
+    
+    The mirror object names (see FollicleJoint.getMirrorObject) are 
+    looked up, and the follicle joints found, for all of folObjs at 
+    once. Each pair is listed once, from whichever of the two comes
+    first in folObjs.
+    Returns (pairs, middles, orphans); [(folObj, mirrorObj)], the 
+    follicle joints which are neither left nor right, and 
+    [(folObj, missing mirror name)].
+    If strict, an exception is raised for any middles or orphans.
+    """
+    sideObjs = []
+    middles = []
+    for folObj in folObjs:
+        if folObj.isSide:
+            sideObjs.append(folObj)
+        else:
+            middles.append(folObj)
+    if strict and middles:
+        raise StandardError(
+            "Follicles are neither left nor right! (%s)" % ', '.join(
+                [str(folObj.name) for folObj in middles]))
+    
+    # Find the mirror objects (reusing any in folObjs)
+    mirrorNames = [
+        folObj.getMirrorObject(justName=True) for folObj in sideObjs]
+    byName = dict([(folObj.name, folObj) for folObj in folObjs])
+    toFind = list(set([
+        name for name in mirrorNames if not name in byName]))
+    mirrorNodes = _batchLs(toFind)
+    if mirrorNodes:
+        for mirrorObj in findFollicleJoints(
+                mirrorNodes, strict=False, verbose=False):
+            mirrorObj.sidePrefix = folObjs[0].sidePrefix
+            byName.setdefault(mirrorObj.name, mirrorObj)
+    
+    pairs = []
+    orphans = []
+    paired = set()
+    for folObj, mirrorName in zip(sideObjs, mirrorNames):
+        mirrorObj = byName.get(mirrorName)
+        if mirrorObj is None:
+            orphans.append((folObj, mirrorName))
+        elif not folObj.controlObj in paired:
+            pairs.append((folObj, mirrorObj))
+            paired.update([folObj.controlObj, mirrorObj.controlObj])
+    if strict and orphans:
+        raise StandardError(
+            "No Mirror objects found by the names %s!" % ', '.join(
+                [mirrorName for folObj, mirrorName in orphans]))
+    return pairs, middles, orphans
+
+
+def _uvMirrorPairs(folObjs, axis='u', midVal=0.5, tolerance=0.001, 
+                   strict=True, pairBy='uv', seedEdge=None, mirrorUVs=None):
+    """Pair follicle joints with their mirror objects, by position.
+    
+    The base UVs (without offsets) of folObjs and of every other 
+    follicle joint on the same patches are read at once, and paired 
+    patch by patch, whatever they're named: with uvMirrorPairs, or 
+    with a pairBy of 'topology' by their topological mirror images on
+    mesh patches (meshSymmetry.mirroredUVs, with seedEdge; nurbs 
+    patches are still paired by uv).
+    mirrorUVs: a dict to fill in with the mirrored UV of each of 
+     folObjs (by control object), where found.
+    Returns (pairs, middles, orphans) as _namedMirrorPairs does, but
+    with the UV a missing mirror object would be at in place of its 
+    name (or None, without a patch or mirror image).
+    """
+    # Every follicle joint on the patches, listing folObjs first
+    # (pinned ones by the top node their pin drives)
+    patches = [folObj.patch for folObj in folObjs]
+    patchList = list(set([patch for patch in patches if patch]))
+    listed = set([folObj.fol or folObj.topObj for folObj in folObjs])
+    extraNodes = _batchListConnections(
+        patchList, s=0, d=1, type='follicle', shapes=1)
+    if patchList and _pinsInScene():
+        extraNodes += _batchListConnections(
+            _batchListConnections(patchList, s=0, d=1, type='uvPin'), 
+            s=0, d=1, type='transform')
+    extraNodes = [node for node in set(extraNodes) if not node in listed]
+    extraObjs = []
+    if extraNodes:
+        extraObjs = findFollicleJoints(extraNodes, strict=False, verbose=False)
+    allObjs = list(folObjs) + extraObjs
+    allPatches = patches + [folObj.patch for folObj in extraObjs]
+    uvs = FollicleJointArray(allObjs).uv
+    
+    byPatch = {}
+    for i, patch in enumerate(allPatches):
+        byPatch.setdefault(patch, []).append(i)
+    axisVal = axis == 'v' and 1 or 0
+    pairs = []
+    middles = []
+    orphans = []
+    for patch, indices in byPatch.items():
+        if not patch:
+            orphans.extend([
+                (i, None) for i in indices if i < len(folObjs)])
+            continue
+        if pairBy == 'topology' and pm.objectType(patch, i='mesh'):
+            patchMirrorUVs = meshSymmetry.mirroredUVs(
+                patch, uvs[indices], seedEdge=seedEdge)
+            patchPairs, patchMiddles, patchOrphans = mirroredUVPairs(
+                uvs[indices], patchMirrorUVs, tolerance=tolerance)
+        else:
+            patchMirrorUVs = uvs[indices]
+            patchMirrorUVs[:, axisVal] = 2*midVal - patchMirrorUVs[:, axisVal]
+            patchPairs, patchMiddles, patchOrphans = uvMirrorPairs(
+                uvs[indices], axis=axis, midVal=midVal, tolerance=tolerance)
+        for a, b in patchPairs:
+            # (From whichever is listed first)
+            a, b = sorted([indices[a], indices[b]])
+            if a < len(folObjs):
+                pairs.append((a, b))
+        middles.extend([
+            indices[i] for i in patchMiddles if indices[i] < len(folObjs)])
+        patchOrphans = set(patchOrphans)
+        for i, mirrorUV in enumerate(patchMirrorUVs.tolist()):
+            if np.isnan(mirrorUV).any():
+                mirrorUV = None
+            elif mirrorUVs is not None and indices[i] < len(folObjs):
+                mirrorUVs[allObjs[indices[i]].controlObj] = mirrorUV
+            if i in patchOrphans and indices[i] < len(folObjs):
+                orphans.append((indices[i], mirrorUV))
+    
+    pairs = [(allObjs[a], allObjs[b]) for a, b in sorted(pairs)]
+    middles = [allObjs[i] for i in sorted(middles)]
+    orphans = [(allObjs[i], uv) for i, uv in sorted(orphans)]
+    if strict and middles:
+        raise StandardError(
+            "Follicles are in the middle! (%s)" % ', '.join(
+                [str(folObj.name) for folObj in middles]))
+    if strict and orphans:
+        raise StandardError(
+            "No Mirror objects found for %s!" % ', '.join(
+                [str(folObj.name) for folObj, uv in orphans]))
+    return pairs, middles, orphans
+
+
+def _mirrorPairs(folObjs, pairBy='name', strict=True, mirrorUVs=None, 
+                 **kwargs):
+    """_namedMirrorPairs or _uvMirrorPairs (with kwargs), by pairBy"""
+    if pairBy == 'name':
+        return _namedMirrorPairs(folObjs, strict=strict)
+    elif pairBy in ('uv', 'topology'):
+        return _uvMirrorPairs(
+            folObjs, strict=strict, pairBy=pairBy, mirrorUVs=mirrorUVs,
+            **kwargs)
+    raise StandardError(
+        "Invalid pairBy value '%s'! Valid values are 'name', 'uv' or "
+        "'topology'" % pairBy)
+
+
+def mirrorPairs(
+        objs=None, useSelection=True, pairBy='name', axis='u', midVal=0.5,
+        tolerance=0.001, sidePrefix=None, strict=False, seedEdge=None):
+    """Find the mirror object of each follicle joint.
+    
+    pairBy: 'name' pairs left and right names (see 
+     FollicleJoint.getMirrorObject, and sidePrefix); 'uv' pairs 
+     follicle joints on the same patch at mirrored positions (about 
+     midVal on the axis, within tolerance; see uvMirrorPairs), however
+     they're named; 'topology' pairs follicle joints on meshes at 
+     topologically mirrored positions instead (for UV layouts which 
+     aren't symmetric; see meshSymmetry.mirroredUVs and seedEdge).
+    Returns (pairs, middles, orphans); [(folObj, mirrorObj)] (each pair
+    once, from whichever is listed first), the follicle joints in the 
+    middle, and [(folObj, missing mirror name or UV)].
+    If strict, an exception is raised for any middles or orphans.
+    """
+    folObjs = getFollicleJoints(objs, useSelection=useSelection, strict=False)
+    if sidePrefix:
+        for obj in folObjs:
+            obj.sidePrefix = sidePrefix
+    return _mirrorPairs(
+        folObjs, pairBy=pairBy, strict=strict, axis=axis, midVal=midVal,
+        tolerance=tolerance, seedEdge=seedEdge)
+
+
+def _syncMirrorValues(toFromPlugs, axis='u'):
+    """Copy values across to mirror plugs in bulk.
+    
+    toFromPlugs: [(toPlug, fromPlug, uvIndex, midVal, (min, max))], as
+     from FollicleJoint._mirrorValuePlugs; values with the uvIndex of 
+     the axis (0 for 'u', 1 for 'v') are mirrored about midVal, then 
+     all are clamped to (min, max). A fromPlug may be a value instead.
+    Locked or connected toPlugs are skipped, and returned.
+    """
+    if not toFromPlugs:
+        return []
+    toPlugs, fromPlugs, uvIndices, midVals, ranges = zip(*toFromPlugs)
+    free = batchPlan.freeToChange(toPlugs)
+    
+    fromPlugs = list(itertools.compress(fromPlugs, free))
+    isValue = np.array([
+        isinstance(plug, float) for plug in fromPlugs], dtype=bool)
+    vals = np.zeros(len(fromPlugs))
+    vals[isValue] = list(itertools.compress(fromPlugs, isValue))
+    vals[~isValue] = batchPlan.getValues(
+        list(itertools.compress(fromPlugs, ~isValue)))
+    mirrored = np.array(uvIndices)[free] == (axis == 'v' and 1 or 0)
+    midVals = np.array(midVals, dtype=float)[free]
+    vals[mirrored] = 2*midVals[mirrored] - vals[mirrored]
+    ranges = np.array(ranges, dtype=float)[free]
+    vals = np.clip(vals, ranges[:, 0], ranges[:, 1])
+    
+    batchPlan.setValues(list(itertools.compress(toPlugs, free)), vals)
+    return list(itertools.compress(toPlugs, ~free))
+
+
+@_inBatchSession
 def mirrorFollicleOffsets(
         baseValues=False, offsets=True, objs=None, axis='u', sidePrefix=None,
-        useSelection=True, strict=True, **kwargs):
+        useSelection=True, strict=True, warnings=True, report=None, 
+        pairBy='name', tolerance=0.001, seedEdge=None, **kwargs):
+    """Copy values (by default offsets) to mirror follicle joints.
+    
+    As FollicleJoint.copyValuesToMirror (taking the same midVal, 
+    uvRange, opposingOffsets etc. kwargs) for every follicle joint at 
+    once: the left/right pairs are found in one go (by name, or by 
+    position; see mirrorPairs for pairBy, tolerance, seedEdge and 
+    strict), then every value is read, mirrored and set in bulk. 
+    With a pairBy of 'topology', base values are set to the 
+    topologically mirrored UVs on mesh patches.
+    Each pair is only copied once (from the one listed first).
+    Anything skipped (follicle joints without a mirror object, locked
+    or connected attributes) is printed as one summary (if warnings), 
+    and put in the report dict if given, along with the pairs.
+    Returns the follicle joints (of objs) which were paired.
+    """
     folObjs = getFollicleJoints(
         objs, useSelection=useSelection, strict=strict)
-    mirrorObjs = []
-    for obj in folObjs:
-        if sidePrefix:
-            # Use the given left right prefixes
+    if sidePrefix:
+        # Use the given left right prefixes
+        for obj in folObjs:
             obj.sidePrefix = sidePrefix
-        
-        # Mirror offsets of the objects to matching objects
-        mirrorObj = obj.copyValuesToMirror(
-            baseValues=baseValues, offsets=offsets, axis=axis, strict=strict,
+    
+    # (Topologically mirrored base UVs; otherwise mirrored about midVal)
+    mirrorUVs = {}
+    pairs, middles, orphans = _mirrorPairs(
+        folObjs, pairBy=pairBy, strict=strict, axis=axis, 
+        midVal=kwargs.get('midVal', 0.5), tolerance=tolerance, 
+        seedEdge=seedEdge, 
+        mirrorUVs=(mirrorUVs if pairBy == 'topology' else None))
+    
+    # Whether both of each pair have the offset attributes
+    uvDriverAttrs = np.logical_and(
+        FollicleJointArray([pair[0] for pair in pairs]).hasAttrs, 
+        FollicleJointArray([pair[1] for pair in pairs]).hasAttrs)
+    
+    toFromPlugs = []
+    missing = []
+    for (folObj, mirrorObj), attrs in zip(pairs, uvDriverAttrs):
+        pairPlugs, pairMissing = folObj._mirrorValuePlugs(
+            mirrorObj, baseValues=baseValues, offsets=offsets, 
+            uvDriverAttrs=attrs, mirrorUV=mirrorUVs.get(folObj.controlObj), 
             **kwargs)
-        if mirrorObj:
-            mirrorObjs.append(obj)
-    return mirrorObjs
+        toFromPlugs.extend(pairPlugs)
+        missing.extend(pairMissing)
+    locked = [
+        batchPlan.plugName(plug) for plug in 
+        _syncMirrorValues(toFromPlugs, axis=axis)]
+    
+    if report is not None:
+        report.update({
+            'pairs':pairs, 'middles':middles, 'orphans':orphans, 
+            'missing':missing, 'locked':locked})
+    if warnings:
+        print "Mirrored values of %s pairs of follicle joints." % len(pairs)
+        if middles:
+            print "Skipped %s middle follicle joints: %s" % (
+                len(middles), ', '.join([str(obj.name) for obj in middles]))
+        if orphans:
+            print "Skipped %s follicle joints without mirrors: %s" % (
+                len(orphans), ', '.join([
+                    '%s (no %s)' % (obj.name, mirror)
+                    for obj, mirror in orphans]))
+        for message in missing:
+            print "%s! Skipped." % message
+        if locked:
+            print "Skipped %s locked or connected attributes: %s" % (
+                len(locked), ', '.join(locked))
+    paired = set([obj.controlObj for pair in pairs for obj in pair])
+    return [obj for obj in folObjs if obj.controlObj in paired]
 
 
+@_inBatchSession
 def freezeOffsets(objs=None, useSelection=True):
+    """Freeze the offsets of many follicle joints (as FollicleJoint.freeze)
+    
+    The values are read and set in bulk; nothing is changed if any of
+    the offsets are locked or connected. Returns the frozen objects.
+    """
     folObjs = getFollicleJoints(objs, useSelection=useSelection, strict=False)
-    frozenObjs = []
-    for obj in folObjs:
-        # Freeze offsets of the object
-        if obj.freeze():
-            frozenObjs.append(obj)
-    return frozenObjs
+    folArray = FollicleJointArray(folObjs)
+    ctrlObjs = folArray.controlObjs
+    offsets = folArray.offsets
+    
+    toFreeze = []
+    for i, hasAttrs in enumerate(folArray.hasAttrs):
+        if not hasAttrs:
+            print "Skipped %s; no offset attribute found." % str(ctrlObjs[i])
+        elif not offsets[i].any():
+            print "Skipped %s; offsets already zero." % str(ctrlObjs[i])
+        else:
+            toFreeze.append(i)
+    if not toFreeze:
+        return []
+    
+    # Ensure the offsets can be reset, before changing anything
+    offsetPlugs = [
+        (ctrlObjs[i], attrName) for i in toFreeze for attrName in ('ou', 'ov')]
+    free = batchPlan.freeToChange(offsetPlugs).reshape(-1, 2).all(axis=1)
+    if not free.all():
+        raise StandardError(
+            "Offsets on '%s' were not able to be frozen due to "
+            "connections or locked attributes!" % "', '".join([
+                ctrlObjs[i].name() for i in itertools.compress(
+                    toFreeze, ~free)]))
+    
+    uvPlugs = folArray._uvPlugs
+    folUVs = batchPlan.getValues([
+        plug for i in toFreeze for plug in uvPlugs[i]])
+    batchPlan.setValues(
+        offsetPlugs + [
+            (ctrlObjs[i], attrName)
+            for i in toFreeze for attrName in ('pu', 'pv')],
+        np.concatenate([np.zeros(len(offsetPlugs)), folUVs]))
+    return [folObjs[i] for i in toFreeze]
+
+
+def _duplicateValues(folObjs, newPatch=None, freezeOffsets=False, 
+                     normaliseUV=False):
+    """Read what duplicating (or mirroring) each of folObjs takes, in 
+    bulk: every value with one batchPlan.getValues call, and the UVs 
+    normalised once per patch.
+    
+    newPatch: the patch the copies go on, instead of their own.
+    freezeOffsets, normaliseUV: as for FollicleJoint.duplicate.
+    Returns a dict for each: {'patch', 'patchIsNurb', 'uv' (the copy's 
+    base UV), 'baseUV', 'offsets' (None without offset attributes), 
+    'uvDriverAttrs', 'jntRadius' (None without a joint), 
+    'uvDriverRatio' (as FollicleJoint.uvDriverRatio)}
+    """
+    folArray = FollicleJointArray(folObjs)
+    fols = folArray.fols
+    
+    # Get patches (an invalid newPatch is left to FollicleJoint.new)
+    if newPatch:
+        try:
+            newPatch = cq.filterSelectionForShapeType(
+                newPatch, ['nurbsSurface', 'mesh'])[0]
+        except TypeError:
+            newPatch = None
+        patches = [newPatch]*len(fols)
+    else:
+        # Use the patch that each follicle (or pin) is on
+        folPatches = iter(_folliclePatches([fol for fol in fols if fol]))
+        patches = [
+            next(folPatches) if fol else obj.patch or None 
+            for obj, fol in zip(folObjs, fols)]
+    patchList = list(set([patch for patch in patches if patch]))
+    nurbs = set(_batchLs(patchList, type='nurbsSurface'))
+    
+    # Every value at once (pinned types' ratio nodes found one by one)
+    hasAttrs = folArray.hasAttrs
+    controlObjs = folArray.controlObjs
+    uvPlugs = folArray._uvPlugs
+    folRatioNodes = iter(_offsetRatioNodes([fol for fol in fols if fol], [
+        ctrl if attrs else None 
+        for ctrl, fol, attrs in zip(controlObjs, fols, hasAttrs) if fol]))
+    ratioNodes = [
+        next(folRatioNodes) if fol else (
+            obj._driverRatioNodes if attrs else None)
+        for obj, fol, attrs in zip(folObjs, fols, hasAttrs)]
+    plugs = []
+    for i, fol in enumerate(fols):
+        # Base UV (on the control, or the final UV without offsets)
+        if hasAttrs[i]:
+            plugs.extend([(controlObjs[i], 'pu'), (controlObjs[i], 'pv')])
+        else:
+            plugs.extend(uvPlugs[i])
+        plugs.extend(uvPlugs[i])
+        if hasAttrs[i]:
+            plugs.extend([(controlObjs[i], 'ou'), (controlObjs[i], 'ov')])
+        if folArray.jnts[i] is not None:
+            plugs.append((folArray.jnts[i], 'radius'))
+        plugs.extend([
+            (node, 'i2') for node in ratioNodes[i] or [] if node is not None])
+    readValues = iter(batchPlan.getValues(plugs).tolist())
+    
+    allValues = []
+    for i, fol in enumerate(fols):
+        values = {
+            'patch':patches[i], 'patchIsNurb':None, 'offsets':None,
+            'uvDriverAttrs':bool(hasAttrs[i]), 'jntRadius':None,
+            'uvDriverRatio':None}
+        if patches[i]:
+            values['patchIsNurb'] = patches[i] in nurbs
+        values['baseUV'] = [next(readValues), next(readValues)]
+        folUV = [next(readValues), next(readValues)]
+        values['uv'] = freezeOffsets and folUV or list(values['baseUV'])
+        if hasAttrs[i]:
+            values['offsets'] = [next(readValues), next(readValues)]
+        if folArray.jnts[i] is not None:
+            values['jntRadius'] = next(readValues)
+        if ratioNodes[i]:
+            values['uvDriverRatio'] = [
+                None if node is None else next(readValues) 
+                for node in ratioNodes[i]]
+        allValues.append(values)
+    
+    # Normalise the UVs on each nurbs patch at once
+    for patch in nurbs:
+        indices = [i for i in range(len(fols)) if patches[i] == patch]
+        uvs = normalisedNurbsUVs(
+            patch, [allValues[i]['uv'] for i in indices], 
+            giveWarning=False, warningOnly=not normaliseUV)
+        for i, uv in zip(indices, uvs):
+            allValues[i]['uv'] = uv
+    
+    return allValues
 
 
+@_inBatchSession
+@_usesNameIndex
 def duplicateFollicles(
         objs=None, useSelection=True, newPatch=None, name=None,
-        freezeOffsets=False, selectNew=False, **kwargs):
+        freezeOffsets=False, selectNew=False, planOnly=False,
+        useModifier=False, **kwargs):
+    """Duplicate follicle joints (see FollicleJoint.duplicate)
+    
+    The duplicates are created as one (batchPlan) OperationPlan; 
+    planOnly returns the plan instead and useModifier applies it with 
+    an API modifier.
+    """
     folObjs = getFollicleJoints(objs, useSelection=useSelection, strict=False)
-    dupObjs = []
     for obj in folObjs:
+        obj._requireFollicle('Duplicating')
+    
+    # (Every follicle joint's values read at once)
+    allValues = _duplicateValues(
+        folObjs, newPatch=newPatch, freezeOffsets=freezeOffsets, 
+        normaliseUV=kwargs.get('normaliseUV', False))
+    plan = batchPlan.OperationPlan()
+    dupObjs = []
+    for obj, values in zip(folObjs, allValues):
         # Duplicate the follicle joint
         dup = obj.duplicate(
             newPatch=newPatch, name=name, freezeOffsets=freezeOffsets,
-            selectNew=False, **kwargs)
+            selectNew=False, plan=plan, values=values, **kwargs)
         dupObjs.append(dup)
+    if planOnly:
+        return plan
+    plan.execute(useModifier=useModifier)
     
     if selectNew:
-        pm.select([obj.controlObj for obj in dupObjs])
+        _select([obj.controlObj for obj in dupObjs])
     
     return dupObjs
 
 
+@_inBatchSession
+@_usesNameIndex
 def mirrorFollicles(
         objs=None, useSelection=True, newPatch=None, selectNew=False,
         axis='u', midVal=0.5, uvRange=[0.0, 1.0], sidePrefix=None,
-        strict=True, warnings=True, **kwargs):
+        strict=True, warnings=True, planOnly=False, useModifier=False,
+        pairBy='name', tolerance=0.001, seedEdge=None, **kwargs):
+    """Create mirror follicle joints (see FollicleJoint.createMirrorObject)
+    
+    Existing mirror objects are found for all of them at once, by name
+    or with a pairBy of 'uv' or 'topology' by position (within 
+    tolerance; see mirrorPairs). With 'topology', new mirror objects 
+    on mesh patches are placed at the topologically mirrored UVs.
+    The mirrors are created as one (batchPlan) OperationPlan; planOnly
+    returns the plan instead and useModifier applies it with an API 
+    modifier.
+    """
     folObjs = getFollicleJoints(objs, useSelection=useSelection, strict=False)
-    mirObjs = []
     for obj in folObjs:
-        if sidePrefix:
-            # Use the given left right prefixes
+        obj._requireFollicle('Mirroring')
+    if sidePrefix:
+        # Use the given left right prefixes
+        for obj in folObjs:
             obj.sidePrefix = sidePrefix
-        
+    pairs, middles, orphans = _mirrorPairs(
+        folObjs, pairBy=pairBy, strict=False, axis=axis, midVal=midVal,
+        tolerance=tolerance, seedEdge=seedEdge)
+    existing = dict([(obj.controlObj, False) for obj, mirror in orphans])
+    mirrorUVs = {}
+    if pairBy == 'topology':
+        mirrorUVs = dict([
+            (obj.controlObj, mirror) for obj, mirror in orphans])
+    for obj, mirrorObj in pairs:
+        existing[obj.controlObj] = mirrorObj
+        existing[mirrorObj.controlObj] = obj
+    
+    # (Every follicle joint's values read at once)
+    allValues = _duplicateValues(
+        folObjs, newPatch=newPatch, 
+        freezeOffsets=kwargs.get('freezeOffsets', False), 
+        normaliseUV=kwargs.get('normaliseUV', False))
+    
+    plan = batchPlan.OperationPlan()
+    mirObjs = []
+    for obj, values in zip(folObjs, allValues):
         # Create Mirror of the follicle joint
         mir = obj.createMirrorObject(
             newPatch=newPatch, selectNew=False,
             axis=axis, midVal=midVal, uvRange=uvRange,
-            strict=strict, warnings=warnings, **kwargs)
+            strict=strict, warnings=warnings, plan=plan, 
+            existing=existing.get(obj.controlObj), 
+            mirrorUV=mirrorUVs.get(obj.controlObj), values=values, 
+            **kwargs)
         mirObjs.append(mir)
+    if planOnly:
+        return plan
+    plan.execute(useModifier=useModifier)
     
     if selectNew:
-        pm.select([obj.controlObj for obj in mirObjs])
+        _select([obj.controlObj for obj in mirObjs])
     
     return mirObjs
 
 
+@_inBatchSession
 def transferFolliclesToPatch(
         patch=None, objs=None, useSelection=True, closestPts=True,
-        useSmoothedMesh=True):
-    """Wrapper to transfer multiple follicles."""
+        useSmoothedMesh=True, offline=False, planOnly=False,
+        useModifier=False):
+    """Wrapper to transfer multiple follicles.
+    
+    offline: find closest points without nodes (see closestUVs)
+    
+    The transfers are made as one (batchPlan) OperationPlan; planOnly 
+    returns the plan instead and useModifier applies it with an API 
+    modifier.
+    """
     
     # Get patch
     patch = cq.filterSelectionForShapeType(patch, ['nurbsSurface', 'mesh'])[0]
@@ -1710,6 +4412,7 @@ def transferFolliclesToPatch(
     # Get follicle joint classes for objects
     folObjs = getFollicleJoints(objs, useSelection=useSelection, strict=False)
     
+    plan = batchPlan.OperationPlan()
     if closestPts:
         # For optimisation, get all the UV values at once
         xforms = []
@@ -1719,24 +4422,37 @@ def transferFolliclesToPatch(
             elif obj.jnt: xforms.append(obj.jnt)
             else: continue
             validFols.append(obj)
-        outVals = getClosestUVs(patch, xforms, keepCalcNode=False)[0]
+        outVals = closestUVs(
+            patch, cq.getPointPositionArray(xforms)[0], offline=offline)
         
         for i in range(len(xforms)):
             uvVals = outVals[i]
             validFols[i].transferToPatch(
-                patch=patch, newUV=uvVals, useSmoothedMesh=useSmoothedMesh)
+                patch=patch, newUV=uvVals, useSmoothedMesh=useSmoothedMesh,
+                plan=plan)
     else:
         for obj in folObjs:
             obj.transferToPatch(
-                patch=patch, closestPt=False, useSmoothedMesh=useSmoothedMesh)
+                patch=patch, closestPt=False, useSmoothedMesh=useSmoothedMesh,
+                plan=plan)
+    
+    if planOnly:
+        return plan
+    plan.execute(useModifier=useModifier)
 
 
+@_inBatchSession
 def addAsOffsetDriver(
-        driverObj=None, objs=None, ratio=0.5, attrs=True, selectDriver=True):
+        driverObj=None, objs=None, ratio=0.5, attrs=True, selectDriver=True,
+        planOnly=False, useModifier=False):
     """Drive one follicle joint's offset with another.
     
     With adjustable follow ratio attributes.
     Multiple objects can be driven by one driver.
+    
+    The connections are made as one (batchPlan) OperationPlan; planOnly
+    returns the plan instead and useModifier applies it with an API 
+    modifier.
     """
     if objs is not None and not isinstance(objs, list): objs = [objs]
     
@@ -1754,25 +4470,35 @@ def addAsOffsetDriver(
             "At least two follicles must be supplied - "
             "select the driver follicle first")
     
+    plan = batchPlan.OperationPlan()
     driverAttrObjs = []
     for obj in folObjs:
         returnObjs = obj.addOffsetDriver(
-            driverObj=driverObj, ratio=ratio, attrs=attrs, selectDriver=False)
+            driverObj=driverObj, ratio=ratio, attrs=attrs, selectDriver=False,
+            plan=plan)
         if attrs:
             driverAttrObjs.append(returnObjs[1])
         else:
             driverAttrObjs.extend(returnObjs[0])
+    if planOnly:
+        return plan
+    plan.execute(useModifier=useModifier)
+    if not attrs:
+        driverAttrObjs = [offsetRto.node for offsetRto in driverAttrObjs]
     
     if selectDriver:
-        pm.select(driverAttrObjs)
+        _select(driverAttrObjs)
         
     return driverAttrObjs
 
 
+@_inBatchSession
+@_usesNameIndex
 def autoRename(
         objs=None, useSelection=True, patch=None, name=None, skipSelect=False,
         scaleY=4, uvAsXy=['u', 'v'], midVal=0.5, middleTolerance=0.04,
-        renameFormats=None, sidePrefix=None):
+        renameFormats=None, sidePrefix=None, pairMirrors=False,
+        mirrorTolerance=0.001, rowTolerance=0.01):
     """Auto-rename follicles to left/right and numbered.
     
     Uses parameter U and V values to sort into sides symmetrically.
@@ -1782,11 +4508,17 @@ def autoRename(
     middleTolerance specifies the width of UV value that gets named as
      being the middle.
     midVal defines where (on the x direction) the mirror line is.
-    scaleY defines how numbers count up; a higher number will separate
-     horizontal rows from each other more, helping the counting script
-     to count along in rows.
+    rowTolerance: numbers count along rows (outwards from midVal), 
+     from the lowest row up; a new row starts wherever the y values 
+     jump by more than rowTolerance (see rowOrder).
+    scaleY, with a rowTolerance of None, counts by x + scaleY*y 
+     instead; a higher number will separate horizontal rows from each
+     other more.
     patch is just an alternative to giving a specific name; if only 
      patch is supplied, the name will be the patch transform + '_fol#'
+    pairMirrors: give each right follicle the number of the left one
+     at its mirrored position (within mirrorTolerance; see 
+     uvMirrorPairs), numbering any others after them.
     """
     folObjs = getFollicleJoints(objs, useSelection=useSelection, strict=False)
     if not folObjs: raise TypeError("At least one follicle must be supplied")
@@ -1833,50 +4565,60 @@ def autoRename(
         pre, numNull, suf = splitNumberedName(name)
     
     # Sort uv points into sides (Right, left, middle)
-    LRMside = [{}, {}, {}]
     prevNames = []
-    toTempRename = []
-    nodeUniqueOffset = 0.00001
     for folObj in folObjs:
-        nodes = folObj.allDagObjs
-        uv = folObj.fol.pu.get(), folObj.fol.pv.get()
-        
-        uvStr = ['u', 'v']
-        # Figure out which way up the uv's are (x is across, y is up) 
-        # (eg. uvAsXy=['v', '-u'] would be  V ->, and U down)
-        for i in range(2):
-            if uvStr[i] in uvAsXy[0]:
-                x = uv[i]
-                if '-' in uvAsXy[0]:
-                    # Reverse around mid point
-                    x = 2*midVal - x
-            elif uvStr[i] in uvAsXy[1]:
-                y = uv[i]
-                if '-' in uvAsXy[1]:
+        for node in folObj.allDagObjs:
+            prevNames.append(node.nodeName())
+    
+    # Find the follicle shapes' and top objects' parents in bulk
+    fols = [folObj.fol for folObj in folObjs if folObj.fol]
+    folParents = dict([
+        (parent.longName(), parent) for parent in _batchListRelatives(
+            fols, parent=1, fullPath=1)])
+    shapesByParent = {}
+    for fol in fols:
+        shapesByParent[folParents[_parentPath(fol.longName())]] = [fol]
+    parentObjs = set(_batchListRelatives(
+        [folObj.topObj for folObj in folObjs], parent=1, fullPath=1))
+    
+    folUVs = batchPlan.getValues([
+        plug for folObj in folObjs 
+        for plug in folObj._uvPlugs]).reshape(-1, 2)
+    
+    # Figure out which way up the uv's are (x is across, y is up) 
+    # (eg. uvAsXy=['v', '-u'] would be  V ->, and U down)
+    folXYs = np.zeros_like(folUVs)
+    for i, uvStr in enumerate(['u', 'v']):
+        for j in range(2):
+            if uvStr in uvAsXy[j]:
+                folXYs[:, j] = folUVs[:, i]
+                if '-' in uvAsXy[j]:
                     # Reverse around mid point
-                    y = 2*midVal - y
-
-        # Find which side the follicle is on, and give a number to order it
-        # favouring x (horizontal) to attempt to number horizontally first
-        LRM = 2  # Right, left, middle
-        if x <= midVal-middleTolerance/2:
-            # Left;
-            LRM = 0
-            hashNum = (midVal-x) + scaleY*y
-        else:
-            # Mid/left
-            if x >= midVal+middleTolerance/2:
-                # Right;
-                LRM = 1
-            hashNum = (x-midVal) + scaleY*y
-        # Avoid equal values being skipped
-        while hashNum in LRMside[LRM]:
-            hashNum += nodeUniqueOffset
-        
-        LRMside[LRM][hashNum] = folObj
-        toTempRename.extend(nodes)
-        for node in nodes:
-            prevNames.append(node.name())
+                    folXYs[:, j] = 2*midVal - folXYs[:, j]
+                break
+    
+    # Find which side each follicle is on (Right, left, middle), and 
+    # order them along rows, outwards from the middle
+    xs, ys = folXYs.T
+    folSides = np.full(len(folObjs), 2)
+    folSides[xs <= midVal-middleTolerance/2] = 0
+    folSides[xs >= midVal+middleTolerance/2] = 1
+    across = np.where(folSides == 0, midVal-xs, xs-midVal)
+    LRMside = []
+    for i in range(3):
+        sideIds = np.flatnonzero(folSides == i)
+        order = rowOrder(
+            across[sideIds], ys[sideIds], rowTolerance=rowTolerance, 
+            scaleY=scaleY)
+        LRMside.append([folObjs[k] for k in sideIds[order]])
+    
+    # Pair right follicles with their left mirrors
+    mirrorOf = {}
+    if pairMirrors:
+        for i, j in uvMirrorPairs(
+                folXYs, axis='u', midVal=midVal, tolerance=mirrorTolerance)[0]:
+            if folSides[i] == 0 and folSides[j] == 1:
+                mirrorOf[folObjs[j]] = folObjs[i]
     
     # Generate regex for left/right prefix
     LRMRegex = '('
@@ -1888,18 +4630,20 @@ def autoRename(
     
     # Find existing objects with name 
     # To get highest number for padding zero amount
-    existingObjs = pm.ls(regex=LRMRegex+pre+'[0-9]+'+suf)
+    # (From the name index, rather than searching the scene again)
+    nameIndex = _getNameIndex()
+    existingRegex = re.compile(LRMRegex+pre+'[0-9]+'+suf+'$')
+    prevNameSet = set(prevNames)
     maxNum = 0
-    if existingObjs:
-        for obj in existingObjs:
-            # Skip objects to be renamed
-            if obj.name() in prevNames: continue
-            
-            # Get number ('[0-9]+' ensures one exists)
-            numStr = splitNumberedName(obj.name())[1]
-            numInt = int(numStr)
-            if numInt > maxNum:
-                maxNum = numInt
+    for existingName in nameIndex.matching(existingRegex):
+        # Skip objects to be renamed
+        if existingName in prevNameSet: continue
+        
+        # Get number ('[0-9]+' ensures one exists)
+        numStr = splitNumberedName(existingName)[1]
+        numInt = int(numStr)
+        if numInt > maxNum:
+            maxNum = numInt
     print 'Highest pre-existing number:', maxNum
     
     # Find the new number of names, get the 00 spacer amount
@@ -1912,63 +4656,81 @@ def autoRename(
     numBuffer = len(str(overallMax))
     print 'Final maximum number:', overallMax, "Padding:", numBuffer
     
-    # Temporarily change the existing names, to enable name swaps
-    # (PyNode objects update so the lists will still work)
-    tempSuffix = '_temp_name_while_renaming__'
-    for folNode in toTempRename:
-        # Avoid renaming shapes twice (but some may not auto-rename)
-        currentName = folNode.name()
-        if not tempSuffix in currentName:
-            pm.rename(folNode, currentName+tempSuffix)
+    # Plan all of the new names first; the follicle joints' own names
+    # count as free (as if they'd been renamed out of the way)
+    for prevName in prevNames:
+        nameIndex.discard(prevName)
     
-    # Figure out and name the follicles by sides
+    # Figure out the names of the follicles by sides
+    renames = []
     grpList = []
-    parentObjs = set()
     newNames = []
+    leftNumbers = {}
     for i in range(3):
-        hashDict = LRMside[i]
-        
-        # Order the follicles by their uv-based, scaleY biased value
-        orderedFols = hashDict.keys()
-        orderedFols.sort()
+        # The follicles in row order
+        orderedFols = LRMside[i]
+        if i == 1 and mirrorOf:
+            # Paired follicles first, in their left mirrors' order
+            paired = [
+                folObj for folObj in orderedFols if folObj in mirrorOf]
+            paired.sort(key=lambda folObj: leftNumbers[mirrorOf[folObj]])
+            orderedFols = paired + [
+                folObj for folObj in orderedFols 
+                if not folObj in mirrorOf]
         j = 1
-        for key in orderedFols:
-            folObj = hashDict[key]
+        for folObj in orderedFols:
+            if i == 1 and folObj in mirrorOf:
+                j = leftNumbers[mirrorOf[folObj]]
             # Ensure the given LRM values are used
             folObj.sidePrefix = LRMStr
             
-            # Get the left/right/middle numbered name
-            nameNew = joinNumberedName(LRMStr[i]+pre, j, suf, numBuffer)
-            # Rename to the first unique set of names (variable number string)
-            renameVals = folObj.rename(
-                nameNew, skipPreRename=True, renameFormats=renameFormats)
-            newNames = renameVals[1]
-            renameNum = splitNumberedName(newNames['main'])[1]
-            j = int(renameNum)
+            # Get the first free left/right/middle numbered names
+            # (variable number string)
+            objs = folObj._namedNodes()
+            abbrs = sorted(objs)
+            j = nameIndex.nextNumber(
+                LRMStr[i]+pre, suf, numBuffer, 
+                [renameFormats[abbr] for abbr in abbrs], start=j)
+            newNames = {}
+            for abbr in abbrs:
+                newNames[abbr] = joinNumberedName(
+                    LRMStr[i]+pre, j, suf, numBuffer, 
+                    nameFormat=renameFormats[abbr])
+                nameIndex.add(newNames[abbr])
+                renames.append((objs[abbr], newNames[abbr]))
+            if i == 0:
+                leftNumbers[folObj] = j
             
-            parentObj = folObj.topObj.getParent()
-            if parentObj:
-                parentObjs.add(parentObj)
             grpList.append(folObj.topObj)
             j += 1
     
+    # Rename just the nodes whose names change, without clashes
+    _renameNodes(renames, nameIndex, shapes=shapesByParent)
+    
+    # Then the follicle shapes, after their parents (Maya style)
+    _renameFollicleShapes(shapesByParent, nameIndex)
+    
     # Reshuffle the follicles if not in separate hierarchies
+    # (unless they're already the last children there, in order)
     parentNum = len(parentObjs)
-    if parentNum <= 1:
+    parentObj = parentNum == 1 and list(parentObjs)[0] or None
+    if parentNum <= 1 and not _areLastChildren(grpList, parentObj):
         tempGrp = pm.group(grpList)
         if parentNum == 1:
-            pm.parent(grpList, list(parentObjs)[0])
+            pm.parent(grpList, parentObj)
         else:
             pm.parent(grpList, w=1)
         pm.delete(tempGrp)
     
     # Select the renamed objects
     if not skipSelect:
-        pm.select(grpList, r=1)
+        _select(grpList, r=1)
     
     return newNames
 
 
+@_inBatchSession
+@_usesNameIndex
 def multiRename(
         objs=None, useSelection=True, name=None, skipSelect=False, **kwargs):
     """Rename all DAG nodes in each setup, using consecutive numbers"""
@@ -1980,7 +4742,7 @@ def multiRename(
         folObj.rename(name=name, **kwargs)
         selObjs.append(folObj.topObj)
     if not skipSelect:
-        pm.select(selObjs)
+        _select(selObjs)
     return selObjs
     
 
@@ -2029,5 +4791,5 @@ def getSubNodes(
             selObjs.extend(grpObjs[ctrlTyp])
     
     if not skipSelect:
-        pm.select(selObjs)
+        _select(selObjs)
     return selObjs
\ No newline at end of file
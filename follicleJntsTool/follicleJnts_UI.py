@@ -16,42 +16,61 @@
 import os
 import sys
 
-from shiboken2 import wrapInstance
 from PySide2 import QtGui, QtCore, QtWidgets
-
-import pymel.core as pm
-import maya.OpenMayaUI as mayaUI
 from maya.app.general.mayaMixin import MayaQWidgetDockableMixin
 
+import follicleJntsTool
+from follicleJntsTool import lazyImport
 import follicleJntsTool.follicleJnts as folEng
-reload(folEng)
+if follicleJntsTool.devReload:
+    reload(folEng)
+
+# Only needed once the UI is open (see lazyImport)
+pm = lazyImport.LazyModule('pymel.core', globals(), 'pm')
+mayaUI = lazyImport.LazyModule('maya.OpenMayaUI', globals(), 'mayaUI')
+shiboken2 = lazyImport.LazyModule('shiboken2', globals(), 'shiboken2')
 
 
 allowMissingStylesheet = False
 
+# Evaluate in DG mode while the tools run (see folEng.batchSession);
+# off by default, as switching the evaluation manager back rebuilds
+# its graph after every button press
+pauseEvaluation = False
+
 
-# Read the QSS file (stylesheet) data into a string
-UIqss = ''
+# The QSS file (stylesheet), read when the first UI is made
+UIqss = None
 thisDir = os.path.dirname(__file__)
 qssFilePath = os.path.join(thisDir, "follicleJnts_style.qss")
-try:
-    qssFile = open(qssFilePath, 'rU')
-except IOError:
-    if not allowMissingStylesheet:
-        raise OSError("Could not find the QT Stylesheet file!")
-except OSError:
-    if not allowMissingStylesheet:
-        raise OSError("Could not read the QT Stylesheet file!")
-else:
-    UIqss = ''.join(qssFile.readlines())
-    qssFile.close()
+
+
+def loadStyleSheet():
+    """Read the QSS file (stylesheet) data into a string, once"""
+    global UIqss
+    if UIqss is not None:
+        return UIqss
+    try:
+        qssFile = open(qssFilePath, 'rU')
+    except IOError:
+        if not allowMissingStylesheet:
+            raise OSError("Could not find the QT Stylesheet file!")
+        UIqss = ''
+    except OSError:
+        if not allowMissingStylesheet:
+            raise OSError("Could not read the QT Stylesheet file!")
+        UIqss = ''
+    else:
+        UIqss = ''.join(qssFile.readlines())
+        qssFile.close()
+    return UIqss
 
 
 def _getMayaWin():
     """Get the main Maya window as a QtGui.QMainWindow instance"""
     ptr = mayaUI.MQtUtil.mainWindow()
     if ptr is not None:
-        qob = wrapInstance(long(ptr), QtWidgets.QMainWindow)
+        qob = shiboken2.wrapInstance(long(ptr), QtWidgets.QMainWindow)
         return qob
 
 
@@ -91,8 +110,9 @@ class undoableCaller(object):
     """Wrapper object around a function/method to enable Maya's 'undo'.
     
     Enables the commands triggered in the Qt UI to be undone in Maya
-    in one step, by opening and closing undo chunks before and after
-    the call.
+    in one step, by running the call in a batchSession (one undo 
+    chunk, without viewport refreshes and with a single selection at
+    the end).
     
     If extra arguments are supplied (*args or **kwargs) these are given
     to the command when it is evaluated (shallow copy only.)
@@ -135,19 +155,16 @@ class undoableCaller(object):
         if self.args: args = self.args + list(args)
         if self.kwargs: kwargs.update(self.kwargs)
         
-        # Start the undo block
-        pm.undoInfo(openChunk=True)
         exc = None
         try:
-            self.uiFunction(*args, **kwargs)
+            # Run as one undo block, without redraws
+            with folEng.batchSession(pauseEvaluation=pauseEvaluation):
+                self.uiFunction(*args, **kwargs)
         except Exception:
             # Store the exception if raised
             exc, excInst, trac = sys.exc_info()
             raise
         finally:
-            # End the undo block (re-enables undo)
-            pm.undoInfo(closeChunk=True)
-            
             # Re-raise the exception to ensure the Maya error bar goes red
             if exc:
                 pm.mel.evalDeferred(r'error "%s: %s"' % (
@@ -300,7 +317,7 @@ class UI(MayaQWidgetDockableMixin, QtWidgets.QWidget):
                 workspaceCtrlName, e=1, vcc=self._dockStateChanged)
         
         # Set a stylesheet for the top UI widget (under the maya dock)
-        self.setStyleSheet(UIqss)
+        self.setStyleSheet(loadStyleSheet())
         
         # Load the previous UI settings
         if not resetUI:
@@ -0,0 +1,268 @@
+"""
+#
+# footprint.py
+#
+# @author Nathan Chisholm
+# @web nathanchisholm.weebly.com
+#
+# --------------------------------------------------------------------
+# How heavy a follicle joint rig has become: the nodes and connections
+# each follicle joint is evaluated through (its own nodes and the
+# helper networks upstream of them), with a rough evaluation cost.
+#
+# import follicleJntsTool.footprint as footprint
+# reload(footprint)
+# report = footprint.footprintReport(hierarchy='rig_grp', worst=10)
+# print footprint.footprintText(report)
+# footprint.writeFootprint(report, 'C:/temp/faceRigFootprint.json')
+#
+"""
+
+
+import json
+
+from follicleJntsTool import lazyImport
+from follicleJntsTool import follicleJnts as folTools
+
+# Imported on first use (see lazyImport)
+np = lazyImport.LazyModule('numpy', globals(), 'np')
+pm = lazyImport.LazyModule('pymel.core', globals(), 'pm')
+
+
+# Rough relative evaluation costs by node type (an addDoubleLinear is
+# 1.0); other types cost defaultCost. These are estimates for finding
+# the heavy parts of a rig, not timings.
+nodeCosts = {
+    'addDoubleLinear':1.0,
+    'multDoubleLinear':1.0,
+    'plusMinusAverage':1.5,
+    'multiplyDivide':1.5,
+    'pointMatrixMult':1.5,
+    'decomposeMatrix':2.0,
+    'transform':2.0,
+    'joint':2.5,
+    'follicle':6.0,
+    'uvPin':3.0,
+    'closestPointOnSurface':12.0,
+    'closestPointOnMesh':20.0,
+    }
+defaultCost = 1.0
+
+# Types evaluated once per follicle joint using them, however many
+# share the node (multi-output nodes, costed per element)
+perElementTypes = ('uvPin',)
+
+_surfaceTypes = ('nurbsSurface', 'mesh')
+
+
+def footprintReport(
+        objs=None, useSelection=False, hierarchy=None, namespace=None,
+        worst=10):
+    """Tally the DG footprint of follicle joints.
+
+    The follicle joints are found from objs, the selection, hierarchy
+    or namespace (as findFollicleJoints), or else in the whole scene.
+    Every node upstream of each follicle joint's own nodes (transform,
+    joint and follicle) is walked, through the helper (non-DAG) nodes
+    until DAG nodes are reached; the walk is breadth first, one level
+    of every follicle joint at once, so each level takes a few batched
+    queries however many follicle joints there are.
+
+    Helper nodes used by several follicle joints (eg. a shared uvPin,
+    or link nodes) are counted once in the totals, and their cost is
+    split between the follicle joints (except perElementTypes.)
+
+    Returns a JSON-able dict:
+    {'follicleJoints', 'nodes', 'nodeTypes':{type: count},
+     'connections', 'maxDepth', 'estimatedCost',
+     'patches':{patch: follicle joint count},
+     'joints':[per follicle joint dicts], 'worst':[the worst few of
+     joints, by estimated cost]}
+    Per follicle joint: {'name', 'type', 'nodes', 'sharedNodes',
+    'nodeTypes', 'connections', 'depth' (of the deepest helper node),
+    'patches', 'estimatedCost'}.
+    """
+    if objs is None and useSelection:
+        objs = pm.ls(sl=1) or None
+    if objs is None and hierarchy is None and namespace is None:
+        hierarchy = pm.ls(assemblies=True)
+    folArray = folTools.findFollicleJoints(
+        objs, hierarchy=hierarchy, namespace=namespace, strict=False,
+        verbose=False, asArray=True)
+
+    # The follicle joints' own nodes
+    ownTypes = {}
+    owner = {}
+    for i, nodes in enumerate(zip(
+            folArray.xfms, folArray.jnts, folArray.fols)):
+        for node, nodeType in zip(nodes, ('transform', 'joint', 'follicle')):
+            if node is not None:
+                owner[node] = i
+                ownTypes[node] = nodeType
+
+    # Walk upstream, a level at a time
+    count = len(folArray)
+    users = {}
+    depths = {}
+    nodeTypes = dict(ownTypes)
+    dagNodes = set(ownTypes)
+    connections = np.zeros(count, dtype=int)
+    patches = [set() for i in xrange(count)]
+    allConnections = set()
+    frontier = dict((node, set([i])) for node, i in owner.items())
+    level = 0
+    while frontier:
+        level += 1
+        conns = _listInputs(frontier.keys())
+        newNodes = list(set([
+            src.node() for dest, src in conns]) - set(nodeTypes))
+        nodeTypes.update(_nodeTypes(newNodes))
+        dagNodes.update(folTools._batchLs(newNodes, type='dagNode'))
+
+        nextFrontier = {}
+        for dest, src in conns:
+            destNode, srcNode = dest.node(), src.node()
+            ids = frontier[destNode]
+            allConnections.add((src, dest))
+            for i in ids:
+                connections[i] += 1
+            if srcNode in dagNodes:
+                if nodeTypes.get(srcNode) in _surfaceTypes:
+                    for i in ids:
+                        patches[i].add(srcNode)
+                continue
+            # A helper node; walk on with any new users
+            known = users.setdefault(srcNode, set())
+            newIds = ids - known
+            if newIds:
+                known.update(newIds)
+                depths.setdefault(srcNode, level)
+                nextFrontier.setdefault(srcNode, set()).update(newIds)
+        frontier = nextFrontier
+
+    # Per follicle joint tallies
+    joints = []
+    names = folArray.names
+    typeStrings = [folArray.typeStrings[code] for code in folArray.typeCodes]
+    perJoint = [
+        {'count':0, 'shared':0, 'types':{}, 'depth':0, 'cost':0.0}
+        for i in xrange(count)]
+    for node, i in owner.items():
+        _addNode(perJoint[i], ownTypes[node], 1)
+    for node, ids in users.items():
+        nodeType = nodeTypes[node]
+        for i in ids:
+            _addNode(perJoint[i], nodeType, len(ids))
+            perJoint[i]['depth'] = max(perJoint[i]['depth'], depths[node])
+    for i in xrange(count):
+        tally = perJoint[i]
+        joints.append({
+            'name':names[i], 'type':typeStrings[i],
+            'nodes':tally['count'],
+            'sharedNodes':tally['shared'], 'nodeTypes':tally['types'],
+            'connections':int(connections[i]), 'depth':tally['depth'],
+            'patches':sorted([str(patch) for patch in patches[i]]),
+            'estimatedCost':round(tally['cost'], 3)})
+
+    # Totals
+    typeCounts = {}
+    for node in owner.keys() + users.keys():
+        nodeType = nodeTypes[node]
+        typeCounts[nodeType] = typeCounts.get(nodeType, 0) + 1
+    patchCounts = {}
+    for jointPatches in patches:
+        for patch in jointPatches:
+            patchCounts[str(patch)] = patchCounts.get(str(patch), 0) + 1
+    totalCost = sum([joint['estimatedCost'] for joint in joints])
+    byCost = sorted(
+        joints, key=lambda joint: (-joint['estimatedCost'], joint['name']))
+
+    return {
+        'follicleJoints':count,
+        'nodes':len(owner) + len(users),
+        'nodeTypes':typeCounts,
+        'connections':len(allConnections),
+        'maxDepth':max([joint['depth'] for joint in joints] or [0]),
+        'estimatedCost':round(totalCost, 3),
+        'patches':patchCounts,
+        'joints':joints,
+        'worst':byCost[:worst]}
+
+
+def footprintText(report, highlight=2.0):
+    """A readable summary of a footprintReport.
+
+    The worst offenders are listed, marked with '!' where their
+    estimated cost is more than highlight times the median.
+    """
+    count = report['follicleJoints']
+    lines = [
+        'Follicle joint footprint: %s follicle joints, %s nodes, '
+        '%s connections' % (count, report['nodes'], report['connections']),
+        'Estimated evaluation cost: %s (%.2f per follicle joint)' % (
+            report['estimatedCost'],
+            report['estimatedCost']/max(count, 1)),
+        'Deepest helper chain: %s nodes' % report['maxDepth'],
+        '',
+        'Nodes by type:']
+    lines.extend(_columns(sorted(
+        report['nodeTypes'].items(), key=lambda item: (-item[1], item[0]))))
+    lines.extend(['', 'Follicle joints per patch:'])
+    lines.extend(_columns(sorted(report['patches'].items())) or ['  (none)'])
+
+    if report['worst']:
+        median = np.median([
+            joint['estimatedCost'] for joint in report['joints']])
+        lines.extend(['', 'Worst offenders (by estimated cost):'])
+        rows = []
+        for joint in report['worst']:
+            flag = joint['estimatedCost'] > highlight*median and '!' or ' '
+            rows.append((
+                '%s %s' % (flag, joint['name']), joint['type'],
+                'cost %s' % joint['estimatedCost'],
+                'nodes %s (%s shared)' % (
+                    joint['nodes'], joint['sharedNodes']),
+                'connections %s' % joint['connections'],
+                'depth %s' % joint['depth']))
+        lines.extend(_columns(rows))
+    return '\n'.join(lines)
+
+
+def writeFootprint(report, filePath):
+    """Write a footprintReport to a JSON file."""
+    with open(filePath, 'w') as jsonFile:
+        json.dump(report, jsonFile, indent=1, sort_keys=True)
+
+
+def _addNode(tally, nodeType, users):
+    """Add a node (used by users follicle joints) to a joint's tally"""
+    tally['count'] += 1
+    if users > 1:
+        tally['shared'] += 1
+    tally['types'][nodeType] = tally['types'].get(nodeType, 0) + 1
+    cost = nodeCosts.get(nodeType, defaultCost)
+    if not nodeType in perElementTypes:
+        cost /= float(users)
+    tally['cost'] += cost
+
+
+def _columns(rows):
+    """Format rows of values as aligned, indented text lines"""
+    if not rows:
+        return []
+    rows = [[str(value) for value in row] for row in rows]
+    widths = [max([len(row[i]) for row in rows]) for i in range(len(rows[0]))]
+    return ['  ' + '  '.join([
+        value.ljust(width) for value, width in zip(row, widths)]).rstrip()
+        for row in rows]
+
+
+def _listInputs(nodes):
+    """Every input connection of the nodes, as [(dest plug, src plug)]"""
+    return folTools._batchListConnections(nodes, s=1, d=0, c=1, p=1)
+
+
+def _nodeTypes(nodes):
+    """Return {node: type name}, with one ls call"""
+    typed = folTools._batchLs(nodes, showType=True)
+    return dict(zip(typed[::2], typed[1::2]))
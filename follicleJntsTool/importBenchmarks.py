@@ -0,0 +1,177 @@
+"""
+#
+# importBenchmarks.py
+#
+# @author Nathan Chisholm
+# @web nathanchisholm.weebly.com
+#
+# --------------------------------------------------------------------
+# Import times of the tool modules, each measured in a new Python
+# process (run with mayapy):
+#   cold - the first import there, including everything it loads
+#   warm - importing it again with its dependencies already loaded
+#          (the tool modules themselves are dropped and re-imported)
+# and which heavy modules (pymel, NumPy, Qt) each import pulled in.
+# With standIn, the in-memory Maya stand-in (see mayaStandIn) is
+# installed first, so the modules can be imported outside Maya.
+#
+# Run from the folder holding follicleJntsTool:
+# mayapy -m follicleJntsTool.importBenchmarks
+# python -m follicleJntsTool.importBenchmarks --standIn
+#
+# from follicleJntsTool import importBenchmarks
+# results = importBenchmarks.runImportBenchmarks(repeat=5)
+# importBenchmarks.printResults(results)
+# importBenchmarks.writeResults(results, 'C:/temp/importTimes.json')
+#
+"""
+
+
+import os
+import sys
+import json
+import subprocess
+
+
+# The modules timed by runImportBenchmarks, in order
+benchmarkedModules = (
+    'follicleJntsTool.follicleJnts',
+    'follicleJntsTool.customQueries',
+    'follicleJntsTool.batchPlan',
+    'follicleJntsTool.nurbsEval',
+    'follicleJntsTool.meshBVH',
+    'follicleJntsTool.meshSymmetry',
+    'follicleJntsTool.footprint',
+    'follicleJntsTool.profiling',
+    'follicleJntsTool.follicleJnts_UI',
+    )
+
+# Modules reported when an import loads them
+heavyModules = (
+    'numpy', 'pymel.core', 'maya.cmds', 'PySide2', 'shiboken2')
+
+# Run in the new process: prints the result as JSON on the last line
+_childScript = '''
+import sys
+import json
+import timeit
+
+sys.path.insert(0, %(path)r)
+if %(standIn)r:
+    from follicleJntsTool import mayaStandIn
+    mayaStandIn.install()
+
+result = {'module':%(module)r}
+before = set(sys.modules)
+try:
+    start = timeit.default_timer()
+    __import__(%(module)r)
+    result['cold'] = timeit.default_timer() - start
+    new = [
+        name for name in set(sys.modules) - before
+        if sys.modules[name] is not None]
+    result['loaded'] = [name for name in %(heavyModules)r if name in new]
+    for name in new:
+        if name.split('.')[0] == 'follicleJntsTool':
+            del sys.modules[name]
+    start = timeit.default_timer()
+    __import__(%(module)r)
+    result['warm'] = timeit.default_timer() - start
+except Exception as exc:
+    result['error'] = '%%s: %%s' %% (exc.__class__.__name__, exc)
+sys.stdout.write('\\n' + json.dumps(result) + '\\n')
+'''
+
+
+def runImportBenchmarks(modules=benchmarkedModules, repeat=3,
+                        standIn=False, python=None, verbose=True):
+    """Time importing each module, in repeat new processes each.
+
+    python is the interpreter run (by default this one, or mayapy when
+    run from within Maya.)
+
+    Returns a list of result dicts: {'module', 'cold', 'warm' (the
+    quickest of the repeats, in seconds), 'loaded' (heavyModules the
+    import loaded), 'error' (None, or why it couldn't be imported)}
+    """
+    if python is None:
+        python = _pythonExecutable()
+    results = []
+    for module in modules:
+        runs = [_importOnce(module, standIn, python) for i in range(repeat)]
+        error = runs[0].get('error')
+        result = {
+            'module':module, 'cold':None, 'warm':None,
+            'loaded':runs[0].get('loaded', []), 'error':error}
+        if not error:
+            result['cold'] = min([run['cold'] for run in runs])
+            result['warm'] = min([run['warm'] for run in runs])
+        results.append(result)
+        if verbose:
+            if error:
+                print '%s: %s' % (module, error)
+            else:
+                print '%s: %.1fms cold, %.1fms warm' % (
+                    module, 1000*result['cold'], 1000*result['warm'])
+    return results
+
+
+def printResults(results):
+    """Print runImportBenchmarks results as a table"""
+    header = ['module', 'cold ms', 'warm ms', 'loaded']
+    rows = []
+    for result in results:
+        if result['error']:
+            rows.append([result['module'], '-', '-', result['error']])
+            continue
+        rows.append([
+            result['module'], '%.1f' % (1000*result['cold']),
+            '%.1f' % (1000*result['warm']),
+            ', '.join(result['loaded']) or '-'])
+    widths = [
+        max([len(row[i]) for row in rows] + [len(header[i])])
+        for i in range(len(header))]
+    for row in [header] + rows:
+        print '  '.join([row[0].ljust(widths[0])] + [
+            row[i].rjust(widths[i]) for i in (1, 2)] + [row[3]])
+
+
+def writeResults(results, filePath):
+    """Write runImportBenchmarks results to a JSON file."""
+    with open(filePath, 'w') as jsonFile:
+        json.dump(
+            results, jsonFile, indent=1, sort_keys=True,
+            separators=(',', ': '))
+
+
+def _importOnce(module, standIn, python):
+    """Import module in a new process, returning its result dict"""
+    packageDir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    script = _childScript % {
+        'path':packageDir, 'standIn':bool(standIn), 'module':module,
+        'heavyModules':heavyModules}
+    process = subprocess.Popen(
+        [python, '-c', script], stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE)
+    output, errors = process.communicate()
+    lines = output.strip().splitlines()
+    if process.returncode or not lines:
+        return {'error':(errors.strip().splitlines() or ['Failed'])[-1]}
+    return json.loads(lines[-1])
+
+
+def _pythonExecutable():
+    """This interpreter, or mayapy beside Maya if run from Maya"""
+    folder, executable = os.path.split(sys.executable)
+    name, ext = os.path.splitext(executable)
+    if name.lower() == 'maya':
+        return os.path.join(folder, 'mayapy' + (ext == '.exe' and ext or ''))
+    return sys.executable
+
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    useStandIn = '--standIn' in args
+    names = [arg for arg in args if arg != '--standIn']
+    printResults(runImportBenchmarks(
+        modules=names or benchmarkedModules, standIn=useStandIn))
@@ -0,0 +1,97 @@
+"""
+#
+# lazyImport.py
+#
+# @author Nathan Chisholm
+# @web nathanchisholm.weebly.com
+#
+# --------------------------------------------------------------------
+# Modules imported on first use rather than when the tools are
+# imported, so that eg. a shelf button or mayapy job only wanting the
+# name helpers doesn't wait for pymel (or NumPy) to load.
+#
+# A LazyModule stands in for the module under its name in the
+# importing module; the first attribute looked up on it imports the
+# module and puts the real one in its place, so only that first use
+# goes through the stand-in.
+#
+# from follicleJntsTool import lazyImport
+# pm = lazyImport.LazyModule('pymel.core', globals(), 'pm')
+#
+"""
+
+
+import sys
+import importlib
+
+import follicleJntsTool
+
+
+class LazyModule(object):
+    """Imports a module when it's first used, in place of it.
+
+    scope and alias are the namespace (globals()) and name the
+    LazyModule is assigned to there; once loaded, the module replaces
+    it in scope. Attributes are read from (and set on) the module;
+    the LazyModule's own are underscored, so as not to hide them.
+
+    With devReload, a module already imported elsewhere is reloaded
+    when loaded, if follicleJntsTool.devReload is set (for picking up
+    edits while developing.)
+    """
+
+    __slots__ = ('_name', '_scope', '_alias', '_devReload', '_module')
+
+    def __init__(self, name, scope=None, alias=None, devReload=False):
+        object.__setattr__(self, '_name', name)
+        object.__setattr__(self, '_scope', scope)
+        object.__setattr__(self, '_alias', alias)
+        object.__setattr__(self, '_devReload', devReload)
+        object.__setattr__(self, '_module', None)
+
+    def __repr__(self):
+        return '<%s %s (%s)>' % (
+            self.__class__.__name__, self._name,
+            self._module is None and 'not loaded' or 'loaded')
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __setattr__(self, attr, value):
+        setattr(self._load(), attr, value)
+
+    def __delattr__(self, attr):
+        delattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def _load(self):
+        """Import the module (if not yet done) and return it"""
+        module = self._module
+        if module is not None:
+            return module
+        module = sys.modules.get(self._name)
+        if module is None:
+            module = importlib.import_module(self._name)
+        elif self._devReload and follicleJntsTool.devReload:
+            module = reload(module)
+        object.__setattr__(self, '_module', module)
+        scope = self._scope
+        if scope is not None and scope.get(self._alias) is self:
+            scope[self._alias] = module
+        return module
+
+
+def isLoaded(module):
+    """Whether module (a module or LazyModule) has been imported"""
+    if isinstance(module, LazyModule):
+        return module._module is not None
+    return True
+
+
+def load(module):
+    """Return module, importing it first if it's a LazyModule"""
+    if isinstance(module, LazyModule):
+        return module._load()
+    return module
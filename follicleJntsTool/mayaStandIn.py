@@ -0,0 +1,2072 @@
+"""
+#
+# mayaStandIn.py
+#
+# @author Nathan Chisholm
+# @web nathanchisholm.weebly.com
+#
+# --------------------------------------------------------------------
+# An in-memory stand-in for the slice of pymel.core (and of
+# maya.api.OpenMaya and maya.cmds, for batchPlan) used by the follicle
+# joint tools, for benchmarks and command-count checks on a machine
+# without Maya (see standInBenchmarks).
+#
+# Nodes, attributes, connections, DAG parenting and Maya-style unique
+# '#' naming are modelled; evaluation is not (except for the closest
+# point nodes and simple math nodes.)  Every call that would be a Maya
+# command is counted by command type and charged a configurable
+# latency, added to a modelled clock rather than slept; API calls are
+# counted together, as 'api'.
+#
+# from follicleJntsTool import mayaStandIn
+# standIn = mayaStandIn.install()    # before importing follicleJnts
+# import follicleJntsTool.follicleJnts as folTools
+# patch = standIn.pm.nurbsPlane(ch=0)[0].getShape()
+# folTools.newFollicleGrid(patch=patch, uvRows=[10, 10])
+# print standIn.commandCounts, standIn.scene.modelledTime
+#
+"""
+
+
+import copy
+import re
+import imp
+import sys
+import types
+import fnmatch
+import itertools
+
+
+# Node type inheritance (for ls -type etc.)
+_typeParents = {
+    'dagNode': 'node',
+    'transform': 'dagNode',
+    'joint': 'transform',
+    'shape': 'dagNode',
+    'geometryShape': 'shape',
+    'surfaceShape': 'geometryShape',
+    'controlPoint': 'surfaceShape',
+    'nurbsSurface': 'controlPoint',
+    'mesh': 'controlPoint',
+    'locator': 'shape',
+    'follicle': 'shape',
+    }
+
+# Attributes by node type: (long name, short name, default value)
+# Names ending in [] are multi (array) attributes.
+_typeAttrs = {
+    'node': [
+        ('message', 'msg', None),
+        ('caching', 'cch', False),
+        ('nodeState', 'nds', 0),
+        ],
+    'dagNode': [
+        ('visibility', 'v', True),
+        ('worldMatrix[]', 'wm', None),
+        ('worldInverseMatrix[]', 'wim', None),
+        ('instObjGroups[]', 'iog', None),
+        ],
+    'transform': [
+        ('translate', 't', (0.0, 0.0, 0.0)),
+        ('translateX', 'tx', 0.0),
+        ('translateY', 'ty', 0.0),
+        ('translateZ', 'tz', 0.0),
+        ('rotate', 'r', (0.0, 0.0, 0.0)),
+        ('rotateX', 'rx', 0.0),
+        ('rotateY', 'ry', 0.0),
+        ('rotateZ', 'rz', 0.0),
+        ('scale', 's', (1.0, 1.0, 1.0)),
+        ('rotatePivot', 'rp', (0.0, 0.0, 0.0)),
+        ('offsetParentMatrix', 'opm', None),
+        ],
+    'joint': [
+        ('radius', 'radi', 1.0),
+        ('jointOrient', 'jo', (0.0, 0.0, 0.0)),
+        ],
+    'shape': [
+        ('intermediateObject', 'io', False),
+        ],
+    'nurbsSurface': [
+        ('local', 'l', None),
+        ('worldSpace[]', 'ws', None),
+        ('create', 'cr', None),
+        ('minValueU', 'mnu', 0.0),
+        ('maxValueU', 'mxu', 1.0),
+        ('minValueV', 'mnv', 0.0),
+        ('maxValueV', 'mxv', 1.0),
+        ('minMaxRangeU', 'mmu', (0.0, 1.0)),
+        ('minMaxRangeV', 'mmv', (0.0, 1.0)),
+        ],
+    'mesh': [
+        ('outMesh', 'o', None),
+        ('outSmoothMesh', 'osm', None),
+        ('worldMesh[]', 'w', None),
+        ('inMesh', 'i', None),
+        ],
+    'follicle': [
+        ('parameterU', 'pu', 0.0),
+        ('parameterV', 'pv', 0.0),
+        ('outTranslate', 'ot', (0.0, 0.0, 0.0)),
+        ('outRotate', 'or', (0.0, 0.0, 0.0)),
+        ('inputSurface', 'is', None),
+        ('inputMesh', 'inm', None),
+        ('inputWorldMatrix', 'iwm', None),
+        ],
+    'addDoubleLinear': [
+        ('input1', 'i1', 0.0),
+        ('input2', 'i2', 0.0),
+        ('output', 'o', 0.0),
+        ],
+    'multDoubleLinear': [
+        ('input1', 'i1', 0.0),
+        ('input2', 'i2', 1.0),
+        ('output', 'o', 0.0),
+        ],
+    'closestPointOnSurface': [
+        ('inputSurface', 'is', None),
+        ('inPosition', 'ip', (0.0, 0.0, 0.0)),
+        ('position', 'p', (0.0, 0.0, 0.0)),
+        ('parameterU', 'u', 0.0),
+        ('parameterV', 'v', 0.0),
+        ],
+    'closestPointOnMesh': [
+        ('inMesh', 'im', None),
+        ('inputMatrix', 'im2', None),
+        ('inPosition', 'ip', (0.0, 0.0, 0.0)),
+        ('position', 'p', (0.0, 0.0, 0.0)),
+        ('parameterU', 'u', 0.0),
+        ('parameterV', 'v', 0.0),
+        ],
+    'pointMatrixMult': [
+        ('inMatrix', 'im', None),
+        ('inPoint', 'ip', (0.0, 0.0, 0.0)),
+        ('output', 'o', (0.0, 0.0, 0.0)),
+        ],
+    'uvPin': [
+        ('deformedGeometry', 'dg', None),
+        ('originalGeometry', 'og', None),
+        ('coordinate[]', 'c', None),
+        ('outputMatrix[]', 'om', None),
+        ('normalizedIsoParms', 'nip', True),
+        ],
+    'decomposeMatrix': [
+        ('inputMatrix', 'imat', None),
+        ('outputTranslate', 'ot', (0.0, 0.0, 0.0)),
+        ('outputRotate', 'or', (0.0, 0.0, 0.0)),
+        ],
+    }
+
+# Children of multi compound attributes: {multi long name: [(ln, sn, default)]}
+_multiChildren = {
+    'coordinate': [
+        ('coordinateU', 'cu', 0.0),
+        ('coordinateV', 'cv', 0.0),
+        ],
+    }
+
+# Default node names, where not the type name
+_defaultShapeParentNames = {
+    'follicle': 'follicle', 'nurbsSurface': 'nurbsPlane',
+    'mesh': 'polySurface', 'locator': 'locator',
+    }
+
+
+def _isType(nodeType, checkType):
+    """True if nodeType is checkType or inherits from it"""
+    while nodeType:
+        if nodeType == checkType:
+            return True
+        if nodeType == 'node':
+            return False
+        nodeType = _typeParents.get(nodeType, 'node')
+    return False
+
+
+def _typeChain(nodeType):
+    chain = []
+    while nodeType:
+        chain.append(nodeType)
+        if nodeType == 'node':
+            break
+        nodeType = _typeParents.get(nodeType, 'node')
+    return chain
+
+
+class _AttrSpec(object):
+    __slots__ = ('longName', 'shortName', 'default', 'multi', 'dynamic',
+                 'keyable', 'children')
+
+    def __init__(self, longName, shortName, default, multi=False,
+                 dynamic=False, keyable=False):
+        self.longName = longName
+        self.shortName = shortName
+        self.default = default
+        self.multi = multi
+        self.dynamic = dynamic
+        self.keyable = keyable
+        self.children = _multiChildren.get(longName)
+
+
+class _NodeData(object):
+    """The scene's record of a node"""
+
+    def __init__(self, scene, nodeType, name, parent=None):
+        self.scene = scene
+        self.type = nodeType
+        self.name = name
+        self.parent = parent
+        self.children = []
+        self.alive = True
+        self.uuid = scene._newUuid()
+        self.worldOrder = next(scene._worldOrder)
+        self.values = {}
+        self.locked = set()
+        self.specs = {}
+        self.data = {}
+        for typ in reversed(_typeChain(nodeType)):
+            for longName, shortName, default in _typeAttrs.get(typ, []):
+                multi = longName.endswith('[]')
+                longName = longName.rstrip('[]')
+                spec = _AttrSpec(longName, shortName, default, multi)
+                self.specs[longName] = spec
+                self.specs[shortName] = spec
+        self.isDag = _isType(nodeType, 'dagNode')
+
+    def longName(self):
+        if not self.isDag:
+            return self.name
+        path = ''
+        node = self
+        while node is not None:
+            path = '|' + node.name + path
+            node = node.parent
+        return path
+
+
+class StandInScene(object):
+    """The stand-in's node graph plus command counting.
+
+    commandCosts: {command type: modelled seconds}; any command not
+     listed is charged defaultCost (and 'api' calls apiCost.)
+    """
+
+    def __init__(self, defaultCost=0.0001, apiCost=0.000005,
+                 commandCosts=None):
+        self.defaultCost = defaultCost
+        self.apiCost = apiCost
+        self.commandCosts = dict(commandCosts or {})
+        self.reset()
+
+    def reset(self):
+        self.nodes = []
+        self.byName = {}
+        self.nextFree = {}        # (head, tail) -> lowest number not known held
+        self.connections = {}     # dest plug key -> src plug key
+        self.outConnections = {}  # src plug key -> [dest plug keys]
+        self.nodePlugs = {}       # node data -> [connected plug keys]
+        self.selection = []
+        self._uuidCount = itertools.count(1)
+        self._worldOrder = itertools.count()
+        self.resetCounts()
+
+    def resetCounts(self):
+        self.commandCounts = {}
+        self.modelledTime = 0.0
+
+    # Command accounting
+    def charge(self, command, count=1):
+        counts = self.commandCounts
+        counts[command] = counts.get(command, 0) + count
+        if command == 'api':
+            cost = self.apiCost
+        else:
+            cost = self.commandCosts.get(command, self.defaultCost)
+        self.modelledTime += cost * count
+
+    @property
+    def commandTotal(self):
+        return sum([count for command, count in self.commandCounts.items()
+                    if command != 'api'])
+
+    def _newUuid(self):
+        return '00000000-0000-0000-0000-%012d' % next(self._uuidCount)
+
+    # Naming
+    def nameExists(self, name):
+        return name in self.byName
+
+    def uniqueName(self, name, ignore=None):
+        """Maya style unique name: '#' or clashes get the next number"""
+        if '#' in name:
+            head, tail = name.split('#', 1)
+            return head + str(self._freeNumber(head, tail, 1, ignore)) + tail
+        if not self._heldBy(name, ignore):
+            return name
+        match = re.match(r'^(.*?)(\d*)$', name)
+        head, numStr = match.groups()
+        start = int(numStr) + 1 if numStr else 1
+        return head + str(self._freeNumber(head, '', start, ignore))
+
+    def _freeNumber(self, head, tail, start, ignore):
+        """Lowest number >= start free for head + number + tail.
+
+        nextFree keeps, per stem, a number below which every name is held,
+        so repeated lookups on one stem don't rescan its siblings.
+        """
+        stem = (head, tail)
+        known = self.nextFree.get(stem, 1)
+        while self._heldBy(head + str(known) + tail, None):
+            known += 1
+        self.nextFree[stem] = known
+        num = max(start, known)
+        while self._heldBy(head + str(num) + tail, None):
+            num += 1
+        # The ignored node's own name counts as free
+        if ignore is not None and ignore.name.startswith(head) and (
+                ignore.name.endswith(tail)):
+            ownNum = ignore.name[len(head):len(ignore.name) - len(tail)]
+            if ownNum.isdigit() and ownNum[0] != '0' and (
+                    start <= int(ownNum) < num):
+                num = int(ownNum)
+        return num
+
+    def _heldBy(self, name, ignore):
+        holder = self.byName.get(name)
+        return holder is not None and holder is not ignore
+
+    def _claimName(self, data, name):
+        data.name = name
+        self.byName[name] = data
+
+    def _releaseName(self, data):
+        name = data.name
+        if self.byName.get(name) is not data:
+            return
+        del self.byName[name]
+        # Any stem this name is numbered under has a free number again
+        nextFree = self.nextFree
+        for i, char in enumerate(name):
+            if not char.isdigit() or char == '0':
+                continue
+            j = i + 1
+            while j <= len(name) and name[i:j].isdigit():
+                stem = (name[:i], name[j:])
+                if nextFree.get(stem, 0) > int(name[i:j]):
+                    nextFree[stem] = int(name[i:j])
+                j += 1
+
+    def _setName(self, data, name):
+        self._releaseName(data)
+        self._claimName(data, name)
+
+    # Nodes
+    def createNode(self, nodeType, name=None, parent=None):
+        if _isType(nodeType, 'shape') and parent is None:
+            baseName = _defaultShapeParentNames.get(nodeType, nodeType)
+            parent = self.createNode('transform', baseName + '#')
+            if name is None:
+                name = self.uniqueName(
+                    parent.name.replace(baseName, baseName + 'Shape', 1))
+        if name is None:
+            name = nodeType + '#'
+        name = self.uniqueName(name)
+        data = _NodeData(self, nodeType, name, parent)
+        if parent is not None:
+            parent.children.append(data)
+        self.nodes.append(data)
+        self._claimName(data, name)
+        return data
+
+    def deleteNode(self, data):
+        if not data.alive:
+            return
+        for child in list(data.children):
+            self.deleteNode(child)
+        data.alive = False
+        for key in list(self.nodePlugs.get(data, ())):
+            if key in self.connections:
+                self._disconnect(self.connections[key], key)
+            for dest in list(self.outConnections.get(key, ())):
+                self._disconnect(key, dest)
+        if data.parent is not None and data in data.parent.children:
+            data.parent.children.remove(data)
+        self._releaseName(data)
+        self.nodes.remove(data)
+        if data in self.selection:
+            self.selection.remove(data)
+
+    def reparent(self, data, parent):
+        if data.parent is not None:
+            data.parent.children.remove(data)
+        data.parent = parent
+        if parent is not None:
+            parent.children.append(data)
+        else:
+            data.worldOrder = next(self._worldOrder)
+
+    # Connections (plug keys are (nodeData, attrPath))
+    def connect(self, src, dest, force=False):
+        if dest in self.connections:
+            if not force:
+                raise RuntimeError(
+                    "Maya Error - '%s' is already connected" % (
+                        _plugName(dest)))
+            self._disconnect(self.connections[dest], dest)
+        self.connections[dest] = src
+        self.outConnections.setdefault(src, []).append(dest)
+        for key in (src, dest):
+            plugs = self.nodePlugs.setdefault(key[0], [])
+            if not key in plugs:
+                plugs.append(key)
+
+    def inputsOf(self, data):
+        """The node's input connections: [(dest key, src key)]"""
+        return [(key, self.connections[key])
+                for key in self.nodePlugs.get(data, ())
+                if key in self.connections]
+
+    def _disconnect(self, src, dest):
+        if self.connections.get(dest) == src:
+            del self.connections[dest]
+            outs = self.outConnections.get(src, [])
+            if dest in outs:
+                outs.remove(dest)
+            if not outs:
+                self.outConnections.pop(src, None)
+            for key in (src, dest):
+                if not (key in self.connections or
+                        key in self.outConnections):
+                    self.nodePlugs[key[0]].remove(key)
+
+
+def _plugName(key):
+    return '%s.%s' % (key[0].name, key[1])
+
+
+# --------------------------------------------------------------------
+# pymel.core stand-in
+
+
+def _buildPymelCore(scene):
+    """Return a module standing in for pymel.core, backed by scene"""
+    pm = types.ModuleType('pymel.core')
+    pm.__file__ = __file__
+    pm.scene = scene
+
+    charge = scene.charge
+
+    # -- Attribute path helpers --
+    def splitPlugPath(path):
+        """eg. 'coordinate[2].coordinateU' ->
+        [('coordinate', 2), ('coordinateU', None)]"""
+        parts = []
+        for part in path.split('.'):
+            match = re.match(r'^(\w+)(?:\[(\d+)\])?$', part)
+            if not match:
+                raise AttributeError("Invalid attribute: %s" % path)
+            name, index = match.groups()
+            parts.append((name, int(index) if index is not None else None))
+        return parts
+
+    def canonicalPath(data, path):
+        """Return the long-name attribute path, or None if invalid"""
+        parts = splitPlugPath(path)
+        name, index = parts[0]
+        spec = data.specs.get(name)
+        if spec is None:
+            return None
+        out = spec.longName
+        if index is not None:
+            if not spec.multi:
+                return None
+            out += '[%d]' % index
+        elif spec.multi and len(parts) > 1:
+            return None
+        if len(parts) > 1:
+            if not spec.children or len(parts) > 2:
+                return None
+            childName = parts[1][0]
+            for longName, shortName, default in spec.children:
+                if childName in (longName, shortName):
+                    out += '.' + longName
+                    break
+            else:
+                return None
+        return out
+
+    def specFor(data, canonical):
+        spec = data.specs[canonical.split('[')[0].split('.')[0]]
+        if '.' in canonical and spec.children:
+            childName = canonical.split('.')[1]
+            for longName, shortName, default in spec.children:
+                if longName == childName:
+                    return _AttrSpec(longName, shortName, default)
+        return spec
+
+    # -- Node classes --
+    class PyNode(object):
+        __slots__ = ('_data',)
+
+        def __new__(cls, *args):
+            if cls is PyNode:
+                if not args:
+                    raise TypeError("PyNode requires a node name")
+                obj = args[0]
+                if isinstance(obj, PyNode):
+                    return obj
+                charge('api')
+                found = resolve(str(obj))
+                if found is None:
+                    raise MayaNodeError("No object matches name: %s" % obj)
+                return found
+            return object.__new__(cls)
+
+        def __init__(self, *args):
+            pass
+
+    class MayaNodeError(Exception):
+        pass
+
+    class DependNode(PyNode):
+        __slots__ = ()
+
+        def __eq__(self, other):
+            if isinstance(other, DependNode):
+                return self._data is other._data
+            if isinstance(other, basestring):
+                return other in (self._data.name, self._data.longName())
+            return False
+
+        def __ne__(self, other):
+            return not self.__eq__(other)
+
+        def __hash__(self):
+            return hash(self._data)
+
+        def __str__(self):
+            return self._data.name
+
+        def __repr__(self):
+            nodeType = self._data.type
+            return "nt.%s(%r)" % (
+                nodeType[0].upper() + nodeType[1:], self._data.name)
+
+        def __getattr__(self, name):
+            if name.startswith('__'):
+                raise AttributeError(name)
+            charge('api')
+            return self.attr(name)
+
+        def attr(self, name):
+            canonical = canonicalPath(self._data, name)
+            if canonical is None:
+                raise AttributeError(
+                    "%r has no attribute or method named '%s'" % (self, name))
+            return Attribute._make(self._data, canonical)
+
+        def hasAttr(self, name):
+            return canonicalPath(self._data, name) is not None
+
+        def exists(self):
+            return self._data.alive
+
+        def name(self, long=False):
+            if long:
+                return self._data.longName()
+            return self._data.name
+
+        def nodeName(self):
+            return self._data.name
+
+        def type(self):
+            charge('nodeType')
+            return self._data.type
+
+        def uuid(self):
+            return self._data.uuid
+
+        def inputs(self, **kwargs):
+            return _listConnections([self], s=1, d=0, **kwargs)
+
+        def outputs(self, **kwargs):
+            return _listConnections([self], s=0, d=1, **kwargs)
+
+        def rename(self, name):
+            return rename(self, name)
+
+    class DagNode(DependNode):
+        __slots__ = ()
+
+        def longName(self):
+            return self._data.longName()
+
+        def fullPath(self):
+            return self._data.longName()
+
+        def getParent(self):
+            charge('listRelatives')
+            parent = self._data.parent
+            return wrap(parent) if parent is not None else None
+
+        def getChildren(self, typ=None, type=None, ni=False, shapes=False):
+            charge('listRelatives')
+            return _relatives(self, typ or type, ni, shapes=shapes)
+
+        def getShapes(self, typ=None, type=None, ni=False):
+            charge('listRelatives')
+            return _relatives(self, typ or type, ni, shapes=True)
+
+        def getShape(self, **kwargs):
+            shapes = self.getShapes(**kwargs)
+            return shapes[0] if shapes else None
+
+        def getSiblings(self, typ=None, type=None, ni=False):
+            charge('listRelatives')
+            parent = self._data.parent
+            if parent is None:
+                return []
+            return [node for node in _relatives(wrap(parent), typ or type, ni)
+                    if node._data is not self._data]
+
+    class Transform(DagNode):
+        __slots__ = ()
+
+    class Joint(Transform):
+        __slots__ = ()
+
+    class Shape(DagNode):
+        __slots__ = ()
+
+    class SurfaceShape(Shape):
+        __slots__ = ()
+
+    class NurbsSurface(SurfaceShape):
+        __slots__ = ()
+
+        def numCVsInV(self):
+            charge('api')
+            return len(self._data.data['nurbs']['cvs'][0])
+
+        def numCVsInU(self):
+            charge('api')
+            return len(self._data.data['nurbs']['cvs'])
+
+        def getCVs(self, space='preTransform'):
+            charge('api')
+            return [list(cv) for row in self._data.data['nurbs']['cvs']
+                    for cv in row]
+
+        def getKnotsInU(self):
+            charge('api')
+            return list(self._data.data['nurbs']['knotsU'])
+
+        def getKnotsInV(self):
+            charge('api')
+            return list(self._data.data['nurbs']['knotsV'])
+
+        def degreeU(self):
+            return self._data.data['nurbs']['degree'][0]
+
+        def degreeV(self):
+            return self._data.data['nurbs']['degree'][1]
+
+        def formInU(self):
+            return self._data.data['nurbs']['form'][0]
+
+        def formInV(self):
+            return self._data.data['nurbs']['form'][1]
+
+    class Mesh(SurfaceShape):
+        __slots__ = ()
+
+        def _mesh(self):
+            charge('api')
+            return self._data.data
+
+        def getPoints(self, space='preTransform'):
+            return [list(p) for p in self._mesh()['meshPoints']]
+
+        def numVertices(self):
+            return len(self._mesh()['meshPoints'])
+
+        def numFaces(self):
+            return len(self._mesh()['faceCounts'])
+
+        def getVertices(self):
+            data = self._mesh()
+            return list(data['faceCounts']), list(data['faceVertexIds'])
+
+        def getTriangles(self):
+            data = self._mesh()
+            counts, verts, pos = [], [], 0
+            for count in data['faceCounts']:
+                ids = data['faceVertexIds'][pos:pos + count]
+                pos += count
+                counts.append(count - 2)
+                for i in range(1, count - 1):
+                    verts.extend([ids[0], ids[i], ids[i + 1]])
+            return counts, verts
+
+        def getAssignedUVs(self):
+            data = self._mesh()
+            return list(data['faceCounts']), list(data['faceUVIds'])
+
+        def getUVs(self):
+            uvs = self._mesh()['meshUVs']
+            return [uv[0] for uv in uvs], [uv[1] for uv in uvs]
+
+    class Follicle(Shape):
+        __slots__ = ()
+
+    nt = types.ModuleType('pymel.core.nodetypes')
+    classes = {
+        'node': DependNode, 'dagNode': DagNode, 'transform': Transform,
+        'joint': Joint, 'shape': Shape, 'surfaceShape': SurfaceShape,
+        'nurbsSurface': NurbsSurface, 'mesh': Mesh, 'follicle': Follicle,
+        }
+    for cls in set(classes.values()):
+        setattr(nt, cls.__name__, cls)
+
+    def wrap(data):
+        for typ in _typeChain(data.type):
+            cls = classes.get(typ)
+            if cls is not None:
+                break
+        node = object.__new__(cls)
+        node._data = data
+        return node
+
+    # -- Attributes --
+    class Attribute(PyNode):
+        __slots__ = ('_node', '_path')
+
+        @classmethod
+        def _make(cls, data, path):
+            attr = object.__new__(Attribute)
+            attr._node = data
+            attr._path = path
+            return attr
+
+        def __new__(cls, *args):
+            if args and isinstance(args[0], Attribute):
+                return args[0]
+            if args:
+                charge('api')
+                found = resolve(str(args[0]))
+                if not isinstance(found, Attribute):
+                    raise MayaAttributeError(
+                        "Maya Attribute does not exist: %r" % args[0])
+                return found
+            return object.__new__(cls)
+
+        @property
+        def _key(self):
+            return (self._node, self._path)
+
+        def __eq__(self, other):
+            if isinstance(other, Attribute):
+                return self._key == other._key
+            if isinstance(other, basestring):
+                found = resolve(other)
+                return isinstance(found, Attribute) and found._key == self._key
+            return False
+
+        def __ne__(self, other):
+            return not self.__eq__(other)
+
+        def __hash__(self):
+            return hash(self._key)
+
+        def __str__(self):
+            return '%s.%s' % (self._node.name, self._path)
+
+        def __repr__(self):
+            return 'Attribute(%r)' % str(self)
+
+        def name(self):
+            return str(self)
+
+        def plugAttr(self, longName=False):
+            return self._path
+
+        def attrName(self, longName=False):
+            return self._path.split('.')[-1].split('[')[0]
+
+        def node(self):
+            return wrap(self._node)
+
+        def index(self):
+            match = re.search(r'\[(\d+)\]', self._path)
+            return int(match.group(1))
+
+        def exists(self):
+            return self._node.alive
+
+        def __getitem__(self, index):
+            spec = self._node.specs[self._path.split('[')[0]]
+            if not spec.multi or '[' in self._path:
+                raise TypeError("%s is not a multi attribute" % self)
+            return Attribute._make(self._node, '%s[%d]' % (self._path, index))
+
+        def __getattr__(self, name):
+            if name.startswith('__'):
+                raise AttributeError(name)
+            spec = self._node.specs.get(self._path.split('[')[0])
+            if spec is not None and spec.children:
+                canonical = canonicalPath(
+                    self._node, '%s.%s' % (self._path, name))
+                if canonical is not None:
+                    return Attribute._make(self._node, canonical)
+            raise AttributeError(
+                "%r has no attribute or method named '%s'" % (self, name))
+
+        def get(self, **kwargs):
+            charge('getAttr')
+            return getValue(self._node, self._path)
+
+        def set(self, *args, **kwargs):
+            charge('setAttr')
+            setValue(self, args, kwargs)
+
+        def inputs(self, **kwargs):
+            return _listConnections([self], s=1, d=0, **kwargs)
+
+        def outputs(self, **kwargs):
+            return _listConnections([self], s=0, d=1, **kwargs)
+
+        def isConnected(self):
+            return self._key in scene.connections
+
+        def isLocked(self):
+            return self._path in self._node.locked
+
+        def lock(self):
+            charge('setAttr')
+            self._node.locked.add(self._path)
+
+        def unlock(self):
+            charge('setAttr')
+            self._node.locked.discard(self._path)
+
+        def isFreeToChange(self):
+            charge('api')
+            if self.isLocked() or self._key in scene.connections:
+                return 'notFreeToChange'
+            return 'freeToChange'
+
+        def connect(self, dest, force=False):
+            connectAttr(self, dest, f=force)
+
+        __rshift__ = connect
+
+    class Component(PyNode):
+        __slots__ = ('_node', '_comp')
+
+        def __str__(self):
+            return '%s.%s' % (self._node.name, self._comp)
+
+        def __repr__(self):
+            return 'Component(%r)' % str(self)
+
+        def __eq__(self, other):
+            return str(self) == str(other)
+
+        def __hash__(self):
+            return hash(str(self))
+
+        def node(self):
+            data = self._node
+            if _isType(data.type, 'transform'):
+                data = [child for child in data.children
+                        if _isType(child.type, 'shape')][0]
+            return wrap(data)
+
+    def makeComponent(data, comp):
+        obj = object.__new__(Component)
+        obj._node = data
+        obj._comp = comp
+        return obj
+
+    pm.Component = Component
+
+    class MayaAttributeError(AttributeError):
+        pass
+
+    def getValue(data, path):
+        key = (data, path)
+        src = scene.connections.get(key)
+        if src is not None:
+            return computeValue(src[0], src[1])
+        return computeValue(data, path)
+
+    def computeValue(data, path):
+        if path in data.values:
+            return data.values[path]
+        key = (data, path)
+        src = scene.connections.get(key)
+        if src is not None:
+            return computeValue(src[0], src[1])
+        evaluator = _evaluators.get((data.type, path))
+        if evaluator is not None:
+            return evaluator(data, path)
+        if path == 'output' and data.type in (
+                'addDoubleLinear', 'multDoubleLinear'):
+            i1 = getValue(data, 'input1')
+            i2 = getValue(data, 'input2')
+            return i1 + i2 if data.type == 'addDoubleLinear' else i1 * i2
+        spec = specFor(data, path)
+        return spec.default
+
+    def setValue(attr, args, kwargs):
+        data, path = attr._node, attr._path
+        hasLock = 'lock' in kwargs or 'l' in kwargs
+        hasKeyable = 'k' in kwargs or 'keyable' in kwargs
+        if hasLock or hasKeyable:
+            if kwargs.get('lock', kwargs.get('l')):
+                data.locked.add(path)
+            elif hasLock:
+                data.locked.discard(path)
+            if hasKeyable:
+                specFor(data, path).keyable = bool(
+                    kwargs.get('k', kwargs.get('keyable')))
+            if not args:
+                return
+        if path in data.locked:
+            raise RuntimeError(
+                "Maya Error - The attribute '%s' is locked or connected "
+                "and cannot be modified." % attr)
+        if (data, path) in scene.connections:
+            raise RuntimeError(
+                "Maya Error - The attribute '%s' is locked or connected "
+                "and cannot be modified." % attr)
+        if len(args) == 1:
+            value = args[0]
+            if isinstance(value, list):
+                value = tuple(value)
+        else:
+            value = tuple(args)
+        data.values[path] = value
+        # Keep compound/child values in step (translate <-> tx/ty/tz)
+        spec = specFor(data, path)
+        for compound, children in _compoundChildren.items():
+            if path == compound:
+                for i, child in enumerate(children):
+                    data.values[child] = value[i]
+            elif path in children and compound in data.specs:
+                current = list(computeValue(data, compound))
+                current[children.index(path)] = value
+                data.values[compound] = tuple(current)
+
+    _compoundChildren = {
+        'translate': ['translateX', 'translateY', 'translateZ'],
+        'rotate': ['rotateX', 'rotateY', 'rotateZ'],
+        }
+
+    _evaluators = {}
+    pm._evaluators = _evaluators
+    pm.getValue = getValue
+
+    # -- Resolving names --
+    def resolve(name):
+        """Return the PyNode/Attribute for a name, or None"""
+        if isinstance(name, PyNode):
+            return name
+        name = str(name)
+        nodeName, dot, attrPath = name.partition('.')
+        data = findNodeData(nodeName)
+        if data is None:
+            return None
+        if not dot:
+            return wrap(data)
+        if re.match(r'^(vtx|cv|pt|e|f)\[', attrPath):
+            return makeComponent(data, attrPath)
+        canonical = canonicalPath(data, attrPath)
+        if canonical is None:
+            return None
+        return Attribute._make(data, canonical)
+
+    def findNodeData(nodeName):
+        if '|' in nodeName:
+            leaf = nodeName.rpartition('|')[2]
+            data = scene.byName.get(leaf)
+            if data is not None and (
+                    not nodeName.startswith('|') or
+                    data.longName() == nodeName):
+                return data
+            return None
+        return scene.byName.get(nodeName)
+
+    def toData(obj):
+        if isinstance(obj, DependNode):
+            return obj._data
+        data = findNodeData(str(obj))
+        if data is None:
+            raise MayaNodeError("No object matches name: %s" % obj)
+        return data
+
+    def toAttr(obj):
+        if isinstance(obj, Attribute):
+            return obj
+        found = resolve(str(obj))
+        if not isinstance(found, Attribute):
+            raise MayaAttributeError(
+                "Maya Attribute does not exist: %r" % str(obj))
+        return found
+
+    def flatList(args):
+        out = []
+        for arg in args:
+            if isinstance(arg, (list, tuple, set)):
+                out.extend(flatList(arg))
+            elif arg is not None:
+                out.append(arg)
+        return out
+
+    def typeMatches(data, types_, exact=False):
+        if types_ is None:
+            return True
+        if isinstance(types_, basestring):
+            types_ = [types_]
+        for typ in types_:
+            if exact:
+                if data.type == typ:
+                    return True
+            elif _isType(data.type, typ):
+                return True
+        return False
+
+    def _relatives(node, typ, ni, shapes=False):
+        out = []
+        for child in node._data.children:
+            if shapes and not _isType(child.type, 'shape'):
+                continue
+            if ni and child.values.get('intermediateObject'):
+                continue
+            if typeMatches(child, typ):
+                out.append(wrap(child))
+        return out
+
+    def _listConnections(objs, s=True, d=True, p=False, c=False, t=None,
+                         type=None, exactType=False, et=False, shapes=False,
+                         sh=False, plugs=None, connections=None,
+                         source=None, destination=None, **kwargs):
+        charge('listConnections')
+        if source is not None:
+            s = source
+        if destination is not None:
+            d = destination
+        if plugs is not None:
+            p = plugs
+        if connections is not None:
+            c = connections
+        t = t or type
+        exactType = exactType or et
+        out = []
+        for obj in objs:
+            if not isinstance(obj, PyNode) and '.' in str(obj):
+                obj = toAttr(obj)
+            if isinstance(obj, Attribute):
+                keys = [obj._key]
+                spec = obj._node.specs[obj._path.split('[')[0]]
+                if '.' not in obj._path and spec.children:
+                    # (And the compound's children)
+                    keys.extend([
+                        key for key in scene.nodePlugs.get(obj._node, ())
+                        if key[1].startswith(obj._path + '.')])
+            else:
+                keys = list(scene.nodePlugs.get(toData(obj), ()))
+            seen = set()
+            for key in keys:
+                if key in seen:
+                    continue
+                seen.add(key)
+                others = []
+                if s and key in scene.connections:
+                    others.append(scene.connections[key])
+                if d and key in scene.outConnections:
+                    others.extend(scene.outConnections[key])
+                for other in others:
+                    if not (other[0].alive and
+                            typeMatches(other[0], t, exactType)):
+                        continue
+                    if p:
+                        result = Attribute._make(other[0], other[1])
+                    else:
+                        result = wrap(other[0])
+                    if c:
+                        out.append((Attribute._make(key[0], key[1]), result))
+                    else:
+                        out.append(result)
+        if not c and not p:
+            # Node lists are unique, as in Maya
+            unique = []
+            seenNodes = set()
+            for node in out:
+                if node._data not in seenNodes:
+                    seenNodes.add(node._data)
+                    unique.append(node)
+            out = unique
+        return out
+
+    # -- Commands --
+    def command(name):
+        def decorator(func):
+            def wrapper(*args, **kwargs):
+                charge(name)
+                return func(*args, **kwargs)
+            wrapper.__name__ = func.__name__
+            wrapper.__doc__ = func.__doc__
+            setattr(pm, func.__name__, wrapper)
+            return wrapper
+        return decorator
+
+    @command('createNode')
+    def createNode(nodeType, n=None, name=None, p=None, parent=None,
+                   ss=False, skipSelect=False, **kwargs):
+        parent = p or parent
+        parentData = toData(parent) if parent is not None else None
+        data = scene.createNode(nodeType, n or name, parentData)
+        node = wrap(data)
+        if not (ss or skipSelect):
+            scene.selection = [data]
+        return node
+
+    @command('rename')
+    def rename(obj, newName, **kwargs):
+        data = toData(obj)
+        oldName = data.name
+        newName = scene.uniqueName(newName, ignore=data)
+        scene._setName(data, newName)
+        # Shapes follow their transform's name (as in Maya)
+        for child in data.children:
+            if _isType(child.type, 'shape') and (
+                    child.name == oldName + 'Shape'):
+                scene._setName(child, scene.uniqueName(
+                    newName + 'Shape', ignore=child))
+        return wrap(data)
+
+    @command('connectAttr')
+    def connectAttr(src, dest, f=False, force=False, **kwargs):
+        srcAttr, destAttr = toAttr(src), toAttr(dest)
+        if destAttr._path in destAttr._node.locked:
+            raise RuntimeError(
+                "Maya Error - The destination attribute '%s' is locked" % (
+                    destAttr))
+        scene.connect(srcAttr._key, destAttr._key, force=f or force)
+
+    @command('disconnectAttr')
+    def disconnectAttr(src, dest=None, **kwargs):
+        srcAttr = toAttr(src)
+        if dest is None:
+            for destKey in list(scene.outConnections.get(srcAttr._key, [])):
+                scene._disconnect(srcAttr._key, destKey)
+            return
+        scene._disconnect(srcAttr._key, toAttr(dest)._key)
+
+    def listConnections(*args, **kwargs):
+        return _listConnections(flatList(args), **kwargs)
+
+    pm.listConnections = listConnections
+
+    @command('ls')
+    def ls(*args, **kwargs):
+        return _ls(flatList(args), **kwargs)
+
+    def _ls(objs, sl=False, selection=False, type=None, typ=None,
+            exactType=None, et=None, dag=False, ni=False,
+            noIntermediate=False, regex=None, fl=False, flatten=False,
+            recursive=False, r=False, uuid=False, long=False, l=False,
+            transforms=False, shapes=False, assemblies=False, showType=False,
+            st=False, **kwargs):
+        if showType or st:
+            out = []
+            for node in _ls(objs, type=type, typ=typ, exactType=exactType,
+                            et=et, dag=dag, ni=ni, recursive=recursive, r=r):
+                out.extend([node, node._data.type])
+            return out
+        if assemblies:
+            roots = [data for data in scene.nodes if data.alive and
+                     _isType(data.type, 'dagNode') and data.parent is None]
+            roots.sort(key=lambda data: data.worldOrder)
+            return [wrap(data) for data in roots]
+        types_ = type or typ
+        exact = exactType or et
+        if exact:
+            types_ = exact
+        ni = ni or noIntermediate
+        if sl or selection:
+            candidates = [wrap(data) for data in scene.selection if data.alive]
+            if objs:
+                candidates += [c for c in _lsNames(objs, recursive or r)]
+        elif objs:
+            candidates = _lsNames(objs, recursive or r)
+        else:
+            candidates = [wrap(data) for data in scene.nodes]
+        if dag:
+            expanded = []
+            for node in candidates:
+                if isinstance(node, DagNode):
+                    stack = [node._data]
+                    while stack:
+                        data = stack.pop(0)
+                        expanded.append(wrap(data))
+                        stack[0:0] = data.children
+            candidates = expanded
+        out = []
+        seen = set()
+        for node in candidates:
+            if isinstance(node, Component):
+                if fl or flatten:
+                    out.extend(_flattenComponent(node))
+                else:
+                    out.append(node)
+                continue
+            if isinstance(node, Attribute):
+                if types_ is None and node._key not in seen:
+                    seen.add(node._key)
+                    out.append(node)
+                continue
+            data = node._data
+            if data in seen or not data.alive:
+                continue
+            if not typeMatches(data, types_, bool(exact)):
+                continue
+            if ni and data.values.get('intermediateObject'):
+                continue
+            if transforms and not _isType(data.type, 'transform'):
+                continue
+            if shapes and not _isType(data.type, 'shape'):
+                continue
+            if regex is not None and not re.match(regex + '$', data.name):
+                continue
+            seen.add(data)
+            out.append(node)
+        if uuid:
+            return [node._data.uuid for node in out
+                    if not isinstance(node, Attribute)]
+        if long or l:
+            return [node.longName() if isinstance(node, DagNode) else str(node)
+                    for node in out]
+        return out
+
+    def _flattenComponent(comp):
+        name = comp._comp.partition('[')[0]
+        nodeName = str(comp).partition('.')[0]
+        positions = _componentPositions(str(comp))
+        ranges = re.findall(r'\[(\d+|\*)(?::(\d+))?\]', comp._comp)
+        if len(ranges) == 1 and ranges[0][0] != '*':
+            start, end = ranges[0]
+            return [makeComponent(comp._node, '%s[%d]' % (name, i))
+                    for i in range(int(start), int(end or start) + 1)]
+        raise NotImplementedError('Stand-in only flattens 1D index ranges')
+
+    def _lsNames(objs, recursive=False):
+        out = []
+        for obj in objs:
+            if isinstance(obj, PyNode):
+                if isinstance(obj, Attribute) or obj._data.alive:
+                    out.append(obj)
+                continue
+            name = str(obj)
+            if re.match(r'^[0-9A-F]{8}-', name):
+                out.extend([wrap(d) for d in scene.nodes if d.uuid == name])
+                continue
+            if '*' in name or '?' in name:
+                matchName = name
+                if recursive and ':' in name:
+                    matchName = name.rpartition(':')[2]
+                    ns = name.rpartition(':')[0].rstrip('*')
+                    out.extend([
+                        wrap(d) for d in scene.nodes if
+                        d.name.startswith(ns + ':') and
+                        fnmatch.fnmatchcase(
+                            d.name.rpartition(':')[2], matchName)])
+                    continue
+                out.extend([wrap(d) for d in scene.nodes
+                            if fnmatch.fnmatchcase(d.name, name)])
+                continue
+            found = resolve(name)
+            if found is not None:
+                out.append(found)
+        return out
+
+    @command('duplicate')
+    def duplicate(*args, **kwargs):
+        objs = flatList(args)
+        if not objs:
+            objs = [wrap(d) for d in scene.selection]
+        un = kwargs.get('un') or kwargs.get('upstreamNodes')
+        ic = kwargs.get('ic') or kwargs.get('inputConnections')
+        rr = kwargs.get('rr') or kwargs.get('returnRootsOnly')
+        roots = [toData(obj) for obj in objs]
+        nodeSet = []
+        inSet = set()
+
+        def addHierarchy(data):
+            if data in inSet:
+                return
+            inSet.add(data)
+            nodeSet.append(data)
+            for child in data.children:
+                addHierarchy(child)
+
+        for root in roots:
+            addHierarchy(root)
+        if un:
+            i = 0
+            while i < len(nodeSet):
+                data = nodeSet[i]
+                for dest, (src, srcPath) in scene.inputsOf(data):
+                    if src not in inSet:
+                        top = src
+                        while (top.parent is not None and
+                                top.parent not in inSet):
+                            if not _isType(top.type, 'shape'):
+                                break
+                            top = top.parent
+                        addHierarchy(top)
+                i += 1
+        mapping = {}
+        for data in nodeSet:
+            parent = mapping.get(data.parent, data.parent)
+            new = scene.createNode(data.type, data.name, parent=parent)
+            new.values = copy.deepcopy(data.values)
+            new.specs = dict(data.specs)
+            new.data = data.data
+            new.locked = set(data.locked)
+            mapping[data] = new
+        for data in nodeSet:
+            for (dest, path), (src, srcPath) in scene.inputsOf(data):
+                if src in mapping and (un or ic):
+                    scene.connect(
+                        (mapping[src], srcPath), (mapping[dest], path))
+                elif ic and src not in mapping:
+                    scene.connect((src, srcPath), (mapping[dest], path))
+        scene.selection = [mapping[root] for root in roots]
+        # (Maya lists the new roots first, in order)
+        newRoots = [mapping[root] for root in roots]
+        if rr:
+            return [wrap(new) for new in newRoots]
+        rootSet = set(roots)
+        return [wrap(new) for new in newRoots] + [
+            wrap(mapping[data]) for data in nodeSet if data not in rootSet]
+
+    @command('listRelatives')
+    def listRelatives(*args, **kwargs):
+        objs = flatList(args)
+        if not objs:
+            objs = [wrap(d) for d in scene.selection]
+        typ = kwargs.get('type', kwargs.get('typ'))
+        out = []
+        seen = set()
+        for obj in objs:
+            data = toData(obj)
+            if kwargs.get('parent') or kwargs.get('p'):
+                found = [data.parent] if data.parent is not None else []
+            elif kwargs.get('allDescendents') or kwargs.get('ad'):
+                found = []
+                stack = list(data.children)
+                while stack:
+                    child = stack.pop()
+                    found.append(child)
+                    stack.extend(child.children)
+            else:
+                found = list(data.children)
+            for child in found:
+                if child in seen:
+                    continue
+                if (kwargs.get('shapes') or kwargs.get('s')) and not _isType(
+                        child.type, 'shape'):
+                    continue
+                if (kwargs.get('ni') or kwargs.get('noIntermediate')) and (
+                        child.values.get('intermediateObject')):
+                    continue
+                if not typeMatches(child, typ):
+                    continue
+                seen.add(child)
+                out.append(wrap(child))
+        return out
+
+    @command('objExists')
+    def objExists(name):
+        return resolve(name) is not None
+
+    @command('select')
+    def select(*args, **kwargs):
+        objs = flatList(args)
+        if kwargs.get('cl') or kwargs.get('clear'):
+            scene.selection = []
+            return
+        datas = []
+        for obj in objs:
+            if isinstance(obj, Attribute):
+                continue
+            datas.append(toData(obj))
+        if kwargs.get('add') or kwargs.get('af'):
+            scene.selection.extend([
+                data for data in datas if data not in scene.selection])
+        elif kwargs.get('d') or kwargs.get('deselect'):
+            scene.selection = [d for d in scene.selection if d not in datas]
+        else:
+            scene.selection = datas
+
+    @command('addAttr')
+    def addAttr(obj, ln=None, longName=None, sn=None, shortName=None,
+                k=False, keyable=False, at='double', dv=0.0,
+                defaultValue=None, **kwargs):
+        data = toData(obj)
+        longName = ln or longName
+        shortName = sn or shortName or longName
+        if longName in data.specs or shortName in data.specs:
+            raise RuntimeError(
+                "Maya Error - Found '%s' attribute of the same name" % (
+                    longName))
+        default = defaultValue if defaultValue is not None else dv
+        spec = _AttrSpec(longName, shortName, default, dynamic=True,
+                         keyable=k or keyable)
+        data.specs[longName] = spec
+        data.specs[shortName] = spec
+
+    @command('attributeQuery')
+    def attributeQuery(attrName, n=None, node=None, ex=False, exists=False,
+                       **kwargs):
+        data = toData(n or node)
+        return attrName in data.specs
+
+    @command('parent')
+    def parent(*args, **kwargs):
+        objs = flatList(args)
+        if kwargs.get('w') or kwargs.get('world'):
+            newParent = None
+            children = objs
+        else:
+            newParent = toData(objs[-1])
+            children = objs[:-1]
+        out = []
+        for child in children:
+            data = toData(child)
+            scene.reparent(data, newParent)
+            out.append(wrap(data))
+        return out
+
+    @command('delete')
+    def delete(*args, **kwargs):
+        for obj in flatList(args):
+            if isinstance(obj, Attribute):
+                continue
+            data = toData(obj)
+            scene.deleteNode(data)
+
+    @command('group')
+    def group(*args, **kwargs):
+        objs = flatList(args)
+        grp = scene.createNode(
+            'transform', kwargs.get('n', kwargs.get('name', 'group#')))
+        if objs:
+            commonParent = toData(objs[0]).parent
+            if commonParent is not None:
+                scene.reparent(grp, commonParent)
+        for obj in objs:
+            scene.reparent(toData(obj), grp)
+        scene.selection = [grp]
+        return wrap(grp)
+
+    @command('objectType')
+    def objectType(obj, i=None, isType=None, isAType=None, **kwargs):
+        data = toData(obj)
+        checkType = i or isType
+        if checkType is not None:
+            return data.type == checkType
+        if isAType is not None:
+            return _isType(data.type, isAType)
+        return data.type
+
+    @command('nodeType')
+    def nodeType(obj, **kwargs):
+        isTypeName = kwargs.get('isTypeName') or kwargs.get('itn')
+        typ = obj if isTypeName else toData(obj).type
+        if kwargs.get('inherited') or kwargs.get('i'):
+            return list(reversed(_typeChain(typ)))
+        return typ
+
+    @command('getAttr')
+    def getAttr(plug, **kwargs):
+        if kwargs.get('k') or kwargs.get('keyable'):
+            return specFor(toAttr(plug)._node, toAttr(plug)._path).keyable
+        return getValue(toAttr(plug)._node, toAttr(plug)._path)
+
+    @command('deleteAttr')
+    def deleteAttr(obj, at=None, attribute=None, **kwargs):
+        data = toData(obj)
+        name = at or attribute
+        spec = data.specs[name]
+        if not spec.dynamic:
+            raise RuntimeError('Maya Error - not a dynamic attribute')
+        for key in (spec.longName, spec.shortName):
+            data.specs.pop(key, None)
+            data.values.pop(key, None)
+        names = (spec.longName, spec.shortName)
+        for key in list(scene.connections):
+            (dest, dp), (src, sp) = key, scene.connections[key]
+            if (dest is data and dp.split('[')[0] in names) or (
+                    src is data and sp.split('[')[0] in names):
+                scene._disconnect((src, sp), key)
+
+    @command('setAttr')
+    def setAttr(plug, *args, **kwargs):
+        setValue(toAttr(plug), args, kwargs)
+
+    @command('undoInfo')
+    def undoInfo(*args, **kwargs):
+        if kwargs.get('q') or kwargs.get('query'):
+            if kwargs.get('state') or kwargs.get('st'):
+                return scene.undoState
+            return None
+        for flag in ('state', 'st', 'stateWithoutFlush', 'swf'):
+            if flag in kwargs:
+                scene.undoState = bool(kwargs[flag])
+
+    scene.undoState = True
+
+    @command('undo')
+    def undo(*args, **kwargs):
+        pass
+
+    @command('refresh')
+    def refresh(*args, **kwargs):
+        if kwargs.get('q') or kwargs.get('query'):
+            return scene.refreshSuspended
+        if 'suspend' in kwargs or 'su' in kwargs:
+            scene.refreshSuspended = bool(
+                kwargs.get('suspend', kwargs.get('su')))
+
+    scene.refreshSuspended = False
+
+    @command('evaluationManager')
+    def evaluationManager(*args, **kwargs):
+        if kwargs.get('q') or kwargs.get('query'):
+            return [scene.evaluationMode]
+        if 'mode' in kwargs:
+            scene.evaluationMode = kwargs['mode']
+
+    scene.evaluationMode = 'parallel'
+
+    @command('xform')
+    def xform(obj, q=False, query=False, ws=False, rp=False, t=False,
+              translation=False, **kwargs):
+        objs = flatList([obj])
+        if q or query:
+            out = []
+            for item in objs:
+                if isinstance(item, basestring) and '.' in item:
+                    out.extend(_componentPositions(item))
+                    continue
+                data = toData(item)
+                out.extend(list(getValue(data, 'translate')))
+            return out
+        value = t or translation or kwargs.get('translation')
+        for item in objs:
+            toAttr('%s.translate' % toData(item).name).set(tuple(value))
+
+    def _componentPositions(comp):
+        nodeName, dot, compStr = comp.partition('.')
+        data = toData(nodeName)
+        if _isType(data.type, 'transform'):
+            shapes = [c for c in data.children if _isType(c.type, 'shape')]
+            data = shapes[0]
+        points = data.data.get('points')
+        if points is None and 'nurbs' in data.data:
+            cvs = data.data['nurbs']['cvs']
+            points = [cv for row in cvs for cv in row]
+        ranges = re.findall(r'\[(\d+|\*)(?::(\d+))?\]', compStr)
+        if points is None or not ranges:
+            raise RuntimeError("Invalid component: %s" % comp)
+        if 'nurbs' in data.data:
+            cvs = data.data['nurbs']['cvs']
+            counts = (len(cvs), len(cvs[0]))
+        else:
+            counts = (len(points),)
+        axes = []
+        for (start, end), count in zip(ranges, counts):
+            if start == '*':
+                axes.append(range(count))
+            else:
+                axes.append(range(int(start), int(end or start) + 1))
+        if len(axes) == 2:
+            indices = [u * counts[1] + v for u in axes[0] for v in axes[1]]
+        else:
+            indices = axes[0]
+        out = []
+        for index in indices:
+            out.extend(points[index])
+        return out
+
+    @command('pointPosition')
+    def pointPosition(comp, w=False, world=False, **kwargs):
+        return _componentPositions(str(comp))
+
+    class _Mel(object):
+        def eval(self, script):
+            charge('eval')
+            return None
+
+        def evalDeferred(self, script):
+            charge('evalDeferred')
+
+        def __getattr__(self, name):
+            def melProc(*args, **kwargs):
+                charge(name)
+            return melProc
+
+    pm.mel = _Mel()
+
+    # -- Geometry creation --
+    @command('nurbsPlane')
+    def nurbsPlane(name=None, n=None, ch=True, w=1.0, width=None, lr=1.0,
+                   u=1, v=1, patchesU=None, patchesV=None, **kwargs):
+        width = width or w
+        name = name or n or 'nurbsPlane#'
+        xform = scene.createNode('transform', name)
+        shape = scene.createNode(
+            'nurbsSurface', xform.name + 'Shape', parent=xform)
+        patchesU = patchesU or u
+        patchesV = patchesV or v
+        shape.data['nurbs'] = _planeSurfaceData(
+            width, lr * width, patchesU, patchesV)
+        return [wrap(xform)]
+
+    @command('polyPlane')
+    def polyPlane(name=None, n=None, ch=True, w=1.0, h=1.0, sx=10, sy=10,
+                  **kwargs):
+        name = name or n or 'pPlane#'
+        xform = scene.createNode('transform', name)
+        shape = scene.createNode('mesh', xform.name + 'Shape', parent=xform)
+        shape.data.update(_planeMeshData(w, h, sx, sy))
+        shape.data['points'] = shape.data['meshPoints']
+        return [wrap(xform)]
+
+    def flatClosestUV(data, path):
+        """Closest point UVs, on the stand-in's flat (XZ) planes"""
+        point = getValue(data, 'inPosition')
+        src = (scene.connections.get((data, 'inputSurface')) or
+               scene.connections.get((data, 'inMesh')))
+        surf = src[0]
+        if 'nurbs' in surf.data:
+            points = [cv for row in surf.data['nurbs']['cvs'] for cv in row]
+        else:
+            points = surf.data['meshPoints']
+        xs = [pos[0] for pos in points]
+        zs = [-pos[2] for pos in points]
+        if path == 'parameterU':
+            value = (point[0] - min(xs)) / (max(xs) - min(xs))
+        else:
+            value = (-point[2] - min(zs)) / (max(zs) - min(zs))
+        return min(max(value, 0.0), 1.0)
+
+    for typ in ('closestPointOnSurface', 'closestPointOnMesh'):
+        for path in ('parameterU', 'parameterV'):
+            _evaluators[(typ, path)] = flatClosestUV
+
+    def pointMatrixMult(data, path):
+        point = list(getValue(data, 'inPoint'))
+        mtx = getValue(data, 'inMatrix')
+        if not mtx:
+            return tuple(point)
+        return tuple(sum([(point + [1.0])[i] * mtx[i][j] for i in range(4)])
+                     for j in range(3))
+    _evaluators[('pointMatrixMult', 'output')] = pointMatrixMult
+
+    def worldOffset(data):
+        offset = [0.0, 0.0, 0.0]
+        while data is not None:
+            if 'translate' in data.values:
+                offset = [
+                    a + b for a, b in zip(offset, data.values['translate'])]
+            data = data.parent
+        return offset
+
+    def worldMatrix(data, path):
+        x, y, z = worldOffset(data)
+        if path.startswith('worldInverse'):
+            x, y, z = -x, -y, -z
+        return [[1.0, 0, 0, 0], [0, 1.0, 0, 0], [0, 0, 1.0, 0], [x, y, z, 1.0]]
+
+    for typ in ('transform', 'joint', 'mesh', 'nurbsSurface', 'follicle'):
+        for path in ('worldMatrix[0]', 'worldInverseMatrix[0]'):
+            _evaluators[(typ, path)] = worldMatrix
+    pm.PyNode = PyNode
+    pm.Attribute = Attribute
+    pm.nt = nt
+    pm.nodetypes = nt
+    pm.MayaNodeError = MayaNodeError
+    pm.MayaAttributeError = MayaAttributeError
+    pm.wrap = wrap
+    pm.toData = toData
+    return pm
+
+
+def _planeSurfaceData(width, length, patchesU, patchesV, degree=3):
+    """Knots/CVs of a flat cubic nurbsPlane in XZ, normalised 0-1"""
+    def knotsFor(spans):
+        inner = [float(i) / spans for i in range(spans + 1)]
+        return [0.0] * (degree - 1) + inner + [1.0] * (degree - 1)
+
+    def cvCoords(spans, size):
+        # Greville abscissae of the clamped knot vector
+        knots = [0.0] + knotsFor(spans) + [1.0]
+        count = spans + degree
+        return [size * (sum(knots[i + 1:i + degree + 1]) / degree - 0.5)
+                for i in range(count)]
+
+    us = cvCoords(patchesU, width)
+    vs = cvCoords(patchesV, length)
+    cvs = [[(x, 0.0, -z) for z in vs] for x in us]
+    return {
+        'degree': (degree, degree),
+        'form': ('open', 'open'),
+        'knotsU': knotsFor(patchesU),
+        'knotsV': knotsFor(patchesV),
+        'cvs': cvs,
+        }
+
+
+def _planeMeshData(width, height, subdivX, subdivY):
+    points = []
+    uvs = []
+    for j in range(subdivY + 1):
+        for i in range(subdivX + 1):
+            u = float(i) / subdivX
+            v = float(j) / subdivY
+            points.append(((u - 0.5) * width, 0.0, (0.5 - v) * height))
+            uvs.append((u, v))
+    counts = []
+    vertexIds = []
+    for j in range(subdivY):
+        for i in range(subdivX):
+            a = j * (subdivX + 1) + i
+            counts.append(4)
+            vertexIds.extend([a, a + 1, a + subdivX + 2, a + subdivX + 1])
+    return {
+        'meshPoints': points, 'meshUVs': uvs, 'faceCounts': counts,
+        'faceVertexIds': vertexIds, 'faceUVIds': list(vertexIds),
+        }
+
+
+# --------------------------------------------------------------------
+# maya.api.OpenMaya and maya.cmds stand-ins (what batchPlan uses)
+
+
+def _buildOpenMaya(scene, pm):
+    """Return (OpenMaya, cmds) modules standing in for the parts of
+    maya.api.OpenMaya and maya.cmds used by batchPlan, backed by pm"""
+    om = types.ModuleType('maya.api.OpenMaya')
+    cmds = types.ModuleType('maya.cmds')
+
+    class apiCalls(object):
+        """Recount the commands used within the block as api calls"""
+
+        def __enter__(self):
+            self.before = dict(scene.commandCounts)
+            self.modelledTime = scene.modelledTime
+
+        def __exit__(self, *args):
+            added = 0
+            for command, count in scene.commandCounts.items():
+                extra = count - self.before.get(command, 0)
+                if extra and command != 'api':
+                    if count == extra:
+                        del scene.commandCounts[command]
+                    else:
+                        scene.commandCounts[command] = count - extra
+                    added += extra
+            scene.modelledTime = self.modelledTime
+            if added:
+                scene.charge('api', added)
+
+    class MFn(object):
+        kDagNode = 'dagNode'
+
+    class MObject(object):
+
+        def __init__(self, node=None):
+            self.node = node
+
+        def hasFn(self, fn):
+            return fn == MFn.kDagNode and isinstance(self.node, pm.nt.DagNode)
+
+        def isNull(self):
+            return self.node is None
+
+    MObject.kNullObj = MObject()
+
+    class MPlug(object):
+        kFreeToChange = 0
+
+        def __init__(self, attr):
+            self.attr = attr
+
+        def elementByLogicalIndex(self, index):
+            return MPlug(self.attr[index])
+
+        def child(self, attrName):
+            return MPlug(getattr(self.attr, attrName))
+
+        def partialName(self, includeNodeName=False, **kwargs):
+            return str(self.attr)
+
+        def asDouble(self):
+            with apiCalls():
+                return float(self.attr.get())
+
+        def isFreeToChange(self):
+            with apiCalls():
+                if self.attr.isFreeToChange() == 'freeToChange':
+                    return MPlug.kFreeToChange
+                return 1
+
+    class MSelectionList(object):
+
+        def __init__(self):
+            self.items = []
+            self._added = set()
+
+        def add(self, name):
+            with apiCalls():
+                found = pm.PyNode(name)
+            if not found in self._added:
+                self._added.add(found)
+                self.items.append(found)
+            return self
+
+        def length(self):
+            return len(self.items)
+
+        def getDependNode(self, index):
+            return MObject(self.items[index])
+
+        def getPlug(self, index):
+            return MPlug(self.items[index])
+
+    class MFnDependencyNode(object):
+
+        def __init__(self, obj):
+            self.obj = obj
+
+        def findPlug(self, name, wantNetworked):
+            with apiCalls():
+                return MPlug(self.obj.node.attr(name))
+
+        def attribute(self, name):
+            return name
+
+        def name(self):
+            return self.obj.node.nodeName()
+
+    class MDagPath(object):
+
+        def __init__(self, obj):
+            self.obj = obj
+
+        @staticmethod
+        def getAPathTo(obj):
+            return MDagPath(obj)
+
+        def partialPathName(self):
+            return str(self.obj.node)
+
+    class MFnNumericData(object):
+        kDouble = 'double'
+
+    class MFnNumericAttribute(object):
+
+        def __init__(self):
+            self.keyable = False
+
+        def create(self, longName, shortName, dataType, default):
+            self.spec = (longName, shortName, dataType, default)
+            return self
+
+    class MDGModifier(object):
+        """Queues its edits, and runs them as api calls in doIt"""
+
+        def __init__(self):
+            self.queue = []
+
+        def createNode(self, nodeType):
+            with apiCalls():
+                return MObject(pm.createNode(nodeType, ss=1))
+
+        def renameNode(self, obj, name):
+            self.queue.append(lambda: pm.rename(obj.node, name))
+
+        def addAttribute(self, obj, attrFn):
+            longName, shortName, dataType, default = attrFn.spec
+            self.queue.append(lambda: pm.addAttr(
+                obj.node, ln=longName, sn=shortName, k=attrFn.keyable,
+                dv=default))
+
+        def connect(self, src, dest):
+            self.queue.append(lambda: pm.connectAttr(src.attr, dest.attr))
+
+        def disconnect(self, src, dest):
+            self.queue.append(
+                lambda: pm.disconnectAttr(src.attr, dest.attr))
+
+        def newPlugValueBool(self, plug, value):
+            self.queue.append(lambda: plug.attr.set(value))
+
+        def newPlugValueInt(self, plug, value):
+            self.queue.append(lambda: plug.attr.set(value))
+
+        def newPlugValueDouble(self, plug, value):
+            self.queue.append(lambda: plug.attr.set(float(value)))
+
+        def commandToExecute(self, mel):
+            match = re.match(r'setAttr -k (\d) "(.+)"$', mel)
+            if not match:
+                raise NotImplementedError(
+                    "Stand-in can't run mel: %s" % mel)
+            self.queue.append(lambda: pm.setAttr(
+                match.group(2), k=bool(int(match.group(1)))))
+
+        def doIt(self):
+            with apiCalls():
+                for edit in self.queue:
+                    edit()
+            self.queue = []
+
+        def undoIt(self):
+            raise NotImplementedError("Stand-in modifiers can't be undone")
+
+    class MDagModifier(MDGModifier):
+
+        def createNode(self, nodeType, parent=MObject.kNullObj):
+            with apiCalls():
+                if parent.node is None:
+                    node = pm.createNode(nodeType, ss=1)
+                    if isinstance(node, pm.nt.Shape):
+                        node = node.getParent()
+                else:
+                    node = pm.createNode(nodeType, p=parent.node, ss=1)
+            return MObject(node)
+
+    callbacks = {}
+    callbackIds = itertools.count(100)
+
+    def addCallback(kind, func):
+        callbackId = next(callbackIds)
+        callbacks[callbackId] = (kind, func)
+        return callbackId
+
+    class MMessage(object):
+
+        @staticmethod
+        def removeCallbacks(callbackIds):
+            for callbackId in callbackIds:
+                callbacks.pop(callbackId)
+
+    class MDGMessage(object):
+
+        @staticmethod
+        def addConnectionCallback(func):
+            return addCallback('connection', func)
+
+        @staticmethod
+        def addNodeRemovedCallback(func, nodeType='dependNode'):
+            return addCallback('nodeRemoved', func)
+
+    class MEventMessage(object):
+
+        @staticmethod
+        def addEventCallback(eventName, func):
+            return addCallback(eventName, func)
+
+    class MPxCommand(object):
+        pass
+
+    class MFnPlugin(object):
+
+        def __init__(self, obj):
+            pass
+
+        def registerCommand(self, name, creator):
+            def runCommand(*args):
+                scene.charge(name)
+                command = creator()
+                command.doIt(args)
+                scene.undoCommands.append(command)
+            setattr(cmds, name, runCommand)
+
+        def deregisterCommand(self, name):
+            delattr(cmds, name)
+
+    for cls in (
+            MFn, MObject, MPlug, MSelectionList, MFnDependencyNode,
+            MDagPath, MFnNumericData, MFnNumericAttribute, MDGModifier,
+            MDagModifier, MMessage, MDGMessage, MEventMessage,
+            MPxCommand, MFnPlugin):
+        setattr(om, cls.__name__, cls)
+    om.callbacks = callbacks
+
+    loadedPlugins = set()
+    scene.undoCommands = []
+
+    def pluginInfo(path, q=False, loaded=False):
+        return path in loadedPlugins
+
+    def loadPlugin(path, quiet=False):
+        scene.charge('loadPlugin')
+        module = imp.load_source(
+            'standInPlugin%d' % len(loadedPlugins), path)
+        module.initializePlugin(MObject())
+        loadedPlugins.add(path)
+
+    cmds.pluginInfo = pluginInfo
+    cmds.loadPlugin = loadPlugin
+    return om, cmds
+
+
+class StandIn(object):
+    """Installs the stand-in modules into sys.modules."""
+
+    def __init__(self, **sceneKwargs):
+        self.scene = StandInScene(**sceneKwargs)
+        self.pm = _buildPymelCore(self.scene)
+        self.om, self.cmds = _buildOpenMaya(self.scene, self.pm)
+        self._previous = {}
+
+    @property
+    def commandCounts(self):
+        return self.scene.commandCounts
+
+    def install(self):
+        pymel = types.ModuleType('pymel')
+        pymel.core = self.pm
+        maya = types.ModuleType('maya')
+        maya.api = types.ModuleType('maya.api')
+        maya.api.OpenMaya = self.om
+        maya.cmds = self.cmds
+        modules = {
+            'pymel': pymel, 'pymel.core': self.pm,
+            'pymel.core.nodetypes': self.pm.nt,
+            'maya': maya, 'maya.api': maya.api,
+            'maya.api.OpenMaya': self.om, 'maya.cmds': self.cmds,
+            }
+        for name, module in modules.items():
+            self._previous[name] = sys.modules.get(name)
+            sys.modules[name] = module
+        return self
+
+    def uninstall(self):
+        for name, module in self._previous.items():
+            if module is None:
+                sys.modules.pop(name, None)
+            else:
+                sys.modules[name] = module
+        self._previous = {}
+
+
+def install(**sceneKwargs):
+    """Create a StandIn and install it (call before importing the tools)"""
+    return StandIn(**sceneKwargs).install()
+
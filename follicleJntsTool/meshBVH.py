@@ -0,0 +1,384 @@
+"""
+#
+# meshBVH.py
+#
+# @author Nathan Chisholm
+# @web nathanchisholm.weebly.com
+#
+# --------------------------------------------------------------------
+# Closest point (and UV) queries on meshes with a triangle bounding
+# volume hierarchy, in NumPy.
+#
+# The tree is built once from a mesh's points, triangles and UVs, and
+# answers whole batches of points at a time. forPatch caches a tree per
+# mesh shape, so repeated queries on the same mesh skip the
+# triangulation and the rebuild (the mesh is still read each time, to
+# check it hasn't changed).
+#
+"""
+
+
+import hashlib
+
+import numpy as np
+
+
+class MeshBVH(object):
+    """
+    Bounding volume hierarchy of a triangle mesh.
+
+    points: (numPoints, 3) array
+    triangles: (numTriangles, 3) array of point indices
+    triangleUVs: optional (numTriangles, 3, 2) array of the UVs at each
+        triangle corner
+    leafSize: most triangles in a leaf node
+    """
+    def __init__(self, points, triangles, triangleUVs=None, leafSize=8,
+                 name=None):
+        points = np.asarray(points, dtype=float).reshape(-1, 3)
+        triangles = np.asarray(triangles, dtype=int).reshape(-1, 3)
+        if not len(triangles):
+            raise ValueError("Mesh has no triangles!")
+        self.name = name
+        self.leafSize = max(1, int(leafSize))
+
+        corners = points[triangles]
+        order = self._build(corners)
+
+        # Triangles stored in leaf order, so each leaf is a range
+        self.triangleIds = order
+        self.corners = corners[order]
+        if triangleUVs is None:
+            self.cornerUVs = None
+        else:
+            triangleUVs = np.asarray(triangleUVs, dtype=float)
+            self.cornerUVs = triangleUVs.reshape(-1, 3, 2)[order]
+
+    def _build(self, corners):
+        """Split triangles at the median centroid of the longest axis.
+
+        Fills the flat node arrays; returns the triangle order.
+        """
+        centroids = corners.mean(axis=1)
+        lows = corners.min(axis=1)
+        highs = corners.max(axis=1)
+        order = np.arange(len(corners))
+
+        boxMin, boxMax, children, leafStart, leafCount = [], [], [], [], []
+        # (node id, start, end) ranges of order still to be split
+        stack = [(0, 0, len(order))]
+        boxMin.append(None); boxMax.append(None)
+        children.append((-1, -1)); leafStart.append(0); leafCount.append(0)
+        while stack:
+            node, start, end = stack.pop()
+            ids = order[start:end]
+            boxMin[node] = lows[ids].min(axis=0)
+            boxMax[node] = highs[ids].max(axis=0)
+            if end-start <= self.leafSize:
+                leafStart[node] = start
+                leafCount[node] = end-start
+                continue
+
+            extent = centroids[ids].max(axis=0)-centroids[ids].min(axis=0)
+            axis = extent.argmax()
+            half = (end-start)//2
+            split = np.argpartition(centroids[ids, axis], half)
+            order[start:end] = ids[split]
+
+            childIds = []
+            for childStart, childEnd in ((start, start+half), (start+half, end)):
+                childIds.append(len(boxMin))
+                boxMin.append(None); boxMax.append(None)
+                children.append((-1, -1)); leafStart.append(0)
+                leafCount.append(0)
+                stack.append((childIds[-1], childStart, childEnd))
+            children[node] = tuple(childIds)
+
+        self.boxMin = np.array(boxMin)
+        self.boxMax = np.array(boxMax)
+        self.children = np.array(children, dtype=int)
+        self.leafStart = np.array(leafStart, dtype=int)
+        self.leafCount = np.array(leafCount, dtype=int)
+        return order
+
+    @classmethod
+    def fromMesh(cls, mesh, leafSize=8):
+        """Build from a mesh shape's object space points and current UVs
+        (in a Maya session)
+        """
+        import pymel.core as pm
+
+        if not pm.objectType(mesh, i='mesh'):
+            raise ValueError("Patch must be a mesh shape PyNode!")
+        mesh = pm.PyNode(mesh)
+        points, triangles, triangleUVs = _meshArrays(mesh)
+        return cls(points, triangles, triangleUVs, leafSize=leafSize,
+                   name=mesh.nodeName())
+
+    # - Queries -
+    def closestPoints(self, points):
+        """Closest points on the mesh to a batch of points.
+
+        Returns (closest, triangleIds, barycentric, distances): an
+        (N, 3) array of points, (N,) triangle indices (into the
+        triangles the tree was built with), (N, 3) barycentric weights
+        of those triangles' corners, and (N,) distances.
+        """
+        points = np.asarray(points, dtype=float).reshape(-1, 3)
+        count = len(points)
+        bestSqDists = np.full(count, np.inf)
+        bestSlots = np.zeros(count, dtype=int)
+        bestBary = np.zeros((count, 3))
+        bestPoints = np.zeros((count, 3))
+        best = (bestSqDists, bestSlots, bestBary, bestPoints)
+
+        # Descend to the nearest looking leaf first, for a tight bound
+        queries = np.arange(count)
+        nodes = np.zeros(count, dtype=int)
+        internal = self.leafCount[nodes] == 0
+        while internal.any():
+            inner = np.nonzero(internal)[0]
+            first, second = self.children[nodes[inner]].T
+            firstSq = _boxSqDistances(
+                points[inner], self.boxMin[first], self.boxMax[first])
+            secondSq = _boxSqDistances(
+                points[inner], self.boxMin[second], self.boxMax[second])
+            # (by box centre where the point is inside both boxes)
+            firstCentre = _centreSqDistances(
+                points[inner], self.boxMin[first], self.boxMax[first])
+            secondCentre = _centreSqDistances(
+                points[inner], self.boxMin[second], self.boxMax[second])
+            takeFirst = (firstSq < secondSq) | (
+                (firstSq == secondSq) & (firstCentre <= secondCentre))
+            nodes[inner] = np.where(takeFirst, first, second)
+            internal = self.leafCount[nodes] == 0
+        self._testLeaves(points, queries, nodes, best)
+
+        # Then visit every node that could still hold a closer triangle
+        nodes = np.zeros(count, dtype=int)
+        while len(queries):
+            sqDists = _boxSqDistances(
+                points[queries], self.boxMin[nodes], self.boxMax[nodes])
+            near = sqDists < bestSqDists[queries]
+            queries = queries[near]
+            nodes = nodes[near]
+
+            leaves = self.leafCount[nodes] > 0
+            self._testLeaves(points, queries[leaves], nodes[leaves], best)
+            queries = np.tile(queries[~leaves], 2)
+            nodes = self.children[nodes[~leaves]].T.ravel()
+
+        return (bestPoints, self.triangleIds[bestSlots], bestBary,
+                np.sqrt(bestSqDists))
+
+    def _testLeaves(self, points, queries, nodes, best):
+        """Check (query, leaf) pairs' triangles, updating best in place"""
+        if not len(queries):
+            return
+        bestSqDists, bestSlots, bestBary, bestPoints = best
+
+        # Expand each pair to one row per triangle in the leaf
+        counts = self.leafCount[nodes]
+        rowQueries = np.repeat(queries, counts)
+        offsets = np.arange(counts.sum()) - np.repeat(
+            np.cumsum(counts)-counts, counts)
+        slots = np.repeat(self.leafStart[nodes], counts) + offsets
+
+        corners = self.corners[slots]
+        bary = _closestBarycentric(points[rowQueries], corners)
+        closest = (corners*bary[:, :, None]).sum(axis=1)
+        offset = closest-points[rowQueries]
+        sqDists = (offset*offset).sum(axis=1)
+
+        # Closest row per query, kept if closer than its best so far
+        order = np.lexsort((sqDists, rowQueries))
+        firsts = order[np.r_[True, rowQueries[order][1:] !=
+                             rowQueries[order][:-1]]]
+        better = sqDists[firsts] < bestSqDists[rowQueries[firsts]]
+        firsts = firsts[better]
+        ids = rowQueries[firsts]
+        bestSqDists[ids] = sqDists[firsts]
+        bestSlots[ids] = slots[firsts]
+        bestBary[ids] = bary[firsts]
+        bestPoints[ids] = closest[firsts]
+
+    def closestUVs(self, points):
+        """UVs of the closest points on the mesh, interpolated over the
+        closest triangles (barycentrically).
+
+        Triangles without UVs give (0, 0), like closestPointOnMesh.
+        Returns (uvs, distances, triangleIds)
+        """
+        if self.cornerUVs is None:
+            raise ValueError("MeshBVH has no UVs!")
+        closest, triangleIds, bary, distances = self.closestPoints(points)
+        slots = np.empty(len(self.triangleIds), dtype=int)
+        slots[self.triangleIds] = np.arange(len(self.triangleIds))
+        cornerUVs = self.cornerUVs[slots[triangleIds]]
+        uvs = (cornerUVs*bary[:, :, None]).sum(axis=1)
+        return uvs, distances, triangleIds
+
+
+def _boxSqDistances(points, boxMin, boxMax):
+    """Squared distances from points to (paired) axis aligned boxes"""
+    gap = np.maximum(boxMin-points, 0.0) + np.maximum(points-boxMax, 0.0)
+    return (gap*gap).sum(axis=1)
+
+
+def _centreSqDistances(points, boxMin, boxMax):
+    """Squared distances from points to (paired) box centres"""
+    offset = points-(boxMin+boxMax)*0.5
+    return (offset*offset).sum(axis=1)
+
+
+def _closestBarycentric(points, corners):
+    """Barycentric weights of the closest points on (paired) triangles.
+
+    Vectorised form of the Voronoi region tests in Ericson's 'Real-Time
+    Collision Detection' (ClosestPtPointTriangle).
+    corners: (N, 3, 3) array of triangle corners; returns (N, 3)
+    """
+    dot = lambda a, b: (a*b).sum(axis=1)
+    a, b, c = corners[:, 0], corners[:, 1], corners[:, 2]
+    ab = b-a
+    ac = c-a
+    ap = points-a
+    bp = points-b
+    cp = points-c
+    d1, d2 = dot(ab, ap), dot(ac, ap)
+    d3, d4 = dot(ab, bp), dot(ac, bp)
+    d5, d6 = dot(ab, cp), dot(ac, cp)
+    va = d3*d6-d5*d4
+    vb = d5*d2-d1*d6
+    vc = d1*d4-d3*d2
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # Inside the face, then the regions in reverse order of priority
+        total = va+vb+vc
+        v = np.where(total != 0.0, vb/total, 0.0)
+        w = np.where(total != 0.0, vc/total, 0.0)
+        bary = np.column_stack((1.0-v-w, v, w))
+
+        edgeBC = (va <= 0.0) & (d4-d3 >= 0.0) & (d5-d6 >= 0.0)
+        t = _ratio(d4-d3, (d4-d3)+(d5-d6))
+        bary[edgeBC] = np.column_stack((0.0*t, 1.0-t, t))[edgeBC]
+
+        edgeAC = (vb <= 0.0) & (d2 >= 0.0) & (d6 <= 0.0)
+        t = _ratio(d2, d2-d6)
+        bary[edgeAC] = np.column_stack((1.0-t, 0.0*t, t))[edgeAC]
+
+        cornerC = (d6 >= 0.0) & (d5 <= d6)
+        bary[cornerC] = (0.0, 0.0, 1.0)
+
+        edgeAB = (vc <= 0.0) & (d1 >= 0.0) & (d3 <= 0.0)
+        t = _ratio(d1, d1-d3)
+        bary[edgeAB] = np.column_stack((1.0-t, t, 0.0*t))[edgeAB]
+
+        cornerB = (d3 >= 0.0) & (d4 <= d3)
+        bary[cornerB] = (0.0, 1.0, 0.0)
+
+        cornerA = (d1 <= 0.0) & (d2 <= 0.0)
+        bary[cornerA] = (1.0, 0.0, 0.0)
+    return bary
+
+
+def _ratio(numerator, denominator):
+    """numerator/denominator, with 0.0 where the denominator is zero"""
+    return np.divide(
+        numerator, denominator, out=np.zeros_like(numerator),
+        where=denominator != 0.0)
+
+
+def _meshArrays(mesh):
+    """Object space points, triangles and triangle corner UVs of a mesh"""
+    points = np.array(
+        [list(point)[:3] for point in mesh.getPoints(space='object')],
+        dtype=float)
+    triCounts, triVertices = mesh.getTriangles()
+    faceCounts, faceVertices = mesh.getVertices()
+    uvCounts, uvIds = mesh.getAssignedUVs()
+    us, vs = mesh.getUVs()
+    triCounts = np.asarray(triCounts, dtype=int)
+    triVertices = np.asarray(triVertices, dtype=int).reshape(-1, 3)
+    faceCounts = np.asarray(faceCounts, dtype=int)
+    faceVertices = np.asarray(faceVertices, dtype=int)
+
+    # Find each triangle corner's face vertex, by (face, vertex) key
+    numPoints = max(len(points), 1)
+    faceIds = np.repeat(np.arange(len(faceCounts)), faceCounts)
+    faceVertexKeys = faceIds*numPoints + faceVertices
+    keyOrder = np.argsort(faceVertexKeys, kind='mergesort')
+    cornerFaces = np.repeat(np.arange(len(faceCounts)), triCounts)
+    cornerKeys = cornerFaces[:, None]*numPoints + triVertices
+    faceVertexIds = keyOrder[np.searchsorted(
+        faceVertexKeys[keyOrder], cornerKeys)]
+
+    # UV ids per face vertex (-1 for faces without UVs)
+    faceVertexUVIds = np.full(len(faceVertices), -1, dtype=int)
+    mapped = np.repeat(np.asarray(uvCounts, dtype=int) > 0, faceCounts)
+    faceVertexUVIds[mapped] = np.asarray(uvIds, dtype=int)
+    uvs = np.column_stack((
+        np.asarray(us, dtype=float), np.asarray(vs, dtype=float)))
+    uvs = np.concatenate((uvs.reshape(-1, 2), [[0.0, 0.0]]))
+    triangleUVs = uvs[faceVertexUVIds[faceVertexIds]]
+    return points, triVertices, triangleUVs
+
+
+# - Per patch cache -
+_treeCache = {}
+
+
+def _meshSignature(mesh):
+    """A signature of a mesh shape's geometry, for the cache.
+
+    The topology hash (meshSymmetry.topologyHash) and digests of the
+    object space points and the UVs. This reads the whole mesh, so it
+    costs O(mesh) per call; it only saves the triangulation and the tree
+    build, and keeps digests rather than the arrays.
+    """
+    import pymel.core as pm
+    from follicleJntsTool import meshSymmetry
+
+    faceCounts, faceVertices = mesh.getVertices()
+    uvCounts, uvIds = mesh.getAssignedUVs()
+    us, vs = mesh.getUVs()
+    points = pm.xform('%s.vtx[*]' % mesh.longName(), q=1, os=1, t=1)
+    pointDigest = hashlib.sha1(np.asarray(points, dtype=float).tobytes())
+    uvDigest = hashlib.sha1(np.asarray(uvCounts, dtype=np.int64).tobytes())
+    uvDigest.update(np.asarray(uvIds, dtype=np.int64).tobytes())
+    uvDigest.update(np.asarray(us, dtype=float).tobytes())
+    uvDigest.update(np.asarray(vs, dtype=float).tobytes())
+    return (
+        meshSymmetry.topologyHash(faceCounts, faceVertices),
+        pointDigest.hexdigest(), uvDigest.hexdigest())
+
+
+def forPatch(patch, leafSize=8):
+    """A (cached) MeshBVH of a mesh shape's object space geometry.
+
+    The tree is rebuilt only if the mesh's points, topology or UVs have
+    changed since it was last built (or with a different leafSize).
+    That's checked by reading the mesh again (see _meshSignature), so a
+    cache hit still costs a full read of the mesh, just no rebuild.
+    """
+    import pymel.core as pm
+
+    patch = pm.PyNode(patch)
+    signature = (leafSize,) + _meshSignature(patch)
+    key = patch.longName()
+    cached = _treeCache.get(key)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+    points, triangles, triangleUVs = _meshArrays(patch)
+    tree = MeshBVH(points, triangles, triangleUVs, leafSize=leafSize,
+                   name=patch.nodeName())
+    _treeCache[key] = (signature, tree)
+    return tree
+
+
+def clearCache(patch=None):
+    """Forget the cached tree of a patch, or of all patches"""
+    if patch is None:
+        _treeCache.clear()
+    else:
+        _treeCache.pop(patch.longName(), None)
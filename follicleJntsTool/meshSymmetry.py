@@ -0,0 +1,365 @@
+"""
+#
+# meshSymmetry.py
+#
+# @author Nathan Chisholm
+# @web nathanchisholm.weebly.com
+#
+# --------------------------------------------------------------------
+# Topological symmetry of meshes, for mirroring points on meshes whose
+# UV layouts aren't symmetric, in NumPy.
+#
+# The vertex and face symmetry maps are found by walking the mesh's
+# faces outwards from a seed edge on the symmetry line, so only the
+# topology has to be symmetric (not the points or UVs). forPatch caches
+# the maps per topology hash, so every mesh with the same topology
+# (and any deformed version of it) shares them.
+#
+"""
+
+
+import collections
+import hashlib
+
+import numpy as np
+
+from follicleJntsTool import meshBVH
+
+
+class MeshSymmetry(object):
+    """
+    Vertex and face symmetry maps of a (topologically symmetric) mesh.
+
+    faceCounts: vertex count of each face
+    faceVertices: vertex indices of each face, in order, one face
+        after another (as from MFnMesh.getVertices)
+    seedEdge: (vertex, vertex) of an edge on the symmetry line, with a
+        face either side of it
+    vertexMap, faceMap: the mirror index of each vertex and face (-1
+        where the walk didn't reach; eg. other mesh shells)
+    """
+    def __init__(self, faceCounts, faceVertices, seedEdge, name=None):
+        self.faceCounts = np.asarray(faceCounts, dtype=int)
+        self.faceVertices = np.asarray(faceVertices, dtype=int)
+        self.faceStarts = np.cumsum(self.faceCounts) - self.faceCounts
+        self.numVertices = int(self.faceVertices.max()) + 1
+        self.seedEdge = tuple([int(vertex) for vertex in seedEdge])
+        self.name = name
+        self.vertexMap, self.faceMap = self._walk()
+
+        # Face vertex of each (face, vertex), by sortable key
+        faceIds = np.repeat(np.arange(len(self.faceCounts)), self.faceCounts)
+        keys = faceIds*self.numVertices + self.faceVertices
+        self._keyOrder = np.argsort(keys, kind='mergesort')
+        self._sortedKeys = keys[self._keyOrder]
+
+    def __repr__(self):
+        return "MeshSymmetry(%s, %s of %s vertices mapped)" % (
+            self.name or '', (self.vertexMap >= 0).sum(),
+            len(self.vertexMap))
+
+    def _walk(self):
+        """Breadth first walk over the faces, out from the seed edge.
+
+        Each pair of mirror faces is matched vertex by vertex, one
+        forwards and the other backwards round its face (mirroring
+        reverses the winding), and their neighbours across each pair
+        of mirror edges are matched next.
+        Returns (vertexMap, faceMap)
+        """
+        counts = self.faceCounts
+        starts = self.faceStarts
+        loops = [
+            self.faceVertices[start:start+count].tolist()
+            for start, count in zip(starts, counts)]
+        # Face of each directed edge
+        nexts = np.arange(len(self.faceVertices)) + 1
+        nexts[starts + counts - 1] = starts
+        faceIds = np.repeat(np.arange(len(counts)), counts)
+        edgeFaces = dict(zip(
+            zip(self.faceVertices.tolist(),
+                self.faceVertices[nexts].tolist()),
+            faceIds.tolist()))
+
+        vertexMap = [-1]*self.numVertices
+        faceMap = [-1]*len(counts)
+        a, b = self.seedEdge
+        first = edgeFaces.get((a, b))
+        second = edgeFaces.get((b, a))
+        if first is None or second is None:
+            raise ValueError(
+                "Seed edge (%s, %s) needs a face either side!" % (a, b))
+        faceMap[first] = second
+        faceMap[second] = first
+        # (face, mirror face, a vertex of face, its mirror vertex)
+        queue = collections.deque([(first, second, a, a)])
+        while queue:
+            face, mirFace, vertex, mirVertex = queue.popleft()
+            loop = loops[face]
+            mirLoop = loops[mirFace]
+            size = len(loop)
+            if len(mirLoop) != size:
+                raise ValueError(
+                    "Mesh isn't symmetric! (faces %s and %s)" % (
+                        face, mirFace))
+            i = loop.index(vertex)
+            j = mirLoop.index(mirVertex)
+            mirrors = [mirLoop[(j-k) % size] for k in range(size)]
+            for k in range(size):
+                for one, other in ((loop[(i+k) % size], mirrors[k]),
+                                   (mirrors[k], loop[(i+k) % size])):
+                    if vertexMap[one] == -1:
+                        vertexMap[one] = other
+                    elif vertexMap[one] != other:
+                        raise ValueError(
+                            "Mesh isn't symmetric! (vertex %s)" % one)
+
+            # Neighbours across each edge, and across its mirror edge
+            for k in range(size):
+                start = loop[(i+k) % size]
+                end = loop[(i+k+1) % size]
+                mirStart, mirEnd = mirrors[k], mirrors[(k+1) % size]
+                nextFace = edgeFaces.get((end, start))
+                nextMirFace = edgeFaces.get((mirStart, mirEnd))
+                if nextFace is None and nextMirFace is None:
+                    continue
+                if nextFace is None or nextMirFace is None:
+                    raise ValueError(
+                        "Mesh isn't symmetric! (edge %s-%s)" % (start, end))
+                if faceMap[nextFace] == -1:
+                    faceMap[nextFace] = nextMirFace
+                    faceMap[nextMirFace] = nextFace
+                    queue.append((nextFace, nextMirFace, end, mirEnd))
+                elif faceMap[nextFace] != nextMirFace:
+                    raise ValueError(
+                        "Mesh isn't symmetric! (face %s)" % nextFace)
+        return np.array(vertexMap, dtype=int), np.array(faceMap, dtype=int)
+
+    def faceVertexIds(self, faces, vertices):
+        """Face vertex indices of (paired) faces and vertices (-1 where
+        the vertex isn't on the face)
+        """
+        faces = np.asarray(faces, dtype=int)
+        vertices = np.asarray(vertices, dtype=int)
+        keys = faces*self.numVertices + vertices
+        slots = np.searchsorted(self._sortedKeys, keys)
+        slots = np.minimum(slots, len(self._sortedKeys)-1)
+        found = (self._sortedKeys[slots] == keys) & (faces >= 0) & (
+            vertices >= 0)
+        return np.where(found, self._keyOrder[slots], -1)
+
+    def mirrorSurfacePoints(self, faces, cornerVertices, weights,
+                            faceVertexUVs):
+        """UVs of the mirror images of points on the mesh.
+
+        faces: (N,) face of each point
+        cornerVertices: (N, C) vertices of that face that the point is
+            interpolated between (eg. a triangle's corners)
+        weights: (N, C) weight of each corner vertex (eg. barycentric)
+        faceVertexUVs: (numFaceVertices, 2) UV of each face vertex
+        The same weights are applied to the mirror vertices, with their
+        UVs on the mirror face; points off the mapped part of the mesh
+        give NaN.
+        """
+        faces = np.asarray(faces, dtype=int)
+        cornerVertices = np.asarray(cornerVertices, dtype=int)
+        weights = np.asarray(weights, dtype=float)
+        mirFaces = np.where(faces >= 0, self.faceMap[faces], -1)
+        mirVertices = np.where(
+            cornerVertices >= 0, self.vertexMap[cornerVertices], -1)
+        ids = self.faceVertexIds(
+            np.repeat(mirFaces[:, None], mirVertices.shape[1], axis=1),
+            mirVertices)
+        faceVertexUVs = np.concatenate((
+            np.asarray(faceVertexUVs, dtype=float).reshape(-1, 2),
+            [[np.nan, np.nan]]))
+        cornerUVs = faceVertexUVs[ids]
+        return (cornerUVs*weights[:, :, None]).sum(axis=1)
+
+
+def topologyHash(faceCounts, faceVertices):
+    """Hash of a mesh's topology (its face vertex lists)"""
+    digest = hashlib.sha1(np.asarray(faceCounts, dtype=np.int64).tobytes())
+    digest.update(np.asarray(faceVertices, dtype=np.int64).tobytes())
+    return digest.hexdigest()
+
+
+def findSeedEdge(points, faceCounts, faceVertices, axis='x',
+                 tolerance=1e-4):
+    """An edge on the symmetry plane (axis=0), with a face either side.
+
+    tolerance: how far the edge's vertices may be off the plane,
+        relative to the size of the mesh
+    Of the edges with both vertices on the plane, the one whose two
+    faces lie furthest to either side of it is used.
+    Returns (vertex, vertex)
+    """
+    points = np.asarray(points, dtype=float).reshape(-1, 3)
+    faceCounts = np.asarray(faceCounts, dtype=int)
+    faceVertices = np.asarray(faceVertices, dtype=int)
+    axisIndex = 'xyz'.index(axis)
+    coords = points[:, axisIndex]
+    size = max(np.ptp(points, axis=0).max(), 1e-12)
+    onPlane = np.abs(coords) <= tolerance*size
+
+    starts = np.cumsum(faceCounts) - faceCounts
+    nexts = np.arange(len(faceVertices)) + 1
+    nexts[starts + faceCounts - 1] = starts
+    faceIds = np.repeat(np.arange(len(faceCounts)), faceCounts)
+    centres = np.bincount(
+        faceIds, coords[faceVertices], minlength=len(faceCounts)
+        )/np.maximum(faceCounts, 1)
+
+    # Directed edges on the plane, and their faces
+    ends = faceVertices[nexts]
+    onEdges = np.flatnonzero(onPlane[faceVertices] & onPlane[ends])
+    edgeFaces = dict(zip(
+        zip(faceVertices[onEdges].tolist(), ends[onEdges].tolist()),
+        faceIds[onEdges].tolist()))
+    best = None
+    for (a, b), face in edgeFaces.items():
+        other = edgeFaces.get((b, a))
+        if other is None:
+            continue
+        across = centres[face]*centres[other]
+        if across < 0.0 and (best is None or across < best[0]):
+            best = (across, (a, b))
+    if best is None:
+        raise ValueError("No edge found on the %s symmetry plane!" % axis)
+    return best[1]
+
+
+def triangleUVTree(faceCounts, faceVertexUVs, leafSize=8):
+    """A MeshBVH of a mesh's faces laid out in UV space.
+
+    Each face is split into a fan of triangles (faces without UVs are
+    left out); its triangles' corners are face vertex indices.
+    Returns (tree, triangleFaces, triangleCorners)
+    """
+    faceCounts = np.asarray(faceCounts, dtype=int)
+    faceVertexUVs = np.asarray(faceVertexUVs, dtype=float).reshape(-1, 2)
+    starts = np.cumsum(faceCounts) - faceCounts
+    mapped = ~np.isnan(faceVertexUVs).any(axis=1)
+    mappedFaces = np.bincount(
+        np.repeat(np.arange(len(faceCounts)), faceCounts), ~mapped,
+        minlength=len(faceCounts)) == 0
+
+    triCounts = np.where(mappedFaces, np.maximum(faceCounts-2, 0), 0)
+    triangleFaces = np.repeat(np.arange(len(faceCounts)), triCounts)
+    fanIds = np.arange(triCounts.sum()) - np.repeat(
+        np.cumsum(triCounts)-triCounts, triCounts)
+    firsts = starts[triangleFaces]
+    triangleCorners = np.column_stack(
+        (firsts, firsts+fanIds+1, firsts+fanIds+2))
+    if not len(triangleCorners):
+        raise ValueError("Mesh has no UVs!")
+    points = np.column_stack((
+        np.nan_to_num(faceVertexUVs), np.zeros(len(faceVertexUVs))))
+    tree = meshBVH.MeshBVH(points, triangleCorners, leafSize=leafSize)
+    return tree, triangleFaces, triangleCorners
+
+
+# - Per mesh caches -
+# {(topology hash, seed edge or axis): MeshSymmetry}
+_symmetryCache = {}
+# {mesh: (UV signature, (tree, triangle faces, triangle corners))}
+_uvTreeCache = {}
+
+
+def _meshTopology(mesh):
+    """Face counts and face vertices of a mesh shape"""
+    faceCounts, faceVertices = mesh.getVertices()
+    return (np.asarray(faceCounts, dtype=int),
+            np.asarray(faceVertices, dtype=int))
+
+
+def _faceVertexUVs(mesh, faceCounts):
+    """UV of each face vertex of a mesh (NaN for faces without UVs)"""
+    uvCounts, uvIds = mesh.getAssignedUVs()
+    us, vs = mesh.getUVs()
+    uvs = np.column_stack((
+        np.asarray(us, dtype=float), np.asarray(vs, dtype=float)))
+    uvs = np.concatenate((uvs.reshape(-1, 2), [[np.nan, np.nan]]))
+    faceVertexUVIds = np.full(np.sum(faceCounts), -1, dtype=int)
+    mapped = np.repeat(np.asarray(uvCounts, dtype=int) > 0, faceCounts)
+    faceVertexUVIds[mapped] = np.asarray(uvIds, dtype=int)
+    return uvs[faceVertexUVIds]
+
+
+def forPatch(patch, seedEdge=None, axis='x'):
+    """The (cached) MeshSymmetry of a mesh shape.
+
+    seedEdge: (vertex, vertex) of an edge on the symmetry line; by
+     default one is found on the axis plane in object space (see
+     findSeedEdge).
+    The maps depend only on the topology, so they're cached by its
+    hash: meshes with the same topology share them, and they're only
+    rebuilt if the topology (or seedEdge) changes.
+    """
+    import pymel.core as pm
+
+    patch = pm.PyNode(patch)
+    if not pm.objectType(patch, i='mesh'):
+        raise ValueError("Patch must be a mesh shape PyNode!")
+    faceCounts, faceVertices = _meshTopology(patch)
+    key = (topologyHash(faceCounts, faceVertices),
+           seedEdge and tuple(seedEdge) or axis)
+    symmetry = _symmetryCache.get(key)
+    if symmetry is None:
+        if seedEdge is None:
+            points = np.array([
+                list(point)[:3]
+                for point in patch.getPoints(space='object')], dtype=float)
+            seedEdge = findSeedEdge(points, faceCounts, faceVertices, axis)
+        symmetry = MeshSymmetry(
+            faceCounts, faceVertices, seedEdge, name=patch.nodeName())
+        _symmetryCache[key] = symmetry
+    return symmetry
+
+
+def _uvTree(patch, faceCounts, faceVertexUVs):
+    """The (cached) triangleUVTree of a mesh shape, rebuilt if its
+    topology or UVs have changed
+    """
+    signature = (faceCounts.tobytes(), faceVertexUVs.tobytes())
+    key = patch.longName()
+    cached = _uvTreeCache.get(key)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+    treeData = triangleUVTree(faceCounts, faceVertexUVs)
+    _uvTreeCache[key] = (signature, treeData)
+    return treeData
+
+
+def mirroredUVs(patch, uvs, seedEdge=None, axis='x', tolerance=1e-4):
+    """The UVs of the topological mirror images of UV points on a mesh.
+
+    Each UV is found in the mesh's faces (within tolerance, in UV
+    space), and its barycentric weights in its triangle are carried
+    over to the mirror vertices on the mirror face (see forPatch for
+    seedEdge and axis). Works however the mesh's UVs are laid out.
+    Returns an (N, 2) array, with NaN for UVs off the mesh (or off its
+    mirrored part).
+    """
+    import pymel.core as pm
+
+    patch = pm.PyNode(patch)
+    uvs = np.asarray(uvs, dtype=float).reshape(-1, 2)
+    if not len(uvs):
+        return np.zeros((0, 2))
+    symmetry = forPatch(patch, seedEdge=seedEdge, axis=axis)
+    faceVertexUVs = _faceVertexUVs(patch, symmetry.faceCounts)
+    tree, triangleFaces, triangleCorners = _uvTree(
+        patch, symmetry.faceCounts, faceVertexUVs)
+
+    closest, triangleIds, bary, distances = tree.closestPoints(
+        np.column_stack((uvs, np.zeros(len(uvs)))))
+    faces = np.where(distances <= tolerance, triangleFaces[triangleIds], -1)
+    corners = symmetry.faceVertices[triangleCorners[triangleIds]]
+    return symmetry.mirrorSurfacePoints(faces, corners, bary, faceVertexUVs)
+
+
+def clearCache():
+    """Forget every cached symmetry map and UV tree"""
+    _symmetryCache.clear()
+    _uvTreeCache.clear()
@@ -0,0 +1,442 @@
+"""
+#
+# nurbsEval.py
+#
+# @author Nathan Chisholm
+# @web nathanchisholm.weebly.com
+#
+# --------------------------------------------------------------------
+# NumPy evaluation of nurbs patches, independent of Maya.
+#
+# A patch's knots, CVs, degrees and forms are read once (fromPatch needs
+# a Maya session, the rest doesn't), after which positions, first
+# derivatives and normals can be evaluated for whole batches of
+# normalised (follicle) UVs at a time.
+#
+"""
+
+
+import numpy as np
+
+
+class NurbsPatch(object):
+    """
+    Surface data of a nurbs patch, evaluated with vectorised de Boor.
+
+    UVs given to and returned from the evaluation methods are normalised
+    (0 to 1 over the patch's parameter range) like follicle parameters,
+    whatever the knot range of the surface itself.
+
+    cvs: (numCVsInU, numCVsInV, 3) array, or 4 with weights (x, y, z, w)
+    knotsU/knotsV: knot vectors as Maya gives them (numCVs+degree-1
+        values) or full (numCVs+degree+1 values)
+    formU/formV: 'open', 'closed' or 'periodic'
+    """
+    def __init__(self, cvs, knotsU, knotsV, degreeU=3, degreeV=3,
+                 formU='open', formV='open', name=None):
+        cvs = np.asarray(cvs, dtype=float)
+        if cvs.ndim != 3 or cvs.shape[2] not in (3, 4):
+            raise ValueError(
+                "CVs must be a (numCVsInU, numCVsInV, 3 or 4) array!")
+        if cvs.shape[2] == 3:
+            weights = np.ones(cvs.shape[:2])
+        else:
+            weights = cvs[:, :, 3]
+            cvs = cvs[:, :, :3]
+
+        self.name = name
+        self.degree = (int(degreeU), int(degreeV))
+        self.form = (str(formU).lower(), str(formV).lower())
+        self.cvs = cvs
+        self.weights = weights
+        self.rational = not np.all(weights == 1.0)
+        # Homogeneous CVs (wx, wy, wz, w)
+        self._cvsW = np.concatenate(
+            (cvs*weights[:, :, None], weights[:, :, None]), axis=2)
+
+        self.knots = (
+            self._fullKnots(knotsU, cvs.shape[0], self.degree[0]),
+            self._fullKnots(knotsV, cvs.shape[1], self.degree[1]))
+        self.range = tuple(
+            (float(knots[degree]), float(knots[-degree-1]))
+            for knots, degree in zip(self.knots, self.degree))
+
+    @staticmethod
+    def _fullKnots(knots, numCVs, degree):
+        """Pad Maya's knot vector with the (unused) end knots if needed"""
+        knots = np.asarray(knots, dtype=float)
+        if len(knots) == numCVs+degree-1:
+            knots = np.concatenate(([knots[0]], knots, [knots[-1]]))
+        elif len(knots) != numCVs+degree+1:
+            raise ValueError(
+                "Knot count %s doesn't match %s CVs of degree %s!" % (
+                    len(knots), numCVs, degree))
+        return knots
+
+    @classmethod
+    def fromPatch(cls, patch, space='world'):
+        """Read the surface data of a nurbsSurface shape (in a Maya session)"""
+        import pymel.core as pm
+
+        if not pm.objectType(patch, i='nurbsSurface'):
+            raise ValueError("Patch must be a nurbSurface shape PyNode!")
+        patch = pm.PyNode(patch)
+        numU = patch.numCVsInU()
+        numV = patch.numCVsInV()
+        cvs = np.array(
+            [[cv[0], cv[1], cv[2], getattr(cv, 'w', 1.0)]
+             for cv in patch.getCVs(space=space)],
+            dtype=float).reshape(numU, numV, 4)
+        return cls(
+            cvs, patch.getKnotsInU(), patch.getKnotsInV(),
+            patch.degreeU(), patch.degreeV(),
+            str(patch.formInU()), str(patch.formInV()),
+            name=patch.nodeName())
+
+    @property
+    def isNormalised(self):
+        return self.range == ((0.0, 1.0), (0.0, 1.0))
+
+    # - Parameter conversion -
+    def toParams(self, uvs):
+        """Normalised UVs to surface parameters, as an (N, 2) array.
+
+        Periodic directions wrap, others are clamped to the patch.
+        """
+        uvs = np.array(uvs, dtype=float).reshape(-1, 2)
+        for axis in (0, 1):
+            if self.form[axis] == 'periodic':
+                uvs[:, axis] %= 1.0
+            else:
+                np.clip(uvs[:, axis], 0.0, 1.0, out=uvs[:, axis])
+        low = np.array([self.range[0][0], self.range[1][0]])
+        high = np.array([self.range[0][1], self.range[1][1]])
+        return low + uvs*(high-low)
+
+    def toNormalised(self, params):
+        """Surface parameters to normalised UVs, as an (N, 2) array"""
+        params = np.asarray(params, dtype=float).reshape(-1, 2)
+        low = np.array([self.range[0][0], self.range[1][0]])
+        high = np.array([self.range[0][1], self.range[1][1]])
+        return (params-low)/(high-low)
+
+    # - Evaluation -
+    def evaluate(self, uvs, derivatives=True):
+        """Positions (and first derivatives) at normalised UVs.
+
+        Returns positions, or (positions, dPdu, dPdv) if derivatives;
+        each an (N, 3) array, derivatives being with respect to the
+        normalised u and v.
+        """
+        derivs = self._evaluateParams(
+            self.toParams(uvs), 1 if derivatives else 0)
+        if not derivatives:
+            return derivs[(0, 0)]
+        return derivs[(0, 0)], derivs[(1, 0)], derivs[(0, 1)]
+
+    def _evaluateParams(self, params, order=1):
+        """Position and derivatives (up to order 2) at surface parameters.
+
+        Returns a dict of (N, 3) arrays keyed by (u order, v order),
+        eg. (1, 0) for dPdu, (1, 1) for d2Pdudv; derivatives are with
+        respect to the normalised u and v.
+        """
+        firstIdsU, basisU = _basisFunctions(
+            self.knots[0], self.degree[0], params[:, 0], order)
+        firstIdsV, basisV = _basisFunctions(
+            self.knots[1], self.degree[1], params[:, 1], order)
+
+        # Gather each point's (degreeU+1, degreeV+1) block of CVs
+        cvIdsU = firstIdsU[:, None] + np.arange(self.degree[0]+1)
+        cvIdsV = firstIdsV[:, None] + np.arange(self.degree[1]+1)
+        block = self._cvsW[cvIdsU[:, :, None], cvIdsV[:, None, :]]
+
+        # Homogeneous derivatives, scaled to the normalised UVs
+        lengths = [high-low for low, high in self.range]
+        homog = {}
+        for orderV in range(order+1):
+            # Sum over the v CVs first, then u, for each order
+            alongU = (block*basisV[orderV][:, None, :, None]).sum(axis=2)
+            for orderU in range(order+1-orderV):
+                homog[(orderU, orderV)] = (
+                    alongU*basisU[orderU][:, :, None]).sum(axis=1) * (
+                    lengths[0]**orderU * lengths[1]**orderV)
+
+        # Project (quotient rule, for rational surfaces)
+        weight = homog[(0, 0)][:, 3:]
+        derivs = {}
+        for key in sorted(homog, key=sum):
+            orderU, orderV = key
+            deriv = homog[key][:, :3].copy()
+            for lowU in range(orderU+1):
+                for lowV in range(orderV+1):
+                    if (lowU, lowV) == key:
+                        continue
+                    coeff = (_binomial(orderU, lowU) *
+                             _binomial(orderV, lowV))
+                    deriv -= coeff * homog[
+                        (orderU-lowU, orderV-lowV)][:, 3:] * derivs[
+                        (lowU, lowV)]
+            derivs[key] = deriv/weight
+        return derivs
+
+    def positions(self, uvs):
+        """World (or read space) positions at normalised UVs, (N, 3)"""
+        return self.evaluate(uvs, derivatives=False)
+
+    def derivatives(self, uvs):
+        """(dPdu, dPdv) at normalised UVs, each (N, 3)"""
+        return self.evaluate(uvs)[1:]
+
+    def normals(self, uvs):
+        """Unit surface normals (dPdu x dPdv) at normalised UVs, (N, 3)
+
+        Degenerate points (eg. poles) give zero vectors.
+        """
+        dPdu, dPdv = self.derivatives(uvs)
+        normals = np.cross(dPdu, dPdv)
+        lengths = np.sqrt((normals*normals).sum(axis=1))
+        nonZero = lengths > 1e-12
+        normals[nonZero] /= lengths[nonZero, None]
+        normals[~nonZero] = 0.0
+        return normals
+
+    # - Closest points -
+    def seedUVs(self, points, rows=None, chunkSize=4096):
+        """Normalised UVs of the closest samples on a grid over the patch.
+
+        rows: [u, v] sample counts; defaults to 4 per span (at least 8)
+        """
+        points = np.asarray(points, dtype=float).reshape(-1, 3)
+        if rows is None:
+            rows = [max(8, 4*(len(knots)-2*degree-1)+1)
+                    for knots, degree in zip(self.knots, self.degree)]
+        gridU, gridV = np.meshgrid(
+            np.linspace(0.0, 1.0, rows[0]), np.linspace(0.0, 1.0, rows[1]),
+            indexing='ij')
+        samples = np.column_stack((gridU.ravel(), gridV.ravel()))
+        samplePts = self.positions(samples)
+        sampleSqLengths = (samplePts*samplePts).sum(axis=1)
+
+        # Nearest sample per point (|p-s|^2 less the constant |p|^2),
+        # in chunks to keep the distance matrix small
+        nearest = np.empty(len(points), dtype=int)
+        for start in range(0, len(points), chunkSize):
+            chunk = points[start:start+chunkSize]
+            sqDists = sampleSqLengths[None, :] - 2.0*chunk.dot(samplePts.T)
+            nearest[start:start+chunkSize] = sqDists.argmin(axis=1)
+        return samples[nearest]
+
+    def closestUVs(self, points, seedRows=None, iterations=20,
+                   tolerance=1e-6, maxStep=0.25, backtracks=4):
+        """Project world points onto the patch, all at once.
+
+        Each point starts from the closest sample of a coarse grid over
+        the patch (seedUVs), then Newton iterations on the squared 
+        distance refine every unconverged point together (halving any
+        step that doesn't get closer, up to backtracks times). UVs are 
+        clamped to (or for periodic forms, wrapped around) the patch.
+        
+        points: (N, 3) array/sequence of positions (in the read space)
+        tolerance: convergence distance, in world units, of a step
+        maxStep: largest normalised UV change per iteration
+        Returns (uvs, distances, converged): (N, 2) normalised UVs like
+         follicle parameters, (N,) distances and (N,) bool flags
+        """
+        points = np.asarray(points, dtype=float).reshape(-1, 3)
+        uvs = self.seedUVs(points, seedRows)
+        converged = np.zeros(len(points), dtype=bool)
+        active = np.arange(len(points))
+
+        for i in range(iterations):
+            if not len(active):
+                break
+            uv = uvs[active]
+            derivs = self._evaluateParams(self.toParams(uv), order=2)
+            offset = derivs[(0, 0)]-points[active]
+            dPdu, dPdv = derivs[(1, 0)], derivs[(0, 1)]
+
+            step, grad, hessDiag = _newtonSteps(
+                offset, dPdu, dPdv,
+                derivs[(2, 0)], derivs[(1, 1)], derivs[(0, 2)])
+            self._blockSteps(uv, step, grad, hessDiag)
+            np.clip(step, -maxStep, maxStep, out=step)
+            distances = np.sqrt((offset*offset).sum(axis=1))
+
+            # Halve steps which don't bring points closer
+            newUV = self._limitUVs(uv+step)
+            trial = np.arange(len(uv))
+            for halving in range(backtracks+1):
+                newOffset = self.positions(newUV[trial])-points[active[trial]]
+                newDists = np.sqrt((newOffset*newOffset).sum(axis=1))
+                trial = trial[newDists > distances[trial]*(1.0+1e-12)]
+                if not len(trial):
+                    break
+                step[trial] *= 0.5
+                newUV[trial] = self._limitUVs(uv[trial]+step[trial])
+            failed = np.zeros(len(uv), dtype=bool)
+            failed[trial] = True
+            newUV[failed] = uv[failed]
+
+            # Distance actually moved over the surface (after clamping)
+            moved = newUV-uv
+            for axis in (0, 1):
+                if self.form[axis] == 'periodic':
+                    moved[:, axis] = (moved[:, axis]+0.5) % 1.0 - 0.5
+            travel = dPdu*moved[:, :1] + dPdv*moved[:, 1:]
+            travel = np.sqrt((travel*travel).sum(axis=1))
+
+            uvs[active] = newUV
+            done = (travel < tolerance) | (distances < tolerance)
+            converged[active[done & ~failed]] = True
+            active = active[~(done | failed)]
+
+        offset = self.positions(uvs)-points
+        distances = np.sqrt((offset*offset).sum(axis=1))
+        return uvs, distances, converged
+
+    def _blockSteps(self, uvs, steps, grad, hessDiag):
+        """Stop steps leaving the patch at its edges (in place).
+
+        Where a step is blocked on one axis, the other axis takes a 1D
+        Newton step along the edge instead.
+        """
+        blocked = np.zeros(steps.shape, dtype=bool)
+        for axis in (0, 1):
+            if self.form[axis] != 'periodic':
+                blocked[:, axis] = (
+                    ((uvs[:, axis] <= 0.0) & (steps[:, axis] < 0.0)) |
+                    ((uvs[:, axis] >= 1.0) & (steps[:, axis] > 0.0)))
+        for axis in (0, 1):
+            edge = blocked[:, 1-axis] & ~blocked[:, axis]
+            steps[edge, axis] = -_safeDivide(
+                grad[edge, axis], hessDiag[edge, axis])
+        steps[blocked] = 0.0
+
+    def _limitUVs(self, uvs):
+        """Clamp (or wrap periodic) normalised UVs to the patch"""
+        for axis in (0, 1):
+            if self.form[axis] == 'periodic':
+                uvs[:, axis] %= 1.0
+            else:
+                np.clip(uvs[:, axis], 0.0, 1.0, out=uvs[:, axis])
+        return uvs
+
+
+def _newtonSteps(offset, dPdu, dPdv, dPduu, dPduv, dPdvv):
+    """Newton steps in (u, v) minimising |P(u, v) - point|^2 for a batch.
+
+    Returns (steps, gradients, Hessian diagonals), each (N, 2).
+
+    Falls back to Gauss-Newton (no second derivative terms) where the
+    full Hessian isn't positive definite, and to per-axis steps where
+    even that is singular (eg. at a pole).
+    """
+    dot = lambda a, b: (a*b).sum(axis=1)
+    gradU = dot(dPdu, offset)
+    gradV = dot(dPdv, offset)
+    jUU = dot(dPdu, dPdu)
+    jUV = dot(dPdu, dPdv)
+    jVV = dot(dPdv, dPdv)
+    hUU = jUU + dot(offset, dPduu)
+    hUV = jUV + dot(offset, dPduv)
+    hVV = jVV + dot(offset, dPdvv)
+
+    det = hUU*hVV-hUV*hUV
+    fallback = (det <= 1e-12*(jUU*jVV+1e-30)) | (hUU <= 0.0)
+    hUU = np.where(fallback, jUU, hUU)
+    hUV = np.where(fallback, jUV, hUV)
+    hVV = np.where(fallback, jVV, hVV)
+    det = hUU*hVV-hUV*hUV
+
+    steps = np.zeros((len(offset), 2))
+    solvable = det > 1e-12*(jUU*jVV+1e-30)
+    steps[solvable, 0] = -(hVV*gradU-hUV*gradV)[solvable]/det[solvable]
+    steps[solvable, 1] = -(hUU*gradV-hUV*gradU)[solvable]/det[solvable]
+    single = ~solvable
+    steps[single, 0] = -_safeDivide(gradU[single], hUU[single])
+    steps[single, 1] = -_safeDivide(gradV[single], hVV[single])
+    return (steps, np.column_stack((gradU, gradV)),
+            np.column_stack((hUU, hVV)))
+
+
+def _binomial(n, k):
+    """n choose k, for the small orders used here"""
+    result = 1
+    for i in range(k):
+        result = result*(n-i)//(i+1)
+    return result
+
+
+def _knotSpans(knots, degree, params):
+    """Knot span index of each parameter (last span for the end value)"""
+    numCVs = len(knots)-degree-1
+    spans = np.searchsorted(knots, params, side='right')-1
+    return np.clip(spans, degree, numCVs-1)
+
+
+def _basisFunctions(knots, degree, params, order=1):
+    """Non-zero basis functions (and derivatives) for a batch of params.
+
+    Vectorised form of the triangular de Boor/Cox recurrence (as in
+    Piegl & Tiller's DersBasisFuns) over all parameters.
+    Returns (firstCVIds, ders); ders[k] being an (N, degree+1) array of
+    the k-th derivatives for CVs firstCVIds to firstCVIds+degree.
+    """
+    count = len(params)
+    spans = _knotSpans(knots, degree, params)
+    left = np.zeros((count, degree+1))
+    right = np.zeros((count, degree+1))
+    # Upper triangle holds basis functions, lower the knot differences
+    ndu = np.zeros((count, degree+1, degree+1))
+    ndu[:, 0, 0] = 1.0
+    for j in range(1, degree+1):
+        left[:, j] = params-knots[spans+1-j]
+        right[:, j] = knots[spans+j]-params
+        saved = np.zeros(count)
+        for r in range(j):
+            ndu[:, j, r] = right[:, r+1]+left[:, j-r]
+            temp = _safeDivide(ndu[:, r, j-1], ndu[:, j, r])
+            ndu[:, r, j] = saved+right[:, r+1]*temp
+            saved = left[:, j-r]*temp
+        ndu[:, j, j] = saved
+
+    ders = [ndu[:, :, degree].copy()]
+    ders.extend([np.zeros((count, degree+1)) for k in range(order)])
+    for r in range(degree+1):
+        # Alternating rows of derivative coefficients
+        a = np.zeros((2, count, degree+1))
+        a[0, :, 0] = 1.0
+        s1, s2 = 0, 1
+        for k in range(1, min(order, degree)+1):
+            d = np.zeros(count)
+            rk = r-k
+            pk = degree-k
+            if r >= k:
+                a[s2, :, 0] = _safeDivide(a[s1, :, 0], ndu[:, pk+1, rk])
+                d += a[s2, :, 0]*ndu[:, rk, pk]
+            j1 = 1 if rk >= -1 else -rk
+            j2 = k-1 if r-1 <= pk else degree-r
+            for j in range(j1, j2+1):
+                a[s2, :, j] = _safeDivide(
+                    a[s1, :, j]-a[s1, :, j-1], ndu[:, pk+1, rk+j])
+                d += a[s2, :, j]*ndu[:, rk+j, pk]
+            if r <= pk:
+                a[s2, :, k] = -_safeDivide(a[s1, :, k-1], ndu[:, pk+1, r])
+                d += a[s2, :, k]*ndu[:, r, pk]
+            ders[k][:, r] = d
+            s1, s2 = s2, s1
+
+    # Multiply through by degree!/(degree-k)!
+    factor = degree
+    for k in range(1, order+1):
+        ders[k] *= factor
+        factor *= degree-k
+    return spans-degree, ders
+
+
+def _safeDivide(numerator, denominator):
+    """numerator/denominator, with 0.0 where the denominator is zero"""
+    return np.divide(
+        numerator, denominator, out=np.zeros_like(numerator),
+        where=denominator != 0.0)
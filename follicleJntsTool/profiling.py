@@ -0,0 +1,395 @@
+"""
+#
+# profiling.py
+#
+# @author Nathan Chisholm
+# @web nathanchisholm.weebly.com
+#
+# --------------------------------------------------------------------
+# Opt-in call tracing for the follicle joint tools: wall time of each
+# public follicleJnts function and FollicleJoint method call (nested
+# as spans), and the Maya commands each issues, by command (batchPlan's
+# batched API reads and writes count as a command each.)
+#
+# Nothing is wrapped until tracing is enabled (and the originals are
+# put back when it's disabled), so there is no overhead otherwise.
+# span() marks out extra sections, eg. in tools calling these; it does
+# nothing while tracing is off.
+#
+# import follicleJntsTool.profiling as folProfile
+# reload(folProfile)
+# with folProfile.profiled() as trace:
+#     folTools.newFollicleGrid(patch=None, uvRows=[20, 20])
+# print trace.summary()
+# trace.writeChromeTrace('C:/temp/gridTrace.json')  # chrome://tracing
+#
+"""
+
+
+import json
+import types
+import timeit
+import functools
+import contextlib
+
+from follicleJntsTool import lazyImport
+from follicleJntsTool import follicleJnts as folTools
+from follicleJntsTool import batchPlan
+
+# Imported on first use (see lazyImport)
+pm = lazyImport.LazyModule('pymel.core', globals(), 'pm')
+
+
+_timer = timeit.default_timer
+
+# Modules whose public functions, and classes whose public methods, are
+# traced
+tracedModules = [folTools]
+tracedClasses = [folTools.FollicleJoint, folTools.FollicleJointArray]
+
+# pymel.core commands that are counted
+countedCommands = (
+    'createNode', 'connectAttr', 'disconnectAttr', 'rename', 'getAttr',
+    'setAttr', 'objExists', 'ls', 'listConnections', 'listRelatives',
+    'select', 'delete', 'parent', 'group', 'duplicate', 'addAttr',
+    'deleteAttr', 'attributeQuery', 'objectType', 'nodeType', 'xform',
+    'undoInfo', 'refresh')
+
+# PyNode/Attribute methods counted as the command they issue:
+# (class path in pymel.core, method, command)
+countedMethods = (
+    ('Attribute', 'get', 'getAttr'),
+    ('Attribute', 'set', 'setAttr'),
+    ('Attribute', 'inputs', 'listConnections'),
+    ('Attribute', 'outputs', 'listConnections'),
+    ('Attribute', 'connect', 'connectAttr'),
+    ('Attribute', 'disconnect', 'disconnectAttr'),
+    ('nt.DependNode', 'rename', 'rename'),
+    ('nt.DependNode', 'inputs', 'listConnections'),
+    ('nt.DependNode', 'outputs', 'listConnections'),
+    ('nt.DagNode', 'getParent', 'listRelatives'),
+    ('nt.DagNode', 'getChildren', 'listRelatives'),
+    ('nt.DagNode', 'getShapes', 'listRelatives'),
+    )
+
+# batchPlan's batched API reads/writes, counted as one command per call
+countedApiCalls = ('getValues', 'setValues', 'freeToChange')
+
+# The trace being recorded (see enable)
+_activeTrace = None
+
+# [(owner, attribute name, original value or None if inherited)]
+_patched = []
+
+
+class Span(object):
+    """A traced call: its name, start/end times (seconds, from the
+    start of the trace), depth, and the commands it issued itself"""
+
+    __slots__ = (
+        'name', 'category', 'start', 'end', 'depth', 'commands',
+        'childTime')
+
+    def __init__(self, name, category, start, depth):
+        self.name = name
+        self.category = category
+        self.start = start
+        self.end = None
+        self.depth = depth
+        self.commands = {}
+        self.childTime = 0.0
+
+    def __repr__(self):
+        return '<%s %s: %.3fms>' % (
+            self.__class__.__name__, self.name, 1000.0*self.duration)
+
+    @property
+    def duration(self):
+        return (self.end or self.start) - self.start
+
+
+class Trace(object):
+    """Spans and command counts recorded while tracing.
+
+    spans are listed in the order they started. Command counts are
+    kept per span (for the commands issued directly within it) and
+    overall (commandCounts).
+    """
+
+    def __init__(self):
+        self.spans = []
+        self.commandCounts = {}
+        self._stack = []
+        self._startTime = _timer()
+        self._inCommand = False
+
+    def __repr__(self):
+        return '<%s: %s spans, %s commands>' % (
+            self.__class__.__name__, len(self.spans),
+            sum(self.commandCounts.values()))
+
+    def begin(self, name, category='function'):
+        span = Span(
+            name, category, _timer() - self._startTime, len(self._stack))
+        self.spans.append(span)
+        self._stack.append(span)
+        return span
+
+    def end(self):
+        span = self._stack.pop()
+        span.end = _timer() - self._startTime
+        if self._stack:
+            self._stack[-1].childTime += span.duration
+        return span
+
+    def command(self, name):
+        """Count a Maya command, against the innermost span"""
+        self.commandCounts[name] = self.commandCounts.get(name, 0) + 1
+        if self._stack:
+            commands = self._stack[-1].commands
+            commands[name] = commands.get(name, 0) + 1
+
+    def inclusiveCommands(self):
+        """Commands issued within each span (including by nested
+        spans), as a list parallel to spans"""
+        totals = [dict(span.commands) for span in self.spans]
+        # (Children always follow their parents; add them in reverse)
+        stack = []
+        parentOf = [None]*len(self.spans)
+        for i, span in enumerate(self.spans):
+            del stack[span.depth:]
+            if stack:
+                parentOf[i] = stack[-1]
+            stack.append(i)
+        for i in reversed(range(len(self.spans))):
+            parent = parentOf[i]
+            if parent is not None:
+                for name, count in totals[i].items():
+                    totals[parent][name] = totals[parent].get(name, 0) + count
+        return totals
+
+    def totals(self):
+        """Per traced name: {name: {'calls', 'seconds', 'selfSeconds',
+        'commands':{command: count}}}
+
+        Recursive calls of a name are only timed at the outermost one.
+        """
+        totals = {}
+        open_ = []
+        for span, commands in zip(self.spans, self.inclusiveCommands()):
+            del open_[span.depth:]
+            entry = totals.setdefault(span.name, {
+                'calls':0, 'seconds':0.0, 'selfSeconds':0.0,
+                'commands':{}})
+            entry['calls'] += 1
+            entry['selfSeconds'] += span.duration - span.childTime
+            if not span.name in open_:
+                entry['seconds'] += span.duration
+                for name, count in commands.items():
+                    entry['commands'][name] = (
+                        entry['commands'].get(name, 0) + count)
+            open_.append(span.name)
+        return totals
+
+    def summary(self, sortBy='seconds', limit=None, commandTypes=3):
+        """A flat table of the traced calls, by total time (or sortBy
+        'selfSeconds' or 'calls'), with their most used commands."""
+        totals = self.totals()
+        names = sorted(
+            totals, key=lambda name: (-totals[name][sortBy], name))
+        if limit:
+            names = names[:limit]
+        rows = [['call', 'calls', 'total ms', 'self ms', 'commands',
+                 'most used']]
+        for name in names:
+            entry = totals[name]
+            commands = entry['commands']
+            mostUsed = sorted(
+                commands.items(), key=lambda item: (-item[1], item[0]))
+            rows.append([
+                name, entry['calls'], '%.2f' % (1000.0*entry['seconds']),
+                '%.2f' % (1000.0*entry['selfSeconds']),
+                sum(commands.values()), ', '.join([
+                    '%s %s' % item for item in mostUsed[:commandTypes]])])
+        widths = [
+            max([len(str(row[i])) for row in rows])
+            for i in range(len(rows[0]))]
+        lines = []
+        for row in rows:
+            lines.append('  '.join(
+                [str(row[0]).ljust(widths[0])] +
+                [str(row[i]).rjust(widths[i]) for i in range(1, 5)] +
+                [str(row[5])]).rstrip())
+        lines.append('Commands: %s' % ', '.join([
+            '%s %s' % item for item in sorted(
+                self.commandCounts.items(),
+                key=lambda item: (-item[1], item[0]))]))
+        return '\n'.join(lines)
+
+    def chromeTrace(self):
+        """The trace as Chrome trace-event data (complete 'X' events,
+        in microseconds), with each span's commands as its args"""
+        events = []
+        for span, commands in zip(self.spans, self.inclusiveCommands()):
+            events.append({
+                'name':span.name, 'cat':span.category, 'ph':'X',
+                'ts':round(1e6*span.start, 3),
+                'dur':round(1e6*span.duration, 3),
+                'pid':1, 'tid':1, 'args':commands})
+        return {'traceEvents':events, 'displayTimeUnit':'ms'}
+
+    def writeChromeTrace(self, filePath):
+        """Write chromeTrace to a JSON file (for chrome://tracing)"""
+        with open(filePath, 'w') as jsonFile:
+            json.dump(self.chromeTrace(), jsonFile)
+
+
+class _NullSpan(object):
+    """span() while tracing is off"""
+
+    def __enter__(self):
+        return None
+
+    def __exit__(self, *args):
+        return False
+
+_nullSpan = _NullSpan()
+
+
+def span(name, category='user'):
+    """Context manager timing a section as a span of the active trace.
+
+    Does nothing (cheaply) while tracing is off.
+    """
+    if _activeTrace is None:
+        return _nullSpan
+    return _tracedSpan(_activeTrace, name, category)
+
+
+@contextlib.contextmanager
+def _tracedSpan(trace, name, category):
+    trace.begin(name, category)
+    try:
+        yield trace
+    finally:
+        trace.end()
+
+
+def isEnabled():
+    return _activeTrace is not None
+
+
+def enable(trace=None):
+    """Start tracing (into trace, or a new Trace), and return it.
+
+    Wraps the traced functions/methods and the counted commands.
+    """
+    global _activeTrace
+    if _activeTrace is not None:
+        raise StandardError("Tracing is already enabled!")
+    if trace is None:
+        trace = Trace()
+    _instrument()
+    _activeTrace = trace
+    return trace
+
+
+def disable():
+    """Stop tracing, restoring everything wrapped; returns the trace."""
+    global _activeTrace
+    trace = _activeTrace
+    _activeTrace = None
+    _uninstrument()
+    return trace
+
+
+@contextlib.contextmanager
+def profiled(trace=None):
+    """Trace the calls made within a with block (yielding the Trace)"""
+    trace = enable(trace)
+    try:
+        yield trace
+    finally:
+        disable()
+
+
+def _instrument():
+    for module in tracedModules:
+        prefix = module.__name__.rpartition('.')[2]
+        for name, value in vars(module).items():
+            if (not name.startswith('_') and
+                    isinstance(value, types.FunctionType) and
+                    value.__module__ == module.__name__):
+                _patch(module, name, _tracedCall(
+                    value, '%s.%s' % (prefix, name)))
+    for cls in tracedClasses:
+        for name, value in vars(cls).items():
+            if (not name.startswith('_') and
+                    isinstance(value, types.FunctionType)):
+                _patch(cls, name, _tracedCall(
+                    value, '%s.%s' % (cls.__name__, name)))
+
+    for name in countedCommands:
+        func = getattr(pm, name, None)
+        if func is not None:
+            _patch(pm, name, _countedCall(func, name))
+    for ownerPath, name, command in countedMethods:
+        owner = pm
+        for part in ownerPath.split('.'):
+            owner = getattr(owner, part)
+        method = getattr(owner, name, None)
+        if method is not None:
+            _patch(owner, name, _countedCall(method, command))
+    for name in countedApiCalls:
+        _patch(batchPlan, name, _countedCall(
+            getattr(batchPlan, name), 'batchPlan.%s' % name))
+
+
+def _uninstrument():
+    while _patched:
+        owner, name, original = _patched.pop()
+        if original is None:
+            delattr(owner, name)
+        else:
+            setattr(owner, name, original)
+
+
+def _patch(owner, name, value):
+    original = None
+    if isinstance(owner, type):
+        original = owner.__dict__.get(name)
+    else:
+        original = getattr(owner, name)
+    _patched.append((owner, name, original))
+    setattr(owner, name, value)
+
+
+def _tracedCall(func, name):
+    """Wrap func to record a span for each call"""
+    @functools.wraps(func)
+    def traced(*args, **kwargs):
+        trace = _activeTrace
+        if trace is None:
+            return func(*args, **kwargs)
+        trace.begin(name)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            trace.end()
+    return traced
+
+
+def _countedCall(func, command):
+    """Wrap a command (or method) to count each (outermost) call"""
+    @functools.wraps(func)
+    def counted(*args, **kwargs):
+        trace = _activeTrace
+        if trace is None or trace._inCommand:
+            return func(*args, **kwargs)
+        trace.command(command)
+        trace._inCommand = True
+        try:
+            return func(*args, **kwargs)
+        finally:
+            trace._inCommand = False
+    return counted
@@ -0,0 +1,298 @@
+"""
+#
+# standInBenchmarks.py
+#
+# @author Nathan Chisholm
+# @web nathanchisholm.weebly.com
+#
+# --------------------------------------------------------------------
+# Benchmarks of the follicle joint tools run against the in-memory
+# Maya stand-in (mayaStandIn), so scaling can be checked without Maya.
+# Each command the tools issue is counted and charged a modelled
+# latency, so the results show both the time taken here and the time
+# the commands would roughly cost in Maya, per follicle.
+#
+# Run outside Maya, eg. from the folder holding follicleJntsTool:
+# python -m follicleJntsTool.standInBenchmarks 10 100 1000 10000
+#
+# from follicleJntsTool import standInBenchmarks as standInBench
+# results = standInBench.runSuite(sizes=[10, 100, 1000])
+# standInBench.printResults(results)
+#
+"""
+
+
+import sys
+import time
+
+from follicleJntsTool import mayaStandIn
+
+
+# The benchmarks run by runSuite, in order
+benchmarkNames = (
+    'grid', 'gridClone', 'closestClone', 'discovery', 'freeze',
+    'mirrorOffsets', 'mirrorFollicles', 'autoRename', 'autoRenameNamed',
+    'duplicate', 'transfer')
+
+# The follicle joint type the grids are made of
+folType = 't/f-j'
+
+# The stand-in in use, and the tool modules imported against it
+_standIn = None
+_folTools = None
+
+
+def runSuite(sizes=(10, 100, 1000, 10000), benchmarks=benchmarkNames,
+             defaultCost=0.0001, apiCost=0.000005, commandCosts=None,
+             verbose=True):
+    """Run the benchmarks on grids of roughly each size of follicles.
+
+    defaultCost, apiCost and commandCosts ({command: seconds}) set the
+    modelled latency of each command (see mayaStandIn.StandInScene).
+
+    Returns a list of result dicts: {'benchmark', 'follicles',
+    'seconds', 'modelledSeconds', 'commands', 'apiCalls',
+    'commandCounts'}
+    """
+    folTools = _setUp(defaultCost, apiCost, commandCosts)
+    results = []
+    for size in sizes:
+        for name in benchmarks:
+            result = runBenchmark(name, size, folTools=folTools)
+            results.append(result)
+            if verbose:
+                print '%s %s: %.3fs' % (
+                    name, result['follicles'], result['seconds'])
+    return results
+
+
+def runBenchmark(name, size, folTools=None):
+    """Run one benchmark (one of benchmarkNames) in a new scene.
+
+    Only the benchmarked operation is timed and counted, not the
+    scene setup before it.
+    """
+    if not name in benchmarkNames:
+        raise ValueError("Unknown benchmark: %s" % name)
+    if folTools is None:
+        folTools = _setUp()
+    scene = _standIn.scene
+    scene.reset()
+    operation, count = globals()['_bench_' + name](folTools, size)
+
+    scene.resetCounts()
+    startTime = time.time()
+    operation()
+    seconds = time.time() - startTime
+    counts = dict(scene.commandCounts)
+    return {
+        'benchmark':name, 'follicles':count, 'seconds':seconds,
+        'modelledSeconds':scene.modelledTime,
+        'commands':scene.commandTotal, 'apiCalls':counts.get('api', 0),
+        'commandCounts':counts}
+
+
+def printResults(results, commandTypes=3):
+    """Print runSuite results as a table, with per-follicle figures"""
+    header = [
+        'benchmark', 'follicles', 'seconds', 'modelled', 'commands',
+        'ms/fol', 'modelled ms/fol', 'commands/fol', 'api/fol',
+        'most used']
+    rows = []
+    for result in results:
+        count = float(max(result['follicles'], 1))
+        commands = [
+            item for item in result['commandCounts'].items()
+            if item[0] != 'api']
+        commands.sort(key=lambda item: (-item[1], item[0]))
+        rows.append([
+            result['benchmark'], result['follicles'],
+            '%.3f' % result['seconds'],
+            '%.3f' % result['modelledSeconds'], result['commands'],
+            '%.3f' % (1000*result['seconds']/count),
+            '%.3f' % (1000*result['modelledSeconds']/count),
+            '%.1f' % (result['commands']/count),
+            '%.1f' % (result['apiCalls']/count),
+            ', '.join(['%s %s' % item for item in commands[:commandTypes]])])
+    widths = [
+        max([len(str(row[i])) for row in rows] + [len(header[i])])
+        for i in range(len(header))]
+    print '  '.join([header[0].ljust(widths[0])] + [
+        header[i].rjust(widths[i]) for i in range(1, len(header) - 1)] +
+        [header[-1]])
+    for row in rows:
+        print '  '.join([str(row[0]).ljust(widths[0])] + [
+            str(row[i]).rjust(widths[i]) for i in range(1, len(row) - 1)] +
+            [str(row[-1])])
+
+
+def _setUp(defaultCost=None, apiCost=None, commandCosts=None):
+    """Install the stand-in (once) and import the tools against it.
+
+    Returns the follicleJnts module.
+    """
+    global _standIn, _folTools
+    if _standIn is None:
+        if 'maya.cmds' in sys.modules:
+            raise StandardError(
+                "The stand-in benchmarks must be run outside Maya!")
+        _standIn = mayaStandIn.install()
+        from follicleJntsTool import follicleJnts
+        _folTools = follicleJnts
+    scene = _standIn.scene
+    if defaultCost is not None:
+        scene.defaultCost = defaultCost
+    if apiCost is not None:
+        scene.apiCost = apiCost
+    if commandCosts is not None:
+        scene.commandCosts = dict(commandCosts)
+    return _folTools
+
+
+def _gridShape(size):
+    """[rows in U, rows in V] for a roughly square grid of size"""
+    rowsU = max(int(round(size**0.5)), 2)
+    return [rowsU, max(int(round(size/float(rowsU))), 2)]
+
+
+def _newPatch(name='benchPatch'):
+    pm = _standIn.pm
+    return pm.nurbsPlane(name=name, ch=0, u=4, v=4)[0].getShape()
+
+
+def _newGrid(folTools, size, uvRange=None, patch=None):
+    """A patch and grid of about size follicle joints: (patch, tops)"""
+    if patch is None:
+        patch = _newPatch()
+    folJnts = folTools.newFollicleGrid(
+        patch=patch, uvRows=_gridShape(size), edgeBounded=[1, 1],
+        uvRange=list(uvRange or [0.0, 1.0, 0.0, 1.0]), folType=folType,
+        selectNew=False, giveWarning=False)
+    return patch, [folJnt.topObj for folJnt in folJnts]
+
+
+def _newPoints(size):
+    """About size transforms spread over (and above) a patch"""
+    pm = _standIn.pm
+    rowsX, rowsZ = _gridShape(size)
+    points = []
+    for i in range(rowsX):
+        for j in range(rowsZ):
+            point = pm.group(em=True, n='benchPoint#')
+            pm.xform(point, t=[
+                i/float(rowsX - 1) - 0.5, 0.1, j/float(rowsZ - 1) - 0.5])
+            points.append(point)
+    return points
+
+
+def _newNamedGrid(folTools, size, uvRange=None):
+    """A grid renamed left/right, so mirrors pair by name"""
+    patch, tops = _newGrid(folTools, size, uvRange=uvRange)
+    folTools.autoRename(tops, useSelection=False, name='bench_#')
+    return patch, tops
+
+
+# Benchmarks: each sets up a scene and returns (operation to time,
+# follicle count)
+def _bench_grid(folTools, size):
+    patch = _newPatch()
+    uvRows = _gridShape(size)
+    return (
+        lambda: folTools.newFollicleGrid(
+            patch=patch, uvRows=uvRows, edgeBounded=[1, 1],
+            uvRange=[0.0, 1.0, 0.0, 1.0], folType=folType,
+            selectNew=False, giveWarning=False),
+        uvRows[0]*uvRows[1])
+
+
+def _bench_gridClone(folTools, size):
+    patch = _newPatch()
+    uvRows = _gridShape(size)
+    return (
+        lambda: folTools.newFollicleGrid(
+            patch=patch, uvRows=uvRows, edgeBounded=[1, 1],
+            uvRange=[0.0, 1.0, 0.0, 1.0], folType=folType,
+            selectNew=False, giveWarning=False, clone=True),
+        uvRows[0]*uvRows[1])
+
+
+def _bench_closestClone(folTools, size):
+    patch = _newPatch()
+    points = _newPoints(size)
+    return (
+        lambda: folTools.newFollicleAtClosestPt(
+            patch=patch, objs=points, folType=folType, clone=True),
+        len(points))
+
+
+def _bench_discovery(folTools, size):
+    patch, tops = _newGrid(folTools, size)
+    return (
+        lambda: folTools.findFollicleJoints(
+            tops, strict=False, verbose=False, asArray=True),
+        len(tops))
+
+
+def _bench_freeze(folTools, size):
+    patch, tops = _newGrid(folTools, size)
+    folTools.getFollicleJoints(tops, asArray=True).offsets = 0.01
+    return (
+        lambda: folTools.freezeOffsets(tops, useSelection=False),
+        len(tops))
+
+
+def _bench_mirrorOffsets(folTools, size):
+    patch, tops = _newNamedGrid(folTools, size)
+    return (
+        lambda: folTools.mirrorFollicleOffsets(
+            objs=tops, useSelection=False, strict=False, warnings=False),
+        len(tops))
+
+
+def _bench_mirrorFollicles(folTools, size):
+    # (A left half grid, mirrored)
+    patch, tops = _newNamedGrid(
+        folTools, size/2, uvRange=[0.0, 0.4, 0.0, 1.0])
+    return (
+        lambda: folTools.mirrorFollicles(
+            objs=tops, useSelection=False, strict=False, warnings=False),
+        len(tops))
+
+
+def _bench_autoRename(folTools, size):
+    patch, tops = _newGrid(folTools, size)
+    return (
+        lambda: folTools.autoRename(
+            tops, useSelection=False, name='renamed_#'),
+        len(tops))
+
+
+def _bench_autoRenameNamed(folTools, size):
+    # (Already named as it would be, so nothing is renamed)
+    patch, tops = _newNamedGrid(folTools, size)
+    return (
+        lambda: folTools.autoRename(
+            tops, useSelection=False, name='bench_#'),
+        len(tops))
+
+
+def _bench_duplicate(folTools, size):
+    patch, tops = _newGrid(folTools, size)
+    return (
+        lambda: folTools.duplicateFollicles(
+            objs=tops, useSelection=False),
+        len(tops))
+
+
+def _bench_transfer(folTools, size):
+    patch, tops = _newGrid(folTools, size)
+    newPatch = _newPatch('benchNewPatch')
+    return (
+        lambda: folTools.transferFolliclesToPatch(
+            patch=newPatch, objs=tops, useSelection=False),
+        len(tops))
+
+
+if __name__ == '__main__':
+    runSizes = [int(arg) for arg in sys.argv[1:]] or [10, 100, 1000]
+    printResults(runSuite(sizes=runSizes))